@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Regenerates the manifest of steps and flows built into OpenLane
+(``openlane/manifest.py``), or with ``--check``, fails if it is out of date.
+
+Usage: python3 ./.github/scripts/update_manifest.py [--check]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.getcwd())
+
+from openlane.registry import MANIFEST_PATH, generate_manifest  # noqa: E402
+
+generated = generate_manifest()
+current = open(MANIFEST_PATH, encoding="utf8").read()
+if current == generated:
+    exit(0)
+
+if "--check" in sys.argv[1:]:
+    print(
+        f"{MANIFEST_PATH} is out of date. Run 'make manifest' to regenerate it.",
+        file=sys.stderr,
+    )
+    exit(1)
+
+with open(MANIFEST_PATH, "w", encoding="utf8") as f:
+    f.write(generated)
+print(f"Updated {MANIFEST_PATH}.")
@@ -0,0 +1,116 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measures how long it takes to load and validate a design configuration against
+the variables of the PDK and a flow.
+
+Usage: python3 -m benchmarks.config_validation --pdk sky130A ./designs/spm/config.json
+"""
+import json
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import click
+
+from openlane.config import Config, Variable, universal_flow_config_variables
+from openlane.config.pdk import all_variables as pdk_variables
+from openlane.config.flow import removed_variables
+from openlane.flows import Flow
+
+
+def get_flow_variables(flow_name: str) -> List[Variable]:
+    flow = Flow.factory.get(flow_name)
+    if flow is None:
+        raise click.BadParameter(f"Unknown flow '{flow_name}'.")
+    by_name: Dict[str, Variable] = {
+        variable.name: variable for variable in universal_flow_config_variables
+    }
+    for variable in flow.config_vars:
+        by_name[variable.name] = variable
+    for step in flow.Steps:
+        for variable in step.config_vars:
+            by_name[variable.name] = variable
+    return list(by_name.values())
+
+
+@click.command()
+@click.option("--pdk-root", default=None, help="The PDK root.")
+@click.option("--pdk", default=None, help="The PDK.")
+@click.option("--scl", default=None, help="The standard cell library.")
+@click.option("--flow", "flow_name", default="Classic", help="The flow.")
+@click.option(
+    "--iterations",
+    type=int,
+    default=100,
+    help="The number of times to load and validate the configuration.",
+)
+@click.argument("config_file", type=click.Path(exists=True, dir_okay=False))
+def main(
+    pdk_root: Optional[str],
+    pdk: Optional[str],
+    scl: Optional[str],
+    flow_name: str,
+    iterations: int,
+    config_file: str,
+):
+    flow_variables = get_flow_variables(flow_name)
+    variables = pdk_variables + flow_variables
+
+    # The first load processes the PDK configuration
+    start = time.perf_counter()
+    config, design_dir = Config.load(
+        config_file,
+        flow_variables,
+        pdk=pdk,
+        pdk_root=pdk_root,
+        scl=scl,
+    )
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        Config.load(
+            config_file,
+            flow_variables,
+            pdk=pdk,
+            pdk_root=pdk_root,
+            scl=scl,
+        )
+    load = (time.perf_counter() - start) / iterations
+
+    # Validation alone, without reading and resolving the configuration file
+    raw = json.load(open(config_file, encoding="utf8"), parse_float=Decimal)
+    raw.pop("meta", None)
+    pdk_config, resolver = Config._resolve_dict(
+        raw,
+        design_dir,
+        pdk_root=Config._resolve_pdk_root(pdk_root),
+        pdk=pdk,
+        scl=scl,
+    )
+    unprocessed = Config(pdk_config, overrides=resolver.resolved())
+    start = time.perf_counter()
+    for _ in range(iterations):
+        unprocessed.process_variable_list(variables, removed_variables)
+    validation = (time.perf_counter() - start) / iterations
+
+    print(f"Variables: {len(variables)} ({config['PDK']}, {flow_name})")
+    print(f"First load: {first * 1000:.2f}ms")
+    print(f"Load: {load * 1000:.2f}ms")
+    print(f"Validation: {validation * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measures how long it takes to start OpenLane's command-line interface, and
+checks that only the modules in an allow-list are imported at startup: steps,
+flows, configuration processing and the like are only imported by the
+command-line interface once it actually runs a flow.
+
+Usage: python3 -m benchmarks.import_time --iterations 10 --max-ms 1000
+"""
+import sys
+import time
+import statistics
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+# The OpenLane modules `openlane --version` and `openlane --help` may import
+STARTUP_MODULES = [
+    "openlane",
+    "openlane.__main__",
+    "openlane.__version__",
+    "openlane.common",
+    "openlane.logging",
+    "openlane.manifest",
+    "openlane.registry",
+]
+
+IMPORTED_MODULES = """
+import sys
+import openlane.__main__
+
+for module in sorted(sys.modules):
+    if module == "openlane" or module.startswith("openlane."):
+        print(module)
+"""
+
+
+def time_command(args: List[str], iterations: int) -> float:
+    """
+    :returns: The median wall time of running ``args``, in milliseconds.
+    """
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        subprocess.check_call(args, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    :returns: The self and cumulative import times of every module imported
+        by ``module``, in microseconds, as reported by ``-X importtime``.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        encoding="utf8",
+        check=True,
+    )
+    result: Dict[str, Tuple[int, int]] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = fields
+        try:
+            result[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:  # Header
+            continue
+    return result
+
+
+@click.command()
+@click.option(
+    "--iterations",
+    type=int,
+    default=10,
+    help="The number of times to run each command.",
+)
+@click.option(
+    "--top",
+    type=int,
+    default=15,
+    help="The number of modules with the longest import times to list.",
+)
+@click.option(
+    "--max-ms",
+    type=float,
+    default=None,
+    help="Fail if the median time of `openlane --version` exceeds this value.",
+)
+def main(iterations: int, top: int, max_ms: Optional[float]):
+    version = time_command([sys.executable, "-m", "openlane", "--version"], iterations)
+    help = time_command([sys.executable, "-m", "openlane", "--help"], iterations)
+    print(f"openlane --version: {version:.1f}ms")
+    print(f"openlane --help: {help:.1f}ms")
+
+    times = import_times("openlane.__main__")
+    print(f"Modules imported: {len(times)}")
+    print("Longest imports (self, cumulative):")
+    for name, (self_us, cumulative_us) in sorted(
+        times.items(), key=lambda e: e[1][0], reverse=True
+    )[:top]:
+        print(f"  {name}: {self_us / 1000:.1f}ms, {cumulative_us / 1000:.1f}ms")
+
+    failed = False
+    imported = subprocess.check_output(
+        [sys.executable, "-c", IMPORTED_MODULES], encoding="utf8"
+    ).split()
+    eager = [module for module in imported if module not in STARTUP_MODULES]
+    if len(eager) != 0:
+        print(f"Modules imported at startup that should not be: {', '.join(eager)}")
+        failed = True
+    if max_ms is not None and version > max_ms:
+        print(f"openlane --version took longer than {max_ms:.1f}ms.")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Checks that tiled Magic DRC finds the same violations as a check of the whole
+layout, and compares how long both take.
+
+Takes the final state of a finished run of a design, e.g. one of the designs in
+``./designs``, as the input of ``Magic.DRC``.
+
+Usage: python3 -m benchmarks.magic_drc_tiles --pdk sky130A --state ./designs/spm/runs/RUN_TAG/final/state_out.json ./designs/spm/config.json
+"""
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import click
+
+from openlane.flows import SequentialFlow
+from openlane.state import State
+from openlane.utils.drc import DBUBox, DRCStore
+
+
+def run_drc(
+    config_file: str,
+    state: State,
+    tag: str,
+    overrides: List[str],
+    **kwargs,
+) -> Tuple[str, float]:
+    Flow = SequentialFlow.make(["Magic.DRC"])
+    flow = Flow(config_file, config_override_strings=overrides, **kwargs)
+    start = time.perf_counter()
+    flow.start(with_initial_state=state, tag=tag)
+    elapsed = time.perf_counter() - start
+    assert flow.step_objects is not None
+    step_dir = flow.step_objects[0].step_dir
+    return os.path.join(step_dir, "reports", "drc.db"), elapsed
+
+
+def load_violations(path: str) -> Set[Tuple[str, DBUBox]]:
+    with DRCStore(path) as store:
+        return {(category.category_name, box) for category, box in store.query()}
+
+
+@click.command()
+@click.option("--pdk-root", default=None, help="The PDK root.")
+@click.option("--pdk", default=None, help="The PDK.")
+@click.option("--scl", default=None, help="The standard cell library.")
+@click.option(
+    "--state",
+    "state_path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="A state with GDS and DEF views to check.",
+)
+@click.option(
+    "--tiles",
+    type=int,
+    default=4,
+    help="The number of columns and rows of tiles.",
+)
+@click.option(
+    "--halo",
+    default=None,
+    help="Overrides MAGIC_DRC_TILE_HALO, in microns.",
+)
+@click.argument("config_file", type=click.Path(exists=True, dir_okay=False))
+def main(
+    pdk_root: Optional[str],
+    pdk: Optional[str],
+    scl: Optional[str],
+    state_path: str,
+    tiles: int,
+    halo: Optional[str],
+    config_file: str,
+):
+    kwargs = {"pdk_root": pdk_root, "pdk": pdk, "scl": scl}
+    state = State.load(state_path)
+    timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+
+    full_db, full_time = run_drc(
+        config_file,
+        state,
+        f"drc_tiles_full_{timestamp}",
+        ["MAGIC_DRC_TILES=1"],
+        **kwargs,
+    )
+    tiled_overrides = [f"MAGIC_DRC_TILES={tiles}"]
+    if halo is not None:
+        tiled_overrides.append(f"MAGIC_DRC_TILE_HALO={halo}")
+    tiled_db, tiled_time = run_drc(
+        config_file,
+        state,
+        f"drc_tiles_{tiles}x{tiles}_{timestamp}",
+        tiled_overrides,
+        **kwargs,
+    )
+
+    full = load_violations(full_db)
+    tiled = load_violations(tiled_db)
+    print(f"Whole layout: {len(full)} violations in {full_time:.2f}s")
+    print(f"{tiles}x{tiles} tiles: {len(tiled)} violations in {tiled_time:.2f}s")
+
+    missing = sorted(full - tiled)
+    extra = sorted(tiled - full)
+    by_category: Dict[str, List[int]] = {}
+    for name, _ in missing:
+        by_category.setdefault(name, [0, 0])[0] += 1
+    for name, _ in extra:
+        by_category.setdefault(name, [0, 0])[1] += 1
+    for name, (missing_count, extra_count) in sorted(by_category.items()):
+        print(f"  {name}: {missing_count} missing, {extra_count} extra")
+    for name, box in (missing + extra)[:10]:
+        print(f"  {'missing' if (name, box) in full else 'extra'}: {name} {box}")
+
+    if len(missing) != 0 or len(extra) != 0:
+        print("Tiled results differ from the whole layout.")
+        sys.exit(1)
+    print("Tiled results match the whole layout.")
+
+
+if __name__ == "__main__":
+    main()
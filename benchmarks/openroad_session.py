@@ -0,0 +1,130 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compares the wall time of the OpenROAD steps of a flow when each step starts
+a new OpenROAD process and when consecutive steps share a persistent session,
+as well as the number of Liberty files each step reads, which should be zero
+for steps reusing a session.
+
+Usage: python3 -m benchmarks.openroad_session --pdk sky130A --to OpenROAD.DetailedPlacement ./designs/spm/config.json
+"""
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+import click
+
+from openlane.flows import Flow
+from openlane.steps import OpenROADStep
+from openlane.steps.session import SessionPool, get_session_pool, set_session_pool
+
+LIB_READ = re.compile(r"^Reading (?:\w+ ){0,2}library")
+
+
+def count_lib_reads(log_path: str) -> int:
+    try:
+        with open(log_path, encoding="utf8") as f:
+            return sum(1 for line in f if LIB_READ.match(line))
+    except FileNotFoundError:
+        return 0
+
+
+def run_flow(
+    flow_name: str,
+    config_file: str,
+    tag: str,
+    to: Optional[str],
+    **kwargs,
+) -> Dict[str, Tuple[float, int]]:
+    Target = Flow.factory.get(flow_name)
+    if Target is None:
+        raise click.BadParameter(f"Unknown flow '{flow_name}'.")
+    flow = Target(config_file, **kwargs)
+    flow.start(tag=tag, to=to)
+    times: Dict[str, Tuple[float, int]] = {}
+    for step in flow.step_objects or []:
+        if not isinstance(step, OpenROADStep):
+            continue
+        if step.start_time is None or step.end_time is None:
+            continue
+        times[step.id] = (
+            step.end_time - step.start_time,
+            count_lib_reads(step.get_log_path()),
+        )
+    return times
+
+
+@click.command()
+@click.option("--pdk-root", default=None, help="The PDK root.")
+@click.option("--pdk", default=None, help="The PDK.")
+@click.option("--scl", default=None, help="The standard cell library.")
+@click.option("--flow", "flow_name", default="Classic", help="The flow.")
+@click.option(
+    "--to",
+    default="OpenROAD.DetailedPlacement",
+    help="The last step to run.",
+)
+@click.argument("config_file", type=click.Path(exists=True, dir_okay=False))
+def main(
+    pdk_root: Optional[str],
+    pdk: Optional[str],
+    scl: Optional[str],
+    flow_name: str,
+    to: Optional[str],
+    config_file: str,
+):
+    timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+    kwargs = {"pdk_root": pdk_root, "pdk": pdk, "scl": scl}
+
+    set_session_pool(None)
+    baseline = run_flow(
+        flow_name, config_file, f"session_bench_off_{timestamp}", to, **kwargs
+    )
+
+    set_session_pool(SessionPool())
+    try:
+        sessions = run_flow(
+            flow_name, config_file, f"session_bench_on_{timestamp}", to, **kwargs
+        )
+    finally:
+        if pool := get_session_pool():
+            pool.close()
+        set_session_pool(None)
+
+    print(
+        f"{'Step':<40} {'Processes':>10} {'Sessions':>10} {'Libs read':>10} {'(sessions)':>10}"
+    )
+    for step_id, (elapsed, libs_read) in baseline.items():
+        with_sessions = sessions.get(step_id)
+        print(
+            f"{step_id:<40} {elapsed:>9.2f}s "
+            + (
+                f"{with_sessions[0]:>9.2f}s {libs_read:>10} {with_sessions[1]:>10}"
+                if with_sessions is not None
+                else f"{'-':>10} {libs_read:>10} {'-':>10}"
+            )
+        )
+    total_off = sum(elapsed for elapsed, _ in baseline.values())
+    total_on = sum(elapsed for elapsed, _ in sessions.values())
+    libs_off = sum(libs_read for _, libs_read in baseline.values())
+    libs_on = sum(libs_read for _, libs_read in sessions.values())
+    print(
+        f"{'Total':<40} {total_off:>9.2f}s {total_on:>9.2f}s {libs_off:>10} {libs_on:>10}"
+    )
+    if total_off:
+        print(f"Saved: {(1 - total_on / total_off) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compares querying the timing paths of an STA step through a timing path store
+against scanning its text reports with regular expressions.
+
+Takes the directory of a finished STA step, e.g.
+``./designs/spm/runs/RUN_TAG/NN-openroad-stapostpnr``, with the reports of
+every corner either in the step directory itself or in one subdirectory per
+corner.
+
+Usage: python3 -m benchmarks.sta_reports ./designs/spm/runs/RUN_TAG/NN-openroad-stapostpnr
+"""
+import os
+import re
+import time
+import tempfile
+from typing import Callable, Dict, List, Tuple, TypeVar
+
+import click
+
+from openlane.utils.sta import TimingPathStore, sta_reports_to_store
+
+T = TypeVar("T")
+
+ENDPOINT = re.compile(r"^Endpoint: (\S+)")
+CORNER = re.compile(r"^Corner: (\S+)")
+SLACK = re.compile(r"^\s*(\S+)\s+slack \(")
+
+
+def find_reports(step_dir: str) -> List[Tuple[str, str]]:
+    reports: List[Tuple[str, str]] = []
+    for directory in [step_dir] + sorted(
+        os.path.join(step_dir, name)
+        for name in os.listdir(step_dir)
+        if os.path.isdir(os.path.join(step_dir, name))
+    ):
+        for report in ["min.rpt", "max.rpt", "checks.rpt"]:
+            path = os.path.join(directory, report)
+            if os.path.exists(path):
+                reports.append((os.path.basename(directory), path))
+    return reports
+
+
+def scan_slacks(reports: List[Tuple[str, str]]) -> List[Tuple[float, str, str]]:
+    """
+    The way triage scripts usually read reports: every line is matched against
+    the patterns of interest.
+    """
+    slacks: List[Tuple[float, str, str]] = []
+    for corner, path in reports:
+        if os.path.basename(path) != "max.rpt":
+            continue
+        endpoint = ""
+        path_corner = corner
+        for line in open(path, encoding="utf8"):
+            if match := ENDPOINT.match(line):
+                endpoint = match[1]
+            elif match := CORNER.match(line):
+                path_corner = match[1]
+            elif match := SLACK.match(line):
+                slacks.append((float(match[1]), endpoint, path_corner))
+    return slacks
+
+
+def timed(function: Callable[[], T]) -> Tuple[T, float]:
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+@click.command()
+@click.option("-n", "count", type=int, default=100, help="The number of paths.")
+@click.option(
+    "--bin-width",
+    type=float,
+    default=0.1,
+    help="The width of the bins of the slack histogram.",
+)
+@click.argument("step_dir", type=click.Path(exists=True, file_okay=False))
+def main(count: int, bin_width: float, step_dir: str):
+    reports = find_reports(step_dir)
+    if len(reports) == 0:
+        raise click.BadParameter(f"No reports found in '{step_dir}'.")
+    size = sum(os.path.getsize(path) for _, path in reports)
+    print(f"Reports: {len(reports)} ({size / 1024 / 1024:.1f} MiB)")
+
+    with tempfile.TemporaryDirectory() as d:
+        store_path = os.path.join(d, "timing_paths.db")
+        paths, convert_time = timed(lambda: sta_reports_to_store(reports, store_path))
+        print(
+            f"Conversion: {paths} paths in {convert_time:.2f}s ({os.path.getsize(store_path) / 1024 / 1024:.1f} MiB)"
+        )
+
+        def scan_worst() -> List[Tuple[float, str, str]]:
+            return sorted(scan_slacks(reports))[:count]
+
+        def scan_histogram() -> Dict[int, int]:
+            histogram: Dict[int, int] = {}
+            for slack, _, _ in scan_slacks(reports):
+                index = int(slack // bin_width)
+                histogram[index] = histogram.get(index, 0) + 1
+            return histogram
+
+        def scan_corners() -> Dict[str, Dict[str, float]]:
+            by_endpoint: Dict[str, Dict[str, float]] = {}
+            for slack, endpoint, corner in scan_slacks(reports):
+                corners = by_endpoint.setdefault(endpoint, {})
+                corners[corner] = min(slack, corners.get(corner, slack))
+            return by_endpoint
+
+        with TimingPathStore(store_path) as store:
+            for name, scan, query in [
+                (
+                    f"Worst {count} setup paths",
+                    scan_worst,
+                    lambda: store.worst(count, path_type="max", report="max.rpt"),
+                ),
+                (
+                    "Setup slack histogram",
+                    scan_histogram,
+                    lambda: store.slack_histogram(
+                        bin_width, path_type="max", report="max.rpt"
+                    ),
+                ),
+                (
+                    "Setup slack per endpoint and corner",
+                    scan_corners,
+                    lambda: store.compare_corners("max", report="max.rpt"),
+                ),
+            ]:
+                _, scan_time = timed(scan)
+                _, query_time = timed(query)
+                print(
+                    f"{name}: {scan_time * 1000:.2f}ms scanning, {query_time * 1000:.2f}ms querying ({scan_time / query_time:.1f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
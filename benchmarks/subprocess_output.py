@@ -0,0 +1,116 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Feeds a synthetic tool log through :class:`openlane.steps.step.OutputProcessor`
+and reports throughput and peak memory usage.
+
+Usage: python3 -m benchmarks.subprocess_output --size 2048
+"""
+import os
+import time
+import resource
+import tempfile
+from typing import Iterator
+
+import click
+
+from openlane.steps.step import (
+    OutputProcessor,
+    METRIC_LOCUS,
+    REPORT_START_LOCUS,
+    REPORT_END_LOCUS,
+)
+
+LINE = "[INFO DRT-0195] Start 42nd optimization iteration: 1234 violations remaining, elapsed 00:01:02, memory = 4096.00 (MB).\n"
+
+
+def synthetic_log(size: int, report_every: int) -> Iterator[str]:
+    """
+    Generates roughly ``size`` bytes of log lines, with a short report and a
+    metric every ``report_every`` lines.
+    """
+    generated = 0
+    count = 0
+    while generated < size:
+        if count % report_every == 0:
+            for line in [
+                f"{REPORT_START_LOCUS} bench_{count % 4}.rpt\n",
+                "Startpoint: a (rising edge-triggered flip-flop)\n",
+                "Endpoint: b (rising edge-triggered flip-flop)\n",
+                REPORT_END_LOCUS + "\n",
+                f"{METRIC_LOCUS}_I bench__line__count {count}\n",
+            ]:
+                generated += len(line)
+                yield line
+        generated += len(LINE)
+        count += 1
+        yield LINE
+
+
+def get_peak_rss_mib() -> float:
+    # Linux reports KiB, macOS reports bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if os.uname().sysname == "Darwin":
+        peak //= 1024
+    return peak / 1024
+
+
+@click.command()
+@click.option(
+    "--size",
+    type=int,
+    default=2048,
+    help="The size of the synthetic log in MiB.",
+)
+@click.option(
+    "--report-every",
+    type=int,
+    default=10000,
+    help="Emit a report and a metric every this many lines.",
+)
+@click.option(
+    "--legacy",
+    is_flag=True,
+    default=False,
+    help="Also accumulate the whole log in a string as previous versions did, for comparison.",
+)
+def main(size: int, report_every: int, legacy: bool):
+    size_bytes = size * 1024 * 1024
+    rss_before = get_peak_rss_mib()
+    with tempfile.TemporaryDirectory() as d:
+        with open(
+            os.path.join(d, "bench.log"),
+            "w",
+            encoding="utf8",
+            buffering=OutputProcessor.buffer_size,
+        ) as log_file:
+            processor = OutputProcessor(log_file, report_dir=d, silent=True)
+            lines = ""
+            start = time.perf_counter()
+            for line in synthetic_log(size_bytes, report_every):
+                if legacy:
+                    lines += line
+                processor.process(line)
+            processor.close()
+            if legacy:
+                lines.split("\n")
+            elapsed = time.perf_counter() - start
+
+    print(f"Processed {size} MiB in {elapsed:.2f}s ({size / elapsed:.1f} MiB/s).")
+    print(f"Metrics: {processor.metrics}")
+    print(f"Peak RSS: {get_peak_rss_mib():.1f} MiB (before: {rss_before:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,10 +24,48 @@ Flows and/or custom Steps for the design of more sophisticated chips.
     no-imported-members
 """
 
-from .config import Variable, Config, InvalidConfig
-from .flows import Flow, SequentialFlow
-from .state import State, DesignFormat
-from .steps import Step
+import importlib
+from typing import TYPE_CHECKING
+
 from .common import *
-from .plugins import discovered_plugins
 from .__version__ import __version__
+
+# The rest of the API is imported on demand, see __getattr__, so the
+# command-line interface only imports what it actually uses.
+_lazy_attributes = {
+    "Variable": ("config", "Variable"),
+    "Config": ("config", "Config"),
+    "InvalidConfig": ("config", "InvalidConfig"),
+    "Flow": ("flows", "Flow"),
+    "SequentialFlow": ("flows", "SequentialFlow"),
+    "State": ("state", "State"),
+    "DesignFormat": ("state", "DesignFormat"),
+    "Step": ("steps", "Step"),
+    "discovered_plugins": ("plugins", "discovered_plugins"),
+    "config": ("config", None),
+    "flows": ("flows", None),
+    "state": ("state", None),
+    "steps": ("steps", None),
+    "plugins": ("plugins", None),
+}
+
+if TYPE_CHECKING:
+    from .config import Variable, Config, InvalidConfig
+    from .flows import Flow, SequentialFlow
+    from .state import State, DesignFormat
+    from .steps import Step
+    from .plugins import discovered_plugins
+
+
+def __getattr__(name: str):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    module_name, attribute = _lazy_attributes[name]
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_attributes))
@@ -43,7 +43,6 @@ from cloup.constraints import (
 
 
 from .__version__ import __version__
-from .state import State
 from .logging import (
     LogLevelsDict,
     set_log_level,
@@ -52,10 +51,10 @@ from .logging import (
     info,
 )
 from . import common
-from .container import run_in_container
-from .plugins import discovered_plugins
-from .config import Config, InvalidConfig
-from .flows import Flow, SequentialFlow, FlowException, FlowError
+from .registry import list_flows
+
+# The rest of OpenLane is imported in the callbacks that need it, so
+# `openlane --version` or `openlane --help` do not have to import it.
 
 
 def run(
@@ -73,9 +72,15 @@ def run(
     only: Optional[str],
     skip: Tuple[str, ...],
     initial_state_json: Optional[str],
+    incremental: bool,
+    delta_states: bool,
     config_override_strings: List[str],
     log_level: Union[str, int],
 ) -> int:
+    from .state import State
+    from .config import Config, InvalidConfig
+    from .flows import Flow, SequentialFlow, FlowException, FlowError
+
     try:
         set_log_level(log_level)
     except ValueError:
@@ -145,7 +150,7 @@ def run(
 
     initial_state: Optional[State] = None
     if initial_state_json is not None:
-        initial_state = State.loads(open(initial_state_json).read())
+        initial_state = State.load(initial_state_json)
 
     if last_run:
         runs = glob.glob(os.path.join(flow.design_dir, "runs", "*"))
@@ -171,6 +176,8 @@ def run(
             to=to,
             skip=list(skip),
             with_initial_state=initial_state,
+            incremental=incremental,
+            delta_states=delta_states,
         )
     except FlowException as e:
         err(f"The flow has encountered an unexpected error: {e}")
@@ -185,6 +192,27 @@ def run(
     return 0
 
 
+class FlowChoice(click.Choice):
+    """
+    A choice of flow that only imports plugins, which may register additional
+    flows, if the name is not that of a built-in flow.
+    """
+
+    def __init__(self):
+        super().__init__(list_flows(), case_sensitive=False)
+
+    def convert(self, value, param, ctx):
+        try:
+            return super().convert(value, param, ctx)
+        except click.BadParameter:
+            from .flows import Flow
+            from .plugins import load_plugins
+
+            load_plugins()
+            self.choices = tuple(Flow.factory.list())
+            return super().convert(value, param, ctx)
+
+
 def print_version(ctx: click.Context, param: click.Parameter, value: bool):
     if not value:
         return
@@ -204,6 +232,8 @@ def print_version(ctx: click.Context, param: click.Parameter, value: bool):
 
     print(message)
 
+    from .plugins import discovered_plugins
+
     if len(discovered_plugins) > 0:
         print("Discovered plugins:")
         for name, module in discovered_plugins.items():
@@ -268,6 +298,8 @@ def run_smoke_test(
             only=None,
             skip=(),
             initial_state_json=None,
+            incremental=False,
+            delta_states=False,
             config_override_strings=[],
             log_level="VERBOSE",
         )
@@ -295,6 +327,8 @@ def cli_in_container(
     if not value:
         return
 
+    from .container import run_in_container
+
     status = 0
     docker_mounts = list(ctx.params.get("docker_mounts") or ())
     pdk_root = ctx.params.get("pdk_root")
@@ -426,7 +460,7 @@ o = partial(option, show_default=True)
         "-f",
         "--flow",
         "flow_name",
-        type=click.Choice(Flow.factory.list(), case_sensitive=False),
+        type=FlowChoice(),
         default=None,
         help="The built-in OpenLane flow to use for this run",
     ),
@@ -442,6 +476,18 @@ o = partial(option, show_default=True)
         default=None,
         help="Use this JSON file as an initial state. If this is not specified, the latest `state_out.json` of the run directory will be used if available.",
     ),
+    o(
+        "--incremental",
+        is_flag=True,
+        default=False,
+        help="When resuming a run (--run-tag/--last-run), run the flow from the beginning, but reuse the results of every step whose configuration and inputs are unchanged since it last ran in that run directory. Only the steps affected by changed configuration variables or input files are run again. Only steps that have been run with --incremental (or --step-cache) themselves can be reused.",
+    ),
+    o(
+        "--delta-states",
+        is_flag=True,
+        default=False,
+        help="Save the state_in.json and state_out.json files of steps as deltas against the state files they have been derived from. Faster and smaller for long flows, but these files can then only be loaded by OpenLane, and only as long as the earlier steps of the run are kept.",
+    ),
     o(
         "-c",
         "--override-config",
@@ -517,7 +563,65 @@ o = partial(option, show_default=True)
     "--jobs",
     type=int,
     default=os.cpu_count(),
-    help="The maximum number of threads or processes that can be used by OpenLane.",
+    help="The maximum number of threads or processes that can be used by OpenLane. Tools are only started when the sum of their estimated thread counts is within this budget.",
+)
+@o(
+    "--max-memory",
+    type=float,
+    default=None,
+    help="The maximum memory, in GiB, that tools run by OpenLane are estimated to use at the same time. Defaults to the machine's physical memory.",
+)
+@o(
+    "--openroad-sessions/--no-openroad-sessions",
+    default=False,
+    help="Run consecutive OpenROAD steps in a persistent OpenROAD process that keeps the design and libraries in memory, instead of starting a new process that reads them again for every step.",
+)
+@option_group(
+    "Step cache options",
+    o(
+        "--step-cache/--no-step-cache",
+        default=False,
+        help="Restore the results of steps whose configuration, inputs and tools are unchanged from a persistent cache shared between runs instead of running them again.",
+    ),
+    o(
+        "--step-cache-dir",
+        type=click.Path(
+            file_okay=False,
+            dir_okay=True,
+        ),
+        default=None,
+        help="The directory in which the step cache is stored. If unset, a directory inside $OPENLANE_CACHE_DIR (default: ~/.cache/openlane) is used.",
+    ),
+    o(
+        "--step-cache-size",
+        type=int,
+        default=10240,
+        help="The maximum size of the step cache in MiB, beyond which the least recently used results are evicted.",
+    ),
+    o(
+        "--lib-cache/--no-lib-cache",
+        default=True,
+        help="Share Liberty files with excluded cells removed between runs using a cache inside $OPENLANE_CACHE_DIR (default: ~/.cache/openlane).",
+    ),
+    o(
+        "--pdk-config-cache/--no-pdk-config-cache",
+        default=False,
+        help="Share evaluated PDK configurations between runs using a cache inside $OPENLANE_CACHE_DIR (default: ~/.cache/openlane), instead of evaluating the PDK's configuration files every time. Entries are used as long as the PDK's configuration files and the environment variables they refer to are unchanged.",
+    ),
+)
+@option_group(
+    "Distributed execution options",
+    o(
+        "--workers",
+        type=int,
+        default=0,
+        help="Run steps in this many worker processes instead of the main OpenLane process. The --jobs and --max-memory budgets are split evenly between them.",
+    ),
+    o(
+        "--worker-address",
+        default=None,
+        help="Also accept workers started with 'python3 -m openlane.steps.worker' connecting to this HOST:PORT, e.g. on other machines sharing the same filesystem. The authentication key is read from $OPENLANE_WORKER_AUTHKEY.",
+    ),
 )
 @click.argument(
     "config_files",
@@ -529,8 +633,81 @@ o = partial(option, show_default=True)
     ),
 )
 @click.pass_context
-def cli(ctx: click.Context, jobs: int, **kwargs):
+def cli(
+    ctx: click.Context,
+    jobs: int,
+    max_memory: Optional[float],
+    openroad_sessions: bool,
+    step_cache: bool,
+    step_cache_dir: Optional[str],
+    step_cache_size: int,
+    lib_cache: bool,
+    pdk_config_cache: bool,
+    workers: int,
+    worker_address: Optional[str],
+    **kwargs,
+):
+    from .config.config import default_pdk_config_cache, set_pdk_config_cache
+    from .steps.cache import StepCache, set_step_cache
+    from .utils.toolbox import set_lib_cache
+    from .steps.supervisor import ProcessSupervisor, set_supervisor
+    from .steps.session import SessionPool, set_session_pool
+    from .steps.executor import (
+        AUTHKEY_ENV,
+        LocalWorkerPool,
+        SocketStepExecutor,
+        set_step_executor,
+    )
+    from .steps.scheduler import (
+        GiB,
+        ResourceScheduler,
+        get_physical_memory,
+        set_scheduler,
+    )
+
     common.set_tpe(ThreadPoolExecutor(max_workers=jobs))
+    set_supervisor(ProcessSupervisor(max_processes=jobs))
+    memory_budget = get_physical_memory()
+    if max_memory is not None:
+        memory_budget = int(max_memory * GiB)
+    set_scheduler(ResourceScheduler(jobs, memory_budget))
+    if openroad_sessions:
+        set_session_pool(SessionPool())
+    step_cache_obj = None
+    if step_cache:
+        step_cache_obj = StepCache(
+            step_cache_dir, max_size=step_cache_size * 1024 * 1024
+        )
+        set_step_cache(step_cache_obj)
+    if not lib_cache:
+        set_lib_cache(None)
+    if pdk_config_cache:
+        set_pdk_config_cache(default_pdk_config_cache())
+    if workers > 0 or worker_address is not None:
+        address = ("127.0.0.1", 0)
+        authkey = None
+        if worker_address is not None:
+            host, port = worker_address.rsplit(":", maxsplit=1)
+            address = (host, int(port))
+            authkey_str = os.getenv(AUTHKEY_ENV)
+            if authkey_str is None:
+                err(f"{AUTHKEY_ENV} must be set to use --worker-address.")
+                ctx.exit(-1)
+            authkey = authkey_str.encode("ascii")
+        executor: SocketStepExecutor
+        if workers > 0:
+            executor = LocalWorkerPool(
+                workers,
+                threads=jobs,
+                memory=memory_budget,
+                step_cache_dir=step_cache_obj.store.path if step_cache_obj else None,
+                openroad_sessions=openroad_sessions,
+                address=address,
+                authkey=authkey,
+            )
+        else:
+            executor = SocketStepExecutor(address, authkey)
+        set_step_executor(executor)
     args = kwargs["config_files"]
     run_kwargs = kwargs.copy()
 
@@ -0,0 +1,275 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Persistent Caching
+
+A content-addressed on-disk cache shared between OpenLane runs, used to avoid
+redoing expensive work whose inputs have not changed.
+"""
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .common import mkdirp
+
+SIZE_FILE = ".size"
+
+
+def get_cache_dir() -> str:
+    """
+    :returns: The root directory for OpenLane's persistent caches.
+
+        This is ``$OPENLANE_CACHE_DIR`` if set, otherwise, ``openlane`` inside
+        ``$XDG_CACHE_HOME`` (which itself defaults to ``~/.cache``).
+    """
+    if cache_dir := os.getenv("OPENLANE_CACHE_DIR"):
+        return os.path.abspath(cache_dir)
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(xdg_cache_home, "openlane")
+
+
+class Hasher(object):
+    """
+    Incrementally builds a SHA-256 digest out of strings and files.
+    """
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+
+    def update(self, *args: Union[str, bytes]) -> "Hasher":
+        """
+        Adds a number of strings or byte sequences to the digest. Every element
+        is length-prefixed, so different splits of the same data do not collide.
+        """
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode("utf8")
+            self._hash.update(b"%d:" % len(arg))
+            self._hash.update(arg)
+        return self
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+_file_hash_memo: Dict[Tuple[str, int, int, int], str] = {}
+_file_hash_lock = threading.Lock()
+
+
+def hash_file(path: Union[str, os.PathLike]) -> str:
+    """
+    :param path: A path to a file.
+    :returns: The SHA-256 hex digest of the file's contents.
+
+        Digests are memoized per process by the file's path, inode, size and
+        modification time, so the same file is only read once unless it changes.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    memo_key = (path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    with _file_hash_lock:
+        if memoized := _file_hash_memo.get(memo_key):
+            return memoized
+
+    hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            hash.update(chunk)
+    digest = hash.hexdigest()
+
+    with _file_hash_lock:
+        _file_hash_memo[memo_key] = digest
+    return digest
+
+
+def hash_path(path: Union[str, "os.PathLike[str]"]) -> str:
+    """
+    Like :func:`hash_file`, but also accepts directories, in which case the
+    relative paths and contents of all files inside the directory are hashed.
+
+    :param path: A path to a file or a directory.
+    :returns: A SHA-256 hex digest.
+    """
+    path = os.fspath(path)
+    if not os.path.isdir(path):
+        return hash_file(path)
+    hasher = Hasher()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file in sorted(files):
+            file_path = os.path.join(root, file)
+            hasher.update(os.path.relpath(file_path, path), hash_file(file_path))
+    return hasher.hexdigest()
+
+
+class DiskCache(object):
+    """
+    A persistent, size-bounded, content-addressed store of directories.
+
+    Each entry is a directory named after its key. Entries are created in a
+    temporary directory then renamed into place, so readers (including other
+    processes) never see partially-written entries. When the total size of all
+    entries exceeds ``max_size``, the least recently used entries are evicted.
+
+    :param path: The directory in which to store entries.
+    :param max_size: The maximum total size of all entries, in bytes. If
+        ``None``, entries are never evicted.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], max_size: Optional[int] = None):
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        :param key: The key of the entry, usually a hex digest.
+        :returns: The path to the entry's directory if it exists, else ``None``.
+
+            The entry is marked as the most recently used.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        return entry_path
+
+    def put(self, key: str, populate: Callable[[str], None]) -> str:
+        """
+        Creates an entry if it does not already exist.
+
+        :param key: The key of the entry, usually a hex digest.
+        :param populate: A function that writes the entry's contents into the
+            directory passed to it.
+
+            If it raises an exception, the entry is not created and the exception
+            is propagated.
+        :returns: The path to the entry's directory.
+        """
+        entry_path = self._entry_path(key)
+        if os.path.isdir(entry_path):
+            os.utime(entry_path)
+            return entry_path
+
+        parent = os.path.dirname(entry_path)
+        mkdirp(parent)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=parent)
+        try:
+            populate(staging)
+            with open(os.path.join(staging, SIZE_FILE), "w") as f:
+                f.write(str(self._measure(staging)))
+            os.rename(staging, entry_path)
+        except OSError:
+            # Raced by another writer: theirs is just as good
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(entry_path):
+                raise
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self.evict()
+        return entry_path
+
+    def remove(self, key: str):
+        """
+        Removes an entry if it exists.
+
+        :param key: The key of the entry.
+        """
+        shutil.rmtree(self._entry_path(key), ignore_errors=True)
+
+    def entries(self) -> Iterable[Tuple[str, float, int]]:
+        """
+        :returns: An iterable of ``(path, last_used, size)`` for every entry.
+        """
+        try:
+            buckets = os.listdir(self.path)
+        except FileNotFoundError:
+            return
+        for bucket in buckets:
+            bucket_path = os.path.join(self.path, bucket)
+            if not os.path.isdir(bucket_path):
+                continue
+            for entry in os.listdir(bucket_path):
+                if "." in entry:
+                    # Staging or evicted
+                    continue
+                entry_path = os.path.join(bucket_path, entry)
+                try:
+                    last_used = os.path.getmtime(entry_path)
+                    with open(os.path.join(entry_path, SIZE_FILE)) as f:
+                        size = int(f.read())
+                except (OSError, ValueError):
+                    continue
+                yield (entry_path, last_used, size)
+
+    def size(self) -> int:
+        """
+        :returns: The total size of all entries, in bytes.
+        """
+        return sum(size for _, _, size in self.entries())
+
+    def evict(self, max_size: Optional[int] = None):
+        """
+        Removes the least recently used entries until the total size is
+        within the limit.
+
+        :param max_size: Overrides the instance's ``max_size``.
+        """
+        max_size = max_size if max_size is not None else self.max_size
+        if max_size is None:
+            return
+        with self._lock:
+            entries: List[Tuple[str, float, int]] = list(self.entries())
+            total = sum(size for _, _, size in entries)
+            if total <= max_size:
+                return
+            entries.sort(key=lambda entry: entry[1])
+            for entry_path, _, size in entries:
+                if total <= max_size:
+                    break
+                # Rename first so concurrent readers see either everything or
+                # nothing
+                doomed = f"{entry_path}.evicted-{time.time_ns()}"
+                try:
+                    os.rename(entry_path, doomed)
+                except OSError:
+                    continue
+                shutil.rmtree(doomed, ignore_errors=True)
+                total -= size
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        self.evict(max_size=0)
+
+    @staticmethod
+    def _measure(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for file in files:
+                total += os.path.getsize(os.path.join(root, file))
+        return total
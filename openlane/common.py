@@ -25,9 +25,11 @@ import unicodedata
 from enum import Enum
 from decimal import Decimal
 from dataclasses import asdict, is_dataclass
+from collections.abc import ItemsView, KeysView, ValuesView
 from concurrent.futures import ThreadPoolExecutor
 
 from typing import (
+    Callable,
     Dict,
     Hashable,
     Iterator,
@@ -37,6 +39,7 @@ from typing import (
     Type,
     TypeVar,
     Tuple,
+    ClassVar,
     Optional,
 )
 
@@ -264,7 +267,30 @@ class GenericDict(Mapping[KT, VT]):
 
 
 class GenericImmutableDict(GenericDict[KT, VT]):
+    """
+    An immutable :class:`GenericDict`.
+
+    Copies of immutable dictionaries with a few overrides are structurally
+    shared: instead of copying all entries, they reference the (flat) original
+    and only store their own overrides. Once the overrides grow beyond a
+    fraction of the original, they are merged into a new flat dictionary,
+    which keeps lookups at no more than two levels deep.
+
+    Values are shared as-is and must not be mutated.
+
+    The original may also be loaded on demand: see :meth:`deferred`.
+    """
+
     _lock: bool
+    _shared: Optional["GenericImmutableDict[KT, VT]"]
+    _loader: Optional[Callable[[], "GenericImmutableDict[KT, VT]"]]
+    _flat: Optional["GenericImmutableDict[KT, VT]"]
+    _own: Dict[KT, VT]
+
+    #: Overrides are merged into a flat dictionary once they exceed this
+    #: fraction of the base's size (and :attr:`min_overrides`).
+    merge_ratio: ClassVar[float] = 0.25
+    min_overrides: ClassVar[int] = 32
 
     def __init__(
         self,
@@ -274,14 +300,154 @@ class GenericImmutableDict(GenericDict[KT, VT]):
         overrides: Optional[Mapping[KT, VT]] = None,
         **kwargs,
     ) -> None:
-        super().__init__(copying, *args, overrides=overrides, **kwargs)
+        self._base = None
+        self._flat = None
+        if isinstance(copying, GenericImmutableDict) and len(args) + len(kwargs) == 0:
+            if loader := copying._loader:
+                # Not loaded yet: stays that way
+                self._own = dict(copying._own)
+                self._own.update(overrides or {})
+                self._loader = loader
+                self._lock = True
+                return
+            if base := copying._base:
+                self._own = dict(copying._own)
+            else:
+                base = copying
+                self._own = {}
+            self._own.update(overrides or {})
+            self._base = base
+            if len(self._own) > max(
+                self.min_overrides, len(base._own) * self.merge_ratio
+            ):
+                self._flatten()
+        else:
+            super().__init__(copying, *args, overrides=overrides, **kwargs)
         self._lock = True
 
+    T = TypeVar("T", bound="GenericImmutableDict")
+
+    @classmethod
+    def deferred(
+        Self: Type[T],
+        loader: Callable[[], "GenericImmutableDict[KT, VT]"],
+        overrides: Mapping[KT, VT],
+    ) -> T:
+        """
+        :param loader: Returns the dictionary to override. It is only called
+            once an entry that is not among ``overrides`` is needed, if ever.
+        :param overrides: The entries that differ from the loaded dictionary.
+        :returns: A dictionary sharing its structure with the loaded one.
+        """
+        result = Self.__new__(Self)
+        GenericImmutableDict.__init__(result, dict(overrides))
+        result._loader = loader
+        return result
+
+    def __getstate__(self):
+        # Loaders are not necessarily picklable
+        self._base
+        state = self.__dict__.copy()
+        state["_flat"] = None
+        return state
+
+    @property
+    def _base(self) -> Optional["GenericImmutableDict[KT, VT]"]:
+        if loader := self._loader:
+            # Loading twice (from two threads) is harmless, but the loader may
+            # only be cleared once the result is visible.
+            self._shared = loader()._flattened()
+            self._loader = None
+        return self._shared
+
+    @_base.setter
+    def _base(self, value: Optional["GenericImmutableDict[KT, VT]"]):
+        self._shared = value
+        self._loader = None
+
+    def _flattened(self) -> "GenericImmutableDict[KT, VT]":
+        # A flat dictionary with the same entries, computed once and without
+        # modifying this one, as other threads may be reading it.
+        if self._base is None:
+            return self
+        if self._flat is None:
+            self._flat = GenericImmutableDict(GenericImmutableDict.to_raw_dict(self))
+        return self._flat
+
+    def _flatten(self):
+        if base := self._base:
+            flat = dict(base._own)
+            flat.update(self._own)
+            self._own = flat
+            self._base = None
+
+    @property  # type: ignore
+    def _data(self) -> Dict[KT, VT]:  # type: ignore
+        self._flatten()
+        return self._own
+
+    @_data.setter
+    def _data(self, value: Dict[KT, VT]):
+        self._base = None
+        self._own = value
+
+    def __getitem__(self, key: KT) -> VT:
+        try:
+            return self._own[key]
+        except KeyError:
+            if base := self._base:
+                return base._own[key]
+            raise
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._own:
+            return True
+        if base := self._base:
+            return key in base._own
+        return False
+
     def __setitem__(self, key: KT, item: VT):
         if self._lock:
             raise TypeError(f"{self.__class__.__name__} is immutable")
         return super().__setitem__(key, item)
 
+    def __len__(self) -> int:
+        if base := self._base:
+            return len(base._own) + sum(1 for key in self._own if key not in base._own)
+        return len(self._own)
+
+    def __iter__(self) -> Iterator[KT]:
+        yield from self._own
+        if base := self._base:
+            for key in base._own:
+                if key not in self._own:
+                    yield key
+
+    def keys(self):
+        if self._base is None:
+            return self._own.keys()
+        return KeysView(self)
+
+    def values(self):
+        if self._base is None:
+            return self._own.values()
+        return ValuesView(self)
+
+    def items(self):
+        if self._base is None:
+            return self._own.items()
+        return ItemsView(self)
+
+    def to_raw_dict(self) -> dict:
+        if base := self._base:
+            final = base._own.copy()
+            final.update(self._own)
+            return final
+        return self._own.copy()
+
+    def check(self, key: KT, /) -> Tuple[Optional[KT], Optional[VT]]:
+        return (key if key in self else None, self.get(key))
+
 
 # Screw this, if you can figure out how to type hint mapping in dictionary out
 # and non-mapping in sequence out in Python, be my guest
@@ -20,7 +20,7 @@ configuration objects. Configuration objects are the primary input to a flow.
 from .resolve import Keys
 from .variable import Variable
 from .macro import Macro, Instance
-from .config import Config, InvalidConfig
+from .config import Config, InvalidConfig, VariantReport
 
 
 from .tcleval import env_from_tcl
@@ -12,14 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import re
 import json
 import yaml
+import threading
 from glob import glob
 from decimal import Decimal
 from textwrap import dedent
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import (
     Any,
+    Mapping,
+    Set,
     ClassVar,
     Tuple,
     Union,
@@ -32,7 +36,14 @@ from typing import (
 
 from .variable import Variable
 from .tcleval import env_from_tcl
-from .resolve import resolve, Keys as SpecialKeys
+from .resolve import (
+    PROCESS_INFO_ALLOWLIST,
+    InvalidConfig as UnresolvableConfig,
+    Keys as SpecialKeys,
+    Resolver,
+    get_resolver,
+    resolve,
+)
 from .flow import removed_variables, all_variables as flow_common_variables
 from .pdk import (
     all_variables as pdk_variables,
@@ -41,8 +52,88 @@ from .pdk import (
 )
 
 from ..state import Path
-from ..logging import info, warn
+from ..logging import debug, info, warn
 from ..common import GenericDict, GenericImmutableDict
+from ..cache import DiskCache, Hasher, get_cache_dir, hash_file
+from ..__version__ import __version__
+
+PDK_CONFIG_FILE = "pdk_config.json"
+
+
+def default_pdk_config_cache() -> DiskCache:
+    """
+    :returns: A cache for PDK configurations inside the directory returned by
+        :func:`openlane.cache.get_cache_dir`.
+    """
+    return DiskCache(
+        os.path.join(get_cache_dir(), "pdk"),
+        max_size=256 * 1024 * 1024,
+    )
+
+
+PDK_CONFIG_CACHE: Optional[DiskCache] = None
+
+
+def set_pdk_config_cache(cache: Optional[DiskCache]):
+    """
+    Sets the cache shared between processes in which evaluated PDK
+    configurations are stored. Disabled by default.
+
+    Entries only hold the values set by the PDK's configuration files, which are
+    validated again whenever an entry is used.
+
+    :param cache: The cache, or ``None`` to disable caching.
+    """
+    global PDK_CONFIG_CACHE
+    PDK_CONFIG_CACHE = cache
+
+
+def get_pdk_config_cache() -> Optional[DiskCache]:
+    """
+    :returns: The cache in which evaluated PDK configurations are stored, if any.
+    """
+    global PDK_CONFIG_CACHE
+    return PDK_CONFIG_CACHE
+
+
+# Environment variables referred to by Tcl configuration files
+env_rx = re.compile(r"(?:\$|info\s+exists\s+)(?:::)?env\(\s*(\w+)\s*\)")
+
+
+@dataclass
+class _PDKConfigDependencies:
+    """
+    The files and environment variables a PDK configuration has been
+    evaluated from, other than the PDK ``config.tcl`` file.
+
+    :param files: The hashes of the SCL ``config.tcl`` file and of the files
+        sourced by either configuration file, by path.
+    :param environment: The values of the environment variables referred to
+        by any of these files, by name, or ``None`` for unset variables.
+    """
+
+    files: Dict[str, str]
+    environment: Dict[str, Optional[str]]
+
+    def changed(self) -> bool:
+        for path, file_hash in self.files.items():
+            try:
+                current_hash = hash_file(path)
+            except OSError:
+                current_hash = None
+            if file_hash != current_hash:
+                return True
+        for name, value in self.environment.items():
+            if os.environ.get(name) != value:
+                return True
+        return False
+
+
+# ((config, pdkpath, scl, warnings), dependencies) by key
+_pdk_configs: Dict[
+    str, Tuple[Tuple["Config", str, str, List[str]], _PDKConfigDependencies]
+] = {}
+_pdk_configs_lock = threading.Lock()
 
 
 @dataclass
@@ -88,6 +179,32 @@ class InvalidConfig(ValueError):
         super().__init__(message, *args, **kwargs)
 
 
+@dataclass
+class VariantReport:
+    """
+    The outcome of loading one variant of a configuration using
+    :meth:`Config.load_batch`.
+
+    :param overrides: The overrides making up this variant.
+    :param warnings: Warnings generated while loading this variant, excluding
+        those already generated by the base configuration.
+    :param errors: Errors generated while loading this variant. If non-empty,
+        no configuration has been created for this variant.
+    :param incremental: Whether only the overridden variables and the variables
+        depending on them have been processed, as opposed to the entire
+        configuration.
+    """
+
+    overrides: Dict[str, Any]
+    warnings: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    incremental: bool = False
+
+    @property
+    def valid(self) -> bool:
+        return len(self.errors) == 0
+
+
 class Config(GenericImmutableDict[str, Any]):
     """
     A map from OpenLane configuration variable keys to their values.
@@ -127,7 +244,7 @@ class Config(GenericImmutableDict[str, Any]):
         return Config(self, overrides=overrides)
 
     def to_raw_dict(self) -> Dict[str, Any]:
-        final: Dict[Any, Any] = self._data.copy()
+        final: Dict[Any, Any] = super().to_raw_dict()
         final["meta"] = self.meta
         return final
 
@@ -336,6 +453,125 @@ class Config(GenericImmutableDict[str, Any]):
 
         return (loaded, design_dir)
 
+    @classmethod
+    def load_batch(
+        Self,
+        config_in: Union[str, os.PathLike, Dict[str, Any]],
+        flow_config_vars: Sequence[Variable],
+        variants: Sequence[Union[Sequence[str], Mapping[str, Any]]],
+        pdk: Optional[str] = None,
+        pdk_root: Optional[str] = None,
+        scl: Optional[str] = None,
+        design_dir: Optional[str] = None,
+    ) -> Tuple[List[Optional["Config"]], List[VariantReport], str]:
+        """
+        Loads a number of variants of one configuration, e.g. for a parameter
+        sweep, as if by calling :meth:`load` once per variant with its
+        overrides, but with the base configuration only being resolved and
+        validated once.
+
+        For each variant, only the overridden variables (and any variables
+        referring to them) are processed again, unless the overrides affect
+        the resolution of the entire configuration (e.g. by changing the PDK,
+        or overriding a key that other keys in the configuration refer to), in
+        which case the variant is loaded in full.
+
+        Errors in a variant do not raise an exception, but are instead
+        reported in the list of variant reports.
+
+        :param config_in: Either a file path to a JSON file or a Python
+            dictionary representing an unprocessed OpenLane configuration
+            object. Tcl files are not supported.
+
+        :param variants: A list of overrides, each either a list of
+            NAME=VALUE strings as in :meth:`load` or a dictionary.
+
+        :param design_dir: The design directory for said configuration.
+            Supported and required *if and only if* config_in is a dictionary.
+
+        :param pdk: A process design kit to use. Required unless specified via the
+            "PDK" key in a configuration object.
+
+        :param pdk_root: Required if Volare is not installed.
+
+            If Volare is installed, this value can be used to optionally override
+            Volare's default.
+
+        :param scl: A standard cell library to use. If not specified, the PDK's
+            default standard cell library will be used instead.
+
+        :returns: A tuple containing a list with a Config object per variant
+            (or ``None`` for invalid variants), a list with a
+            :class:`VariantReport` per variant, and the design directory.
+        """
+        raw: Dict[str, Any] = {}
+        if not isinstance(config_in, dict):
+            if design_dir is not None:
+                raise TypeError(
+                    "The argument design_dir is not supported when config_in is not a dictionary."
+                )
+            config_in = os.path.abspath(config_in)
+
+            design_dir = str(os.path.dirname(config_in))
+            config_in = str(config_in)
+            if not config_in.endswith(".json"):
+                _, ext = os.path.splitext(config_in)
+                raise ValueError(
+                    f"Unsupported configuration file extension '{ext}' for '{config_in}': only JSON files can be loaded in batches."
+                )
+            raw = json.load(open(config_in, encoding="utf8"), parse_float=Decimal)
+        else:
+            if design_dir is None:
+                raise TypeError(
+                    "The argument design_dir is required when using attempting to load a Config with a dictionary."
+                )
+            raw = dict(config_in)
+
+        pdk_root = Self._resolve_pdk_root(pdk_root)
+
+        batch = _ConfigBatch(
+            raw,
+            design_dir,
+            pdk_variables + list(flow_config_vars),
+            pdk_root=pdk_root,
+            pdk=pdk,
+            scl=scl,
+        )
+        if len(batch.errors) == 0:
+            if len(batch.warnings) > 0:
+                info(
+                    "Loading the design configuration file has generated the following warnings:"
+                )
+            for warning in batch.warnings:
+                warn(warning)
+
+        configs: List[Optional[Config]] = []
+        reports: List[VariantReport] = []
+        for variant in variants:
+            report = VariantReport({})
+            config = None
+            try:
+                report.overrides = _parse_overrides(variant)
+                report.incremental = batch.is_incremental(report.overrides)
+                if report.incremental:
+                    config, report.warnings, report.errors = batch.load(
+                        report.overrides
+                    )
+                else:
+                    config, report.warnings, report.errors = batch.load_full(
+                        report.overrides
+                    )
+            except (ValueError, UnresolvableConfig) as e:
+                report.errors.append(str(e))
+            configs.append(config)
+            reports.append(report)
+
+        debug(
+            f"Loaded {len(reports)} configuration variants, {sum(report.incremental for report in reports)} incrementally."
+        )
+
+        return (configs, reports, design_dir)
+
     @classmethod
     def _loads(
         Self,
@@ -375,35 +611,15 @@ class Config(GenericImmutableDict[str, Any]):
             key, value = string.split("=", 1)
             raw[key] = value
 
-        process_info = resolve(
+        pdk_config, resolver = Self._resolve_dict(
             raw,
-            only_extract_process_info=True,
-            design_dir=design_dir,
-        )
-
-        pdk = process_info.get(SpecialKeys.pdk) or pdk
-        if pdk is None:
-            raise ValueError(
-                "The pdk argument is required as the configuration object lacks a 'PDK' key."
-            )
-
-        config_in, pdkpath, scl = Self._get_pdk_config(
+            design_dir,
+            pdk_root=pdk_root,
             pdk=pdk,
             scl=scl,
-            pdk_root=pdk_root,
             full_pdk_warnings=full_pdk_warnings,
         )
-
-        config_in = Config(
-            config_in,
-            overrides=resolve(
-                raw,
-                pdk=pdk,
-                pdkpath=pdkpath,
-                scl=config_in[SpecialKeys.scl],
-                design_dir=design_dir,
-            ),
-        )
+        config_in = Config(pdk_config, overrides=resolver.resolved())
 
         config_in, design_warnings, design_errors = config_in.process_variable_list(
             pdk_variables + list(flow_config_vars),
@@ -430,6 +646,45 @@ class Config(GenericImmutableDict[str, Any]):
 
         return config_in
 
+    @classmethod
+    def _resolve_dict(
+        Self,
+        raw: Dict[str, Any],
+        design_dir: str,
+        pdk_root: str,
+        pdk: Optional[str] = None,
+        scl: Optional[str] = None,
+        full_pdk_warnings: bool = False,
+    ) -> Tuple["Config", Resolver]:
+        process_info = resolve(
+            raw,
+            only_extract_process_info=True,
+            design_dir=design_dir,
+        )
+
+        pdk = process_info.get(SpecialKeys.pdk) or pdk
+        if pdk is None:
+            raise ValueError(
+                "The pdk argument is required as the configuration object lacks a 'PDK' key."
+            )
+
+        pdk_config, pdkpath, scl = Self._get_pdk_config(
+            pdk=pdk,
+            scl=scl,
+            pdk_root=pdk_root,
+            full_pdk_warnings=full_pdk_warnings,
+        )
+
+        resolver = get_resolver(
+            raw,
+            pdk=pdk,
+            pdkpath=pdkpath,
+            scl=pdk_config[SpecialKeys.scl],
+            design_dir=design_dir,
+        )
+
+        return (pdk_config, resolver)
+
     @classmethod
     def _loads_tcl(
         Self,
@@ -532,9 +787,172 @@ class Config(GenericImmutableDict[str, Any]):
         full_pdk_warnings: Optional[bool] = False,
     ) -> Tuple["Config", str, str]:
         """
+        Processed PDK configurations are stored in memory, and evaluated PDK
+        configurations in the cache returned by :func:`get_pdk_config_cache`
+        (if any), keyed by the arguments and the contents of the PDK
+        ``config.tcl`` file. The contents of the SCL ``config.tcl`` file and of
+        any files sourced by either, as well as the environment variables any of
+        these files refer to, are checked again whenever a stored configuration
+        is used.
+
         :returns: A tuple of the PDK configuration, the PDK path and the SCL.
         """
+        pdkpath = os.path.join(pdk_root, pdk)
+        pdk_config_path = os.path.join(pdkpath, "libs.tech", "openlane", "config.tcl")
+
+        key: Optional[str] = None
+        if os.path.isfile(pdk_config_path):
+            key = (
+                Hasher()
+                .update("pdk-config/4", __version__, pdk_root, pdk, scl or "")
+                .update(hash_file(pdk_config_path))
+                .hexdigest()
+            )
 
+        cached = key and Self._get_cached_pdk_config(key)
+        if cached:
+            config_in, pdkpath, scl, pdk_warnings = cached
+        else:
+            sourced: List[str] = []
+            raw, pdkpath, scl = Self._evaluate_pdk_config(pdk, scl, pdk_root, sourced)
+            config_in, pdk_warnings = Self._process_pdk_config(raw)
+            if key is not None:
+                Self._cache_pdk_config(
+                    key,
+                    raw,
+                    (config_in, pdkpath, scl, pdk_warnings),
+                    [pdk_config_path, Self._get_scl_config_path(pdkpath, scl)]
+                    + sourced,
+                )
+
+        if len(pdk_warnings) > 0:
+            if full_pdk_warnings:
+                info(
+                    "Loading the PDK configuration files has generated the following warnings:"
+                )
+                for warning in pdk_warnings:
+                    warn(warning)
+
+        return (config_in, pdkpath, scl)
+
+    @classmethod
+    def _get_scl_config_path(Self, pdkpath: str, scl: str) -> str:
+        return os.path.join(pdkpath, "libs.tech", "openlane", scl, "config.tcl")
+
+    @classmethod
+    def _get_cached_pdk_config(
+        Self,
+        key: str,
+    ) -> Optional[Tuple["Config", str, str, List[str]]]:
+        with _pdk_configs_lock:
+            cached = _pdk_configs.get(key)
+        if cached is not None:
+            processed, dependencies = cached
+            if dependencies.changed():
+                return None
+            return processed
+
+        cache = get_pdk_config_cache()
+        if cache is None:
+            return None
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        try:
+            with open(os.path.join(entry, PDK_CONFIG_FILE), encoding="utf8") as f:
+                stored = json.load(f)
+            raw: Dict[str, str] = stored["config"]
+            pdkpath: str = stored["pdkpath"]
+            scl: str = stored["scl"]
+            dependencies = _PDKConfigDependencies(
+                stored["files"],
+                stored["environment"],
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            debug(f"Failed to read cached PDK configuration: {e}")
+            return None
+        if dependencies.changed():
+            # The SCL configuration, a sourced file or the environment has changed
+            return None
+
+        config_in, pdk_warnings = Self._process_pdk_config(raw)
+        processed = (config_in, pdkpath, scl, pdk_warnings)
+        with _pdk_configs_lock:
+            _pdk_configs[key] = (processed, dependencies)
+        return processed
+
+    @classmethod
+    def _cache_pdk_config(
+        Self,
+        key: str,
+        raw: Dict[str, Any],
+        processed: Tuple["Config", str, str, List[str]],
+        files: List[str],
+    ):
+        """
+        :param files: The PDK and SCL ``config.tcl`` files, followed by the
+            files sourced by either.
+        """
+        _, pdkpath, scl, _ = processed
+        names: Set[str] = set()
+        try:
+            for path in files:
+                with open(path, encoding="utf8") as f:
+                    names.update(env_rx.findall(f.read()))
+            dependencies = _PDKConfigDependencies(
+                {path: hash_file(path) for path in files[1:]},
+                {
+                    name: os.environ.get(name)
+                    for name in sorted(names)
+                    # Set explicitly, and part of the key
+                    if name not in [SpecialKeys.pdk_root, SpecialKeys.pdk]
+                },
+            )
+        except (OSError, UnicodeDecodeError) as e:
+            debug(f"Failed to cache PDK configuration: {e}")
+            return
+        with _pdk_configs_lock:
+            _pdk_configs[key] = (processed, dependencies)
+        cache = get_pdk_config_cache()
+        if cache is None:
+            return
+        try:
+            # Replaces stale entries, e.g. if a sourced file has changed
+            cache.remove(key)
+
+            def populate(dir: str):
+                with open(
+                    os.path.join(dir, PDK_CONFIG_FILE), "w", encoding="utf8"
+                ) as f:
+                    json.dump(
+                        {
+                            "config": raw,
+                            "pdkpath": pdkpath,
+                            "scl": scl,
+                            "files": dependencies.files,
+                            "environment": dependencies.environment,
+                        },
+                        f,
+                    )
+
+            cache.put(key, populate)
+        except (OSError, TypeError, ValueError) as e:
+            debug(f"Failed to cache PDK configuration: {e}")
+
+    @classmethod
+    def _evaluate_pdk_config(
+        Self,
+        pdk: str,
+        scl: Optional[str],
+        pdk_root: str,
+        sourced: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, Any], str, str]:
+        """
+        :param sourced: If set, the paths of the files sourced by the PDK and
+            SCL configuration files are appended to this list.
+        :returns: A tuple of the values set by the PDK and SCL configuration
+            files, the PDK path and the SCL.
+        """
         pdk_config: GenericDict[str, Any] = GenericDict(
             {
                 SpecialKeys.pdk_root: pdk_root,
@@ -559,6 +977,7 @@ class Config(GenericImmutableDict[str, Any]):
         pdk_env = env_from_tcl(
             pdk_config,
             open(pdk_config_path, encoding="utf8").read(),
+            sourced,
         )
 
         scl = pdk_env["STD_CELL_LIBRARY"]
@@ -566,18 +985,29 @@ class Config(GenericImmutableDict[str, Any]):
             scl is not None
         ), "Fatal error: STD_CELL_LIBRARY default value not set by PDK."
 
-        scl_config_path = os.path.join(
-            pdkpath, "libs.tech", "openlane", scl, "config.tcl"
-        )
+        scl_config_path = Self._get_scl_config_path(pdkpath, scl)
 
         scl_env = migrate_old_config(
             env_from_tcl(
                 pdk_env,
                 open(scl_config_path, encoding="utf8").read(),
+                sourced,
             )
         )
 
-        config_in = Config(scl_env)
+        return (scl_env, pdkpath, scl)
+
+    @classmethod
+    def _process_pdk_config(
+        Self,
+        raw: Dict[str, Any],
+    ) -> Tuple["Config", List[str]]:
+        """
+        :param raw: The values set by the PDK and SCL configuration files.
+        :returns: A tuple of the PDK configuration and the warnings generated
+            while processing it.
+        """
+        config_in = Config(raw)
         config_in, pdk_warnings, pdk_errors = config_in.process_variable_list(
             pdk_variables,
             pdk_removed_variables,
@@ -586,15 +1016,7 @@ class Config(GenericImmutableDict[str, Any]):
         if len(pdk_errors) != 0:
             raise InvalidConfig("PDK configuration files", pdk_warnings, pdk_errors)
 
-        if len(pdk_warnings) > 0:
-            if full_pdk_warnings:
-                info(
-                    "Loading the PDK configuration files has generated the following warnings:"
-                )
-                for warning in pdk_warnings:
-                    warn(warning)
-
-        return (config_in, pdkpath, scl)
+        return (config_in, pdk_warnings)
 
     def process_variable_list(
         self,
@@ -707,12 +1129,8 @@ class Config(GenericImmutableDict[str, Any]):
         for key in sorted(mutable.keys()):
             assert isinstance(key, str)
 
-            if key in vars(SpecialKeys).values():
-                continue
-            if key in removed:
-                warnings.append(f"'{key}' has been removed: {removed[key]}")
-            elif "_OPT" not in key and key != "//":
-                warnings.append(f"Unknown key '{key}' provided.")
+            if warning := _unused_key_warning(key, removed):
+                warnings.append(warning)
 
         if translated_macros:
             for macro in final["MACROS"].values():
@@ -720,3 +1138,203 @@ class Config(GenericImmutableDict[str, Any]):
                     macro.gds = Path("")
 
         return (Config(final), warnings, errors)
+
+
+def _unused_key_warning(key: str, removed: Dict[str, str]) -> Optional[str]:
+    if key in vars(SpecialKeys).values():
+        return None
+    if key in removed:
+        return f"'{key}' has been removed: {removed[key]}"
+    elif "_OPT" not in key and key != "//":
+        return f"Unknown key '{key}' provided."
+    return None
+
+
+reference_rx = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+
+
+def _referenced_names(value: Any) -> Set[str]:
+    if isinstance(value, str):
+        return set(reference_rx.findall(value))
+    elif isinstance(value, dict):
+        result = set()
+        for key, element in value.items():
+            result.update(_referenced_names(key))
+            result.update(_referenced_names(element))
+        return result
+    elif isinstance(value, (list, tuple)):
+        return set().union(*[_referenced_names(element) for element in value])
+    return set()
+
+
+def _conditional_keys(raw: Dict[str, Any], within: bool = False) -> Set[str]:
+    result = set()
+    for key, value in raw.items():
+        if isinstance(value, dict) and key.startswith(("pdk::", "scl::")):
+            result.update(_conditional_keys(value, within=True))
+        elif within:
+            result.add(key)
+    return result
+
+
+def _parse_overrides(
+    variant: Union[Sequence[str], Mapping[str, Any]]
+) -> Dict[str, Any]:
+    if isinstance(variant, Mapping):
+        return dict(variant)
+    overrides = {}
+    for string in variant:
+        if "=" not in string:
+            raise ValueError(f"Invalid override '{string}': expected NAME=VALUE.")
+        key, value = string.split("=", 1)
+        overrides[key] = value
+    return overrides
+
+
+class _ConfigBatch(object):
+    """
+    The shared part of a batch of configurations loaded by
+    :meth:`Config.load_batch`.
+
+    Variants are resolved and validated incrementally against the base
+    configuration: only the overridden keys and the keys referring to them are
+    resolved again, and only the variables among those and the variables
+    referring to them in their values or defaults are validated again.
+    """
+
+    # Keys that need the entire configuration to be reprocessed
+    full_keys = set(vars(SpecialKeys).values()) | {
+        *PROCESS_INFO_ALLOWLIST,
+        "DIODE_INSERTION_STRATEGY",
+        "EXTRA_SPEFS",
+    }
+
+    def __init__(
+        self,
+        raw: Dict[str, Any],
+        design_dir: str,
+        variables: List[Variable],
+        pdk_root: str,
+        pdk: Optional[str],
+        scl: Optional[str],
+    ):
+        self.raw = raw
+        self.design_dir = design_dir
+        self.variables = variables
+        self.pdk_root = pdk_root
+        self.pdk = pdk
+        self.scl = scl
+
+        self.meta = Meta()
+        self.meta_errors: List[str] = []
+        if (meta_raw := raw.pop("meta", None)) is not None:
+            try:
+                self.meta = Meta(**meta_raw)
+            except TypeError as e:
+                self.meta_errors.append(f"'meta' object is invalid: {e}")
+
+        pdk_config, self.resolver = Config._resolve_dict(
+            raw,
+            design_dir,
+            pdk_root=pdk_root,
+            pdk=pdk,
+            scl=scl,
+        )
+        self.unprocessed = Config(pdk_config, overrides=self.resolver.resolved())
+
+        config, self.warnings, self.errors = self.unprocessed.process_variable_list(
+            variables,
+            removed_variables,
+        )
+        self.errors += self.meta_errors
+        config.meta = self.meta
+        self.config = config
+
+        self.conditional_keys = _conditional_keys(raw)
+        self.names: Dict[str, Set[str]] = {}
+        self.dependencies: Dict[str, Set[str]] = {}
+        for variable in variables:
+            names = {variable.name}
+            for deprecated_name in variable.deprecated_names or []:
+                if not isinstance(deprecated_name, str):
+                    deprecated_name = deprecated_name[0]
+                names.add(deprecated_name)
+            self.names[variable.name] = names
+            dependencies = _referenced_names(variable.default)
+            for name in names:
+                dependencies.update(_referenced_names(self.unprocessed.get(name)))
+            self.dependencies[variable.name] = dependencies
+
+    def is_incremental(self, overrides: Dict[str, Any]) -> bool:
+        if len(self.errors) != 0:
+            # Variants may fix errors in the base configuration
+            return False
+        for key in overrides:
+            if (
+                key in self.full_keys
+                or key.startswith(("pdk::", "scl::"))
+                or key in self.conditional_keys
+            ):
+                return False
+        return True
+
+    def load(
+        self, overrides: Dict[str, Any]
+    ) -> Tuple[Optional[Config], List[str], List[str]]:
+        resolved = self.resolver.override(overrides)
+
+        mutable = Config(self.unprocessed, overrides=resolved)
+        warnings: List[str] = []
+        errors: List[str] = []
+        updated: Dict[str, Any] = {}
+        affected = set(resolved)
+        used = set()
+        for variable in self.variables:
+            if self.names[variable.name].isdisjoint(affected) and self.dependencies[
+                variable.name
+            ].isdisjoint(affected):
+                continue
+            affected.add(variable.name)
+            try:
+                exists, updated[variable.name] = variable.compile(
+                    mutable_config=mutable,
+                    warning_list_ref=warnings,
+                    values_so_far=Config(self.config, overrides=updated),
+                )
+                used.add(exists)
+            except ValueError as e:
+                errors.append(str(e))
+
+        for key in sorted(set(overrides) - used):
+            if warning := _unused_key_warning(key, removed_variables):
+                warnings.append(warning)
+
+        if len(errors) != 0:
+            return (None, warnings, errors)
+        return (Config(self.config, overrides=updated, meta=self.meta), warnings, [])
+
+    def load_full(
+        self, overrides: Dict[str, Any]
+    ) -> Tuple[Optional[Config], List[str], List[str]]:
+        raw = dict(self.raw)
+        raw.update(overrides)
+        pdk_config, resolver = Config._resolve_dict(
+            raw,
+            self.design_dir,
+            pdk_root=self.pdk_root,
+            pdk=self.pdk,
+            scl=self.scl,
+        )
+        config, warnings, errors = Config(
+            pdk_config, overrides=resolver.resolved()
+        ).process_variable_list(
+            self.variables,
+            removed_variables,
+        )
+        errors = self.meta_errors + errors
+        if len(self.errors) == 0:
+            warnings = [warning for warning in warnings if warning not in self.warnings]
+        if len(errors) != 0:
+            return (None, warnings, errors)
+        config.meta = self.meta
+        return (config, warnings, [])
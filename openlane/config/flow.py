@@ -121,7 +121,7 @@ all_variables = [
     ),
     Variable(
         "FP_PADFRAME_CFG",
-        Optional[str],
+        Optional[Path],
         "A configuration file passed to `padringer`, a padframe generator.",
     ),
     Variable(
@@ -165,6 +165,12 @@ all_variables = [
         "Checks for assign statement in the generated gate level netlist and aborts if any were found.",
         default=False,
     ),
+    Variable(
+        "TCL_CONFIG_MODE",
+        StringEnum("TCL_CONFIG_MODE", ["env", "file"]),
+        "How the configuration is passed to Tcl-based tools. `env` exports every configuration variable as an environment variable. `file` writes the configuration to a Tcl file in the step directory, which is sourced by the scripts, and only exports the variables declared by the step, which keeps the environment of the tools small.",
+        default="env",
+    ),
 ]
 removed_variables: Dict[str, str] = {
     "PL_RANDOM_GLB_PLACEMENT": "The random global placer no longer yields a tangible benefit with newer versions of OpenROAD.",
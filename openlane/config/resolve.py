@@ -16,10 +16,22 @@ import re
 import os
 import glob
 import fnmatch
+import bisect
 from enum import Enum
 from decimal import Decimal
 from types import SimpleNamespace
-from typing import Any, Dict, List, Mapping, Tuple, Union, Optional
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Set,
+    Tuple,
+    Union,
+    Optional,
+)
 
 Keys = SimpleNamespace(
     pdk_root="PDK_ROOT",
@@ -45,6 +57,10 @@ class InvalidConfig(Exception):
 
 
 class Expr(object):
+    # Postfix tokens by expression
+    _compiled: ClassVar[Dict[str, Tuple["Expr.Token", ...]]] = {}
+    max_compiled: ClassVar[int] = 16384
+
     class SyntaxError(Exception):
         pass
 
@@ -82,6 +98,7 @@ class Expr(object):
     @staticmethod
     def tokenize(expr: str) -> List["Expr.Token"]:
         rx_list = [
+            (re.compile(r"^\$\{([^}]+)\}"), Expr.Token.Type.VAR),
             (re.compile(r"^\$(\w+)"), Expr.Token.Type.VAR),
             (re.compile(r"^(-?\d+\.?\d*)"), Expr.Token.Type.NUMBER),
             (re.compile(r"^(\*\*)"), Expr.Token.Type.OP),
@@ -113,7 +130,18 @@ class Expr(object):
         return tokens
 
     @staticmethod
-    def evaluate(expression: str, values_so_far: Mapping[str, Any]) -> float:
+    def compile(expression: str) -> Tuple["Expr.Token", ...]:
+        """
+        Parses an expression into a sequence of tokens in postfix notation.
+
+        Expressions are only parsed once: the results are cached.
+
+        :param expression: The expression.
+        :returns: The tokens of the expression in postfix notation.
+        """
+        if (postfix_cached := Expr._compiled.get(expression)) is not None:
+            return postfix_cached
+
         tokens: List["Expr.Token"] = Expr.tokenize(expression)
         ETT = Expr.Token.Type
 
@@ -158,6 +186,17 @@ class Expr(object):
             postfix.append(opstack[-1])
             opstack.pop()
 
+        result = tuple(postfix)
+        if len(Expr._compiled) >= Expr.max_compiled:
+            Expr._compiled.clear()
+        Expr._compiled[expression] = result
+        return result
+
+    @staticmethod
+    def evaluate(expression: str, values_so_far: Mapping[str, Any]) -> float:
+        postfix = Expr.compile(expression)
+        ETT = Expr.Token.Type
+
         # Evaluate
         eval_stack = []
         for token in postfix:
@@ -171,6 +210,8 @@ class Expr(object):
                     raise SyntaxError(
                         f"Configuration variable '{token.value}' not found."
                     )
+                except InvalidConfig:
+                    raise
                 except Exception:
                     raise SyntaxError(
                         f"Invalid non-numeric value '{value}' for variable ${token.value}."
@@ -192,7 +233,7 @@ class Expr(object):
                     elif token.value == "+":
                         result = number1 + number2
                     elif token.value == "-":
-                        result = number1 + number2
+                        result = number1 - number2
 
                     eval_stack.append(result)
                 except IndexError:
@@ -298,52 +339,257 @@ def process_scalar(key: str, value: Scalar, values_so_far: Mapping[str, Any]) ->
     return result
 
 
-def process_config_dict_recursive(config_in: Dict[str, Any], state: dict):
+class _Resolution(Mapping[str, Any]):
+    """
+    A mapping resolving the values of keys on demand, recording which keys
+    refer to which.
+
+    A reference gets the value of the last assignment preceding the referring
+    assignment, or the exposed variable of the same name if there is none. A
+    key that is only assigned later in the configuration gets its final value.
+    In particular, a key referring to itself, e.g. in a conditional block
+    refining a value assigned earlier, gets its previous assignment.
+    """
+
+    def __init__(
+        self,
+        assignments: Dict[str, Any],
+        exposed: Dict[str, Any],
+        resolved: Optional[Dict[str, Any]] = None,
+        dependencies: Optional[Dict[str, Set[str]]] = None,
+        previous: Optional[Dict[str, List[Any]]] = None,
+        positions: Optional[Dict[str, List[int]]] = None,
+    ) -> None:
+        self.assignments = assignments
+        self.exposed = exposed
+        self.resolved = resolved or {}
+        self.dependencies = dependencies or {}
+        self.previous = previous or {}
+        self.positions = positions or {}
+        # Keys being resolved, with the index of the assignment
+        self.stack: List[Tuple[str, int]] = []
+
+    def __getitem__(self, key: str) -> Any:
+        if len(self.stack):
+            current, current_level = self.stack[-1]
+            self.dependencies.setdefault(current, set()).add(key)
+        if key not in self.assignments:
+            return self.exposed[key]
+
+        final = len(self.previous.get(key, []))
+        level = final
+        if len(self.stack):
+            # Assignments of the key before the current assignment
+            before = bisect.bisect_left(
+                self.positions[key],
+                self.positions[current][current_level],
+            )
+            if before == 0 and (key == current or key in self.exposed):
+                return self.exposed[key]
+            if before != 0:
+                level = before - 1
+
+        if level == final and key in self.resolved:
+            return self.resolved[key]
+        if (key, level) in self.stack:
+            start = self.stack.index((key, level))
+            cycle = [resolving for resolving, _ in self.stack[start:]] + [key]
+            raise InvalidConfig(f"Circular reference: {' -> '.join(cycle)}.")
+
+        value = self._resolve(key, level)
+        if level == final:
+            self.resolved[key] = value
+        return value
+
+    def _resolve(self, key: str, level: int) -> Any:
+        previous = self.previous.get(key, [])
+        value = previous[level] if level < len(previous) else self.assignments[key]
+        self.stack.append((key, level))
+        try:
+            if isinstance(value, list):
+                processed = []
+                for i, item in enumerate(value):
+                    current_key = f"{key}[{i}]"
+                    processed.append(f"{process_scalar(current_key, item, self)}")
+                value = " ".join(processed)
+            elif not isinstance(value, dict):
+                value = process_scalar(key, value, self)
+        finally:
+            self.stack.pop()
+        return value
+
+    def __iter__(self):
+        yield from self.exposed
+        for key in self.assignments:
+            if key not in self.exposed:
+                yield key
+
+    def __len__(self) -> int:
+        return len(set(self.exposed) | set(self.assignments))
+
+
+class Resolver(object):
+    """
+    Resolves the values of a raw configuration dictionary, i.e. ``ref::``,
+    ``expr::``, ``dir::`` and ``pdk_dir::`` strings, as well as ``pdk::`` and
+    ``scl::`` conditional blocks.
+
+    As with sequential processing, a reference gets the value assigned so far,
+    e.g., a key referring to a key assigned again in a later conditional block
+    gets the earlier assignment, and a key assigned more than once may refer to
+    itself to use its previous assignment. Keys may additionally refer to keys
+    that are only assigned later in the dictionary, getting their final value:
+    values are resolved on demand, with circular references being reported as
+    errors. The keys each key refers to are recorded, so :meth:`override` only
+    resolves the keys affected by a number of overrides again.
+
+    :param config_in: The raw configuration dictionary.
+    :param exposed_variables: Variables that may be referred to in addition to
+        the keys of the configuration. Keys of the configuration take precedence
+        over these.
+    :param fixed_variables: Variables that take precedence over the keys of the
+        configuration in the resolved dictionary.
+    """
+
     PDK_PREFIX = "pdk::"
     SCL_PREFIX = "scl::"
 
-    for key, value in config_in.items():
-        withhold = False
-        if not isinstance(key, str):
-            raise InvalidConfig(f"Invalid key {key}: must be a string.")
-        if isinstance(value, dict):
-            if key.startswith(PDK_PREFIX):
-                withhold = True
-                pdk_match = key[len(PDK_PREFIX) :]
-                if fnmatch.fnmatch(state[Keys.pdk], pdk_match):
-                    process_config_dict_recursive(value, state)
-            elif key.startswith(SCL_PREFIX):
-                withhold = True
-                scl_match = key[len(SCL_PREFIX) :]
-                if state[Keys.scl] is not None and fnmatch.fnmatch(
-                    state[Keys.scl], scl_match
-                ):
-                    process_config_dict_recursive(value, state)
-        elif isinstance(value, list):
-            valid = True
-            processed = []
-            for i, item in enumerate(value):
-                current_key = f"{key}[{i}]"
-                processed.append(f"{process_scalar(current_key, item, state)}")
-
-            if not valid:
-                raise InvalidConfig(
-                    f"Invalid value for key '{key}': Arrays must consist only of strings."
-                )
-            value = " ".join(processed)
-        else:
-            value = process_scalar(key, value, state)
-
-        if not withhold:
-            state[key] = value
+    def __init__(
+        self,
+        config_in: Dict[str, Any],
+        exposed_variables: Dict[str, Any],
+        fixed_variables: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.exposed = dict(exposed_variables)
+        self.fixed = dict(fixed_variables or {})
+        self.assignments: Dict[str, Any] = {}
+        # Earlier assignments of keys assigned more than once, in order
+        self.previous: Dict[str, List[Any]] = {}
+        # The order of all assignments of each key among all assignments
+        self.positions: Dict[str, List[int]] = {}
+        self.count = 0
+        self._collect(config_in)
+
+        resolution = _Resolution(
+            self.assignments,
+            self.exposed,
+            previous=self.previous,
+            positions=self.positions,
+        )
+        for key in self.assignments:
+            resolution[key]
+        self.values = resolution.resolved
+        self.dependencies = resolution.dependencies
+        self._dependents: Optional[Dict[str, Set[str]]] = None
+
+    def _collect(self, config_in: Dict[str, Any]):
+        for key, value in config_in.items():
+            if not isinstance(key, str):
+                raise InvalidConfig(f"Invalid key {key}: must be a string.")
+            if isinstance(value, dict) and key.startswith(self.PDK_PREFIX):
+                pdk_match = key[len(self.PDK_PREFIX) :]
+                if fnmatch.fnmatch(self._current(Keys.pdk), pdk_match):
+                    self._collect(value)
+            elif isinstance(value, dict) and key.startswith(self.SCL_PREFIX):
+                scl_match = key[len(self.SCL_PREFIX) :]
+                scl = self._current(Keys.scl)
+                if scl is not None and fnmatch.fnmatch(scl, scl_match):
+                    self._collect(value)
+            else:
+                if key in self.assignments:
+                    self.previous.setdefault(key, []).append(self.assignments[key])
+                self.assignments[key] = value
+                self.positions.setdefault(key, []).append(self.count)
+                self.count += 1
+
+    def _current(self, key: str) -> Any:
+        # Conditional blocks depend on the values assigned so far
+        return _Resolution(
+            dict(self.assignments),
+            self.exposed,
+            previous={key: list(value) for key, value in self.previous.items()},
+            positions={key: list(value) for key, value in self.positions.items()},
+        )[key]
+
+    def resolved(self) -> Dict[str, Any]:
+        """
+        :returns: The exposed variables and the resolved values of the keys of
+            the configuration, in the order they first appear in.
+        """
+        result = dict(self.exposed)
+        for key in self.assignments:
+            result[key] = self.values[key]
+        result.update(self.fixed)
+        return result
+
+    def dependents(self, keys: Iterable[str]) -> Set[str]:
+        """
+        :param keys: A number of keys.
+        :returns: The keys referring to any of ``keys``, directly or indirectly.
+        """
+        if self._dependents is None:
+            self._dependents = {}
+            for key, dependencies in self.dependencies.items():
+                for dependency in dependencies:
+                    self._dependents.setdefault(dependency, set()).add(key)
+        result: Set[str] = set()
+        queue = list(keys)
+        while len(queue):
+            for dependent in self._dependents.get(queue.pop(), []):
+                if dependent not in result:
+                    result.add(dependent)
+                    queue.append(dependent)
+        return result
+
+    def override(self, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolves the keys affected by a number of overrides, i.e., the
+        overridden keys and the keys referring to them, without resolving the
+        other keys of the configuration again.
+
+        Conditional blocks are not re-evaluated: changing the PDK or the
+        standard cell library requires a new :class:`Resolver`.
+
+        Overridden keys replace the final assignment of the key, or are
+        assigned after all other keys if the key is not assigned yet.
+
+        :param overrides: The overridden keys and their new raw values.
+        :returns: The resolved values of the affected keys.
+        """
+        affected = set(overrides) | self.dependents(overrides)
+        assignments = dict(self.assignments)
+        assignments.update(overrides)
+        positions = dict(self.positions)
+        count = self.count
+        for key in overrides:
+            if key not in positions:
+                positions[key] = [count]
+                count += 1
+        values = {
+            key: value for key, value in self.values.items() if key not in affected
+        }
+        dependencies = {
+            key: value
+            for key, value in self.dependencies.items()
+            if key not in affected
+        }
+        resolution = _Resolution(
+            assignments,
+            self.exposed,
+            values,
+            dependencies,
+            self.previous,
+            positions,
+        )
+        result = {key: resolution[key] for key in assignments if key in affected}
+        result.update({key: self.fixed[key] for key in affected if key in self.fixed})
+        return result
 
 
 def process_config_dict(
     config_in: dict, exposed_variables: Dict[str, str]
 ) -> Dict[str, Any]:
-    state: Dict[str, Any] = dict(exposed_variables)
-    process_config_dict_recursive(config_in, state)
-    return state
+    return Resolver(config_in, exposed_variables).resolved()
 
 
 def extract_process_vars(config_in: Dict[str, str]) -> Dict[str, str]:
@@ -354,7 +600,7 @@ def extract_process_vars(config_in: Dict[str, str]) -> Dict[str, str]:
     }
 
 
-def resolve(
+def get_resolver(
     config_dict: Dict[str, Any],
     design_dir: str,
     only_extract_process_info: bool = False,
@@ -362,7 +608,7 @@ def resolve(
     pdk: Optional[str] = None,
     pdkpath: Optional[str] = None,
     scl: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> Resolver:
     if exposing is None:
         exposing = []
 
@@ -414,9 +660,29 @@ def resolve(
                 f"{key} environment variable must be set.",
             )
 
-    resolved = process_config_dict(config_dict, exposed_dict)
+    return Resolver(config_dict, exposed_dict, base_vars_clean)
+
+
+def resolve(
+    config_dict: Dict[str, Any],
+    design_dir: str,
+    only_extract_process_info: bool = False,
+    exposing: Optional[List[str]] = None,
+    pdk: Optional[str] = None,
+    pdkpath: Optional[str] = None,
+    scl: Optional[str] = None,
+) -> Dict[str, Any]:
+    resolver = get_resolver(
+        config_dict,
+        design_dir,
+        only_extract_process_info=only_extract_process_info,
+        exposing=exposing,
+        pdk=pdk,
+        pdkpath=pdkpath,
+        scl=scl,
+    )
+    resolved = resolver.resolved()
     if only_extract_process_info:
         resolved = extract_process_vars(resolved)
-
-    resolved.update(base_vars_clean)
+        resolved.update(resolver.fixed)
     return resolved
@@ -14,13 +14,30 @@
 import re
 import tkinter
 import tempfile
-from typing import Dict, Mapping, Any
+from typing import Dict, List, Mapping, Any, Optional
 
 setter_rx = re.compile(r"set\s+(?:\:\:)?env\(\s*(\w+)\s*\)")
 
 
-def env_from_tcl(env_in: Mapping[str, Any], tcl_in: str) -> Dict[str, Any]:
+# Records the normalized path of every sourced file in ::openlane_sourced
+source_tracker = """
+set ::openlane_sourced [list]
+rename source ::openlane_source
+proc source {args} {
+    lappend ::openlane_sourced [file normalize [lindex $args end]]
+    uplevel 1 [list ::openlane_source {*}$args]
+}
+"""
+
+
+def env_from_tcl(
+    env_in: Mapping[str, Any],
+    tcl_in: str,
+    sourced: Optional[List[str]] = None,
+) -> Dict[str, Any]:
     interpreter = tkinter.Tcl()
+    if sourced is not None:
+        interpreter.eval(source_tracker)
     env_out = dict(env_in)
     keys_modified = setter_rx.findall(tcl_in)
     with tempfile.NamedTemporaryFile("r+") as f:
@@ -41,6 +58,8 @@ def env_from_tcl(env_in: Mapping[str, Any], tcl_in: str) -> Dict[str, Any]:
         {unset_env_str}
         """
         interpreter.eval(tcl_script)
+        if sourced is not None:
+            sourced += interpreter.splitlist(interpreter.eval("set ::openlane_sourced"))
 
         f.seek(0)
         env_strings = f.read()
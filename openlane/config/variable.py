@@ -17,7 +17,7 @@ import shlex
 import inspect
 from enum import Enum
 from decimal import Decimal, InvalidOperation
-from typing import Iterable, Literal, Mapping, get_origin, get_args
+from typing import Dict, Iterable, Literal, Mapping, get_origin, get_args
 from typing import Union, Type, List, Optional, Tuple, Any, Callable
 from dataclasses import _MISSING_TYPE, MISSING, dataclass, field, fields, is_dataclass
 
@@ -104,141 +104,72 @@ def repr_type(t: Type[Any]) -> str:
     return type_string + ("?" if optional else "")
 
 
-@dataclass
-class Variable:
-    """
-    An object representing a configuration variable for a PDK, a Flow or a Step.
-
-    :param name: A string name for the Variable. Because of backwards compatility
-        with OpenLane 1, the convention is ``UPPER_SNAKE_CASE``.
-
-    :param type: A Python type object representing the variable.
-
-        Supported scalars:
-
-        - ``int``
-        - ``decimal.Decimal``
-        - ``bool``
-        - ``str``
-        - :class:`Path`
-
-        Supported products:
-
-        - ``Union`` (incl. ``Optional``)
-        - ``List``
-        - ``Tuple``
-        - ``Dict``
-        - ``Enum``
-
-        Other:
-
-        - ``dataclass`` types composed of the above.
-
-    :param description: A human-readable description of the variable. Used to
-        generate help strings and documentation.
-
-    :param default: A default value for the variable.
+Validator = Callable[[str, Any, Mapping[str, Any]], Any]
 
-        Optional variables have an implicit default value of ``None``.
 
-    :param deprecated_names: A list of deprecated names for said variable.
+_validators: Dict[Any, Validator] = {}
 
-        An element of the list can alternative be a tuple of a name and a Callable
-        used to perform a translation for when a renamed variable is also slightly
-        modified.
 
-    :param units: Used only in documentation: the unit corresponding to this
-        object, i.e., μm, pF, etc. Can be any string, but for consistency, SI units
-        must be represented in terms of their official symbols.
+def get_validator(validating_type: Any) -> Validator:
     """
+    Compiles a type annotation supported by :class:`Variable` into a function
+    that validates and normalizes explicitly specified values of that type.
 
-    name: str
-    type: Any
-    description: str
-    default: Any = None
-    deprecated_names: List[Union[str, Tuple[str, Callable]]] = field(
-        default_factory=list
-    )
-
-    units: Optional[str] = None
+    The type annotation is only introspected once: the resulting functions are
+    cached per type.
 
-    @property
-    def optional(self) -> bool:
-        """
-        Returns whether a variable's type is an `Option type <https://en.wikipedia.org/wiki/Option_type>`_.
-        """
-        return is_optional(self.type)
-
-    @property
-    def some(self) -> Any:
-        """
-        Returns the type of a variable presuming it is not None.
-
-        If a variable is not Optional, that is simply the type specified in the
-        :ivar:`type` field.
-        """
-        return some_of(self.type)
-
-    def type_repr_md(self) -> str:
-        """
-        Prints a pretty Markdown string representation of the Variable's type.
-        """
-        return repr_type(self.type)
-
-    def desc_repr_md(self) -> str:
-        """
-        Prints the description, but with newlines escaped for Markdown.
-        """
-        return newline_rx.sub("<br />", self.description)
-
-    def _process(
-        self,
-        key_path: str,
-        value: Any,
-        values_so_far: Mapping[str, Any],
-        validating_type: Type[Any],
-        default: Any = None,
-        explicitly_specified: bool = True,
-    ):
-        if explicitly_specified and value is None:
-            # User explicitly specified "null" for this value: only error if
-            # value is not optional
-            if not is_optional(validating_type):
-                raise ValueError(
-                    f"Non-optional variable {key_path} received a null value."
-                )
-            else:
-                return None
-        elif not explicitly_specified and value is None:
-            # User did not specify a value for this variable: couple outcomes
-            if default is not None:
-                return self._process(
-                    key_path=key_path,
-                    value=default,
-                    validating_type=validating_type,
-                    values_so_far=values_so_far,
-                )
-            elif not is_optional(validating_type):
-                raise ValueError(
-                    f"Required variable {key_path} did not get a specified value."
-                )
-            else:
+    :param validating_type: The type annotation.
+    :returns: A function taking a key path (for error messages), a value and
+        a mapping of the values processed so far (for references), returning
+        the processed value or raising a ``ValueError``.
+    """
+    if validator := _validators.get(validating_type):
+        return validator
+    validator = _compile(validating_type)
+    _validators[validating_type] = validator
+    return validator
+
+
+def _compile(validating_type: Any) -> Validator:
+    if is_optional(validating_type):
+        validate_some = _compile_some(some_of(validating_type))
+
+        def validate_optional(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
+            # User explicitly specified "null" for this value
+            if value is None:
                 return None
+            if type(value) == str:
+                value = process_string(value, values_so_far)
+            return validate_some(key_path, value, values_so_far)
 
-        assert (
-            explicitly_specified and value is not None
-        ), "Configurator has built an inconsistent state."
+        return validate_optional
 
-        if is_optional(validating_type):
-            validating_type = some_of(validating_type)
+    validate_some = _compile_some(validating_type)
 
+    def validate(key_path: str, value: Any, values_so_far: Mapping[str, Any]) -> Any:
+        if value is None:
+            raise ValueError(f"Non-optional variable {key_path} received a null value.")
         if type(value) == str:
             value = process_string(value, values_so_far)
+        return validate_some(key_path, value, values_so_far)
+
+    return validate
+
+
+def _compile_some(validating_type: Any) -> Validator:
+    # Values passed to the returned functions are not None and have already
+    # been processed by process_string
+    type_origin = get_origin(validating_type)
+    type_args = get_args(validating_type)
+    if type_origin in [list, tuple]:
+        item_validators = [get_validator(arg) for arg in type_args]
+        is_tuple = type_origin == tuple
 
-        type_origin = get_origin(validating_type)
-        type_args = get_args(validating_type)
-        if type_origin in [list, tuple]:
-            return_value = list()
+        def validate_list(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             raw = value
             if isinstance(raw, list):
                 pass
@@ -254,31 +185,32 @@ class Variable:
                     f"Invalid List provided for variable {key_path}: {value}"
                 )
 
-            if type_origin == tuple:
-                if len(raw) != len(type_args):
-                    raise ValueError(
-                        f"Invalid {validating_type} provided for variable {key_path}: ({len(raw)}/{len(type_args)}) tuple entries provided"
-                    )
+            if is_tuple and len(raw) != len(item_validators):
+                raise ValueError(
+                    f"Invalid {validating_type} provided for variable {key_path}: ({len(raw)}/{len(item_validators)}) tuple entries provided"
+                )
 
-            for i, (item, value_type) in enumerate(
-                zip_first(raw, type_args, fillvalue=type_args[0])
+            return_value = []
+            for i, (item, item_validator) in enumerate(
+                zip_first(raw, item_validators, fillvalue=item_validators[0])
             ):
                 return_value.append(
-                    self._process(
-                        key_path=f"{key_path}[{i}]",
-                        value=item,
-                        validating_type=value_type,
-                        values_so_far=values_so_far,
-                    )
+                    item_validator(f"{key_path}[{i}]", item, values_so_far)
                 )
 
-            if type_origin == tuple:
+            if is_tuple:
                 return tuple(raw)
 
             return return_value
-        elif type_origin == dict:
+
+        return validate_list
+    elif type_origin == dict:
+        key_validator, value_validator = [get_validator(arg) for arg in type_args]
+
+        def validate_dict(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             raw = value
-            key_type, value_type = type_args
             if isinstance(raw, dict):
                 pass
             elif isinstance(raw, str):
@@ -300,32 +232,26 @@ class Variable:
 
             processed = {}
             for key, val in raw.items():
-                key_validated = self._process(
-                    key_path=key_path,
-                    value=key,
-                    validating_type=key_type,
-                    values_so_far=values_so_far,
-                )
-                value_validated = self._process(
-                    key_path=f"{key_path}.{key_validated}",
-                    value=val,
-                    validating_type=value_type,
-                    values_so_far=values_so_far,
+                key_validated = key_validator(key_path, key, values_so_far)
+                value_validated = value_validator(
+                    f"{key_path}.{key_validated}", val, values_so_far
                 )
                 processed[key_validated] = value_validated
 
             return processed
-        elif type_origin == Union:
+
+        return validate_dict
+    elif type_origin == Union:
+        arg_validators = [get_validator(arg) for arg in type_args]
+
+        def validate_union(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             final_value = None
             errors = []
-            for arg in type_args:
+            for arg_validator in arg_validators:
                 try:
-                    final_value = self._process(
-                        key_path=key_path,
-                        value=value,
-                        validating_type=arg,
-                        values_so_far=values_so_far,
-                    )
+                    final_value = arg_validator(key_path, value, values_so_far)
                 except ValueError as e:
                     errors.append(f"\t{str(e)}")
             if final_value is not None:
@@ -339,51 +265,97 @@ class Variable:
                         + errors
                     )
                 )
-        elif type_origin == Literal:
-            arg = type_args[0]
+
+        return validate_union
+    elif type_origin == Literal:
+        arg = type_args[0]
+
+        def validate_literal(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             if value == arg:
                 return value
             else:
                 raise ValueError(f"Value for {key_path} is not '{arg}': '{value}'")
-        elif is_dataclass(validating_type):
+
+        return validate_literal
+    elif is_dataclass(validating_type):
+        field_validators = []
+        dataclass_type: Any = validating_type
+        for current_field in fields(dataclass_type):
+            field_type: Any = current_field.type
+            field_default = None
+            if (
+                current_field.default is not None
+                and type(current_field.default) != _MISSING_TYPE
+            ):
+                field_default = current_field.default
+            field_default_factory = None
+            if current_field.default_factory != MISSING:
+                field_default_factory = current_field.default_factory
+            field_validators.append(
+                (
+                    current_field.name,
+                    get_validator(field_type),
+                    is_optional(field_type),
+                    field_default,
+                    field_default_factory,
+                )
+            )
+
+        def validate_dataclass(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             raw = value
             if not isinstance(raw, dict):
                 raise ValueError(
                     f"Value provided for deserializable path {validating_type} at {key_path} is not a dictionary."
                 )
             kwargs_dict = {}
-            for current_field in fields(validating_type):
-                key = current_field.name
-                subtype = current_field.type
-                explicitly_specified = False
+            for (
+                key,
+                field_validator,
+                optional,
+                field_default,
+                field_default_factory,
+            ) in field_validators:
+                field_key_path = f"{key_path}.{key}"
+                if field_default_factory is not None:
+                    field_default = field_default_factory()
+                value_processed = None
                 if key in raw:
-                    explicitly_specified = True
-                field_value = raw.get(key)
-                field_default = None
-                if (
-                    current_field.default is not None
-                    and type(current_field.default) != _MISSING_TYPE
-                ):
-                    field_default = current_field.default
-                if current_field.default_factory != MISSING:
-                    field_default = current_field.default_factory()
-                value_processed = self._process(
-                    key_path=f"{key_path}.{key}",
-                    value=field_value,
-                    explicitly_specified=explicitly_specified,
-                    default=field_default,
-                    validating_type=subtype,
-                    values_so_far=values_so_far,
-                )
+                    value_processed = field_validator(
+                        field_key_path, raw[key], values_so_far
+                    )
+                elif field_default is not None:
+                    value_processed = field_validator(
+                        field_key_path, field_default, values_so_far
+                    )
+                elif not optional:
+                    raise ValueError(
+                        f"Required variable {field_key_path} did not get a specified value."
+                    )
                 kwargs_dict[key] = value_processed
-            return validating_type(**kwargs_dict)
-        elif validating_type == Path:
+            return dataclass_type(**kwargs_dict)
+
+        return validate_dataclass
+    elif validating_type == Path:
+
+        def validate_path(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             if not os.path.exists(str(value)):
                 raise ValueError(
                     f"Path provided for variable {key_path} does not exist: '{value}'"
                 )
             return Path(value)
-        elif validating_type == bool:
+
+        return validate_path
+    elif validating_type == bool:
+
+        def validate_bool(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             if value in ["1", "true", True]:
                 return True
             elif value in ["0", "false", False]:
@@ -392,14 +364,26 @@ class Variable:
                 raise ValueError(
                     f"Value provided for variable {key_path} of type {validating_type} is invalid: '{value}'"
                 )
-        elif issubclass(validating_type, Enum):
+
+        return validate_bool
+    elif inspect.isclass(validating_type) and issubclass(validating_type, Enum):
+
+        def validate_enum(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             try:
                 return validating_type[value]
             except KeyError:
                 raise ValueError(
                     f"Variable provided for variable {key_path} of enumerated type {validating_type} is invalid: '{value}'"
                 )
-        elif issubclass(validating_type, Decimal):
+
+        return validate_enum
+    elif inspect.isclass(validating_type) and issubclass(validating_type, Decimal):
+
+        def validate_decimal(
+            key_path: str, value: Any, values_so_far: Mapping[str, Any]
+        ) -> Any:
             try:
                 return Decimal(value)
             except InvalidOperation:
@@ -407,13 +391,132 @@ class Variable:
                     f"Value provided for variable {key_path} of type {validating_type} is invalid: '{value}'"
                 )
 
-        else:
-            try:
-                return validating_type(value)
-            except ValueError as e:
+        return validate_decimal
+
+    def validate_other(
+        key_path: str, value: Any, values_so_far: Mapping[str, Any]
+    ) -> Any:
+        try:
+            return validating_type(value)
+        except ValueError as e:
+            raise ValueError(
+                f"Value provided for variable {key_path} of type {validating_type} is invalid: '{value}' {e}"
+            )
+
+    return validate_other
+
+
+@dataclass
+class Variable:
+    """
+    An object representing a configuration variable for a PDK, a Flow or a Step.
+
+    :param name: A string name for the Variable. Because of backwards compatility
+        with OpenLane 1, the convention is ``UPPER_SNAKE_CASE``.
+
+    :param type: A Python type object representing the variable.
+
+        Supported scalars:
+
+        - ``int``
+        - ``decimal.Decimal``
+        - ``bool``
+        - ``str``
+        - :class:`Path`
+
+        Supported products:
+
+        - ``Union`` (incl. ``Optional``)
+        - ``List``
+        - ``Tuple``
+        - ``Dict``
+        - ``Enum``
+
+        Other:
+
+        - ``dataclass`` types composed of the above.
+
+    :param description: A human-readable description of the variable. Used to
+        generate help strings and documentation.
+
+    :param default: A default value for the variable.
+
+        Optional variables have an implicit default value of ``None``.
+
+    :param deprecated_names: A list of deprecated names for said variable.
+
+        An element of the list can alternative be a tuple of a name and a Callable
+        used to perform a translation for when a renamed variable is also slightly
+        modified.
+
+    :param units: Used only in documentation: the unit corresponding to this
+        object, i.e., μm, pF, etc. Can be any string, but for consistency, SI units
+        must be represented in terms of their official symbols.
+    """
+
+    name: str
+    type: Any
+    description: str
+    default: Any = None
+    deprecated_names: List[Union[str, Tuple[str, Callable]]] = field(
+        default_factory=list
+    )
+
+    units: Optional[str] = None
+
+    @property
+    def optional(self) -> bool:
+        """
+        Returns whether a variable's type is an `Option type <https://en.wikipedia.org/wiki/Option_type>`_.
+        """
+        return is_optional(self.type)
+
+    @property
+    def some(self) -> Any:
+        """
+        Returns the type of a variable presuming it is not None.
+
+        If a variable is not Optional, that is simply the type specified in the
+        :ivar:`type` field.
+        """
+        return some_of(self.type)
+
+    def type_repr_md(self) -> str:
+        """
+        Prints a pretty Markdown string representation of the Variable's type.
+        """
+        return repr_type(self.type)
+
+    def desc_repr_md(self) -> str:
+        """
+        Prints the description, but with newlines escaped for Markdown.
+        """
+        return newline_rx.sub("<br />", self.description)
+
+    def _process(
+        self,
+        key_path: str,
+        value: Any,
+        values_so_far: Mapping[str, Any],
+        validating_type: Type[Any],
+        default: Any = None,
+        explicitly_specified: bool = True,
+    ):
+        validator = get_validator(validating_type)
+        if not explicitly_specified and value is None:
+            # User did not specify a value for this variable: couple outcomes
+            if default is not None:
+                return validator(key_path, default, values_so_far)
+            elif not is_optional(validating_type):
                 raise ValueError(
-                    f"Value provided for variable {key_path} of type {validating_type} is invalid: '{value}' {e}"
+                    f"Required variable {key_path} did not get a specified value."
                 )
+            else:
+                return None
+
+        assert explicitly_specified, "Configurator has built an inconsistent state."
+
+        return validator(key_path, value, values_so_far)
 
     def compile(
         self,
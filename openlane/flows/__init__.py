@@ -17,6 +17,19 @@ The Flow Module
 An API for implementing new flows using the OpenLane infrastructure, as well
 as a number of built-in flows.
 """
+import importlib
+from typing import TYPE_CHECKING
+
 from .flow import Flow, FlowException, FlowError
 from .sequential import SequentialFlow
-from . import builtins
+from .dag import DAGFlow
+
+if TYPE_CHECKING:
+    from . import builtins
+
+
+def __getattr__(name: str):
+    # Built-in flows are imported on demand, see Flow.factory
+    if name == "builtins":
+        return importlib.import_module(".builtins", __name__)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
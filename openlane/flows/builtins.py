@@ -13,5 +13,6 @@
 # limitations under the License.
 # flake8: noqa
 from .optimizing import Optimizing
-from .classic import Classic
+from .exploration import Exploration
+from .classic import Classic, ClassicDAG
 from .misc import OpenInKLayout, OpenInOpenROAD
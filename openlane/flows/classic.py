@@ -27,6 +27,7 @@ from ..steps import (
 )
 from .flow import Flow
 from .sequential import SequentialFlow
+from .dag import DAGFlow
 
 
 @Flow.factory.register()
@@ -88,3 +89,14 @@ class Classic(SequentialFlow):
         Netgen.LVS,
         Checker.LVS,
     ]
+
+
+@Flow.factory.register()
+class ClassicDAG(DAGFlow):
+    """
+    A flow of type :class:`openlane.flows.DAGFlow` that runs the same steps as
+    :class:`Classic`, running independent steps (e.g. the two stream-outs or
+    the signoff checks) simultaneously.
+    """
+
+    Steps: List[Type[Step]] = Classic.Steps
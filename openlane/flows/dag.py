@@ -0,0 +1,246 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from .flow import FlowException, FlowError
+from .sequential import SequentialFlow
+from ..state import State, DesignFormat
+from ..steps import (
+    Step,
+    StepError,
+    StepException,
+    DeferredStepError,
+)
+from ..steps.step import ViewsUpdate, MetricsUpdate, get_updates, apply_updates
+from ..logging import info, success, err
+from ..common import get_tpe
+
+
+def get_step_dependencies(Steps: Sequence[Type[Step]]) -> List[Set[int]]:
+    """
+    Derives a dependency graph from a list of steps, using the ``inputs`` and
+    ``outputs`` declared by each step.
+
+    A step depends on an earlier step if:
+
+    * It reads a design format the earlier step may write. Design formats that
+      allow multiple views (e.g. SPEF, LIB) are read-modify-written, so they
+      count as inputs for the steps that output them.
+    * It is a :class:`openlane.steps.Checker.MetricChecker`, which reads
+      metrics, and the earlier step is not a checker. Any step may generate
+      any metric.
+    * The earlier step is a checker that raises immediate (i.e., not deferred)
+      errors, which is used as a gate for all steps that come after it.
+
+    Writes by two steps to the same design format do not create a dependency:
+    the updates are applied in the order the steps are declared.
+
+    :param Steps: A list of step types.
+    :returns: A list of the same length as ``Steps``, where each element is the
+        set of indices of steps that the corresponding step directly depends on.
+    """
+    from ..steps.checker import MetricChecker
+
+    dependencies: List[Set[int]] = []
+    writers_by_format: Dict[DesignFormat, List[int]] = {}
+    non_checkers: List[int] = []
+    gates: List[int] = []
+    for i, cls in enumerate(Steps):
+        current: Set[int] = set(gates)
+
+        reads = set(cls.inputs)
+        reads.update(output for output in cls.outputs if output.value.multiple)
+        for format in reads:
+            current.update(writers_by_format.get(format, []))
+
+        if issubclass(cls, MetricChecker):
+            current.update(non_checkers)
+            if not cls.deferred:
+                gates.append(i)
+        else:
+            non_checkers.append(i)
+
+        for format in cls.outputs:
+            writers_by_format.setdefault(format, []).append(i)
+
+        dependencies.append(current)
+    return dependencies
+
+
+class DAGFlow(SequentialFlow):
+    """
+    A flow that runs the same :attr:`.Steps` as a :class:`SequentialFlow`,
+    but builds a dependency graph from the design formats each step declares
+    as ``inputs`` and ``outputs`` (see :func:`get_step_dependencies`), running
+    steps that do not depend on one another simultaneously.
+
+    The input state of every step is the initial state with the updates of all
+    of the step's (transitive) dependencies applied in declaration order, and
+    the final state of the flow is the initial state with all updates applied
+    in declaration order, so as long as every step's declarations are accurate,
+    the results are identical to that of the equivalent :class:`SequentialFlow`.
+
+    Steps are started with :meth:`Flow.start_step_async`, i.e., by the executor
+    returned by :func:`openlane.steps.get_step_executor`, which by default runs
+    them on the thread pool returned by :func:`openlane.common.get_tpe`.
+
+    :param max_concurrent_steps: The maximum number of steps that may run
+        at the same time.
+
+        If unset, half the pool's worker count (minimum one) is used, as some
+        steps (e.g. multi-corner STA) submit further jobs to the same pool and
+        wait on them.
+
+    :param args: Arguments for :class:`SequentialFlow`.
+    :param kwargs: Keyword arguments for :class:`SequentialFlow`.
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_concurrent_steps: Optional[int] = None,
+        **kwargs,
+    ):
+        self.max_concurrent_steps = max_concurrent_steps
+        super().__init__(*args, **kwargs)
+
+    def _get_max_concurrent_steps(self) -> int:
+        if self.max_concurrent_steps is not None:
+            return max(1, self.max_concurrent_steps)
+        workers = getattr(get_tpe(), "_max_workers", None) or os.cpu_count() or 1
+        return max(1, workers // 2)
+
+    def run(
+        self,
+        initial_state: State,
+        frm: Optional[str] = None,
+        to: Optional[str] = None,
+        skip: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Tuple[State, List[Step]]:
+        frm_resolved, to_resolved, skipped_ids = self._resolve_step_bounds(
+            frm,
+            to,
+            skip,
+        )
+
+        step_count = len(self.Steps)
+        self.set_max_stage_count(step_count)
+
+        executing = frm is None
+        Steps: List[Type[Step]] = []
+        for cls in self.Steps:
+            if frm_resolved is not None and frm_resolved == cls.id:
+                executing = True
+
+            if not executing or cls.id in skipped_ids:
+                info(f"Skipping step '{cls.id}'…")
+                self.end_stage(increment_ordinal=False)
+            else:
+                Steps.append(cls)
+
+            if to_resolved and to_resolved == cls.id:
+                executing = False
+
+        dependencies = get_step_dependencies(Steps)
+        ancestors: List[Set[int]] = []
+        for direct in dependencies:
+            current: Set[int] = set(direct)
+            for dependency in direct:
+                current.update(ancestors[dependency])
+            ancestors.append(current)
+
+        # Step initializers are not thread-safe, so all step objects are
+        # created here with a Future input state that is realized once all
+        # of their dependencies are done.
+        step_list: List[Step] = []
+        state_in_futures: List[Future[State]] = []
+        for cls in Steps:
+            state_in_future: Future[State] = Future()
+            step = cls(config=self.config, state_in=state_in_future, flow=self)
+            self._ordinal += 1
+            step_list.append(step)
+            state_in_futures.append(state_in_future)
+
+        info("Starting…")
+
+        states_in: Dict[int, State] = {}
+        updates: Dict[int, Tuple[ViewsUpdate, MetricsUpdate]] = {}
+        running: Dict[Future[State], int] = {}
+        pending: List[int] = list(range(len(step_list)))
+        deferred_errors: List[str] = []
+        fatal: Optional[Exception] = None
+        max_concurrent_steps = self._get_max_concurrent_steps()
+
+        while len(pending) + len(running):
+            if fatal is None:
+                for i in list(pending):
+                    if len(running) >= max_concurrent_steps:
+                        break
+                    if not dependencies[i].issubset(updates.keys()):
+                        continue
+                    pending.remove(i)
+                    states_in[i] = apply_updates(
+                        initial_state,
+                        [updates[dependency] for dependency in sorted(ancestors[i])],
+                    )
+                    state_in_futures[i].set_result(states_in[i])
+                    running[self.start_step_async(step_list[i])] = i
+            else:
+                pending = []
+
+            if len(running) == 0:
+                break
+
+            self.start_stage(
+                ", ".join(step_list[i].name for i in sorted(running.values()))
+            )
+
+            done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                try:
+                    updates[i] = get_updates(states_in[i], future.result())
+                except DeferredStepError as e:
+                    updates[i] = ({}, {})
+                    deferred_errors.append(str(e))
+                except StepException as e:
+                    fatal = fatal or FlowException(str(e))
+                except StepError as e:
+                    fatal = fatal or FlowError(str(e))
+                except Exception as e:
+                    fatal = fatal or e
+                self.end_stage(increment_ordinal=False)
+
+        if fatal is not None:
+            raise fatal
+
+        if len(deferred_errors) != 0:
+            err("The following deferred step errors have been encountered:")
+            for error in deferred_errors:
+                err(error)
+            raise FlowError("One or more deferred errors were encountered.")
+
+        final_state = apply_updates(
+            initial_state,
+            [updates[i] for i in range(len(step_list))],
+        )
+
+        self._save_final_views(final_state)
+        success("Flow complete.")
+        return (final_state, step_list)
@@ -0,0 +1,498 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import os
+import json
+import math
+import random
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+from .flow import Flow, FlowException, FlowError
+from .sequential import SequentialFlow
+from .classic import Classic
+from ..config import Config, Variable
+from ..config.pdk import all_variables as pdk_variables
+from ..config.resolve import Expr
+from ..state import State
+from ..steps import Step, StepError, DeferredStepError
+from ..logging import info, success, warn, err
+from ..common import GenericDict, GenericDictEncoder, StringEnum, get_tpe, slugify
+
+REPORT_FILE = "exploration.json"
+
+
+def evaluate_metric_expression(
+    expression: str,
+    metrics: Mapping[str, Any],
+) -> Optional[float]:
+    """
+    Evaluates an arithmetic expression over a set of metrics, using the same
+    syntax as ``expr::`` configuration values, i.e., metrics are referenced as
+    ``$metric_name``, or ``${metric_name}`` for names with characters other
+    than letters, digits and underscores, e.g. ``${timing__setup__ws__corner:nom_tt_025C_1v80}``.
+
+    :param expression: The expression.
+    :param metrics: The metrics, e.g. :attr:`openlane.state.State.metrics`.
+    :returns: The value of the expression, or ``None`` if it references
+        metrics that do not exist (yet) or it cannot be evaluated.
+    """
+    try:
+        return Expr.evaluate(expression, metrics)
+    except (SyntaxError, ArithmeticError):
+        return None
+
+
+def grid_size(space: Mapping[str, List[Any]]) -> int:
+    """
+    :returns: The number of points in the Cartesian product of a parameter space.
+    """
+    return math.prod(len(values) for values in space.values())
+
+
+def grid_point(space: Mapping[str, List[Any]], index: int) -> Dict[str, Any]:
+    """
+    :param space: A map from variable names to lists of candidate values.
+    :param index: An index in ``range(grid_size(space))``.
+    :returns: The point at ``index`` of the Cartesian product of the space,
+        where the last variable varies the fastest.
+    """
+    point: Dict[str, Any] = {}
+    for name, values in reversed(list(space.items())):
+        index, value_index = divmod(index, len(values))
+        point[name] = values[value_index]
+    return dict(reversed(list(point.items())))
+
+
+def sample_grid(
+    space: Mapping[str, List[Any]],
+    count: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    :param space: A map from variable names to lists of candidate values.
+    :param count: The number of distinct points to sample. If ``None`` or at
+        least the size of the grid, the whole grid is returned in order.
+    :param seed: A seed for the random number generator.
+    :returns: A list of points of the Cartesian product of the space.
+
+        Points are decoded from sampled indices, so the product is never
+        materialized and sampling is cheap even for very large spaces.
+    """
+    size = grid_size(space)
+    if count is None or count >= size:
+        indices: Iterable[int] = range(size)
+    else:
+        indices = random.Random(seed).sample(range(size), count)
+    return [grid_point(space, index) for index in indices]
+
+
+@dataclass
+class Candidate:
+    """
+    A configuration under exploration.
+
+    :param index: The index of the candidate.
+    :param overrides: The variables set by this candidate.
+    :param config: The full configuration of this candidate.
+    :param state: The output state of the last step run for this candidate.
+    :param next_step: The index of the next step to run.
+    :param objective: The value of the objective expression for :attr:`state`,
+        if it can be evaluated.
+    :param status: ``running``, ``complete``, ``pruned``, ``eliminated`` or
+        ``failed``.
+    :param reason: A human-readable reason for the candidate's status.
+    """
+
+    index: int
+    overrides: Dict[str, Any]
+    config: Config
+    state: State
+    next_step: int = 0
+    objective: Optional[float] = None
+    status: str = "running"
+    reason: Optional[str] = None
+    steps: List[Step] = field(default_factory=list)
+
+    @property
+    def alive(self) -> bool:
+        return self.status == "running"
+
+    def describe(self) -> str:
+        return ", ".join(f"{k}={v}" for k, v in self.overrides.items()) or "baseline"
+
+
+@Flow.factory.register()
+class Exploration(SequentialFlow):
+    """
+    A flow that explores a space of configurations in parallel, running
+    :attr:`.Steps` (by default those of the ``Classic`` flow, bounded by the
+    usual ``--from``/``--to``/``--skip`` options) for every candidate
+    configuration and returning the state of the best candidate.
+
+    The space is given by ``EXPLORATION_SPACE``, a map from any configuration
+    variable to a list of candidate values. Candidates are chosen using one of
+    three strategies:
+
+    * ``grid``: Every combination of values.
+    * ``random``: ``EXPLORATION_SAMPLES`` distinct combinations, drawn at random.
+    * ``successive_halving``: All combinations (or ``EXPLORATION_SAMPLES`` random
+      ones) are run up to the first step of ``EXPLORATION_RUNGS``, then only the
+      best ``1/EXPLORATION_REDUCTION_FACTOR`` of them are carried on to the
+      next rung, and so on, until the survivors run to completion.
+
+    Candidates are ranked by ``EXPLORATION_OBJECTIVE``, an expression over
+    the candidate's metrics, which is minimized unless ``EXPLORATION_MAXIMIZE``
+    is set. Candidates that fail are excluded from the ranking, as are those
+    with deferred errors (e.g. from checkers.)
+
+    Candidates still running are pruned as soon as one of the
+    ``EXPLORATION_PRUNING_METRICS`` expressions, which should only ever get
+    worse (i.e., higher) as the flow progresses, is higher than its value for
+    the best candidate to have completed so far.
+
+    Each candidate's steps are run in a separate subdirectory of the run
+    directory, and a summary of all candidates is written to
+    ``exploration.json``.
+    """
+
+    Steps: List[Type[Step]] = list(Classic.Steps)
+
+    config_vars = SequentialFlow.config_vars + [
+        Variable(
+            "EXPLORATION_SPACE",
+            Optional[Dict[str, List[str]]],
+            "A map from configuration variables to lists of values to explore. Values are validated against the type of their variable.",
+        ),
+        Variable(
+            "EXPLORATION_STRATEGY",
+            StringEnum(
+                "EXPLORATION_STRATEGY",
+                ["grid", "random", "successive_halving"],
+            ),
+            "The strategy used to pick candidate configurations from the space.",
+            default="grid",
+        ),
+        Variable(
+            "EXPLORATION_SAMPLES",
+            Optional[int],
+            "The number of candidates drawn at random from the space by the `random` strategy, and optionally the initial number of candidates for the `successive_halving` strategy.",
+        ),
+        Variable(
+            "EXPLORATION_SEED",
+            int,
+            "The seed for random sampling of the space.",
+            default=0,
+        ),
+        Variable(
+            "EXPLORATION_OBJECTIVE",
+            str,
+            "An expression ranking the candidates, in the same syntax as `expr::` values, where metrics are referenced as `$metric_name` or `${metric_name}`.",
+            default="$design__instance__area",
+        ),
+        Variable(
+            "EXPLORATION_MAXIMIZE",
+            bool,
+            "Whether the best candidate maximizes the objective rather than minimizes it.",
+            default=False,
+        ),
+        Variable(
+            "EXPLORATION_PRUNING_METRICS",
+            Optional[List[str]],
+            "Expressions over metrics that may only get worse (higher) as the flow progresses. A candidate is pruned as soon as any of them exceeds its value for the best candidate to have completed so far.",
+        ),
+        Variable(
+            "EXPLORATION_RUNGS",
+            Optional[List[str]],
+            "For the `successive_halving` strategy, the IDs of the steps after which candidates are ranked and the worse ones eliminated. If unset, candidates are ranked after a third and two thirds of the steps.",
+        ),
+        Variable(
+            "EXPLORATION_REDUCTION_FACTOR",
+            int,
+            "For the `successive_halving` strategy, the factor by which the number of candidates is divided at every rung.",
+            default=2,
+        ),
+        Variable(
+            "EXPLORATION_CONCURRENCY",
+            Optional[int],
+            "The maximum number of candidates run at the same time. If unset, half the number of jobs is used.",
+        ),
+    ]
+
+    def _get_concurrency(self) -> int:
+        if concurrency := self.config["EXPLORATION_CONCURRENCY"]:
+            return max(1, concurrency)
+        workers = getattr(get_tpe(), "_max_workers", None) or os.cpu_count() or 1
+        return max(1, workers // 2)
+
+    def _get_candidate_overrides(self) -> List[Dict[str, Any]]:
+        space: Dict[str, List[Any]] = self.config["EXPLORATION_SPACE"] or {}
+        variables = {
+            variable.name: variable
+            for variable in list(pdk_variables) + self.get_config_variables()
+        }
+
+        errors: List[str] = []
+        validated: Dict[str, List[Any]] = {}
+        for name, values in space.items():
+            variable = variables.get(name)
+            if variable is None:
+                errors.append(f"Unknown variable '{name}' in EXPLORATION_SPACE.")
+                continue
+            if len(values) == 0:
+                errors.append(f"No values to explore for '{name}'.")
+                continue
+            validated[name] = []
+            for value in values:
+                try:
+                    _, processed = variable.compile(
+                        GenericDict({name: value}),
+                        warning_list_ref=[],
+                        values_so_far=self.config,
+                    )
+                except ValueError as e:
+                    errors.append(str(e))
+                    continue
+                validated[name].append(processed)
+        if len(errors) != 0:
+            raise FlowException(
+                "Invalid EXPLORATION_SPACE:\n" + "\n".join(f"\t* {e}" for e in errors)
+            )
+
+        strategy = self.config["EXPLORATION_STRATEGY"].value
+        samples = self.config["EXPLORATION_SAMPLES"]
+        if strategy == "random" and samples is None:
+            raise FlowException(
+                "EXPLORATION_SAMPLES must be set for the 'random' exploration strategy."
+            )
+        if strategy == "grid":
+            samples = None
+        return sample_grid(validated, samples, self.config["EXPLORATION_SEED"])
+
+    def _get_rungs(self, Steps: List[Type[Step]]) -> List[int]:
+        # Exclusive step indices after which candidates are ranked
+        step_count = len(Steps)
+        if self.config["EXPLORATION_STRATEGY"].value != "successive_halving":
+            return [step_count]
+        rung_ids = self.config["EXPLORATION_RUNGS"]
+        if rung_ids is None:
+            rungs = [step_count // 3, 2 * step_count // 3]
+        else:
+            ids = [cls.id.lower() for cls in Steps]
+            rungs = []
+            for rung_id in rung_ids:
+                if rung_id.lower() not in ids:
+                    raise FlowException(
+                        f"Step '{rung_id}' in EXPLORATION_RUNGS is not run by the flow."
+                    )
+                rungs.append(ids.index(rung_id.lower()) + 1)
+        return sorted(set(rung for rung in rungs if 0 < rung < step_count)) + [
+            step_count
+        ]
+
+    def _is_better(self, lhs: Optional[float], rhs: Optional[float]) -> bool:
+        if lhs is None:
+            return False
+        if rhs is None:
+            return True
+        if self.config["EXPLORATION_MAXIMIZE"]:
+            return lhs > rhs
+        return lhs < rhs
+
+    def _rank(self, candidates: List[Candidate]) -> List[Candidate]:
+        sign = -1 if self.config["EXPLORATION_MAXIMIZE"] else 1
+        return sorted(
+            candidates,
+            key=lambda c: (c.objective is None, sign * (c.objective or 0), c.index),
+        )
+
+    def run(
+        self,
+        initial_state: State,
+        frm: Optional[str] = None,
+        to: Optional[str] = None,
+        skip: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Tuple[State, List[Step]]:
+        assert self.run_dir is not None
+        run_dir = self.run_dir
+        frm_resolved, to_resolved, skipped_ids = self._resolve_step_bounds(
+            frm,
+            to,
+            skip,
+        )
+
+        executing = frm is None
+        Steps: List[Type[Step]] = []
+        for cls in self.Steps:
+            if frm_resolved is not None and frm_resolved == cls.id:
+                executing = True
+            if executing and cls.id not in skipped_ids:
+                Steps.append(cls)
+            if to_resolved and to_resolved == cls.id:
+                executing = False
+
+        objective = self.config["EXPLORATION_OBJECTIVE"]
+        pruning_metrics: List[str] = self.config["EXPLORATION_PRUNING_METRICS"] or []
+        reduction_factor = max(2, self.config["EXPLORATION_REDUCTION_FACTOR"])
+        rungs = self._get_rungs(Steps)
+
+        candidates = [
+            Candidate(
+                index=i,
+                overrides=overrides,
+                config=self.config.copy(**overrides),
+                state=initial_state,
+            )
+            for i, overrides in enumerate(self._get_candidate_overrides())
+        ]
+        info(
+            f"Exploring {len(candidates)} candidate(s) with the '{self.config['EXPLORATION_STRATEGY'].value}' strategy…"
+        )
+
+        lock = threading.Lock()
+        best: Dict[str, Any] = {"candidate": None, "pruning_values": {}}
+        step_prefix_digits = len(str(len(Steps)))
+
+        def prune_if_worse(candidate: Candidate) -> bool:
+            with lock:
+                baseline: Dict[str, float] = best["pruning_values"]
+            for expression in pruning_metrics:
+                reference = baseline.get(expression)
+                current = evaluate_metric_expression(
+                    expression, candidate.state.metrics
+                )
+                if reference is None or current is None:
+                    continue
+                if current > reference:
+                    candidate.status = "pruned"
+                    candidate.reason = f"'{expression}' is already {current}, worse than {reference} for the best candidate"
+                    return True
+            return False
+
+        def advance(candidate: Candidate, until: int):
+            candidate_dir = os.path.join(run_dir, f"candidate-{candidate.index}")
+            deferred_errors: List[str] = []
+            while candidate.next_step < until:
+                cls = Steps[candidate.next_step]
+                step = cls(
+                    config=candidate.config,
+                    state_in=candidate.state,
+                    step_dir=os.path.join(
+                        candidate_dir,
+                        f"%0{step_prefix_digits}d-{slugify(cls.id)}"
+                        % (candidate.next_step + 1),
+                    ),
+                    flow=self,
+                )
+                candidate.steps.append(step)
+                try:
+                    candidate.state = self.start_step_async(step).result()
+                except DeferredStepError as e:
+                    deferred_errors.append(str(e))
+                except StepError as e:
+                    candidate.status = "failed"
+                    candidate.reason = str(e)
+                    return
+                candidate.next_step += 1
+                if prune_if_worse(candidate):
+                    return
+
+            candidate.objective = evaluate_metric_expression(
+                objective, candidate.state.metrics
+            )
+            if len(deferred_errors) != 0:
+                candidate.status = "failed"
+                candidate.reason = "; ".join(deferred_errors)
+            elif candidate.next_step == len(Steps):
+                candidate.status = "complete"
+                with lock:
+                    current_best = best["candidate"]
+                    if current_best is None or self._is_better(
+                        candidate.objective, current_best.objective
+                    ):
+                        best["candidate"] = candidate
+                        best["pruning_values"] = {
+                            expression: value
+                            for expression in pruning_metrics
+                            if (
+                                value := evaluate_metric_expression(
+                                    expression, candidate.state.metrics
+                                )
+                            )
+                            is not None
+                        }
+
+        self.set_max_stage_count(len(rungs))
+        with ThreadPoolExecutor(max_workers=self._get_concurrency()) as drivers:
+            for i, rung in enumerate(rungs):
+                self.start_stage(f"Exploration (Rung {i + 1}/{len(rungs)})")
+                alive = [candidate for candidate in candidates if candidate.alive]
+                for future in [
+                    drivers.submit(advance, candidate, rung) for candidate in alive
+                ]:
+                    future.result()
+                self.end_stage()
+
+                if rung == len(Steps):
+                    break
+
+                survivors = self._rank([c for c in alive if c.alive])
+                keep = max(1, math.ceil(len(survivors) / reduction_factor))
+                for candidate in survivors[keep:]:
+                    candidate.status = "eliminated"
+                    candidate.reason = f"ranked {survivors.index(candidate) + 1}/{len(survivors)} after {Steps[rung - 1].id}"
+                info(
+                    f"Keeping {min(keep, len(survivors))} of {len(survivors)} candidate(s) after {Steps[rung - 1].id}."
+                )
+
+        for candidate in candidates:
+            message = f"Candidate {candidate.index} ({candidate.describe()}): {candidate.status}"
+            if candidate.objective is not None:
+                message += f", objective = {candidate.objective}"
+            if candidate.reason is not None:
+                message += f" ({candidate.reason})"
+            if candidate.status == "failed":
+                warn(message)
+            else:
+                info(message)
+
+        report = [
+            {
+                "index": candidate.index,
+                "overrides": candidate.overrides,
+                "status": candidate.status,
+                "reason": candidate.reason,
+                "objective": candidate.objective,
+                "steps_run": candidate.next_step,
+                "metrics": candidate.state.metrics,
+            }
+            for candidate in candidates
+        ]
+        with open(os.path.join(run_dir, REPORT_FILE), "w") as f:
+            json.dump(report, f, cls=GenericDictEncoder, indent=4)
+
+        step_list = [step for candidate in candidates for step in candidate.steps]
+        winner: Optional[Candidate] = best["candidate"]
+        if winner is None:
+            err("No candidate has completed successfully.")
+            raise FlowError("Exploration failed: no candidate has completed.")
+
+        info(f"Best candidate: {winner.index} ({winner.describe()}).")
+        self._save_final_views(winner.state)
+        success("Flow complete.")
+        return (winner.state, step_list)
@@ -17,6 +17,7 @@ import os
 import glob
 import datetime
 import textwrap
+import importlib
 from abc import abstractmethod
 from concurrent.futures import Future
 from typing import (
@@ -28,6 +29,7 @@ from typing import (
     Optional,
     Dict,
     Callable,
+    Set,
     Union,
 )
 
@@ -46,10 +48,13 @@ from ..config import (
     universal_flow_config_variables,
 )
 from ..state import State
-from ..steps import Step
+from ..steps import Step, get_step_executor
+from ..plugins import load_plugins
+from ..registry import get_flow_module, list_flows
+from ..steps.cache import STEP_KEY_FILE
 from ..utils import Toolbox
 from ..logging import console, info, verbose, warn
-from ..common import get_tpe, mkdirp, internal, final, slugify
+from ..common import mkdirp, internal, final, slugify
 
 
 class FlowException(RuntimeError):
@@ -95,6 +100,10 @@ class Flow(Step._FlowType):
         as a class member- but subclasses may allow this value to be further
         overridden during construction (and only then.)
 
+    :ivar config_vars:
+        A list of configuration variables used by the Flow itself, in
+        addition to those of its :attr:`.Steps`.
+
     :ivar step_objects:
         A list of :class:`Step` **objects** from the last run of the flow,
         if it exists.
@@ -110,13 +119,24 @@ class Flow(Step._FlowType):
         The :class:`Toolbox` of the last run of the flow, if it exists.
 
         If :meth:`start` is called again, the reference is destroyed.
+
+    :ivar incremental:
+        Whether the last run of the flow has been started incrementally. See
+        :meth:`start`.
+
+    :ivar delta_states:
+        Whether steps in the last run of the flow save their states as deltas
+        against their input states. See :meth:`start`.
     """
 
     name: str
     Steps: List[Type[Step]] = []  # Override
+    config_vars: ClassVar[List[Variable]] = []
     step_objects: Optional[List[Step]] = None
     run_dir: Optional[str] = None
     toolbox: Optional[Toolbox] = None
+    incremental: bool = False
+    delta_states: bool = False
 
     # Private State Variables
     _ordinal: int
@@ -124,6 +144,8 @@ class Flow(Step._FlowType):
     _max_stage: int
     _task_id: Optional[TaskID]
     _progress: Optional[Progress]
+    _step_results: Dict[str, str]
+    _step_result_ids: Set[str]
 
     def _reset_private_state_variables(self):
         self._ordinal = 1
@@ -131,6 +153,8 @@ class Flow(Step._FlowType):
         self._max_stage = 0
         self._task_id = None
         self._progress = None
+        self._step_results = {}
+        self._step_result_ids = set()
 
     def __init__(
         self,
@@ -209,6 +233,8 @@ class Flow(Step._FlowType):
             variable.name: (variable, "Universal")
             for variable in universal_flow_config_variables
         }
+        for variable in self.config_vars:
+            flow_variables_by_name[variable.name] = (variable, type(self).__name__)
         for step_cls in self.Steps:
             for variable in step_cls.config_vars:
                 if flow_variables_by_name.get(variable.name) is not None:
@@ -240,6 +266,8 @@ class Flow(Step._FlowType):
         self,
         with_initial_state: Optional[State] = None,
         tag: Optional[str] = None,
+        incremental: bool = False,
+        delta_states: bool = False,
         **kwargs,
     ) -> Tuple[State, List[Step]]:
         """
@@ -247,10 +275,31 @@ class Flow(Step._FlowType):
 
         :param with_initial_state: An optional initial state object to use.
             If not provided:
-            * If resuming a previous run, the latest `state_out.json` (by filesystem modification date)
+            * If resuming a previous run non-incrementally, the latest `state_out.json` (by filesystem modification date)
             * If not, an empty state object is created.
         :param tag: A name for this invocation of the flow. If not provided,
             one based on a date string will be created.
+        :param incremental: If resuming a previous run, run the flow from the
+            beginning, but reuse the results of every step whose configuration
+            and inputs are unchanged since it last ran in this run directory
+            instead of running it again (see :meth:`find_step_result`).
+
+            This way, only the steps affected by a configuration change or an
+            edited input file, i.e., the earliest invalidated step and those
+            that depend on its results, are actually run.
+
+            Only the results of steps that have been run incrementally
+            themselves (or with a step cache, see
+            :func:`openlane.steps.set_step_cache`) can be reused, as the key
+            each step's results are stored with, which covers the contents of
+            all of its input files, is not computed otherwise.
+        :param delta_states: Save the ``state_in.json`` and ``state_out.json``
+            files of steps as deltas against the state files of the step they
+            have been derived from (see :meth:`State.save`), which is faster
+            and takes less space for long flows.
+
+            Delta files can only be loaded using :meth:`State.load`, and only
+            as long as the files they have been derived from are not removed.
 
         :returns: `(success, state_list)`
         """
@@ -261,6 +310,10 @@ class Flow(Step._FlowType):
         self.run_dir = os.path.join(self.design_dir, "runs", tag)
         # Stored until next start()
         self.toolbox = Toolbox(os.path.join(self.run_dir, "tmp"))
+        # Stored until next start()
+        self.incremental = incremental
+        # Stored until next start()
+        self.delta_states = delta_states
 
         initial_state = with_initial_state or State()
 
@@ -281,8 +334,10 @@ class Flow(Step._FlowType):
                     continue
                 self._ordinal = max(self._ordinal, current_ordinal + 1)
 
-            # Extract Maximum State
-            if with_initial_state is None:
+            if incremental:
+                self._index_step_results()
+            elif with_initial_state is None:
+                # Extract Maximum State
                 latest_time: float = 0
                 latest_json: Optional[str] = None
                 state_out_jsons = glob.glob(
@@ -297,9 +352,7 @@ class Flow(Step._FlowType):
                 verbose(f"Using state at '{latest_json}'.")
 
                 if latest_json is not None:
-                    initial_state = State.loads(
-                        open(latest_json, encoding="utf8").read()
-                    )
+                    initial_state = State.load(latest_json)
 
         except NotADirectoryError:
             raise FlowException(
@@ -361,7 +414,8 @@ class Flow(Step._FlowType):
         **kwargs,
     ) -> Future[State]:
         """
-        A helper function that may run a step asynchronously.
+        A helper function that may run a step asynchronously, using the
+        executor returned by :func:`openlane.steps.get_step_executor`.
 
         It returns a `Future` encapsulating a State object, which can then be
         used as an input to the next step or inspected to await it.
@@ -375,7 +429,7 @@ class Flow(Step._FlowType):
 
         kwargs["toolbox"] = self.toolbox
 
-        return get_tpe().submit(step.start, *args, **kwargs)
+        return get_step_executor().submit(step, *args, **kwargs)
 
     @internal
     def set_max_stage_count(self, count: int):
@@ -427,6 +481,40 @@ class Flow(Step._FlowType):
         max_stage_digits = len(str(self._max_stage))
         return f"%0{max_stage_digits}d-" % self._ordinal
 
+    def _index_step_results(self):
+        assert self.run_dir is not None
+        step_key_files = glob.glob(
+            os.path.join(self.run_dir, "**", STEP_KEY_FILE), recursive=True
+        )
+        step_key_files.sort(key=os.path.getmtime)
+        for step_key_file in step_key_files:
+            step_dir = os.path.dirname(step_key_file)
+            if not os.path.isfile(os.path.join(step_dir, "state_out.json")):
+                continue
+            with open(step_key_file, encoding="utf8") as f:
+                # Later results override earlier ones
+                self._step_results[f.read().strip()] = step_dir
+            self._step_result_ids.add(os.path.basename(step_dir).split("-", 1)[-1])
+        verbose(f"Found {len(self._step_results)} reusable step results.")
+
+    def find_step_result(self, step: Step, key: str) -> Optional[str]:
+        """
+        Looks up the results of a step in a previous invocation of the flow on
+        the same run directory, if the flow has been started incrementally.
+
+        :param step: The step object about to be run.
+        :param key: A key covering the step's configuration and inputs, as
+            returned by :func:`openlane.steps.cache.get_step_key`.
+        :returns: The directory of the latest run of a step with the same key,
+            or ``None`` if there is none.
+        """
+        step_dir = self._step_results.get(key)
+        if step_dir is None and slugify(step.id) in self._step_result_ids:
+            info(
+                f"The configuration or inputs of {step.id} have changed since it last ran: running it again."
+            )
+        return step_dir
+
     def dir_for_step(self, step: Step) -> str:
         """
         Returns a directory within the run directory for a specific step,
@@ -482,16 +570,28 @@ class Flow(Step._FlowType):
             """
             Retrieves a Flow type from the registry using a lookup string.
 
+            Modules defining built-in flows and plugins are imported on demand.
+
             :param name: The registered name of the Flow. Case-sensitive.
             """
+            if name not in Self._registry:
+                if module := get_flow_module(name):
+                    importlib.import_module(module)
+                else:
+                    load_plugins()
             return Self._registry.get(name)
 
         @classmethod
         def list(Self) -> List[str]:
             """
-            :returns: A list of strings representing all registered flows.
+            :returns: A list of strings representing all built-in flows and all
+                registered flows.
             """
-            return list(Self._registry.keys())
+            result = list_flows()
+            for name in Self._registry:
+                if name not in result:
+                    result.append(name)
+            return result
 
     factory = FlowFactory
     get = FlowFactory.get
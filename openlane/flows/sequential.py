@@ -17,7 +17,8 @@ import os
 from typing import List, Tuple, Optional, Type, Dict, Union
 
 from .flow import Flow, FlowException, FlowError
-from ..state import State
+from ..config import Variable
+from ..state import State, SnapshotMode
 from ..steps import (
     Step,
     StepError,
@@ -45,6 +46,15 @@ class SequentialFlow(Flow):
     :param kwargs: Keyword arguments for :class:`Flow`.
     """
 
+    config_vars = [
+        Variable(
+            "FINAL_VIEWS_SNAPSHOT_MODE",
+            SnapshotMode,
+            "How the final views are placed into the `final` directory of the run. `reflink` shares the data of files using copy-on-write clones on filesystems that support them, while `hardlink` and `symlink` link to the files in the directories of the steps that generated them. All modes fall back to copying a file if it cannot be linked, e.g. across devices.",
+            default="reflink",
+        ),
+    ]
+
     @classmethod
     def make(Self, step_ids: List[str]) -> Type[SequentialFlow]:
         Step_list = []
@@ -108,14 +118,19 @@ class SequentialFlow(Flow):
 
         self.Steps[i] = with_step
 
-    def run(
+    def _resolve_step_bounds(
         self,
-        initial_state: State,
         frm: Optional[str] = None,
         to: Optional[str] = None,
         skip: Optional[List[str]] = None,
-        **kwargs,
-    ) -> Tuple[State, List[Step]]:
+    ) -> Tuple[Optional[str], Optional[str], List[str]]:
+        """
+        Resolves case-insensitive step IDs passed as the ``frm``, ``to`` and
+        ``skip`` arguments to :meth:`run` to the IDs of steps in :attr:`.Steps`.
+
+        :returns: A tuple of the resolved start step ID, end step ID and skipped
+            step IDs respectively.
+        """
         step_ids = {cls.id.lower(): cls.id for cls in reversed(self.Steps)}
         skipped_ids = []
 
@@ -145,6 +160,36 @@ class SequentialFlow(Flow):
                     raise FlowException(
                         f"Failed to process skipped step '{skipped_step}': no step with ID '{skipped_step}' found in flow."
                     )
+
+        return (frm_resolved, to_resolved, skipped_ids)
+
+    def _save_final_views(self, final_state: State):
+        assert self.run_dir is not None
+        final_views_path = os.path.join(self.run_dir, "final")
+        info(f"Saving final views to '{final_views_path}'…")
+        try:
+            report = final_state.save_snapshot(
+                final_views_path,
+                mode=self.config.get("FINAL_VIEWS_SNAPSHOT_MODE")
+                or SnapshotMode.reflink,
+            )
+        except Exception as e:
+            raise FlowException(f"Failed to save final views: {e}")
+        info(f"Saved final views: {report}.")
+
+    def run(
+        self,
+        initial_state: State,
+        frm: Optional[str] = None,
+        to: Optional[str] = None,
+        skip: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Tuple[State, List[Step]]:
+        frm_resolved, to_resolved, skipped_ids = self._resolve_step_bounds(
+            frm,
+            to,
+            skip,
+        )
         step_count = len(self.Steps)
         self.set_max_stage_count(step_count)
 
@@ -187,12 +232,6 @@ class SequentialFlow(Flow):
                 err(error)
             raise FlowError("One or more deferred errors were encountered.")
 
-        assert self.run_dir is not None
-        final_views_path = os.path.join(self.run_dir, "final")
-        info(f"Saving final views to '{final_views_path}'…")
-        try:
-            current_state.save_snapshot(final_views_path)
-        except Exception as e:
-            raise FlowException(f"Failed to save final views: {e}")
+        self._save_final_views(current_state)
         success("Flow complete.")
         return (current_state, step_list)
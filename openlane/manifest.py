@@ -0,0 +1,74 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# This file is generated by `make manifest`. Do not edit it.
+steps = {
+    "Checker.DisconnectedPins": "openlane.steps.checker",
+    "Checker.IllegalOverlap": "openlane.steps.checker",
+    "Checker.LVS": "openlane.steps.checker",
+    "Checker.MagicDRC": "openlane.steps.checker",
+    "Checker.TrDRC": "openlane.steps.checker",
+    "Checker.WireLength": "openlane.steps.checker",
+    "Checker.XOR": "openlane.steps.checker",
+    "Checker.YosysChecks": "openlane.steps.checker",
+    "Checker.YosysUnmappedCells": "openlane.steps.checker",
+    "KLayout.OpenGUI": "openlane.steps.klayout",
+    "KLayout.StreamOut": "openlane.steps.klayout",
+    "KLayout.XOR": "openlane.steps.klayout",
+    "Magic.DRC": "openlane.steps.magic",
+    "Magic.SpiceExtraction": "openlane.steps.magic",
+    "Magic.StreamOut": "openlane.steps.magic",
+    "Magic.WriteLEF": "openlane.steps.magic",
+    "Misc.LoadBaseSDC": "openlane.steps.misc",
+    "Netgen.LVS": "openlane.steps.netgen",
+    "Odb.ApplyDEFTemplate": "openlane.steps.odb",
+    "Odb.CustomIOPlacement": "openlane.steps.odb",
+    "Odb.DiodesOnPorts": "openlane.steps.odb",
+    "Odb.HeuristicDiodeInsertion": "openlane.steps.odb",
+    "Odb.ManualMacroPlacement": "openlane.steps.odb",
+    "Odb.ReportDisconnectedPins": "openlane.steps.odb",
+    "Odb.ReportWireLength": "openlane.steps.odb",
+    "OpenROAD.BasicMacroPlacement": "openlane.steps.openroad",
+    "OpenROAD.CTS": "openlane.steps.openroad",
+    "OpenROAD.CheckAntennas": "openlane.steps.openroad",
+    "OpenROAD.DetailedPlacement": "openlane.steps.openroad",
+    "OpenROAD.DetailedRouting": "openlane.steps.openroad",
+    "OpenROAD.FillInsertion": "openlane.steps.openroad",
+    "OpenROAD.Floorplan": "openlane.steps.openroad",
+    "OpenROAD.GeneratePDN": "openlane.steps.openroad",
+    "OpenROAD.GlobalPlacement": "openlane.steps.openroad",
+    "OpenROAD.GlobalRouting": "openlane.steps.openroad",
+    "OpenROAD.IOPlacement": "openlane.steps.openroad",
+    "OpenROAD.IRDropReport": "openlane.steps.openroad",
+    "OpenROAD.LayoutSTA": "openlane.steps.openroad",
+    "OpenROAD.OpenGUI": "openlane.steps.openroad",
+    "OpenROAD.RCX": "openlane.steps.openroad",
+    "OpenROAD.RepairDesign": "openlane.steps.openroad",
+    "OpenROAD.ResizerTimingPostCTS": "openlane.steps.openroad",
+    "OpenROAD.ResizerTimingPostGRT": "openlane.steps.openroad",
+    "OpenROAD.STAMidPNR": "openlane.steps.openroad",
+    "OpenROAD.STAPostPNR": "openlane.steps.openroad",
+    "OpenROAD.STAPrePNR": "openlane.steps.openroad",
+    "OpenROAD.TapEndcapInsertion": "openlane.steps.openroad",
+    "Yosys.JsonHeader": "openlane.steps.yosys",
+    "Yosys.Synthesis": "openlane.steps.yosys",
+}
+
+flows = {
+    "Classic": "openlane.flows.classic",
+    "ClassicDAG": "openlane.flows.classic",
+    "Exploration": "openlane.flows.exploration",
+    "OpenInKLayout": "openlane.flows.misc",
+    "OpenInOpenROAD": "openlane.flows.misc",
+    "Optimizing": "openlane.flows.optimizing",
+}
@@ -11,11 +11,99 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+"""
+Discovery of OpenLane plugins, i.e., top-level packages named
+``openlane_plugin_*``, which are imported on demand: when a step or flow that
+is not built into OpenLane is looked up, or when :data:`discovered_plugins` is
+accessed.
+
+As finding plugins requires listing every directory in ``sys.path``, the names
+of the plugins found are cached, keyed by ``sys.path`` and the modification
+times of its directories, which change when packages are added or removed.
+"""
+import os
+import sys
+import json
 import pkgutil
 import importlib
+import threading
+from types import ModuleType
+from typing import Dict, Iterator, List, Mapping, Optional
+
+from .cache import Hasher, get_cache_dir
+
+PLUGIN_PREFIX = "openlane_plugin_"
+PLUGIN_CACHE_FILE = "plugins.json"
+
+_plugins: Optional[Dict[str, ModuleType]] = None
+_plugins_lock = threading.RLock()
+
+
+def _get_discovery_key() -> str:
+    hasher = Hasher().update("plugins/1")
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            mtime = -1
+        hasher.update(entry, str(mtime))
+    return hasher.hexdigest()
+
+
+def find_plugins() -> List[str]:
+    """
+    :returns: The names of the plugins that may be imported.
+    """
+    key = _get_discovery_key()
+    cache_path = os.path.join(get_cache_dir(), PLUGIN_CACHE_FILE)
+    try:
+        with open(cache_path, encoding="utf8") as f:
+            cached = json.load(f)
+        if cached["key"] == key:
+            return cached["plugins"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    names = sorted(
+        name for _, name, _ in pkgutil.iter_modules() if name.startswith(PLUGIN_PREFIX)
+    )
+
+    try:
+        os.makedirs(get_cache_dir(), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf8") as f:
+            json.dump({"key": key, "plugins": names}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+    return names
+
+
+def load_plugins() -> Dict[str, ModuleType]:
+    """
+    Imports all plugins, registering their steps and flows. Plugins are only
+    imported once.
+
+    :returns: The plugin modules by name.
+    """
+    global _plugins
+    with _plugins_lock:
+        if _plugins is None:
+            _plugins = {name: importlib.import_module(name) for name in find_plugins()}
+        return _plugins
+
+
+class _DiscoveredPlugins(Mapping[str, ModuleType]):
+    def __getitem__(self, name: str) -> ModuleType:
+        return load_plugins()[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(load_plugins())
+
+    def __len__(self) -> int:
+        return len(load_plugins())
+
 
-discovered_plugins = {
-    name: importlib.import_module(name)
-    for finder, name, ispkg in pkgutil.iter_modules()
-    if name.startswith("openlane_plugin_")
-}
+#: The plugin modules by name. Accessing this imports all plugins.
+discovered_plugins: Mapping[str, ModuleType] = _DiscoveredPlugins()
@@ -0,0 +1,112 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+The registry of steps and flows built into OpenLane.
+
+Built-in steps and flows are looked up in a manifest (``openlane/manifest.py``)
+mapping their IDs to the modules defining them, so :attr:`Step.factory` and
+:attr:`Flow.factory` only import these modules when a step or flow is
+actually looked up. Anything not in the manifest is looked up in plugins.
+
+The manifest is generated from the modules in :mod:`openlane.steps` and
+:mod:`openlane.flows`. It has to be regenerated when a built-in step or flow
+is added, removed or renamed, using ``make manifest``.
+"""
+import os
+import pkgutil
+import importlib
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from . import manifest
+
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "manifest.py")
+
+
+@lru_cache(maxsize=1)
+def _step_modules() -> Dict[str, str]:
+    return {step_id.lower(): module for step_id, module in manifest.steps.items()}
+
+
+def get_step_module(step_id: str) -> Optional[str]:
+    """
+    :param step_id: The ID of a step. Case-insensitive.
+    :returns: The module defining the built-in step, if any.
+    """
+    return _step_modules().get(step_id.lower())
+
+
+def get_flow_module(name: str) -> Optional[str]:
+    """
+    :param name: The registered name of a flow. Case-sensitive.
+    :returns: The module defining the built-in flow, if any.
+    """
+    return manifest.flows.get(name)
+
+
+def list_steps() -> List[str]:
+    """
+    :returns: The IDs of all built-in steps.
+    """
+    return list(manifest.steps)
+
+
+def list_flows() -> List[str]:
+    """
+    :returns: The registered names of all built-in flows.
+    """
+    return list(manifest.flows)
+
+
+def generate_manifest() -> str:
+    """
+    Imports every module in :mod:`openlane.steps` and :mod:`openlane.flows`
+    and generates the manifest from the steps and flows registered by them.
+
+    :returns: The source code of the manifest.
+    """
+    from .steps import Step
+    from .flows import Flow
+    from . import steps, flows
+
+    for package in [steps, flows]:
+        for module_info in pkgutil.iter_modules(package.__path__):
+            importlib.import_module(f"{package.__name__}.{module_info.name}")
+
+    step_modules = {
+        cls.id: cls.__module__
+        for cls in Step.factory._registry.values()
+        if cls.__module__.startswith(f"{__package__}.")
+    }
+    flow_modules = {
+        name: cls.__module__
+        for name, cls in Flow.factory._registry.items()
+        if cls.__module__.startswith(f"{__package__}.")
+    }
+
+    header = open(__file__, encoding="utf8").read().split('"""', maxsplit=1)[0]
+    lines = [
+        header.rstrip(),
+        "# This file is generated by `make manifest`. Do not edit it.",
+        "steps = {",
+    ]
+    for step_id in sorted(step_modules):
+        lines.append(f'    "{step_id}": "{step_modules[step_id]}",')
+    lines.append("}")
+    lines.append("")
+    lines.append("flows = {")
+    for name in sorted(flow_modules):
+        lines.append(f'    "{name}": "{flow_modules[name]}",')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
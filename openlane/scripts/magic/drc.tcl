@@ -18,7 +18,12 @@ if { $::env(MAGIC_DRC_USE_GDS) } {
 	source $::env(SCRIPTS_DIR)/magic/def/read.tcl
 }
 
+set tiled [info exists ::env(MAGIC_DRC_TILE)]
+
 set report_dir $::env(STEP_DIR)/reports
+if { $tiled } {
+	set report_dir $::env(MAGIC_DRC_TILE_DIR)
+}
 file mkdir $report_dir
 set drc_prefix $report_dir/drc
 
@@ -33,7 +38,35 @@ load $cell_name
 select top cell
 drc euclidean on
 drc style drc(full)
-drc check
+if { $tiled } {
+	# Check the tile and a halo around it, so rules across the edges of the
+	# tile see all the shapes they involve, but only list errors in the tile
+	lassign $::env(MAGIC_DRC_TILE) column row columns rows
+	lassign [box values] llx lly urx ury
+	set tile_llx [expr {$llx + ($urx - $llx) * $column / $columns}]
+	set tile_lly [expr {$lly + ($ury - $lly) * $row / $rows}]
+	set tile_urx [expr {$llx + ($urx - $llx) * ($column + 1) / $columns}]
+	set tile_ury [expr {$lly + ($ury - $lly) * ($row + 1) / $rows}]
+
+	if { [info exists ::env(MAGIC_DRC_TILE_HALO)] && $::env(MAGIC_DRC_TILE_HALO) != "" } {
+		set halo [expr {int(ceil($::env(MAGIC_DRC_TILE_HALO) / $oscale))}]
+	} elseif { [catch {drc halo} halo] } {
+		puts stderr "\[ERROR\] Magic could not report the DRC halo distance: set MAGIC_DRC_TILE_HALO."
+		exit 1
+	}
+	puts stdout "\[INFO\] Checking tile ($column, $row) of ${columns}x${rows} with a halo of [expr {$halo * $oscale}]um\n"
+	flush stdout
+
+	box values [expr {$tile_llx - $halo}] [expr {$tile_lly - $halo}] [expr {$tile_urx + $halo}] [expr {$tile_ury + $halo}]
+	drc check
+	box values $tile_llx $tile_lly $tile_urx $tile_ury
+
+	set fwin [open $report_dir/window.rpt w]
+	puts $fwin [format "%.3f %.3f %.3f %.3f" [expr {$oscale * $tile_llx}] [expr {$oscale * $tile_lly}] [expr {$oscale * $tile_urx}] [expr {$oscale * $tile_ury}]]
+	close $fwin
+} else {
+	drc check
+}
 set drcresult [drc listall why]
 
 
@@ -66,6 +99,11 @@ puts stdout "\[INFO\] Should be divided by 3 or 4"
 puts stdout "\[INFO\] DRC Checking DONE ($drc_rpt_path)"
 flush stdout
 
+if { $tiled } {
+	# The errors of the tiles are merged by OpenLane
+	exit 0
+}
+
 set views_dir $::env(STEP_DIR)/views
 file mkdir $views_dir
 
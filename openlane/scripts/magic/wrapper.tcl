@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+if { [info exists ::env(CONFIG_TCL)] } {
+    source $::env(CONFIG_TCL)
+}
+
 if {[catch {source $::env(MAGIC_SCRIPT)} err]} {
     puts "Error: $err"
     exit 1
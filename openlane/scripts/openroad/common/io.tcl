@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+if { [info exists ::env(CONFIG_TCL)] } {
+    source $::env(CONFIG_TCL)
+}
+
 source $::env(SCRIPTS_DIR)/openroad/common/set_global_connections.tcl
 
 proc string_in_file {file_path substring} {
@@ -202,19 +206,46 @@ proc read_lefs {{tlef_key "TECH_LEF"}} {
     }
 }
 
+proc design_in_session {} {
+    # Whether this script runs in a persistent session (see session.tcl) that
+    # already has the current database in memory, in which case the libraries
+    # in memory are also those this step would read (see
+    # OpenROADStep.run_script).
+    return [expr {
+        [info exists ::openlane_session::odb]
+        && [info exists ::env(CURRENT_ODB)]
+        && $::openlane_session::odb == $::env(CURRENT_ODB)
+    }]
+}
+
+proc reset_constraints {} {
+    # Timing constraints are not part of the database, so those of the
+    # previous script in a session would otherwise still apply.
+    if { [info commands ::sta::remove_constraints] != {} } {
+        sta::remove_constraints
+    } else {
+        puts "\[WARN] Could not remove the timing constraints of the previous step."
+    }
+}
+
 proc read_current_odb {args} {
     sta::parse_key_args "read_current_odb" args \
         keys {}\
         flags {}
 
-    puts "Reading OpenROAD database at '$::env(CURRENT_ODB)'…"
-    if { [ catch {read_db $::env(CURRENT_ODB)} errmsg ]} {
-        puts stderr $errmsg
-        exit 1
-    }
+    if { [design_in_session] } {
+        puts "Using the OpenROAD database at '$::env(CURRENT_ODB)' and the libraries already in memory…"
+        reset_constraints
+    } else {
+        puts "Reading OpenROAD database at '$::env(CURRENT_ODB)'…"
+        if { [ catch {read_db $::env(CURRENT_ODB)} errmsg ]} {
+            puts stderr $errmsg
+            exit 1
+        }
 
-    # Read supporting views (if applicable)
-    read_pnr_libs
+        # Read supporting views (if applicable)
+        read_pnr_libs
+    }
     read_current_sdc
 }
 
@@ -312,7 +343,7 @@ proc max {a b} {
 
 set ::metric_count 0
 set ::metrics_file ""
-if { [info exists ::env(OPENSTA)] && $::env(OPENSTA) } {
+if { ([info exists ::env(OPENSTA)] && $::env(OPENSTA)) || [namespace exists ::openlane_session] } {
     proc write_metric_num {metric value} {
         if { $value == 1e30 } {
             write_metric_str $metric Infinity
@@ -12,6 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 proc load_rsz_corners {args} {
+    if { [design_in_session] } {
+        puts "Using the timing libraries already in memory…"
+        return
+    }
+
     set i "0"
     set tc_key "RSZ_CORNER_$i"
     while { [info exists ::env($tc_key)] } {
@@ -0,0 +1,91 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Runs scripts sent over stdin one after the other in the same OpenROAD
+# process, keeping the design and libraries that are already loaded in memory.
+# See openlane/steps/session.py.
+#
+# Each request is one complete Tcl command, usually a call to
+# ::openlane_session::run. Once it finishes, the line
+# "%OL_SESSION_DONE <exit code>" is printed.
+
+namespace eval ::openlane_session {
+    # The path of the database currently in memory, if any. Set per request,
+    # used by read_current_odb.
+    variable odb ""
+    variable globals [info globals]
+}
+
+# Scripts calling exit end the request, not the process
+rename exit ::openlane_session::exit_process
+proc exit {{code 0}} {
+    return -code error -errorcode [list OPENLANE_EXIT $code] "exit $code"
+}
+
+proc ::openlane_session::run {script metrics_path odb_in_memory env_in} {
+    variable odb
+    variable globals
+
+    set odb $odb_in_memory
+
+    foreach key [array names ::env] {
+        if { ![dict exists $env_in $key] } {
+            unset ::env($key)
+        }
+    }
+    array set ::env $env_in
+
+    catch {utl::open_metrics $metrics_path}
+    set code [catch {uplevel #0 [list source $script]} result options]
+    catch {utl::close_metrics $metrics_path}
+
+    # Variables set by one script are not visible to the next
+    foreach name [info globals] {
+        if { [lsearch -exact $globals $name] == -1 } {
+            unset -nocomplain ::$name
+        }
+    }
+
+    if { $code == 1 } {
+        set error_code [dict get $options -errorcode]
+        if { [lindex $error_code 0] == "OPENLANE_EXIT" } {
+            return [expr {[lindex $error_code 1] & 0xFF}]
+        }
+        puts stderr [dict get $options -errorinfo]
+        return 1
+    }
+    return 0
+}
+
+proc ::openlane_session::serve {} {
+    fconfigure stdout -buffering line
+    set request ""
+    while { [gets stdin line] >= 0 } {
+        append request $line "\n"
+        if { ![info complete $request] } {
+            continue
+        }
+        if { [catch {uplevel #0 $request} exit_code] } {
+            puts stderr $exit_code
+            set exit_code 1
+        }
+        set request ""
+        flush stderr
+        puts "%OL_SESSION_DONE $exit_code"
+        flush stdout
+    }
+}
+
+::openlane_session::serve
+::openlane_session::exit_process 0
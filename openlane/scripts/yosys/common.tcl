@@ -11,6 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+if { [info exists ::env(CONFIG_TCL)] } {
+    source $::env(CONFIG_TCL)
+}
+
 proc read_deps {{power_defines "off"}} {
     if { [info exists ::env(SYNTH_DEFINES) ] } {
         foreach define $::env(SYNTH_DEFINES) {
@@ -21,3 +21,4 @@ addition to the cumulative set of metrics created by a given step.
 """
 from .state import Path, State, InvalidState, StateElement
 from .design_format import DesignFormat, DesignFormatObject
+from .snapshot import SnapshotMode, SnapshotReport
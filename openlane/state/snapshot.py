@@ -0,0 +1,220 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import os
+import time
+import errno
+import shutil
+from enum import Enum
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Errors signifying that a link could not be created between two paths,
+# e.g. because they are on different devices or the filesystem does not
+# support it, as opposed to errors with the paths themselves.
+LINK_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EMLINK,
+    errno.ENOSYS,
+}
+
+
+class SnapshotMode(Enum):
+    """
+    How files are placed into a snapshot of a state.
+
+    Every mode but ``copy`` falls back to copying files if the link cannot be
+    created, e.g. if the snapshot is on a different device than the file or the
+    filesystem does not support it.
+    """
+
+    #: Copy files.
+    copy = "copy"
+    #: Share the data of files using copy-on-write clones (``FICLONE``), which
+    #: are independent of the original file. Supported by btrfs, XFS and others.
+    reflink = "reflink"
+    #: Create hard links to files. Modifying a file in the snapshot in-place
+    #: also modifies the original.
+    hardlink = "hardlink"
+    #: Create symbolic links to files, which break if the original file is
+    #: removed.
+    symlink = "symlink"
+
+
+@dataclass
+class SnapshotReport:
+    """
+    Statistics about a saved snapshot.
+
+    :param files: The number of files in the snapshot by the mode they were
+        actually placed into it with.
+    :param bytes_total: The total size of the files in the snapshot.
+    :param bytes_copied: The size of the files that have been copied.
+    :param copy_time: The total time spent copying files (across all threads),
+        in seconds.
+    :param elapsed: The wall time it took to save the snapshot, in seconds.
+    """
+
+    files: Dict[SnapshotMode, int] = field(default_factory=dict)
+    bytes_total: int = 0
+    bytes_copied: int = 0
+    copy_time: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def bytes_saved(self) -> int:
+        """
+        The size of the files in the snapshot that have not been copied.
+        """
+        return self.bytes_total - self.bytes_copied
+
+    @property
+    def time_saved(self) -> Optional[float]:
+        """
+        An estimate of the time that would have been spent copying the files
+        that have been linked instead, based on the throughput of the files
+        that have been copied, in seconds.
+
+        ``None`` if nothing was copied, i.e., there's no estimate of the
+        throughput.
+        """
+        if self.bytes_copied == 0 or self.copy_time == 0:
+            return None
+        return self.bytes_saved * self.copy_time / self.bytes_copied
+
+    def add(self, mode: SnapshotMode, size: int, copy_time: float = 0.0):
+        self.files[mode] = self.files.get(mode, 0) + 1
+        self.bytes_total += size
+        if mode == SnapshotMode.copy:
+            self.bytes_copied += size
+            self.copy_time += copy_time
+
+    def __str__(self) -> str:
+        files = ", ".join(
+            f"{count} {mode.value}"
+            for mode, count in sorted(self.files.items(), key=lambda e: e[0].value)
+        )
+        result = f"{sum(self.files.values())} files ({files or 'none'}) in {self.elapsed:.2f}s, {_format_size(self.bytes_saved)} not copied"
+        if time_saved := self.time_saved:
+            result += f" (~{time_saved:.2f}s saved)"
+        return result
+
+
+def _format_size(size: int) -> str:
+    value = float(size)
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def _reflink(src: str, dst: str):
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflinks are not supported on this platform")
+    with open(src, "rb") as f_src:
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            fcntl.ioctl(fd, FICLONE, f_src.fileno())
+        except OSError:
+            os.close(fd)
+            os.unlink(dst)
+            raise
+        os.close(fd)
+    shutil.copymode(src, dst)
+
+
+def place_file(
+    src: Union[str, os.PathLike],
+    dst: Union[str, os.PathLike],
+    mode: SnapshotMode,
+) -> SnapshotMode:
+    """
+    Places a file at a path using the given mode, falling back to copying it
+    if the link cannot be created. Any existing file at ``dst`` is replaced.
+
+    :param src: The file. Symbolic links are resolved.
+    :param dst: The target path.
+    :param mode: The preferred snapshot mode.
+    :returns: The mode that has actually been used.
+    """
+    src = os.path.realpath(src)
+    dst = str(dst)
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    try:
+        if mode == SnapshotMode.reflink:
+            _reflink(src, dst)
+            return mode
+        elif mode == SnapshotMode.hardlink:
+            os.link(src, dst)
+            return mode
+        elif mode == SnapshotMode.symlink:
+            os.symlink(src, dst)
+            return mode
+    except OSError as e:
+        if e.errno not in LINK_ERRNOS:
+            raise
+    shutil.copyfile(src, dst, follow_symlinks=True)
+    return SnapshotMode.copy
+
+
+def place_files(
+    files: List[Tuple[str, str]],
+    mode: SnapshotMode,
+    threads: Optional[int] = None,
+) -> SnapshotReport:
+    """
+    Places a number of files in parallel using :func:`place_file`.
+
+    :param files: A list of ``(src, dst)`` tuples. The parent directories of
+        ``dst`` must exist.
+    :param mode: The preferred snapshot mode.
+    :param threads: The number of files to place simultaneously. Defaults to
+        the number of CPUs.
+    :returns: Statistics about the placed files.
+    """
+    start = time.perf_counter()
+
+    def place(paths: Tuple[str, str]) -> Tuple[SnapshotMode, int, float]:
+        src, dst = paths
+        file_start = time.perf_counter()
+        used = place_file(src, dst, mode)
+        return (used, os.path.getsize(src), time.perf_counter() - file_start)
+
+    # If multiple files are placed at the same path, the last one wins
+    by_dst = {dst: src for src, dst in files}
+
+    report = SnapshotReport()
+    with ThreadPoolExecutor(max_workers=threads or os.cpu_count()) as tpe:
+        for used, size, duration in tpe.map(
+            place, [(src, dst) for dst, src in by_dst.items()]
+        ):
+            report.add(used, size, duration)
+    report.elapsed = time.perf_counter() - start
+    return report
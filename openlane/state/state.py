@@ -15,14 +15,15 @@ from __future__ import annotations
 
 import os
 import json
-import shutil
+import threading
 from decimal import Decimal
-from collections import UserString
-from typing import List, Mapping, Union, Optional, Dict, Any
+from collections import OrderedDict, UserString
+from typing import Callable, List, Mapping, Tuple, Union, Optional, Dict, Any
 
 from .design_format import DesignFormat, DesignFormatObject
+from .snapshot import SnapshotMode, SnapshotReport, place_files
 
-from ..common import GenericImmutableDict, mkdirp, copy_recursive
+from ..common import GenericImmutableDict, mkdirp
 
 
 class Path(UserString, os.PathLike):
@@ -57,12 +58,23 @@ class State(GenericImmutableDict[str, StateElement]):
     The state is the only thing that can be altered by steps other than the
     filesystem.
 
+    States are copy-on-write: copies and states derived from other states
+    share their structure with the original and only store what differs from
+    it, so none of the values of a state (including nested dictionaries) may be
+    mutated in place.
+
     :attr metrics: A dictionary that carries statistics about the design: area,
         wire length, et cetera, but also miscellaneous data, for example, whether
         it passed a certain check or not.
+    :attr json_path: The file this state has last been saved to or loaded from,
+        if any. See :meth:`save`.
     """
 
     metrics: GenericImmutableDict[str, Any]
+    json_path: Optional[str]
+
+    #: The key under which delta state files store the path to their parent.
+    parent_key = "__parent__"
 
     def __init__(
         self,
@@ -74,15 +86,22 @@ class State(GenericImmutableDict[str, StateElement]):
         metrics: Optional[Mapping[str, Any]] = None,
         **kwargs,
     ) -> None:
-        copying_resolved: Dict[str, StateElement] = {}
-        if c_mapping := copying:
-            for key, value in c_mapping.items():
-                copying_resolved[key] = value
-
-        for format in DesignFormat:
-            assert isinstance(format.value, DesignFormatObject)  # type checker shut up
-            if format.value.id not in copying_resolved:
-                copying_resolved[format.value.id] = None
+        copying_resolved: Mapping[str, StateElement]
+        if isinstance(copying, State):
+            # Already has all design formats: share its structure
+            copying_resolved = copying
+        else:
+            copying_resolved = {}
+            if c_mapping := copying:
+                for key, value in c_mapping.items():
+                    copying_resolved[key] = value
+
+            for format in DesignFormat:
+                assert isinstance(
+                    format.value, DesignFormatObject
+                )  # type checker shut up
+                if format.value.id not in copying_resolved:
+                    copying_resolved[format.value.id] = None
 
         overrides_resolved = {}
         if o_mapping := overrides:
@@ -101,7 +120,8 @@ class State(GenericImmutableDict[str, StateElement]):
             **kwargs,
         )
 
-        self.metrics = GenericImmutableDict(metrics or {})
+        self.metrics = GenericImmutableDict(metrics if metrics is not None else {})
+        self.json_path = None
 
     def __getitem__(self, key: Union[DesignFormat, str]) -> StateElement:
         if isinstance(key, DesignFormat):
@@ -122,21 +142,65 @@ class State(GenericImmutableDict[str, StateElement]):
         return super().__delitem__(key)
 
     def to_raw_dict(self, metrics: bool = True) -> Dict[str, Any]:
-        final: Dict[Any, Any] = self._data.copy()
+        final: Dict[Any, Any] = super().to_raw_dict()
         if metrics:
             final["metrics"] = self.metrics
         return final
 
     def copy(self: "State") -> "State":
-        new = State()
-        new._data = copy_recursive(self._data)
-        new.metrics = GenericImmutableDict(copy_recursive(self.metrics))
-        return new
+        """
+        :returns: A copy of the state, which shares its structure with the
+            original.
+        """
+        return State(self, metrics=self.metrics)
+
+    def save(self, path: Union[str, os.PathLike], parent: Optional["State"] = None):
+        """
+        Saves the state to a JSON file.
+
+        By default, the file is self-contained. If ``parent`` is given and has
+        been saved to or loaded from a file itself, only the views and metrics
+        that differ from it are saved instead, alongside a reference to the
+        parent's file (relative to the directory of ``path``). Such a "delta"
+        file can only be loaded using :meth:`load` (or :meth:`loads` with
+        ``base_dir``), and becomes invalid if its parent's file is modified or
+        removed.
+
+        :param path: The path of the file.
+        :param parent: The state this state has been derived from, if a delta
+            file is to be saved.
+        """
+        path = os.path.abspath(path)
+        raw: Dict[str, Any]
+        parent_path = parent.json_path if parent is not None else None
+        if (
+            parent is not None
+            and parent_path is not None
+            and parent_path != path
+            and all(key in self for key in parent)
+            and all(key in self.metrics for key in parent.metrics)
+        ):
+            raw = {self.parent_key: os.path.relpath(parent_path, os.path.dirname(path))}
+            for key, value in self.items():
+                if parent.get(key) != value:
+                    raw[key] = value
+            raw["metrics"] = {
+                key: value
+                for key, value in self.metrics.items()
+                if parent.metrics.get(key) != value
+            }
+        else:
+            raw = self.to_raw_dict()
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(raw, f, cls=self.get_encoder(), indent=4)
+        if self.json_path is None:
+            self.json_path = path
 
     def _save_snapshot_recursive(
         self,
         path: Union[str, os.PathLike],
         views: Union[Dict, "State"],
+        files: List[Tuple[str, str]],
         key_path: str = "",
     ):
         mkdirp(path)
@@ -155,6 +219,7 @@ class State(GenericImmutableDict[str, StateElement]):
                 self._save_snapshot_recursive(
                     subdirectory,
                     value,
+                    files,
                     key_path=current_key_path,
                 )
             else:
@@ -164,22 +229,35 @@ class State(GenericImmutableDict[str, StateElement]):
                 )
                 mkdirp(target_dir)
                 target_path = os.path.join(target_dir, os.path.basename(value))
-                shutil.copyfile(value, target_path, follow_symlinks=True)
+                files.append((str(value), target_path))
 
-    def save_snapshot(self, path: Union[str, os.PathLike]):
+    def save_snapshot(
+        self,
+        path: Union[str, os.PathLike],
+        mode: SnapshotMode = SnapshotMode.copy,
+        threads: Optional[int] = None,
+    ) -> SnapshotReport:
         """
         Validates the current state then saves all views to a folder by
         design format, including the metrics.
 
         :param path: The folder that would contain other folders.
+        :param mode: How to place the views into the folder. See
+            :class:`SnapshotMode`.
+        :param threads: The number of views to place simultaneously. Defaults
+            to the number of CPUs.
+        :returns: Statistics about the placed views.
         """
         self.validate()
-        self._save_snapshot_recursive(path, self)
+        files: List[Tuple[str, str]] = []
+        self._save_snapshot_recursive(path, self, files)
+        report = place_files(files, mode, threads)
         metrics_path = os.path.join(path, "metrics.csv")
         with open(metrics_path, "w") as f:
             f.write("Metric,Value\n")
             for metric in self.metrics:
                 f.write(f"{metric}, {self.metrics[metric]}\n")
+        return report
 
     def _validate_recursive(
         self,
@@ -243,7 +321,22 @@ class State(GenericImmutableDict[str, StateElement]):
         return target
 
     @classmethod
-    def loads(Self, json_in: str, validate_path: bool = True) -> "State":
+    def loads(
+        Self,
+        json_in: str,
+        validate_path: bool = True,
+        base_dir: Optional[str] = None,
+    ) -> "State":
+        """
+        Loads a state from a JSON string.
+
+        :param json_in: The JSON string.
+        :param validate_path: Whether to ensure that all paths in the state
+            exist.
+        :param base_dir: If the JSON string is a delta (see :meth:`save`), the
+            directory its parent's path is relative to, i.e., the directory of
+            the file it has been read from. Required to load deltas.
+        """
         raw = json.loads(json_in, parse_float=Decimal)
         if not isinstance(raw, dict):
             raise InvalidState("Failed to load state: JSON result is a dictionary")
@@ -252,9 +345,72 @@ class State(GenericImmutableDict[str, StateElement]):
         if metrics is not None:
             del raw["metrics"]
 
+        parent_path = raw.pop(Self.parent_key, None)
         views = Self._loads_recursive(raw, validate_path)
-        state = Self(views, metrics=metrics)
+        if parent_path is None:
+            return Self(views, metrics=metrics)
+
+        if base_dir is None:
+            raise InvalidState(
+                "Failed to load state: the state is a delta against another state file, and no base directory has been provided"
+            )
+
+        # The parent is only loaded once a view or metric that is not in the
+        # delta is accessed.
+        parent_path = os.path.join(base_dir, parent_path)
+        state = Self.deferred(_parent_loader(parent_path, lambda p: p), views)
+        state.metrics = GenericImmutableDict.deferred(
+            _parent_loader(parent_path, lambda p: p.metrics),
+            metrics or {},
+        )
+        state.json_path = None
+        if validate_path:
+            state.validate()
+        return state
+
+    @classmethod
+    def load(
+        Self,
+        path: Union[str, os.PathLike],
+        validate_path: bool = True,
+    ) -> "State":
+        """
+        Loads a state from a JSON file written by :meth:`save`.
+
+        The parents of delta files are loaded lazily, i.e., once a view or
+        metric that is not in the delta itself is accessed (or immediately, if
+        ``validate_path`` is set). Parent paths are relative to the directory
+        of the file.
 
+        Files are only read and parsed once as long as they are not modified:
+        states loaded from the same file, or from delta files sharing a parent,
+        share their structure.
+
+        :param path: The path of the file.
+        :param validate_path: Whether to ensure that all paths in the state
+            exist.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with _loaded_lock:
+            state = _loaded.get(key)
+            if state is not None:
+                _loaded.move_to_end(key)
+        if state is None:
+            with open(path, encoding="utf8") as f:
+                state = Self.loads(
+                    f.read(),
+                    validate_path=False,
+                    base_dir=os.path.dirname(path),
+                )
+            state.json_path = path
+            with _loaded_lock:
+                _loaded[key] = state
+                while len(_loaded) > _loaded_max:
+                    _loaded.popitem(last=False)
+        if validate_path:
+            state.validate()
         return state
 
     def _repr_html_(self) -> str:
@@ -288,3 +444,28 @@ class State(GenericImmutableDict[str, StateElement]):
         """
 
         return result
+
+
+_loaded: "OrderedDict[Tuple[str, int, int], State]" = OrderedDict()
+_loaded_max = 128
+_loaded_lock = threading.Lock()
+_loading = threading.local()  # Parents being loaded by the current thread
+
+
+def _parent_loader(
+    path: str,
+    get: Callable[[State], GenericImmutableDict],
+) -> Callable[[], GenericImmutableDict]:
+    def load() -> GenericImmutableDict:
+        loading: set = _loading.__dict__.setdefault("paths", set())
+        if path in loading:
+            raise InvalidState(f"Cyclic parent reference to state file '{path}'.")
+        loading.add(path)
+        try:
+            # Flattened here so grandparents are loaded while this one is
+            # marked as loading
+            return get(State.load(path, validate_path=False))._flattened()
+        finally:
+            loading.discard(path)
+
+    return load
@@ -18,6 +18,9 @@ The Step Module
 This modules includes various functions for importing and/or generating OpenLane
 configuration objects. Configuration objects are the primary input to a flow.
 """
+import importlib
+from typing import TYPE_CHECKING
+
 from .step import (
     Step,
     DeferredStepError,
@@ -25,26 +28,50 @@ from .step import (
     StepException,
 )
 from .tclstep import TclStep
-from . import checker as Checker
+from .cache import StepCache, get_step_cache, set_step_cache
+from .executor import StepExecutor, get_step_executor, set_step_executor
 
+# Modules defining steps are imported on demand, see __getattr__.
+#
 # You'll notice some TclStep subclasses are exposed separately-
 # this is for documentation.
-from . import yosys as Yosys
-from .yosys import YosysStep
-
-from . import openroad as OpenROAD
-from .openroad import OpenROADStep
-
-from . import magic as Magic
-from .magic import MagicStep
+_lazy_attributes = {
+    "Checker": ("checker", None),
+    "Yosys": ("yosys", None),
+    "YosysStep": ("yosys", "YosysStep"),
+    "OpenROAD": ("openroad", None),
+    "OpenROADStep": ("openroad", "OpenROADStep"),
+    "Magic": ("magic", None),
+    "MagicStep": ("magic", "MagicStep"),
+    "Odb": ("odb", None),
+    "Netgen": ("netgen", None),
+    "KLayout": ("klayout", None),
+    "Misc": ("misc", None),
+}
 
-from . import odb as Odb
+if TYPE_CHECKING:
+    from . import checker as Checker
+    from . import yosys as Yosys
+    from .yosys import YosysStep
+    from . import openroad as OpenROAD
+    from .openroad import OpenROADStep
+    from . import magic as Magic
+    from .magic import MagicStep
+    from . import odb as Odb
+    from . import netgen as Netgen
+    from . import klayout as KLayout
+    from . import misc as Misc
 
-# from .odb import OdbpyStep
 
-from . import netgen as Netgen
+def __getattr__(name: str):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    module_name, attribute = _lazy_attributes[name]
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
 
-# from .netgen import NetgenStep
 
-from . import klayout as KLayout
-from . import misc as Misc
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_attributes))
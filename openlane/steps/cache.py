@@ -0,0 +1,362 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import os
+import json
+import shutil
+import inspect
+from enum import Enum
+from decimal import Decimal
+from dataclasses import asdict, is_dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..cache import DiskCache, Hasher, get_cache_dir, hash_file, hash_path
+from ..state import State, Path, DesignFormat
+from ..state.state import StateElement
+from ..config import Config, Variable, universal_flow_config_variables
+from ..config.pdk import all_variables as pdk_variables
+from ..common import GenericDictEncoder, get_script_dir
+from ..__version__ import __version__
+
+if TYPE_CHECKING:
+    from .step import Step
+
+RESULT_FILE = "result.json"
+FILES_DIR = "files"
+STEP_KEY_FILE = "step_key.txt"
+UNCACHED_FILES = ["state_in.json", "state_out.json", STEP_KEY_FILE]
+IGNORED_VARIABLES = ["DESIGN_DIR"]
+
+
+class Uncacheable(ValueError):
+    pass
+
+
+_script_dir_hash: Optional[str] = None
+
+
+def _get_script_dir_hash() -> str:
+    global _script_dir_hash
+    if _script_dir_hash is None:
+        _script_dir_hash = hash_path(get_script_dir())
+    return _script_dir_hash
+
+
+def fingerprint_executable(executable: str) -> Optional[str]:
+    """
+    :param executable: The name of or path to an executable.
+    :returns: A string identifying the specific binary that would be run, based
+        on its resolved path, size and modification time, or ``None`` if it
+        cannot be found.
+    """
+    resolved = shutil.which(executable)
+    if resolved is None:
+        return None
+    resolved = os.path.realpath(resolved)
+    stat = os.stat(resolved)
+    return f"{resolved}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _canonicalize(value: Any) -> Any:
+    # Converts a value to a JSON-serializable form where every path to a file
+    # is replaced with a hash of the file's contents, and every path to a
+    # directory with a hash of the relative paths and contents of its files.
+    if isinstance(value, Path):
+        if os.path.isfile(value):
+            return {"sha256": hash_file(value)}
+        elif os.path.isdir(value):
+            return {"dir": hash_path(value)}
+        raise Uncacheable(f"'{value}' does not exist")
+    elif is_dataclass(value) and not isinstance(value, type):
+        return _canonicalize(asdict(value))
+    elif isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    elif isinstance(value, Enum):
+        return value.name
+    elif isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _relativize(value: StateElement, step_dir: str) -> Any:
+    if value is None:
+        return None
+    elif isinstance(value, dict):
+        return {k: _relativize(v, step_dir) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_relativize(v, step_dir) for v in value]
+    relative = os.path.relpath(os.path.abspath(value), step_dir)
+    if relative.startswith(os.pardir):
+        raise Uncacheable(f"output '{value}' is outside the step directory")
+    return relative
+
+
+def _rebase(value: Any, step_dir: str) -> StateElement:
+    if value is None:
+        return None
+    elif isinstance(value, dict):
+        return {k: _rebase(v, step_dir) for k, v in value.items()}  # type: ignore
+    elif isinstance(value, list):
+        return [_rebase(v, step_dir) for v in value]  # type: ignore
+    return Path(os.path.join(step_dir, value))
+
+
+class StepCache(object):
+    """
+    A persistent cache of step results shared between runs, flows and designs.
+
+    Results are keyed by a hash of:
+
+    * The step's type and the OpenLane version, scripts and step source code.
+    * The values of the configuration variables that may affect the step, i.e.,
+      its own ``config_vars``, the universal flow variables and the PDK/SCL
+      variables, or every configuration variable for steps that may read
+      any of them (see :attr:`Step.uses_entire_config`), such as all
+      Tcl-based steps. Files and directories are hashed by content, so moving
+      a design or a PDK does not invalidate the cache.
+    * The contents of every input view (and every output view that allows
+      multiple values, as those are updated rather than replaced).
+    * The values of the input metrics the step reads (see
+      :attr:`Step.input_metrics`).
+
+    The executables a step invokes are recorded with every entry and
+    fingerprinted again on lookup: if any of them has changed, the entry is
+    discarded.
+
+    On a hit, the entry's files are copied into the step directory, output
+    view paths are rebased onto it and the metrics are restored without
+    running any subprocesses.
+
+    :param path: The directory to store cache entries in. Defaults to ``steps``
+        inside :func:`openlane.cache.get_cache_dir`.
+    :param max_size: The maximum size of the cache in bytes, beyond which the
+        least recently used entries are evicted. If ``None``, the cache grows
+        without bound.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, os.PathLike]] = None,
+        max_size: Optional[int] = None,
+    ):
+        self.store = DiskCache(
+            path or os.path.join(get_cache_dir(), "steps"),
+            max_size=max_size,
+        )
+
+    @staticmethod
+    def get_config_slice(step: Step) -> List[Variable]:
+        """
+        :returns: The configuration variables that are considered as affecting
+            the result of a step, unless it uses the entire configuration (see
+            :attr:`Step.uses_entire_config`).
+        """
+        return (
+            list(step.config_vars)
+            + list(universal_flow_config_variables)
+            + list(pdk_variables)
+        )
+
+    def get_key(self, step: Step, state_in: State) -> Optional[str]:
+        """
+        :param step: The step object about to be run.
+        :param state_in: The resolved input state of the step.
+        :returns: The cache key for the step's result, or ``None`` if the step
+            cannot be cached with this input. See :func:`get_step_key`.
+        """
+        return get_step_key(step, state_in)
+
+    def restore(
+        self,
+        step: Step,
+        key: str,
+    ) -> Optional[Tuple[Dict[DesignFormat, StateElement], Dict[str, Any]]]:
+        """
+        Attempts to restore the result of a step from the cache.
+
+        :param step: The step object about to be run.
+        :param key: The key returned by :meth:`get_key`.
+        :returns: A tuple of the views and metrics updates of the step, or
+            ``None`` on a cache miss.
+        """
+        entry_path = self.store.get(key)
+        if entry_path is None:
+            return None
+
+        try:
+            with open(os.path.join(entry_path, RESULT_FILE), encoding="utf8") as f:
+                result = json.load(f)
+
+            for executable, fingerprint in result["executables"].items():
+                if fingerprint_executable(executable) != fingerprint:
+                    self.store.remove(key)
+                    return None
+
+            shutil.copytree(
+                os.path.join(entry_path, FILES_DIR),
+                step.step_dir,
+                dirs_exist_ok=True,
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+        step_dir = os.path.abspath(step.step_dir)
+        views_updates: Dict[DesignFormat, StateElement] = {}
+        for id, value in result["views"].items():
+            format = DesignFormat.by_id(id)
+            if format is None:
+                return None
+            views_updates[format] = _rebase(value, step_dir)
+
+        return views_updates, result["metrics"]
+
+    def save(
+        self,
+        step: Step,
+        key: str,
+        views_updates: Dict[DesignFormat, StateElement],
+        metrics_updates: Dict[str, Any],
+        executables: Iterable[str],
+    ) -> bool:
+        """
+        Stores the result of a step in the cache.
+
+        :param step: The step object that has just been run.
+        :param key: The key returned by :meth:`get_key`.
+        :param views_updates: The views updated by the step.
+        :param metrics_updates: The metrics updated by the step.
+        :param executables: The executables invoked by the step.
+        :returns: Whether the result has been stored.
+        """
+        step_dir = os.path.abspath(step.step_dir)
+        try:
+            fingerprints: Dict[str, Optional[str]] = {}
+            for executable in executables:
+                fingerprints[executable] = fingerprint_executable(executable)
+
+            result = {
+                "views": {
+                    format.value.id: _relativize(value, step_dir)
+                    for format, value in views_updates.items()
+                },
+                "metrics": metrics_updates,
+                "executables": fingerprints,
+            }
+            serialized = json.dumps(result, cls=GenericDictEncoder)
+        except (Uncacheable, OSError, TypeError, ValueError):
+            return False
+
+        def populate(entry_path: str):
+            with open(os.path.join(entry_path, RESULT_FILE), "w", encoding="utf8") as f:
+                f.write(serialized)
+            shutil.copytree(
+                step_dir,
+                os.path.join(entry_path, FILES_DIR),
+                ignore=lambda _, files: [f for f in files if f in UNCACHED_FILES],
+            )
+
+        try:
+            self.store.put(key, populate)
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def _get_read_formats(step: Step) -> List[DesignFormat]:
+        formats = list(step.inputs)
+        for output in step.outputs:
+            if output.value.multiple and output not in formats:
+                formats.append(output)
+        return formats
+
+
+def get_step_key(step: Step, state_in: State) -> Optional[str]:
+    """
+    Computes a key identifying the result of a step: see :class:`StepCache`
+    for what it covers.
+
+    :param step: The step object about to be run.
+    :param state_in: The resolved input state of the step.
+    :returns: The key, or ``None`` if it cannot be computed for this input,
+        e.g. because a file referenced by the configuration does not exist.
+    """
+    hasher = Hasher()
+    cls = type(step)
+    hasher.update(
+        __version__,
+        f"{cls.__module__}.{cls.__qualname__}",
+        step.id,
+        _get_script_dir_hash(),
+    )
+    try:
+        if source := inspect.getsourcefile(cls):
+            hasher.update(hash_file(source))
+
+        config: Config = step.config
+        names = set(variable.name for variable in StepCache.get_config_slice(step))
+        if step.uses_entire_config:
+            names.update(config.keys())
+        config_slice: Dict[str, Any] = {}
+        for name in sorted(names):
+            if name in IGNORED_VARIABLES:
+                continue
+            config_slice[name] = _canonicalize(config.get(name))
+
+        views: Dict[str, Any] = {}
+        for format in StepCache._get_read_formats(step):
+            views[format.value.id] = _canonicalize(state_in[format])
+
+        metrics: Dict[str, Any] = {}
+        for name in step.input_metrics:
+            metrics[name] = _canonicalize(state_in.metrics.get(name))
+    except (Uncacheable, OSError):
+        return None
+
+    hasher.update(
+        json.dumps(config_slice, sort_keys=True, cls=GenericDictEncoder),
+        json.dumps(views, sort_keys=True, cls=GenericDictEncoder),
+        json.dumps(metrics, sort_keys=True, cls=GenericDictEncoder),
+    )
+    return hasher.hexdigest()
+
+
+STEP_CACHE: Optional[StepCache] = None
+
+
+def set_step_cache(cache: Optional[StepCache]):
+    """
+    Sets the step cache used by all steps, or disables caching if ``None``.
+    """
+    global STEP_CACHE
+    STEP_CACHE = cache
+
+
+def get_step_cache() -> Optional[StepCache]:
+    """
+    :returns: The step cache used by all steps, if enabled.
+    """
+    global STEP_CACHE
+    return STEP_CACHE
@@ -18,6 +18,7 @@ from typing import Optional
 from abc import abstractmethod
 
 from .step import ViewsUpdate, MetricsUpdate, Step, StepError, DeferredStepError, State
+from .scheduler import ResourceRequest
 
 from ..config import Variable
 from ..logging import err, warn, info
@@ -25,6 +26,8 @@ from ..logging import err, warn, info
 
 class MetricChecker(Step):
     deferred = True
+    cacheable = False
+    resource_request = ResourceRequest(threads=0, memory=0)
 
     inputs = []
     outputs = []
@@ -266,3 +266,12 @@ constraint_variables = [
         deprecated_names=["IO_PCT"],
     ),
 ]
+
+violation_heatmap_variables = [
+    Variable(
+        "VIOLATION_HEATMAP_TILES",
+        int,
+        "The number of columns and rows of tiles the die area is divided into when reporting the number of violations found by signoff checks per tile as metrics. Set to 0 to disable per-tile metrics.",
+        default=4,
+    ),
+]
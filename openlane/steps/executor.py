@@ -0,0 +1,473 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Step Executors
+
+Step executors decide where :meth:`openlane.steps.Step.start` actually runs
+when a flow calls :meth:`openlane.flows.Flow.start_step_async`: in a thread of
+the current process (the default), or in a separate worker process that may
+live on another machine.
+
+Remote workers receive a work item consisting of the step's type, its
+configuration and its resolved input state, run the step, then send the output
+state back. Views are exchanged as paths, so the run directory, the PDK and
+any design files must be visible under the same paths to every worker (e.g.
+on a shared network filesystem).
+
+A worker can be started manually with::
+
+    OPENLANE_WORKER_AUTHKEY=<key> python3 -m openlane.steps.worker <host>:<port>
+"""
+from __future__ import annotations
+
+import os
+import sys
+import queue
+import atexit
+import secrets
+import importlib
+import threading
+import subprocess
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from concurrent.futures import Future
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from .step import Step, StepException
+from .cache import get_step_key
+from .scheduler import GiB, get_physical_memory
+from ..state import State
+from ..utils import Toolbox
+from ..common import get_tpe
+from ..logging import verbose, warn
+
+AUTHKEY_ENV = "OPENLANE_WORKER_AUTHKEY"
+
+
+class StepExecutor(ABC):
+    """
+    An abstract base class for objects that run steps on behalf of a flow.
+    """
+
+    @abstractmethod
+    def submit(self, step: Step, *args, **kwargs) -> Future[State]:
+        """
+        Schedules a step to be started.
+
+        :param step: The step object to run.
+        :param args: Arguments to :meth:`openlane.steps.Step.start`.
+        :param kwargs: Keyword arguments to :meth:`openlane.steps.Step.start`.
+        :returns: A future encapsulating the output state of the step.
+        """
+        pass
+
+    def shutdown(self):
+        """
+        Releases any resources held by the executor. Steps that have already
+        been submitted are not guaranteed to finish.
+        """
+        pass
+
+
+class ThreadStepExecutor(StepExecutor):
+    """
+    Runs steps in the current process, using the thread pool returned by
+    :func:`openlane.common.get_tpe`.
+    """
+
+    def submit(self, step: Step, *args, **kwargs) -> Future[State]:
+        return get_tpe().submit(step.start, *args, **kwargs)
+
+
+def _get_step_path(step: Step) -> Optional[Tuple[str, str]]:
+    cls = type(step)
+    if "<locals>" in cls.__qualname__ or cls.__module__ == "__main__":
+        return None
+    return (cls.__module__, cls.__qualname__)
+
+
+def _import_step(module: str, qualname: str) -> Type[Step]:
+    target: Any = importlib.import_module(module)
+    for element in qualname.split("."):
+        target = getattr(target, element)
+    return target
+
+
+@dataclass
+class _WorkItem:
+    step: Step
+    payload: Dict[str, Any]
+    future: Future
+    dispatched: bool = False
+
+
+def run_work_item(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs a step described by a work item created by :class:`SocketStepExecutor`.
+
+    This is the body of a worker's loop and should not be called directly.
+
+    :param payload: The work item.
+    :returns: The result to be sent back to the executor.
+    """
+    try:
+        cls = _import_step(*payload["step"])
+        step = cls(
+            config=payload["config"],
+            state_in=payload["state_in"],
+            step_dir=payload["step_dir"],
+            id=payload["id"],
+            name=payload["name"],
+            long_name=payload["long_name"],
+        )
+        state_out = step.start(toolbox=Toolbox(payload["tmp_dir"]))
+        return {
+            "state_out": state_out,
+            "start_time": step.start_time,
+            "end_time": step.end_time,
+            "executables": step.executables,
+            "process_stats": step.process_stats,
+        }
+    except Exception as e:
+        return {"error": e}
+
+
+class SocketStepExecutor(StepExecutor):
+    """
+    Dispatches steps to worker processes that connect to a socket, one step
+    per worker at a time, in the order in which their inputs become available.
+
+    Workers are started with ``python3 -m openlane.steps.worker``, with the
+    authentication key in the ``OPENLANE_WORKER_AUTHKEY`` environment variable.
+
+    Steps that cannot be reconstructed by a worker, i.e., whose class is
+    not importable by name, that are run with extra keyword arguments or with
+    an interactive configuration, as well as steps that are going to be skipped
+    by flow control or whose previous results are going to be reused by an
+    incremental flow, are run in the current process instead.
+
+    If a worker disconnects before picking up a step, the step is dispatched to
+    another worker. If it disconnects while running one, the step fails.
+
+    :param address: A ``(host, port)`` tuple to listen on. A port of ``0``
+        picks any free port: see :attr:`address` for the actual address.
+    :param authkey: The key workers authenticate with. If ``None``, a random
+        key is generated.
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        authkey: Optional[bytes] = None,
+    ):
+        self.authkey = authkey or secrets.token_hex(32).encode("ascii")
+        self._listener = Listener(address, authkey=self.authkey)
+        self.address: Tuple[str, int] = self._listener.address  # type: ignore
+        self._queue: queue.Queue[Optional[_WorkItem]] = queue.Queue()
+        self._local = ThreadStepExecutor()
+        self._lock = threading.Lock()
+        self._connections: List[Connection] = []
+        self._shut_down = False
+        threading.Thread(
+            target=self._accept,
+            name="openlane-step-executor",
+            daemon=True,
+        ).start()
+
+    def _accept(self):
+        while True:
+            try:
+                connection = self._listener.accept()
+            except (OSError, AuthenticationError):
+                # Authentication failure or closed listener
+                if self._shut_down:
+                    return
+                continue
+            with self._lock:
+                if self._shut_down:
+                    connection.close()
+                    return
+                self._connections.append(connection)
+            verbose(f"A step worker connected from {self._listener.last_accepted}.")
+            threading.Thread(
+                target=self._serve,
+                args=(connection,),
+                name="openlane-step-executor-connection",
+                daemon=True,
+            ).start()
+
+    def _serve(self, connection: Connection):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    # Let the other connections see it as well
+                    self._queue.put(None)
+                    connection.send(None)
+                    return
+                if not item.dispatched:
+                    if not item.future.set_running_or_notify_cancel():
+                        continue
+                    item.dispatched = True
+                try:
+                    connection.send(item.payload)
+                except OSError:
+                    # Nothing has been run: the next worker can have it
+                    self._queue.put(item)
+                    return
+                try:
+                    result = connection.recv()
+                except (EOFError, OSError):
+                    item.future.set_exception(
+                        StepException(
+                            f"Lost connection to the worker running {item.step.id}."
+                        )
+                    )
+                    return
+                self._finish(item, result)
+        except (EOFError, OSError):
+            pass
+        finally:
+            connection.close()
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+
+    def _finish(self, item: _WorkItem, result: Dict[str, Any]):
+        if error := result.get("error"):
+            item.future.set_exception(error)
+            return
+        step = item.step
+        step.state_out = result["state_out"]
+        step.start_time = result["start_time"]
+        step.end_time = result["end_time"]
+        step.executables = result["executables"]
+        step.process_stats = result["process_stats"]
+        item.future.set_result(step.state_out)
+
+    def _is_remotable(self, step: Step, kwargs: Dict[str, Any]) -> bool:
+        if _get_step_path(step) is None:
+            return False
+        if set(kwargs.keys()) - {"toolbox"}:
+            return False
+        if step.config.is_interactive():
+            return False
+        return True
+
+    def _is_skipped(self, step: Step) -> bool:
+        if step.flow is None or step.flow_control_variable is None:
+            return False
+        value = step.config[step.flow_control_variable]
+        return value is None or value is False
+
+    def _is_reusable(self, step: Step, state_in: State) -> bool:
+        if step.flow is None or not step.flow.incremental or not step.cacheable:
+            return False
+        key = get_step_key(step, state_in)
+        return key is not None and step.flow.find_step_result(step, key) is not None
+
+    def _dispatch(
+        self,
+        step: Step,
+        toolbox: Optional[Toolbox],
+        future: Future,
+        state_in: Future[State],
+    ):
+        exception = state_in.exception()
+        if exception is not None:
+            future.set_exception(exception)
+            return
+        if self._is_skipped(step) or self._is_reusable(step, state_in.result()):
+            _chain(self._local.submit(step, toolbox=toolbox), future)
+            return
+
+        if toolbox is None and step.flow is not None:
+            toolbox = step.flow.toolbox
+        if toolbox is None:
+            future.set_exception(
+                StepException("Attempted to 'start' a step before its parent Flow.")
+            )
+            return
+        payload = {
+            "step": _get_step_path(step),
+            "id": step.id,
+            "name": step.name,
+            "long_name": step.long_name,
+            "step_dir": os.path.abspath(step.step_dir),
+            "config": step.config,
+            "state_in": state_in.result(),
+            "tmp_dir": toolbox.tmp_dir,
+        }
+        self._queue.put(_WorkItem(step, payload, future))
+
+    def submit(self, step: Step, *args, **kwargs) -> Future[State]:
+        if len(args) != 0 or not self._is_remotable(step, kwargs):
+            return self._local.submit(step, *args, **kwargs)
+
+        future: Future[State] = Future()
+        step.state_in.add_done_callback(
+            lambda state_in: self._dispatch(
+                step,
+                kwargs.get("toolbox"),
+                future,
+                state_in,
+            )
+        )
+        return future
+
+    def _fail_queued(self, exception: BaseException):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                continue
+            if item.dispatched or item.future.set_running_or_notify_cancel():
+                item.future.set_exception(exception)
+
+    def shutdown(self):
+        with self._lock:
+            if self._shut_down:
+                return
+            self._shut_down = True
+            connections = list(self._connections)
+        self._fail_queued(StepException("The step executor has been shut down."))
+        self._queue.put(None)
+        self._listener.close()
+        try:
+            # Unblock the accepting thread
+            Client(self.address, authkey=self.authkey).close()
+        except Exception:
+            pass
+        for connection in connections:
+            connection.close()
+
+
+class LocalWorkerPool(SocketStepExecutor):
+    """
+    A :class:`SocketStepExecutor` that starts a number of worker processes on
+    the current machine.
+
+    The thread and memory budgets passed to
+    :func:`openlane.steps.scheduler.set_scheduler` in each worker are
+    ``threads // workers`` and ``memory // workers``, so the pool as a whole
+    does not oversubscribe the machine.
+
+    Workers on other machines may connect as well if ``address`` is not a
+    loopback address.
+
+    :param workers: The number of worker processes.
+    :param threads: The total number of threads that may be used by all
+        workers together. Defaults to the number of CPUs.
+    :param memory: The total memory, in bytes, that tools run by all workers
+        together are estimated to use at the same time. Defaults to the
+        machine's physical memory.
+    :param step_cache_dir: If set, workers use a step cache in this directory.
+    :param openroad_sessions: Whether workers run OpenROAD steps in persistent
+        sessions. See :mod:`openlane.steps.session`.
+    :param address: See :class:`SocketStepExecutor`.
+    :param authkey: See :class:`SocketStepExecutor`.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        threads: Optional[int] = None,
+        memory: Optional[int] = None,
+        step_cache_dir: Optional[str] = None,
+        openroad_sessions: bool = False,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        authkey: Optional[bytes] = None,
+    ):
+        super().__init__(address, authkey)
+        threads = threads or os.cpu_count() or 1
+        memory = memory or get_physical_memory()
+        host, port = self.address
+        if host in ["", "0.0.0.0"]:
+            host = "127.0.0.1"
+        env = os.environ.copy()
+        env[AUTHKEY_ENV] = self.authkey.decode("ascii")
+        cmd = [
+            sys.executable,
+            "-m",
+            "openlane.steps.worker",
+            f"{host}:{port}",
+            "--jobs",
+            str(max(1, threads // workers)),
+        ]
+        if memory is not None:
+            cmd += ["--max-memory", str(memory / workers / GiB)]
+        if step_cache_dir is not None:
+            cmd += ["--step-cache-dir", step_cache_dir]
+        if openroad_sessions:
+            cmd.append("--openroad-sessions")
+        self.processes = [
+            subprocess.Popen(cmd, env=env, stdin=subprocess.DEVNULL)
+            for _ in range(workers)
+        ]
+        threading.Thread(
+            target=self._watch,
+            name="openlane-worker-pool-watcher",
+            daemon=True,
+        ).start()
+        atexit.register(self.shutdown)
+
+    def _watch(self):
+        for process in self.processes:
+            process.wait()
+        if not self._shut_down:
+            warn("All step workers have exited.")
+            self._fail_queued(StepException("All step workers have exited."))
+
+    def shutdown(self):
+        super().shutdown()
+        for process in self.processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.terminate()
+
+
+def _chain(source: Future, target: Future):
+    def copy(source: Future):
+        if source.cancelled():
+            target.cancel()
+        elif exception := source.exception():
+            target.set_exception(exception)
+        else:
+            target.set_result(source.result())
+
+    source.add_done_callback(copy)
+
+
+STEP_EXECUTOR: StepExecutor = ThreadStepExecutor()
+
+
+def set_step_executor(executor: StepExecutor):
+    """
+    Sets the executor used by all flows to run steps.
+    """
+    global STEP_EXECUTOR
+    STEP_EXECUTOR = executor
+
+
+def get_step_executor() -> StepExecutor:
+    """
+    :returns: The executor used by all flows to run steps.
+    """
+    global STEP_EXECUTOR
+    return STEP_EXECUTOR
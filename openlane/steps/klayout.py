@@ -14,16 +14,28 @@
 import os
 import subprocess
 import sys
+from decimal import Decimal
 from base64 import b64encode
-from typing import Optional, List, Tuple
-
-from .step import ViewsUpdate, MetricsUpdate, Step, StepError, StepException
+from typing import Dict, Optional, List, Tuple
+
+from .step import (
+    ViewsUpdate,
+    MetricsUpdate,
+    Step,
+    StepError,
+    StepException,
+    SubprocessJob,
+)
+from .scheduler import ResourceRequest, GiB
+from .common_variables import violation_heatmap_variables
 
 from ..logging import warn
 from ..state import DesignFormat, State, Path
 from ..config import Variable, Config
 from ..common import get_script_dir
 from ..utils import Toolbox
+from ..utils.drc import DRCStore, klayout_xml_to_store
+from ..utils.drc_index import heatmap_metrics, store_heatmap
 
 
 def get_lef_args(config: Config, toolbox: Toolbox) -> List[str]:
@@ -75,6 +87,8 @@ class StreamOut(Step):
     inputs = [DesignFormat.DEF]
     outputs = [DesignFormat.GDS, DesignFormat.KLAYOUT_GDS]
 
+    resource_request = ResourceRequest(threads=1, memory=GiB)
+
     config_vars = [
         Variable(
             "RUN_KLAYOUT_STREAMOUT",
@@ -173,6 +187,16 @@ class XOR(Step):
     Performs an XOR operation on the Magic and KLayout GDS views. The idea is:
     if there's any difference between the GDSII streams between the two tools,
     one of them have it wrong and that may lead to ambiguity.
+
+    The layers can be distributed across several KLayout processes, each of
+    which can perform the XOR tile by tile with multiple threads, and the step
+    can stop at the first layer with differences.
+
+    The differences are counted per layer as
+    ``design__xor_difference__count__layer:{layer}`` and per tile of the die
+    area as ``design__xor_difference__count__tile:x{column}y{row}``. They are
+    also converted to a columnar store (``xor.db``) that can be queried by
+    layer and region using :class:`openlane.utils.DRCStore`.
     """
 
     id = "KLayout.XOR"
@@ -184,6 +208,7 @@ class XOR(Step):
         DesignFormat.KLAYOUT_GDS,
     ]
     outputs = []
+    input_metrics = ["design__die__bbox"]
 
     config_vars = [
         Variable(
@@ -195,10 +220,34 @@ class XOR(Step):
         Variable(
             "KLAYOUT_XOR_THREADS",
             int,
-            "Specifies number of threads used in the KLayout XOR check.",
+            "Specifies number of threads used in the KLayout XOR check by each KLayout process. Only used in tiled mode; see `KLAYOUT_XOR_TILE_SIZE`.",
             default=1,
         ),
-    ]
+        Variable(
+            "KLAYOUT_XOR_TILE_SIZE",
+            Optional[Decimal],
+            "If set, KLayout performs the XOR tile by tile using tiles of this size, which reduces the memory used for large layouts and lets the tiles be processed by `KLAYOUT_XOR_THREADS` threads. Differences crossing the edges of tiles are counted once per tile.",
+            units="µm",
+        ),
+        Variable(
+            "KLAYOUT_XOR_PROCESSES",
+            int,
+            "The number of KLayout processes the layers are distributed across. Each process reads both layouts.",
+            default=1,
+        ),
+        Variable(
+            "KLAYOUT_XOR_EARLY_EXIT",
+            bool,
+            "Stop as soon as a layer with differences is found instead of checking all layers, e.g. when only whether the layouts differ matters. The difference count then only covers the layers checked so far.",
+            default=False,
+        ),
+    ] + violation_heatmap_variables
+
+    def get_resource_request(self) -> ResourceRequest:
+        return ResourceRequest(
+            threads=max(self.config["KLAYOUT_XOR_THREADS"], 1),
+            memory=GiB,
+        )
 
     def run(self, state_in: State, **kwargs) -> Tuple[ViewsUpdate, MetricsUpdate]:
         ignored = ""
@@ -216,31 +265,97 @@ class XOR(Step):
 
         kwargs, env = self.extract_env(kwargs)
 
-        self.run_subprocess(
-            [
-                "ruby",
-                os.path.join(
-                    get_script_dir(),
-                    "klayout",
-                    "xor.drc",
-                ),
-                "--output",
-                os.path.join(self.step_dir, "xor.xml"),
-                "--top",
-                self.config["DESIGN_NAME"],
-                "--ignore",
-                ignored,
-                layout_a,
-                layout_b,
-            ],
-            env=env,
+        command = [
+            "ruby",
+            os.path.join(
+                get_script_dir(),
+                "klayout",
+                "xor.drc",
+            ),
+            "--top",
+            self.config["DESIGN_NAME"],
+            "--ignore",
+            ignored,
+            "--threads",
+            str(self.config["KLAYOUT_XOR_THREADS"]),
+        ]
+        if tile_size := self.config["KLAYOUT_XOR_TILE_SIZE"]:
+            command += ["--tile-size", str(tile_size)]
+        if self.config["KLAYOUT_XOR_EARLY_EXIT"]:
+            command.append("--early-exit")
+
+        processes = max(self.config["KLAYOUT_XOR_PROCESSES"], 1)
+        xml_paths: List[str] = []
+        metrics_by_process: List[MetricsUpdate] = []
+        if processes == 1:
+            xml_path = os.path.join(self.step_dir, "xor.xml")
+            xml_paths.append(xml_path)
+            metrics_by_process.append(
+                self.run_subprocess(
+                    command + ["--output", xml_path, layout_a, layout_b],
+                    env=env,
+                    **kwargs,
+                )
+            )
+        else:
+            jobs: Dict[str, SubprocessJob] = {}
+            for i in range(processes):
+                shard_dir = os.path.join(self.step_dir, f"shard_{i}")
+                xml_path = os.path.join(shard_dir, "xor.xml")
+                xml_paths.append(xml_path)
+                jobs[str(i)] = SubprocessJob(
+                    command
+                    + [
+                        "--output",
+                        xml_path,
+                        "--shard",
+                        f"{i}/{processes}",
+                        layout_a,
+                        layout_b,
+                    ],
+                    log_to=os.path.join(shard_dir, "xor.log"),
+                    report_dir=shard_dir,
+                    env=env,
+                    stops_group=(
+                        _found_xor_difference
+                        if self.config["KLAYOUT_XOR_EARLY_EXIT"]
+                        else None
+                    ),
+                )
+            metrics_by_process = list(self.run_subprocesses(jobs).values())
+
+        metrics_updates: MetricsUpdate = {}
+        difference_count = 0
+        for generated_metrics in metrics_by_process:
+            for name, value in generated_metrics.items():
+                if name.startswith(XOR_LAYER_METRIC):
+                    metrics_updates[name] = value
+                    difference_count += value
+        metrics_updates["design__xor_difference__count"] = difference_count
+
+        xor_db_path = os.path.join(self.step_dir, "xor.db")
+        klayout_xml_to_store(
+            [xml_path for xml_path in xml_paths if os.path.exists(xml_path)],
+            xor_db_path,
         )
-
-        difference_count = int(
-            open(os.path.join(self.step_dir, "difference_count.rpt")).read().strip()
+        with DRCStore(xor_db_path) as store:
+            heatmap = store_heatmap(
+                store,
+                self.config["VIOLATION_HEATMAP_TILES"],
+                state_in.metrics.get("design__die__bbox"),
+            )
+        metrics_updates.update(
+            heatmap_metrics("design__xor_difference__count", heatmap)
         )
 
-        return {}, {"design__xor_difference__count": difference_count}
+        return {}, metrics_updates
+
+
+XOR_LAYER_METRIC = "design__xor_difference__count__layer:"
+
+
+def _found_xor_difference(line: str) -> bool:
+    return line.startswith(f"%OL_METRIC_I {XOR_LAYER_METRIC}")
 
 
 @Step.factory.register()
@@ -252,6 +367,7 @@ class OpenGUI(Step):
 
     id = "KLayout.OpenGUI"
     name = "Open In GUI"
+    cacheable = False
 
     inputs = [DesignFormat.DEF]
     outputs = []
@@ -12,22 +12,29 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+from decimal import Decimal
 from abc import abstractmethod
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from .step import ViewsUpdate, MetricsUpdate, Step
+from .step import ViewsUpdate, MetricsUpdate, Step, SubprocessJob
+from .scheduler import ResourceRequest, GiB
 from .tclstep import TclStep
+from .common_variables import violation_heatmap_variables
 from ..state import DesignFormat, State
 
 from ..config import Variable
-from ..common import get_script_dir
-from ..utils import DRC as DRCObject
+from ..common import get_script_dir, mkdirp
+from ..logging import info
+from ..utils.drc import DRCStore, magic_report_to_store, merge_magic_reports
+from ..utils.drc_index import heatmap_metrics, store_heatmap
 
 
 class MagicStep(TclStep):
     inputs = [DesignFormat.GDS]
     outputs = []
 
+    resource_request = ResourceRequest(threads=1, memory=GiB)
+
     config_vars = [
         Variable(
             "MAGIC_DEF_LABELS",
@@ -149,6 +156,7 @@ class StreamOut(MagicStep):
 
     inputs = [DesignFormat.DEF]
     outputs = [DesignFormat.GDS, DesignFormat.MAG_GDS]
+    input_metrics = ["design__die__bbox"]
 
     config_vars = MagicStep.config_vars + [
         Variable(
@@ -206,11 +214,23 @@ class DRC(MagicStep):
     Performs `design rule checking <https://en.wikipedia.org/wiki/Design_rule_checking>`_
     on the GDSII stream using Magic.
 
-    This also converts the results to a KLayout database, which can be loaded.
+    This also converts the results to a KLayout database, which can be loaded,
+    and to a columnar store (``reports/drc.db``) that can be queried by layer,
+    rule and region using :class:`openlane.utils.DRCStore`.
 
     The metrics will be updated with ``magic__drc_error__count``. You can use
     `the relevant checker <#Checker.MagicDRC>`_ to quit if that number is
     nonzero.
+
+    With ``MAGIC_DRC_TILES`` set, the layout is split into a grid of tiles
+    checked in parallel, each with a halo of ``MAGIC_DRC_TILE_HALO`` around it.
+    Violations split across tile seams are stitched back together and
+    duplicates are removed, so the results match a check of the whole layout.
+
+    The number of violations per tile of the die area is also
+    reported as ``magic__drc_error__count__tile:x{column}y{row}`` for every
+    tile with violations; see :class:`openlane.utils.DRCIndex` for interactive
+    queries.
     """
 
     id = "Magic.DRC"
@@ -221,6 +241,7 @@ class DRC(MagicStep):
 
     inputs = [DesignFormat.DEF, DesignFormat.GDS]
     outputs = []
+    input_metrics = ["design__die__bbox"]
 
     config_vars = [
         Variable(
@@ -235,31 +256,111 @@ class DRC(MagicStep):
             "A flag to choose whether to run the magic DRC checks on GDS or not. If not, then the checks will be done on the DEF/LEF, which is faster.",
             default=False,
         ),
-    ]
+        Variable(
+            "MAGIC_DRC_TILES",
+            int,
+            "The number of columns and rows of tiles the layout is divided into for design rule checking. If greater than 1, the tiles are checked by separate Magic processes in parallel and their violations are merged.",
+            default=1,
+        ),
+        Variable(
+            "MAGIC_DRC_TILE_HALO",
+            Optional[Decimal],
+            "The distance around each tile that is also checked so that rules spanning the edges of the tile are evaluated correctly. Must be at least the largest distance of any design rule. If unset, the DRC halo distance reported by Magic is used.",
+            units="µm",
+        ),
+    ] + violation_heatmap_variables
 
     def get_script_path(self):
         return os.path.join(get_script_dir(), "magic", "drc.tcl")
 
+    def get_tiles(self) -> List[Tuple[str, int, int]]:
+        """
+        :returns: A list of ``(name, column, row)`` for every tile checked
+            separately, or an empty list if the layout is checked in one piece.
+        """
+        tiles = self.config["MAGIC_DRC_TILES"]
+        if tiles <= 1:
+            return []
+        return [
+            (f"x{column}y{row}", column, row)
+            for row in range(tiles)
+            for column in range(tiles)
+        ]
+
+    def run_script(
+        self,
+        command: List[str],
+        env: Dict[str, str],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        If the layout is divided into tiles, runs a Magic process per tile
+        simultaneously instead of a single one.
+        """
+        tiles = self.get_tiles()
+        if len(tiles) == 0:
+            return super().run_script(command, env, **kwargs)
+
+        if stdin := kwargs.get("stdin"):
+            stdin.close()
+
+        count = self.config["MAGIC_DRC_TILES"]
+        jobs: Dict[str, SubprocessJob] = {}
+        for name, column, row in tiles:
+            tile_dir = os.path.join(self.step_dir, "tiles", name)
+            tile_env = env.copy()
+            tile_env["MAGIC_DRC_TILE"] = f"{column} {row} {count} {count}"
+            tile_env["MAGIC_DRC_TILE_DIR"] = tile_dir
+            jobs[name] = SubprocessJob(
+                command,
+                log_to=os.path.join(tile_dir, "drc.log"),
+                report_dir=tile_dir,
+                env=tile_env,
+                stdin=os.path.join(get_script_dir(), "magic", "wrapper.tcl"),
+            )
+        info(f"Checking {len(jobs)} tiles in parallel…")
+        self.run_subprocesses(jobs)
+        return {}
+
     def run(self, state_in: State, **kwargs) -> Tuple[ViewsUpdate, MetricsUpdate]:
         views_updates, metrics_updates = super().run(state_in, **kwargs)
 
         reports_dir = os.path.join(self.step_dir, "reports")
         report_path = os.path.join(reports_dir, "drc.rpt")
-        report_stats = os.stat(report_path)
-
-        drc_db_file = None
-        if report_stats.st_size >= 0:  # 134217728:
-            drc_db_file = os.path.join(reports_dir, "drc.db")
-
-        drc, bbox_count = DRCObject.from_magic(
-            open(report_path, encoding="utf8"),
-            db_file=drc_db_file,
-        )
+        drc_db_path = os.path.join(reports_dir, "drc.db")
+        if tiles := self.get_tiles():
+            mkdirp(reports_dir)
+            tile_reports = []
+            for name, _, _ in tiles:
+                tile_dir = os.path.join(self.step_dir, "tiles", name)
+                with open(os.path.join(tile_dir, "window.rpt"), encoding="utf8") as f:
+                    llx, lly, urx, ury = [
+                        round(float(c) * 1000) for c in f.read().split()
+                    ]
+                tile_reports.append(
+                    (os.path.join(tile_dir, "drc.rpt"), (llx, lly, urx, ury))
+                )
+            bbox_count = merge_magic_reports(tile_reports, drc_db_path)
+            with DRCStore(drc_db_path) as store, open(
+                report_path, "w", encoding="utf8"
+            ) as report:
+                store.to_magic_report(report)
+        else:
+            with open(report_path, encoding="utf8") as report:
+                bbox_count = magic_report_to_store(report, drc_db_path)
 
         klayout_db_path = os.path.join(reports_dir, "drc.klayout.xml")
-        drc.to_klayout_xml(open(klayout_db_path, "wb"))
+        with DRCStore(drc_db_path) as store:
+            with open(klayout_db_path, "wb") as out:
+                store.to_klayout_xml(out)
+            heatmap = store_heatmap(
+                store,
+                self.config["VIOLATION_HEATMAP_TILES"],
+                state_in.metrics.get("design__die__bbox"),
+            )
 
         metrics_updates["magic__drc_error__count"] = bbox_count
+        metrics_updates.update(heatmap_metrics("magic__drc_error__count", heatmap))
 
         return views_updates, metrics_updates
 
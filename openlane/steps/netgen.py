@@ -19,6 +19,7 @@ from abc import abstractmethod
 from typing import List, Dict, Tuple
 
 from .step import ViewsUpdate, MetricsUpdate, Step
+from .scheduler import ResourceRequest, GiB
 from .tclstep import TclStep
 
 from ..logging import info
@@ -98,6 +99,8 @@ class NetgenStep(TclStep):
     inputs = []
     outputs = []
 
+    resource_request = ResourceRequest(threads=1, memory=GiB)
+
     @abstractmethod
     def get_script_path(self):
         pass
@@ -161,6 +164,10 @@ class LVS(NetgenStep):
         design_name = self.config["DESIGN_NAME"]
 
         with open(self.get_script_path(), "w") as f:
+            print(
+                "if { [info exists ::env(CONFIG_TCL)] } { source $::env(CONFIG_TCL) }",
+                file=f,
+            )
             for lib in spice_files:
                 print(
                     f"puts \"Reading SPICE netlist file '{lib}'...\"",
@@ -23,6 +23,7 @@ from abc import abstractmethod
 from typing import List, Optional, Tuple
 
 from .step import ViewsUpdate, MetricsUpdate, Step, StepException
+from .scheduler import ResourceRequest, GiB
 from .common_variables import io_layer_variables
 from ..logging import warn
 from ..state import State, DesignFormat, Path
@@ -36,6 +37,8 @@ class OdbpyStep(Step):
     inputs = [DesignFormat.ODB]
     outputs = [DesignFormat.ODB, DesignFormat.DEF]
 
+    resource_request = ResourceRequest(threads=1, memory=GiB)
+
     def run(self, state_in, **kwargs) -> Tuple[ViewsUpdate, MetricsUpdate]:
         kwargs, env = self.extract_env(kwargs)
 
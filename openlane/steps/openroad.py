@@ -23,13 +23,22 @@ from glob import glob
 from decimal import Decimal
 from base64 import b64encode
 from abc import abstractmethod
-from concurrent.futures import Future
 from typing import Any, Callable, Iterable, List, Dict, Tuple, Optional, Union
 
 import rich
 import rich.table
 
-from .step import ViewsUpdate, MetricsUpdate, Step, StepException
+from .step import (
+    ViewsUpdate,
+    MetricsUpdate,
+    OutputProcessor,
+    Step,
+    StepException,
+    SubprocessJob,
+)
+from .supervisor import ProcessGroupError
+from .scheduler import ResourceRequest, GiB
+from .session import get_session_pool
 from .tclstep import TclStep
 from .common_variables import (
     io_layer_variables,
@@ -43,7 +52,8 @@ from .common_variables import (
 from ..config import Variable
 from ..logging import debug, err, info, warn
 from ..state import State, DesignFormat, Path
-from ..common import get_script_dir, StringEnum, get_tpe, mkdirp
+from ..common import get_script_dir, StringEnum, mkdirp
+from ..utils.sta import sta_reports_to_store
 
 EXAMPLE_INPUT = """
 li1 X 0.23 0.46
@@ -111,6 +121,8 @@ class OpenROADStep(TclStep):
         DesignFormat.POWERED_NETLIST,
     ]
 
+    resource_request = ResourceRequest(threads=1, memory=2 * GiB)
+
     config_vars = constraint_variables + [
         Variable(
             "PDN_CONNECT_MACROS_TO_GRID",
@@ -203,6 +215,91 @@ class OpenROADStep(TclStep):
             self.get_script_path(),
         ]
 
+    def get_session_command(self) -> List[str]:
+        """
+        :returns: The command starting a persistent OpenROAD session. See
+            :mod:`openlane.steps.session`.
+        """
+        return [
+            "openroad",
+            "-no_splash",
+            os.path.join(get_script_dir(), "openroad", "session.tcl"),
+        ]
+
+    def run_script(
+        self,
+        command: List[str],
+        env: Dict[str, str],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        If persistent tool sessions are enabled, steps that output an ODB file
+        run their script in an OpenROAD session instead of a new process. The
+        session is reused by a later step reading the ODB file written by this
+        one with the same timing libraries and corners, which then does not
+        need to read the database and libraries again. Its timing constraints
+        are removed and read again instead.
+
+        Steps not outputting an ODB file, which may leave the database in
+        memory in a state that is not saved, always run in a new process.
+        """
+        pool = get_session_pool()
+        if pool is None or len(kwargs) != 0 or DesignFormat.ODB not in self.outputs:
+            return super().run_script(command, env=env, **kwargs)
+
+        cmd_str = [str(arg) for arg in command]
+        self.executables.add(cmd_str[0])
+        with open(os.path.join(self.step_dir, "COMMANDS"), "a+") as f:
+            f.write(" ".join(cmd_str))
+            f.write("\n")
+
+        # Scripts in a reused session skip reading libraries, so every
+        # variable read_pnr_libs and load_rsz_corners read them from counts
+        lib_keys = ["DEFAULT_CORNER", "PNR_LIBS", "MACRO_LIBS", "EXTRA_LIBS"]
+        lib_keys += sorted(key for key in env if key.startswith("RSZ_CORNER_"))
+        libs = "\n".join(f"{key}={env.get(key, '')}" for key in lib_keys)
+        session = pool.acquire(
+            self.get_session_command(),
+            env,
+            odb=env.get("CURRENT_ODB"),
+            libs=libs,
+        )
+        log_path = self.get_log_path()
+        with open(
+            log_path,
+            "w",
+            encoding="utf8",
+            buffering=OutputProcessor.buffer_size,
+        ) as log_file:
+            processor = OutputProcessor(log_file, report_dir=self.step_dir)
+            try:
+                returncode = session.run(
+                    self.get_script_path(),
+                    env,
+                    processor,
+                    os.path.join(self.step_dir, "or_metrics_out.json"),
+                )
+            except BaseException:
+                session.close()
+                raise
+            finally:
+                processor.close()
+
+        saved_odb = env.get("SAVE_ODB")
+        if returncode == 0 and saved_odb is not None and os.path.exists(saved_odb):
+            session.odb = saved_odb
+            session.libs = libs
+            pool.release(session)
+        else:
+            session.close()
+
+        if returncode != 0:
+            err("".join(processor.tail).rstrip("\n"))
+            err(f"Log file: {log_path}")
+            raise subprocess.CalledProcessError(returncode, cmd_str)
+
+        return processor.metrics
+
     def layout_preview(self) -> Optional[str]:
         if self.state_out is None:
             return None
@@ -221,14 +318,51 @@ class OpenROADStep(TclStep):
 class STAStep(OpenROADStep):
     """
     Abstract class for an STA step
+
+    The timing paths of the reports of every corner are converted into a
+    :class:`openlane.utils.sta.TimingPathStore`, ``timing_paths.db``, which can
+    be queried for the worst paths, slack histograms and per-endpoint slacks
+    across corners without parsing the reports again.
     """
 
+    #: The reports written by ``corner.tcl`` holding timing paths
+    timing_path_reports = ["min.rpt", "max.rpt", "checks.rpt"]
+
     def layout_preview(self) -> Optional[str]:
         return None
 
     def get_script_path(self):
         return os.path.join(get_script_dir(), "openroad", "sta", "corner.tcl")
 
+    def write_timing_path_store(self, report_dirs: Dict[str, str]) -> str:
+        """
+        Converts the timing paths of the reports of a number of corners into
+        a store in the step directory.
+
+        :param report_dirs: The directory holding the reports of each corner.
+        :returns: The path of the store.
+        """
+        store_path = os.path.join(self.step_dir, "timing_paths.db")
+        reports = [
+            (corner, os.path.join(report_dir, report))
+            for corner, report_dir in report_dirs.items()
+            for report in self.timing_path_reports
+            if os.path.exists(os.path.join(report_dir, report))
+        ]
+        count = sta_reports_to_store(reports, store_path)
+        debug(f"Wrote {count} timing paths to '{store_path}'.")
+        return store_path
+
+    def run(self, state_in: State, **kwargs) -> Tuple[ViewsUpdate, MetricsUpdate]:
+        kwargs, env = self.extract_env(kwargs)
+
+        views_updates, metrics_updates = super().run(state_in, env=env, **kwargs)
+
+        corner = env.get("CURRENT_CORNER_NAME", self.config["DEFAULT_CORNER"])
+        self.write_timing_path_store({corner: self.step_dir})
+
+        return views_updates, metrics_updates
+
 
 @Step.factory.register()
 class STAMidPNR(STAStep):
@@ -296,6 +430,7 @@ class STAPrePNR(STAStep):
             raise StepException(
                 "Malformed input state: value for LIB is not a dictionary."
             )
+        sdf_dict = sdf_dict.copy()  # Input states are shared
 
         sdfs = glob(os.path.join(self.step_dir, "*.sdf"))
         for sdf in sdfs:
@@ -340,9 +475,8 @@ class STAPostPNR(STAPrePNR):
 
         env["OPENSTA"] = "1"
 
-        def run_corner(corner: str):
-            nonlocal env
-
+        jobs: Dict[str, SubprocessJob] = {}
+        for corner in self.config["STA_CORNERS"]:
             current_env = env.copy()
 
             corner_dir = os.path.join(self.step_dir, corner)
@@ -383,33 +517,30 @@ class STAPostPNR(STAPrePNR):
             )
             current_env["CURRENT_CORNER_TIMING_VIEWS"] = " ".join(timing_file_list)
 
-            log_path = os.path.join(corner_dir, "sta.log")
-
-            try:
-                generated_metrics = self.run_subprocess(
-                    self.get_command(),
-                    log_to=log_path,
-                    env=current_env,
-                    silent=True,
-                    report_dir=corner_dir,
-                )
-                info(f"Finished STA for the {corner} timing corner.")
-            except subprocess.CalledProcessError as e:
-                err(f"Failed STA for the {corner} timing corner:")
-                raise e
-
-            return generated_metrics
-
-        futures: Dict[str, Future[MetricsUpdate]] = {}
-        for corner in self.config["STA_CORNERS"]:
-            futures[corner] = get_tpe().submit(
-                run_corner,
-                corner,
+            jobs[corner] = SubprocessJob(
+                self.get_command(),
+                log_to=os.path.join(corner_dir, "sta.log"),
+                report_dir=corner_dir,
+                env=current_env,
             )
 
+        try:
+            metrics_by_corner = self.run_subprocesses(jobs)
+        except ProcessGroupError as e:
+            err(f"Failed STA for the {e.key} timing corner.")
+            raise e
+
         metrics_updates: MetricsUpdate = {}
-        for corner, updates_future in futures.items():
-            metrics_updates.update(updates_future.result())
+        for corner, generated_metrics in metrics_by_corner.items():
+            info(f"Finished STA for the {corner} timing corner.")
+            metrics_updates.update(generated_metrics)
+
+        self.write_timing_path_store(
+            {
+                corner: os.path.join(self.step_dir, corner)
+                for corner in self.config["STA_CORNERS"]
+            }
+        )
 
         metric_updates_with_aggregates = self.toolbox.aggregate_metrics(
             metrics_updates, timing_metric_aggregation
@@ -462,6 +593,7 @@ class STAPostPNR(STAPrePNR):
             raise StepException(
                 "Malformed input state: value for LIB is not a dictionary."
             )
+        lib_dict = lib_dict.copy()  # Input states are shared
 
         libs = glob(os.path.join(self.step_dir, "**", "*.lib"), recursive=True)
         for lib in libs:
@@ -475,6 +607,7 @@ class STAPostPNR(STAPrePNR):
             raise StepException(
                 "Malformed input state: value for LIB is not a dictionary."
             )
+        sdf_dict = sdf_dict.copy()  # Input states are shared
 
         sdfs = glob(os.path.join(self.step_dir, "**", "*.sdf"), recursive=True)
         for sdf in sdfs:
@@ -937,6 +1070,12 @@ class DetailedRouting(OpenROADStep):
     def get_script_path(self):
         return os.path.join(get_script_dir(), "openroad", "drt.tcl")
 
+    def get_resource_request(self) -> ResourceRequest:
+        return ResourceRequest(
+            threads=self.config.get("DRT_THREADS") or os.cpu_count() or 1,
+            memory=4 * GiB,
+        )
+
     def run(self, state_in: State, **kwargs) -> Tuple[ViewsUpdate, MetricsUpdate]:
         kwargs, env = self.extract_env(kwargs)
         if self.config.get("DRT_THREADS") is None:
@@ -1036,19 +1175,20 @@ class RCX(OpenROADStep):
         kwargs, env = self.extract_env(kwargs)
         env = self.prepare_env(env, state_in)
 
-        def run_corner(corner: str):
+        jobs: Dict[str, SubprocessJob] = {}
+        outputs: Dict[str, str] = {}
+        for corner in self.config["RCX_RULESETS"]:
             rcx_ruleset = self.config["RCX_RULESETS"].get(corner)
             if rcx_ruleset is None:
                 warn(
                     f"RCX ruleset for corner {corner} not found. The corner may be ill-defined."
                 )
-                return None
+                continue
 
             corner_clean = corner
             if corner_clean.endswith("_*"):
                 corner_clean = corner_clean[:-2]
 
-            nonlocal env
             current_env = env.copy()
 
             tech_lefs = self.toolbox.filter_views(
@@ -1056,7 +1196,7 @@ class RCX(OpenROADStep):
             )
             if len(tech_lefs) < 1:
                 warn(f"No tech lef for timing corner {corner} found.")
-                return None
+                continue
             elif len(tech_lefs) > 1:
                 warn(
                     f"Multiple tech lefs found for timing corner {corner}. Only the first one matched will be used."
@@ -1075,26 +1215,18 @@ class RCX(OpenROADStep):
                 f"Running RCX for the {corner_clean} interconnect corner ({log_path})…"
             )
 
-            try:
-                self.run_subprocess(
-                    self.get_command(),
-                    log_to=log_path,
-                    env=current_env,
-                    silent=True,
-                )
-                info(f"Finished RCX for the {corner_clean} interconnect corner.")
-            except subprocess.CalledProcessError as e:
-                err(f"Failed RCX for the {corner_clean} interconnect corner:")
-                raise e
-
-            return out
-
-        futures: Dict[str, Future[str]] = {}
-        for corner in self.config["RCX_RULESETS"]:
-            futures[corner] = get_tpe().submit(
-                run_corner,
-                corner,
+            jobs[corner] = SubprocessJob(
+                self.get_command(),
+                log_to=log_path,
+                env=current_env,
             )
+            outputs[corner] = out
+
+        try:
+            self.run_subprocesses(jobs)
+        except ProcessGroupError as e:
+            err(f"Failed RCX for the {e.key} interconnect corner.")
+            raise e
 
         views_updates: ViewsUpdate = {}
         metrics_updates: MetricsUpdate = {}
@@ -1104,10 +1236,11 @@ class RCX(OpenROADStep):
             raise StepException(
                 "Malformed input state: value for SPEF is not a dictionary."
             )
+        spef_dict = spef_dict.copy()  # Input states are shared
 
-        for corner, future in futures.items():
-            if result := future.result():
-                spef_dict[corner] = Path(result)
+        for corner, out in outputs.items():
+            info(f"Finished RCX for the {corner} interconnect corner.")
+            spef_dict[corner] = Path(out)
 
         views_updates[DesignFormat.SPEF] = spef_dict
 
@@ -1608,6 +1741,7 @@ class OpenGUI(Step):
 
     id = "OpenROAD.OpenGUI"
     name = "Open In GUI"
+    cacheable = False
 
     inputs = [DesignFormat.ODB]
     outputs = []
@@ -0,0 +1,238 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import os
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Iterator, List, Optional, Tuple
+
+GiB = 1024 * 1024 * 1024
+
+
+def get_physical_memory() -> Optional[int]:
+    """
+    :returns: The total physical memory of the machine in bytes, if it can be
+        determined.
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+@dataclass(frozen=True)
+class ResourceRequest:
+    """
+    An estimate of the resources used by a tool invocation.
+
+    :param threads: The number of threads the invocation keeps busy.
+    :param memory: The estimated peak resident set size of the invocation,
+        in bytes.
+    """
+
+    threads: int = 1
+    memory: int = 0
+
+    def is_empty(self) -> bool:
+        return self.threads <= 0 and self.memory <= 0
+
+
+class ResourceScheduler(object):
+    """
+    Admits tool invocations against a machine-wide budget of threads and
+    memory, such that the sum of the estimated resources of all running
+    invocations never exceeds the budget.
+
+    Requests are admitted in the order they are made, i.e., a request that does
+    not fit blocks all requests made after it, so large invocations are not
+    starved by a stream of small ones. Requests that exceed the budget on their
+    own are clamped to it, i.e., they wait until they can run alone.
+
+    :param threads: The total number of threads that may be busy at once.
+    :param memory: The total memory that may be in use at once, in bytes.
+        If ``None``, memory is not accounted for.
+    """
+
+    def __init__(self, threads: int, memory: Optional[int] = None):
+        self.threads = max(1, threads)
+        self.memory = memory
+        self._free_threads = self.threads
+        self._free_memory = memory or 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[ResourceRequest, Callable[[], None]]] = deque()
+
+    def _clamp(self, request: ResourceRequest) -> ResourceRequest:
+        threads = min(max(0, request.threads), self.threads)
+        memory = 0
+        if self.memory is not None:
+            memory = min(max(0, request.memory), self.memory)
+        return ResourceRequest(threads, memory)
+
+    def _fits(self, request: ResourceRequest) -> bool:
+        return (
+            request.threads <= self._free_threads
+            and request.memory <= self._free_memory
+        )
+
+    def _take(self, request: ResourceRequest):
+        self._free_threads -= request.threads
+        self._free_memory -= request.memory
+
+    def _try_take(self, request: ResourceRequest) -> bool:
+        # Lock must be held
+        if len(self._waiters) == 0 and self._fits(request):
+            self._take(request)
+            return True
+        return False
+
+    def _grant_waiters(self):
+        # Lock must be held
+        while len(self._waiters) and self._fits(self._waiters[0][0]):
+            request, wake = self._waiters.popleft()
+            self._take(request)
+            wake()
+
+    def acquire(self, request: ResourceRequest) -> ResourceRequest:
+        """
+        Blocks until the requested resources are available, then reserves them.
+
+        :param request: The requested resources.
+        :returns: The reserved resources, which must be passed to :meth:`release`.
+        """
+        request = self._clamp(request)
+        if request.is_empty():
+            return request
+        event = threading.Event()
+        with self._lock:
+            if self._try_take(request):
+                return request
+            self._waiters.append((request, event.set))
+        event.wait()
+        return request
+
+    async def acquire_async(self, request: ResourceRequest) -> ResourceRequest:
+        """
+        Like :meth:`acquire`, but waits asynchronously.
+
+        If the calling task is cancelled while waiting, nothing is reserved.
+        """
+        request = self._clamp(request)
+        if request.is_empty():
+            return request
+        loop = asyncio.get_running_loop()
+        granted: asyncio.Future[None] = loop.create_future()
+
+        def set_granted():
+            if not granted.done():
+                granted.set_result(None)
+
+        def wake():
+            loop.call_soon_threadsafe(set_granted)
+
+        entry = (request, wake)
+        with self._lock:
+            if self._try_take(request):
+                return request
+            self._waiters.append(entry)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    self._grant_waiters()
+                    raise
+            # Granted in the meantime
+            self.release(request)
+            raise
+        return request
+
+    def release(self, request: ResourceRequest):
+        """
+        Frees resources reserved by :meth:`acquire` or :meth:`acquire_async`.
+
+        :param request: The return value of :meth:`acquire` or :meth:`acquire_async`.
+        """
+        if request.is_empty():
+            return
+        with self._lock:
+            self._free_threads += request.threads
+            self._free_memory += request.memory
+            self._grant_waiters()
+
+    @contextmanager
+    def reserve(self, request: ResourceRequest) -> Iterator[ResourceRequest]:
+        """
+        A context manager that holds the requested resources for its duration.
+        """
+        reserved = self.acquire(request)
+        try:
+            yield reserved
+        finally:
+            self.release(reserved)
+
+    @asynccontextmanager
+    async def reserve_async(
+        self,
+        request: ResourceRequest,
+    ) -> AsyncIterator[ResourceRequest]:
+        """
+        Like :meth:`reserve`, but waits asynchronously.
+        """
+        reserved = await self.acquire_async(request)
+        try:
+            yield reserved
+        finally:
+            self.release(reserved)
+
+    def usage(self) -> Tuple[int, Optional[int]]:
+        """
+        :returns: The number of threads and amount of memory (or ``None`` if
+            memory is not accounted for) currently reserved.
+        """
+        with self._lock:
+            memory: Optional[int] = None
+            if self.memory is not None:
+                memory = self.memory - self._free_memory
+            return (self.threads - self._free_threads, memory)
+
+    def waiting(self) -> List[ResourceRequest]:
+        """
+        :returns: The requests currently waiting to be admitted, in order.
+        """
+        with self._lock:
+            return [request for request, _ in self._waiters]
+
+
+SCHEDULER = ResourceScheduler(os.cpu_count() or 1, get_physical_memory())
+
+
+def set_scheduler(scheduler: ResourceScheduler):
+    """
+    Sets the resource scheduler used by all steps and subprocesses.
+    """
+    global SCHEDULER
+    SCHEDULER = scheduler
+
+
+def get_scheduler() -> ResourceScheduler:
+    """
+    :returns: The resource scheduler used by all steps and subprocesses.
+    """
+    global SCHEDULER
+    return SCHEDULER
@@ -0,0 +1,232 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Persistent sessions of Tcl-based tools.
+
+A :class:`ToolSession` is a long-lived tool process, e.g. OpenROAD, running a
+driver script (``openroad/session.tcl``) that reads Tcl commands from its
+standard input and evaluates them one after the other. Step scripts are run
+by sourcing them in the session, with the environment of the step, so
+anything the tool loaded in a previous script (the design database and
+libraries) is still in memory.
+
+Idle sessions are kept in a :class:`SessionPool`, which hands a session out
+again only to a step whose inputs are what the session has in memory.
+"""
+from __future__ import annotations
+
+import atexit
+import threading
+import subprocess
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .step import OutputProcessor
+from .tclstep import tcl_quote
+
+#: Printed by the driver script after a request is done, followed by the exit
+#: code of the script.
+SESSION_DONE_LOCUS = "%OL_SESSION_DONE"
+
+
+class ToolSession(object):
+    """
+    A tool process running scripts sent over its standard input.
+
+    :param cmd: The command running the driver script.
+    :param env: The environment of the process. Scripts run by the session
+        get their own environment.
+
+    :ivar odb: The path of the database in memory, i.e., the database last
+        written by a script run in this session, if any.
+    :ivar libs: Identifies the libraries loaded into the session, if any.
+    """
+
+    cmd: Tuple[str, ...]
+    odb: Optional[str]
+    libs: Optional[str]
+
+    def __init__(self, cmd: Sequence[str], env: Optional[Dict[str, str]] = None):
+        self.cmd = tuple(cmd)
+        self.odb = None
+        self.libs = None
+        self.process = subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf8",
+            env=env,
+        )
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def is_fresh(self) -> bool:
+        """
+        :returns: Whether no design or libraries have been loaded into the
+            session.
+        """
+        return self.odb is None and self.libs is None
+
+    def run(
+        self,
+        script: str,
+        env: Dict[str, str],
+        processor: OutputProcessor,
+        metrics_path: str,
+    ) -> int:
+        """
+        Runs a script in the session.
+
+        :param script: The path to the script.
+        :param env: The environment the script is run with. Variables not in
+            ``env`` are unset.
+        :param processor: Processes the output of the script.
+        :param metrics_path: The path to which the tool writes metrics
+            generated while running the script, if supported.
+        :returns: The exit code of the script. If the process exits while
+            running the script, its exit code is returned instead and the
+            session can no longer be used.
+        """
+        env_list = " ".join(
+            f"{tcl_quote(key)} {tcl_quote(value)}" for key, value in env.items()
+        )
+        request = " ".join(
+            [
+                "::openlane_session::run",
+                tcl_quote(script),
+                tcl_quote(metrics_path),
+                tcl_quote(self.odb or ""),
+                f"[list {env_list}]",
+            ]
+        )
+        assert self.process.stdin is not None and self.process.stdout is not None
+        try:
+            self.process.stdin.write(request + "\n")
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            return self.process.wait()
+
+        for line in self.process.stdout:
+            if line.startswith(SESSION_DONE_LOCUS):
+                return int(line[len(SESSION_DONE_LOCUS) :].strip())
+            processor.process(line)
+        return self.process.wait()
+
+    def close(self, timeout: float = 10):
+        """
+        Ends the session, killing the process if it does not exit within
+        ``timeout`` seconds.
+        """
+        try:
+            if stdin := self.process.stdin:
+                stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        if stdout := self.process.stdout:
+            stdout.close()
+
+
+class SessionPool(object):
+    """
+    Keeps idle :class:`ToolSession` objects so consecutive steps may reuse
+    them. A session is only reused by a step that reads the database the
+    session has in memory, using the same libraries; other steps get a fresh
+    session.
+
+    :param max_idle: The maximum number of idle sessions kept at a time. The
+        least recently used sessions beyond this number are ended.
+    """
+
+    def __init__(self, max_idle: int = 2):
+        self.max_idle = max_idle
+        self._idle: List[ToolSession] = []
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def acquire(
+        self,
+        cmd: Sequence[str],
+        env: Dict[str, str],
+        odb: Optional[str],
+        libs: str,
+    ) -> ToolSession:
+        """
+        :param cmd: The command running the driver script.
+        :param env: The environment of the process, if a new one is started.
+        :param odb: The database read by the step, if any.
+        :param libs: Identifies the libraries used by the step.
+        :returns: An idle session that has ``odb`` and ``libs`` in memory, or
+            a fresh session.
+        """
+        cmd = tuple(cmd)
+        with self._lock:
+            for i, session in enumerate(self._idle):
+                if session.cmd != cmd or not session.is_alive():
+                    continue
+                if session.is_fresh() or (
+                    odb is not None and session.odb == odb and session.libs == libs
+                ):
+                    return self._idle.pop(i)
+        return ToolSession(cmd, env)
+
+    def release(self, session: ToolSession):
+        """
+        Returns a session to the pool once a step is done with it.
+        """
+        if not session.is_alive():
+            session.close()
+            return
+        evicted: List[ToolSession] = []
+        with self._lock:
+            self._idle.append(session)
+            while len(self._idle) > self.max_idle:
+                evicted.append(self._idle.pop(0))
+        for session in evicted:
+            session.close()
+
+    def close(self):
+        """
+        Ends all idle sessions.
+        """
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+        for session in idle:
+            session.close()
+
+
+SESSION_POOL: Optional[SessionPool] = None
+
+
+def set_session_pool(pool: Optional[SessionPool]):
+    """
+    Sets the pool of tool sessions used by all steps, or disables persistent
+    tool sessions if ``None``.
+    """
+    global SESSION_POOL
+    SESSION_POOL = pool
+
+
+def get_session_pool() -> Optional[SessionPool]:
+    """
+    :returns: The pool of tool sessions used by all steps, if enabled.
+    """
+    global SESSION_POOL
+    return SESSION_POOL
@@ -16,15 +16,19 @@ from __future__ import annotations
 import os
 import time
 import textwrap
+import importlib
 import subprocess
+from collections import deque
 from signal import Signals
 from inspect import isabstract
 from itertools import zip_longest
 from abc import abstractmethod, ABC
+from dataclasses import dataclass
 from concurrent.futures import Future
 from typing import (
     Any,
     List,
+    Set,
     Callable,
     Optional,
     Union,
@@ -32,6 +36,10 @@ from typing import (
     Sequence,
     Dict,
     ClassVar,
+    Deque,
+    Iterable,
+    Mapping,
+    TextIO,
     Type,
 )
 
@@ -41,6 +49,11 @@ from ..state import State, InvalidState
 from ..state import DesignFormat
 from ..utils import Toolbox
 from ..config import Config, Variable
+from ..plugins import load_plugins
+from ..registry import get_step_module, list_steps
+from .cache import STEP_KEY_FILE, get_step_cache, get_step_key
+from .supervisor import ProcessJob, ProcessStats, ProcessGroupError, get_supervisor
+from .scheduler import ResourceRequest, get_scheduler
 from ..common import (
     GenericImmutableDict,
     mkdirp,
@@ -84,6 +97,152 @@ ViewsUpdate = Dict[DesignFormat, StateElement]
 MetricsUpdate = Dict[str, Any]
 
 
+def get_updates(state_in: State, state_out: State) -> Tuple[ViewsUpdate, MetricsUpdate]:
+    """
+    :returns: A tuple of the views and metrics in ``state_out`` that differ
+        from those in ``state_in``.
+    """
+    views_updates: ViewsUpdate = {}
+    for key, value in state_out.items():
+        if state_in.get(key) != value:
+            format = DesignFormat.by_id(key)
+            assert format is not None
+            views_updates[format] = value
+
+    metrics_updates: MetricsUpdate = {}
+    for key, value in state_out.metrics.items():
+        if key not in state_in.metrics or state_in.metrics[key] != value:
+            metrics_updates[key] = value
+
+    return views_updates, metrics_updates
+
+
+def apply_updates(
+    state: State,
+    updates: Iterable[Tuple[ViewsUpdate, MetricsUpdate]],
+) -> State:
+    """
+    :returns: A new state with a series of updates applied in order to ``state``.
+    """
+    views_updates: ViewsUpdate = {}
+    metrics_updates: MetricsUpdate = {}
+    for views, metrics in updates:
+        views_updates.update(views)
+        metrics_updates.update(metrics)
+    return State(
+        state,
+        overrides=views_updates,
+        metrics=GenericImmutableDict(state.metrics, overrides=metrics_updates),
+    )
+
+
+class OutputProcessor(object):
+    """
+    Processes the output of a subprocess line by line in constant memory:
+    every line is written to a log file, metrics and reports are extracted,
+    and only the last few lines are retained (to be printed on failure).
+
+    Lines between a ``%OL_CREATE_REPORT <name>`` line and an ``%OL_END_REPORT``
+    line are written to the file ``<name>`` in ``report_dir``, and lines in the
+    format ``%OL_METRIC{,_I,_F} <name> <value>`` are parsed as metrics. All other
+    lines are echoed to the terminal unless ``silent`` is set.
+
+    :param log_file: A file object to write all lines to.
+    :param report_dir: The directory in which to create reports.
+    :param silent: Whether to not echo lines to the terminal.
+    :param tail_length: The number of lines to retain.
+    """
+
+    buffer_size: ClassVar[int] = 1024 * 1024
+
+    metrics: Dict[str, Any]
+    tail: Deque[str]
+
+    def __init__(
+        self,
+        log_file: TextIO,
+        report_dir: Union[str, os.PathLike],
+        silent: bool = False,
+        tail_length: int = 10,
+    ):
+        self.log_file = log_file
+        self.report_dir = report_dir
+        self.silent = silent
+        self.metrics = {}
+        self.tail = deque(maxlen=tail_length)
+        self._current_report: Optional[TextIO] = None
+
+    def process(self, line: str):
+        """
+        :param line: A line of output, including its line ending, if any.
+        """
+        self.tail.append(line)
+        if line.startswith(REPORT_START_LOCUS):
+            self.close()
+            report_name = line[len(REPORT_START_LOCUS) + 1 :].strip()
+            report_path = os.path.join(self.report_dir, report_name)
+            self._current_report = open(
+                report_path,
+                "w",
+                encoding="utf8",
+                buffering=OutputProcessor.buffer_size,
+            )
+            return
+        elif line.startswith(REPORT_END_LOCUS):
+            self.close()
+            return
+
+        if line.startswith(METRIC_LOCUS):
+            command, name, value = line.split(" ", maxsplit=3)
+            metric_type: Union[Type[str], Type[int], Type[float]] = str
+            if command.endswith("_I"):
+                metric_type = int
+            elif command.endswith("_F"):
+                metric_type = float
+            self.metrics[name] = metric_type(value)
+        elif self._current_report is not None:
+            # No echo- the timing reports especially can be very large
+            # and terminal emulators will slow the flow down.
+            self._current_report.write(line)
+        elif not self.silent and "table template" not in line:  # sky130 ff hack
+            verbose(line.strip())
+        self.log_file.write(line)
+
+    def close(self):
+        """
+        Closes the report currently being written, if any.
+        """
+        if self._current_report is not None:
+            self._current_report.close()
+        self._current_report = None
+
+
+@dataclass
+class SubprocessJob:
+    """
+    A subprocess to be run as part of a group by :meth:`Step.run_subprocesses`.
+
+    :param cmd: A list of variables, representing a program and its arguments.
+    :param log_to: An optional override for the log path from ``get_log_path``.
+    :param report_dir: The directory in which to create reports. Defaults to
+        the step directory.
+    :param env: The environment of the process. If ``None``, the current
+        environment is inherited.
+    :param resources: The estimated resources used by the process. Defaults to
+        the result of :meth:`Step.get_resource_request`.
+    :param stdin: A file to use as the standard input of the process.
+    :param stops_group: See :attr:`openlane.steps.supervisor.ProcessJob.stops_group`.
+    """
+
+    cmd: Sequence[Union[str, os.PathLike]]
+    log_to: Optional[Union[str, os.PathLike]] = None
+    report_dir: Optional[Union[str, os.PathLike]] = None
+    env: Optional[Dict[str, str]] = None
+    resources: Optional[ResourceRequest] = None
+    stdin: Optional[Union[str, os.PathLike]] = None
+    stops_group: Optional[Callable[[str], bool]] = None
+
+
 class Step(ABC):
     """
     An abstract base class for Step objects.
@@ -161,6 +320,28 @@ class Step(ABC):
     :cvar config_vars: A list of configuration :class:`openlane.config.Variable` objects
         to be used to alter the behavior of this Step.
 
+    :cvar cacheable: Whether the results of this step may be stored in and
+        restored from the step cache (see :class:`openlane.steps.StepCache`).
+
+        Steps that read anything other than their configuration, inputs,
+        :attr:`input_metrics` and the tools they invoke, or that have side
+        effects, should set this to ``False``.
+
+    :cvar input_metrics: The metrics of the input state that the results of
+        this step depend on, which are covered by the key of its results in
+        the step cache.
+
+    :cvar uses_entire_config: Whether this step may read configuration
+        variables other than its own ``config_vars``, the universal flow
+        variables and the PDK variables, e.g. by exporting the entire
+        configuration to its scripts, in which case every configuration
+        variable is covered by the key of its results in the step cache.
+
+    :cvar resource_request: An estimate of the threads and peak memory used
+        while this step runs, used to admit it against the machine-wide budget
+        of the :class:`openlane.steps.scheduler.ResourceScheduler`. See
+        :meth:`get_resource_request`.
+
     :ivar state_out:
         The last output state from running this step object, if it exists.
 
@@ -181,6 +362,14 @@ class Step(ABC):
         exists.
 
         If :meth:`start` is called again, the reference is destroyed.
+
+    :ivar executables:
+        The set of executables invoked by :meth:`run_subprocess` and
+        :meth:`run_subprocesses` during the last run of this step object.
+
+    :ivar process_stats:
+        The resource usage of every subprocess run by :meth:`run_subprocesses`
+        during the last run of this step object, by key.
     """
 
     class _FlowType(ABC):
@@ -190,17 +379,30 @@ class Step(ABC):
         """
 
         toolbox: Optional[Toolbox] = None
+        run_dir: Optional[str] = None
+        incremental: bool = False
+        delta_states: bool = False
 
         @abstractmethod
         def dir_for_step(self, step: Step) -> str:
             pass
 
+        def find_step_result(self, step: Step, key: str) -> Optional[str]:
+            return None
+
     # Class Variables
     inputs: ClassVar[List[DesignFormat]]
     outputs: ClassVar[List[DesignFormat]]
     flow_control_variable: ClassVar[Optional[str]] = None
     flow_control_msg: ClassVar[Optional[str]] = None
     config_vars: ClassVar[List[Variable]] = []
+    cacheable: ClassVar[bool] = True
+    input_metrics: ClassVar[List[str]] = []
+    uses_entire_config: ClassVar[bool] = False
+    resource_request: ClassVar[ResourceRequest] = ResourceRequest(
+        threads=1,
+        memory=256 * 1024 * 1024,
+    )
 
     # Instance Variables
     id: str = NotImplemented
@@ -213,6 +415,8 @@ class Step(ABC):
     state_out: Optional[State] = None
     start_time: Optional[float] = None
     end_time: Optional[float] = None
+    executables: Set[str]
+    process_stats: Dict[str, ProcessStats]
 
     # These are mutable class variables. However, they will only be used
     # when steps are run outside of a Flow, pretty much.
@@ -302,6 +506,9 @@ class Step(ABC):
         else:
             state_in_future = state_in
         self.state_in = state_in_future
+        self.executables = set()
+        self.process_stats = {}
+        self._reserved = ResourceRequest(0)
 
     def __init_subclass__(cls):
         if not isabstract(cls):
@@ -470,12 +677,6 @@ class Step(ABC):
                     )
                 return state_in_result.copy()
 
-        mkdirp(self.step_dir)
-        with open(os.path.join(self.step_dir, "state_in.json"), "w") as f:
-            f.write(state_in_result.dumps())
-
-        self.start_time = time.time()
-
         for input in self.inputs:
             value = state_in_result[input]
             if value is None:
@@ -483,15 +684,59 @@ class Step(ABC):
                     f"{type(self).__name__}: missing required input '{input.name}'"
                 )
 
-        try:
-            views_updates, metrics_updates = self.run(state_in_result, **kwargs)
-        except subprocess.CalledProcessError as e:
-            if e.returncode is not None and e.returncode < 0:
-                raise StepSignalled(
-                    f"{self.name}: Interrupted ({Signals(-e.returncode).name})"
-                )
-            else:
-                raise StepError(f"{self.name}: subprocess {e.args} failed")
+        self.executables = set()
+        self.process_stats = {}
+
+        step_cache = None
+        step_key = None
+        restored = None
+        incremental = self.flow is not None and self.flow.incremental
+        if self.cacheable and len(kwargs) == 0:
+            # Hashing the inputs of a step can take a while for large designs,
+            # so keys are only computed if they are going to be used.
+            step_cache = get_step_cache()
+            if step_cache is not None or incremental:
+                step_key = get_step_key(self, state_in_result)
+
+        if step_key is not None and self.flow is not None and incremental:
+            if previous_step_dir := self.flow.find_step_result(self, step_key):
+                if reused := self._load_result(previous_step_dir, state_in_result):
+                    info(
+                        f"The configuration and inputs of {self.id} are unchanged: reusing the results at '{os.path.relpath(previous_step_dir)}'."
+                    )
+                    self.start_time = self.end_time = time.time()
+                    self.state_out = reused
+                    return self.state_out
+
+        mkdirp(self.step_dir)
+        state_in_result.save(
+            os.path.join(self.step_dir, "state_in.json"),
+            parent=self._get_delta_parent(state_in_result),
+        )
+
+        self.start_time = time.time()
+
+        if step_cache is not None and step_key is not None:
+            restored = step_cache.restore(self, step_key)
+
+        if restored is not None:
+            info(f"Restored the results of {self.id} from the step cache.")
+            views_updates, metrics_updates = restored
+        else:
+            scheduler = get_scheduler()
+            self._reserved = scheduler.acquire(self.get_resource_request())
+            try:
+                views_updates, metrics_updates = self.run(state_in_result, **kwargs)
+            except subprocess.CalledProcessError as e:
+                if e.returncode is not None and e.returncode < 0:
+                    raise StepSignalled(
+                        f"{self.name}: Interrupted ({Signals(-e.returncode).name})"
+                    )
+                else:
+                    raise StepError(f"{self.name}: subprocess {e.args} failed")
+            finally:
+                scheduler.release(self._reserved)
+                self._reserved = ResourceRequest(0)
 
         metrics = GenericImmutableDict(
             state_in_result.metrics, overrides=metrics_updates
@@ -507,14 +752,62 @@ class Step(ABC):
             raise StepException(f"Step {self.name} generated invalid state: {e}")
         self.end_time = time.time()
 
-        with open(os.path.join(self.step_dir, "state_out.json"), "w") as f:
-            f.write(self.state_out.dumps())
+        self.state_out.save(
+            os.path.join(self.step_dir, "state_out.json"),
+            parent=self._get_delta_parent(state_in_result),
+        )
+
+        if step_key is not None:
+            with open(os.path.join(self.step_dir, STEP_KEY_FILE), "w") as f:
+                f.write(step_key)
+
+        if step_cache is not None and step_key is not None and restored is None:
+            if not step_cache.save(
+                self,
+                step_key,
+                views_updates,
+                metrics_updates,
+                self.executables,
+            ):
+                verbose(f"The results of {self.id} could not be cached.")
 
         if self.config.is_interactive():
             LastState = self.state_out
 
         return self.state_out
 
+    def _get_delta_parent(self, state: State) -> Optional[State]:
+        # State files are only saved as deltas if the flow asks for it, and only
+        # against files in the same run directory, which are not modified or
+        # removed independently of it.
+        if (
+            self.flow is None
+            or not self.flow.delta_states
+            or self.flow.run_dir is None
+            or state.json_path is None
+        ):
+            return None
+        run_dir = os.path.abspath(self.flow.run_dir)
+        if os.path.commonpath([run_dir, state.json_path]) != run_dir:
+            return None
+        return state
+
+    def _load_result(self, step_dir: str, state_in: State) -> Optional[State]:
+        # Applies the updates a previous run of this step made to its own input
+        # state to the current input state.
+        try:
+            previous_state_in = State.load(
+                os.path.join(step_dir, "state_in.json"),
+                validate_path=False,
+            )
+            previous_state_out = State.load(os.path.join(step_dir, "state_out.json"))
+        except (OSError, ValueError, InvalidState):
+            return None
+        return apply_updates(
+            state_in,
+            [get_updates(previous_state_in, previous_state_out)],
+        )
+
     @abstractmethod
     def run(self, state_in: State, **kwargs) -> Tuple[ViewsUpdate, MetricsUpdate]:
         """
@@ -536,6 +829,16 @@ class Step(ABC):
         """
         pass
 
+    def get_resource_request(self) -> ResourceRequest:
+        """
+        :returns: An estimate of the threads and peak memory used by this step,
+            or by each of the subprocesses it runs with :meth:`run_subprocesses`.
+
+            Defaults to :attr:`resource_request`. Override this if the estimate
+            depends on the configuration, e.g. a configurable thread count.
+        """
+        return self.resource_request
+
     def get_log_path(self) -> str:
         return os.path.join(self.step_dir, f"{slugify(self.id)}.log")
 
@@ -551,7 +854,8 @@ class Step(ABC):
         """
         A helper function for :class:`Step` objects to run subprocesses.
 
-        The output from the subprocess is processed line-by-line.
+        The output from the subprocess is processed line-by-line in constant
+        memory using an :class:`OutputProcessor`.
 
         :param cmd: A list of variables, representing a program and its arguments,
             similar to how you would use it in a shell.
@@ -568,11 +872,9 @@ class Step(ABC):
             report_dir = self.step_dir
         mkdirp(report_dir)
 
-        generated_metrics: Dict[str, Any] = {}
-
         log_path = log_to or self.get_log_path()
-        log_file = open(log_path, "w")
         cmd_str = [str(arg) for arg in cmd]
+        self.executables.add(cmd_str[0])
 
         with open(os.path.join(self.step_dir, "COMMANDS"), "a+") as f:
             f.write(" ".join(cmd_str))
@@ -585,49 +887,118 @@ class Step(ABC):
             kwargs["stdout"] = subprocess.PIPE
         if "stderr" not in kwargs:
             kwargs["stderr"] = subprocess.STDOUT
-        process = subprocess.Popen(
-            cmd_str,
+
+        with open(
+            log_path,
+            "w",
             encoding="utf8",
-            **kwargs,
-        )
-        lines = ""
-        if process_stdout := process.stdout:
-            current_rpt = None
-            while line := process_stdout.readline():
-                lines += line
-                if self.step_dir is not None and line.startswith(REPORT_START_LOCUS):
-                    report_name = line[len(REPORT_START_LOCUS) + 1 :].strip()
-                    report_path = os.path.join(report_dir, report_name)
-                    current_rpt = open(report_path, "w")
-                elif line.startswith(REPORT_END_LOCUS):
-                    if current_rpt is not None:
-                        current_rpt.close()
-                    current_rpt = None
-                else:
-                    if line.startswith(METRIC_LOCUS):
-                        command, name, value = line.split(" ", maxsplit=3)
-                        metric_type: Union[Type[str], Type[int], Type[float]] = str
-                        if command.endswith("_I"):
-                            metric_type = int
-                        elif command.endswith("_F"):
-                            metric_type = float
-                        generated_metrics[name] = metric_type(value)
-                    elif current_rpt is not None:
-                        # No echo- the timing reports especially can be very large
-                        # and terminal emulators will slow the flow down.
-                        current_rpt.write(line)
-                    elif not silent and "table template" not in line:  # sky130 ff hack
-                        verbose(line.strip())
-                    log_file.write(line)
-        returncode = process.wait()
-        split_lines = lines.split("\n")
+            buffering=OutputProcessor.buffer_size,
+        ) as log_file:
+            processor = OutputProcessor(
+                log_file,
+                report_dir=report_dir,
+                silent=silent,
+            )
+            process = subprocess.Popen(
+                cmd_str,
+                encoding="utf8",
+                **kwargs,
+            )
+            if process_stdout := process.stdout:
+                for line in process_stdout:
+                    processor.process(line)
+            processor.close()
+            returncode = process.wait()
+
         if returncode != 0:
             if returncode > 0:
-                err("\n".join(split_lines[-10:]))
+                err("".join(processor.tail).rstrip("\n"))
                 err(f"Log file: {log_path}")
             raise subprocess.CalledProcessError(returncode, process.args)
 
-        return generated_metrics
+        return processor.metrics
+
+    @internal
+    def run_subprocesses(
+        self,
+        jobs: Mapping[str, SubprocessJob],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        A helper function for :class:`Step` objects to run a number of
+        subprocesses simultaneously, e.g. one per timing corner.
+
+        The subprocesses are all supervised by one event loop (see
+        :class:`openlane.steps.supervisor.ProcessSupervisor`) rather than one
+        thread each. Their output is processed like that of :meth:`run_subprocess`,
+        but is never echoed to the terminal.
+
+        If any of the subprocesses fails, the others are terminated. The others
+        are also terminated once a subprocess is found to stop the group (see
+        :attr:`SubprocessJob.stops_group`); the metrics they generated until
+        then are still returned.
+
+        :param jobs: The subprocesses to run, by a unique name, e.g. the corner.
+        :returns: The metrics generated by each subprocess, by name.
+        :raises subprocess.CalledProcessError: If any of the processes has a non-zero
+            exit, this exception will be raised.
+        """
+        processors: Dict[str, OutputProcessor] = {}
+        log_paths: Dict[str, str] = {}
+        process_jobs: Dict[str, ProcessJob] = {}
+        try:
+            for key, job in jobs.items():
+                report_dir = job.report_dir or self.step_dir
+                mkdirp(report_dir)
+
+                cmd_str = [str(arg) for arg in job.cmd]
+                self.executables.add(cmd_str[0])
+                with open(os.path.join(self.step_dir, "COMMANDS"), "a+") as f:
+                    f.write(" ".join(cmd_str))
+                    f.write("\n")
+
+                log_paths[key] = str(job.log_to or self.get_log_path())
+                processors[key] = OutputProcessor(
+                    open(
+                        log_paths[key],
+                        "w",
+                        encoding="utf8",
+                        buffering=OutputProcessor.buffer_size,
+                    ),
+                    report_dir=report_dir,
+                    silent=True,
+                )
+                process_jobs[key] = ProcessJob(
+                    cmd_str,
+                    on_line=processors[key].process,
+                    env=job.env,
+                    resources=job.resources or self.get_resource_request(),
+                    stdin=job.stdin,
+                    stops_group=job.stops_group,
+                )
+
+            # The subprocesses reserve their own resources: holding on to the
+            # step's reservation meanwhile would count it twice.
+            scheduler = get_scheduler()
+            scheduler.release(self._reserved)
+            try:
+                results = get_supervisor().run_group(process_jobs)
+            except ProcessGroupError as e:
+                if e.returncode > 0:
+                    err(f"{e.key}: " + "".join(processors[e.key].tail).rstrip("\n"))
+                    err(f"Log file: {log_paths[e.key]}")
+                raise e
+            finally:
+                self._reserved = scheduler.acquire(self._reserved)
+        finally:
+            for processor in processors.values():
+                processor.close()
+                processor.log_file.close()
+
+        for key, result in results.items():
+            self.process_stats[key] = result.stats
+            verbose(f"{key}: {result.stats}")
+
+        return {key: processor.metrics for key, processor in processors.items()}
 
     @internal
     def extract_env(self, kwargs) -> Tuple[dict, Dict[str, str]]:
@@ -678,16 +1049,30 @@ class Step(ABC):
             """
             Retrieves a Step type from the registry using a lookup string.
 
+            Modules defining built-in steps and plugins are imported on demand.
+
             :param name: The registered name of the Step. Case-insensitive.
             """
-            return Self._registry.get(name.lower())
+            key = name.lower()
+            if key not in Self._registry:
+                if module := get_step_module(name):
+                    importlib.import_module(module)
+                else:
+                    load_plugins()
+            return Self._registry.get(key)
 
         @classmethod
         def list(Self) -> List[str]:
             """
-            :returns: A list of IDs of all registered names.
+            :returns: A list of IDs of all built-in steps and of all registered
+                steps.
             """
-            return [cls.id for cls in Self._registry.values()]
+            result = list_steps()
+            known = {step_id.lower() for step_id in result}
+            for cls in Self._registry.values():
+                if cls.id.lower() not in known:
+                    result.append(cls.id)
+            return result
 
     factory = StepFactory
     get = StepFactory.get
@@ -0,0 +1,440 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import os
+import time
+import asyncio
+import threading
+import subprocess
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from .scheduler import ResourceRequest, get_scheduler
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass
+class ProcessStats:
+    """
+    Resource usage of a supervised process.
+
+    CPU time and peak memory are sampled from ``/proc`` while the process runs,
+    and are thus unavailable (``None``) on platforms without it. Processes that
+    exit between two samples may slightly under-report CPU time.
+
+    :param wall_time: The time between starting and reaping the process, in seconds.
+    :param cpu_time: The user and system CPU time used by the process, in seconds.
+    :param peak_rss: The peak resident set size of the process, in bytes.
+    """
+
+    wall_time: float = 0.0
+    cpu_time: Optional[float] = None
+    peak_rss: Optional[int] = None
+
+    def __str__(self) -> str:
+        elements = [f"wall time: {self.wall_time:.2f}s"]
+        if self.cpu_time is not None:
+            elements.append(f"CPU time: {self.cpu_time:.2f}s")
+        if self.peak_rss is not None:
+            elements.append(f"peak RSS: {self.peak_rss / (1024 * 1024):.1f} MiB")
+        return ", ".join(elements)
+
+
+@dataclass
+class ProcessJob:
+    """
+    A process to be run by a :class:`ProcessSupervisor`.
+
+    :param cmd: The program and its arguments.
+    :param on_line: A function called with every line of the process's combined
+        stdout/stderr, including the line ending. It is called on the
+        supervisor's event loop and should not block.
+    :param env: The environment of the process. If ``None``, the current
+        environment is inherited.
+    :param cwd: The working directory of the process.
+    :param resources: The estimated resources used by the process. If set,
+        the process is not started until they are admitted by the
+        :class:`openlane.steps.scheduler.ResourceScheduler`.
+    :param stdin: A file to use as the standard input of the process. If
+        ``None``, the process has no standard input.
+    :param stops_group: A function called with every line of the process's
+        output. Once it returns ``True``, the other processes in the group run
+        by :meth:`ProcessSupervisor.run_group` are terminated, while this one
+        runs to completion, e.g. once a check has found what it was looking
+        for.
+    """
+
+    cmd: Sequence[Union[str, os.PathLike]]
+    on_line: Optional[Callable[[str], None]] = None
+    env: Optional[Mapping[str, str]] = None
+    cwd: Optional[Union[str, os.PathLike]] = None
+    resources: Optional[ResourceRequest] = None
+    stdin: Optional[Union[str, os.PathLike]] = None
+    stops_group: Optional[Callable[[str], bool]] = None
+
+
+@dataclass
+class ProcessResult:
+    """
+    :param returncode: The exit code of the process. Negative values indicate
+        that the process has been terminated by a signal.
+    :param stats: The resource usage of the process.
+    """
+
+    returncode: int
+    stats: ProcessStats = field(default_factory=ProcessStats)
+
+
+class ProcessGroupError(subprocess.CalledProcessError):
+    """
+    Raised when a process in a group run by :meth:`ProcessSupervisor.run_group`
+    fails. All other processes in the group are terminated.
+
+    :param key: The key of the failed job.
+    :param results: The results of all jobs that have finished, including the
+        failed one, by key.
+    """
+
+    def __init__(
+        self,
+        key: Any,
+        returncode: int,
+        cmd: Sequence[str],
+        results: Dict[Any, ProcessResult],
+    ):
+        super().__init__(returncode, cmd)
+        self.key = key
+        self.results = results
+
+
+def _sample(pid: int, stats: ProcessStats):
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf8") as f:
+            # The command name may contain spaces, but never a closing paren
+            fields = f.read().rsplit(")", maxsplit=1)[1].split()
+        # utime and stime are the 14th and 15th fields overall
+        stats.cpu_time = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        with open(f"/proc/{pid}/status", encoding="utf8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    stats.peak_rss = int(line.split()[1]) * 1024
+                    break
+    except (OSError, IndexError, ValueError):
+        pass
+
+
+async def _read_lines(stream: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    # Unlike StreamReader.readline, this also tolerates lines longer than
+    # the stream's buffer limit.
+    pending = b""
+    while True:
+        try:
+            chunk = await stream.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            if len(pending) + len(e.partial):
+                yield pending + e.partial
+            return
+        except asyncio.LimitOverrunError as e:
+            pending += await stream.readexactly(e.consumed)
+            continue
+        yield pending + chunk
+        pending = b""
+
+
+class ProcessSupervisor(object):
+    """
+    Runs and supervises subprocesses on a single asyncio event loop, which runs
+    in a background thread and is shared by all callers, so that any number of
+    concurrent processes can be supervised without dedicating a thread to each.
+
+    Back-pressure is applied on two levels:
+
+    * Every process's output is read through a buffer of ``buffer_limit``
+      bytes. When it is full, no more is read until ``on_line`` catches up,
+      and the process blocks once the operating system's pipe buffer is full.
+    * At most ``max_processes`` processes run at the same time; any others
+      wait for a slot before being started. Processes with a resource estimate
+      also wait to be admitted by the global
+      :class:`openlane.steps.scheduler.ResourceScheduler`.
+
+    :param max_processes: The maximum number of processes to run at the same
+        time. If ``None``, there is no limit.
+    :param sample_interval: The interval between resource usage samples,
+        in seconds.
+    :param buffer_limit: The size of the output buffer of each process.
+    :param termination_grace_period: When terminating a process, the number
+        of seconds to wait after ``SIGTERM`` before sending ``SIGKILL``.
+    """
+
+    def __init__(
+        self,
+        max_processes: Optional[int] = None,
+        sample_interval: float = 0.5,
+        buffer_limit: int = 64 * 1024,
+        termination_grace_period: float = 5.0,
+    ):
+        self.max_processes = max_processes
+        self.sample_interval = sample_interval
+        self.buffer_limit = buffer_limit
+        self.termination_grace_period = termination_grace_period
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="openlane-process-supervisor",
+                    daemon=True,
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _run_sync(self, coroutine: Awaitable[T]) -> T:
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._get_loop())  # type: ignore
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. KeyboardInterrupt: don't leave orphans behind
+            future.cancel()
+            raise
+
+    async def _acquire_slot(self):
+        if self.max_processes is None:
+            return
+        if self._slots is None:
+            # Created lazily, as it must be bound to the supervisor's loop
+            self._slots = asyncio.Semaphore(self.max_processes)
+        await self._slots.acquire()
+
+    def _release_slot(self):
+        if self._slots is not None:
+            self._slots.release()
+
+    async def _terminate(self, process: asyncio.subprocess.Process):
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), self.termination_grace_period)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        except ProcessLookupError:
+            pass
+
+    async def run_async(
+        self,
+        job: ProcessJob,
+        on_stop: Optional[Callable[[], None]] = None,
+    ) -> ProcessResult:
+        """
+        Runs a process to completion.
+
+        If the calling task is cancelled, the process is terminated.
+
+        :param job: The process to run.
+        :param on_stop: Called once if :attr:`ProcessJob.stops_group` returns
+            ``True`` for a line of the process's output.
+        :returns: The process's exit code and resource usage.
+        """
+        scheduler = get_scheduler()
+        reserved = await scheduler.acquire_async(job.resources or ResourceRequest(0))
+        try:
+            await self._acquire_slot()
+        except BaseException:
+            scheduler.release(reserved)
+            raise
+        try:
+            stats = ProcessStats()
+            start = time.perf_counter()
+            stdin: Any = subprocess.DEVNULL
+            if job.stdin is not None:
+                stdin = open(job.stdin, "rb")
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *[str(arg) for arg in job.cmd],
+                    stdin=stdin,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    env=None if job.env is None else dict(job.env),
+                    cwd=job.cwd,
+                    limit=self.buffer_limit,
+                )
+            finally:
+                if job.stdin is not None:
+                    stdin.close()
+
+            async def sample():
+                while True:
+                    _sample(process.pid, stats)
+                    await asyncio.sleep(self.sample_interval)
+
+            sampler = asyncio.ensure_future(sample())
+            try:
+                assert process.stdout is not None
+                stopped = False
+                async for line in _read_lines(process.stdout):
+                    if job.on_line is None and job.stops_group is None:
+                        continue
+                    text = line.decode("utf8", errors="replace")
+                    if job.on_line is not None:
+                        job.on_line(text)
+                    if (
+                        not stopped
+                        and job.stops_group is not None
+                        and job.stops_group(text)
+                    ):
+                        stopped = True
+                        if on_stop is not None:
+                            on_stop()
+                # Last sample before the process is reaped
+                _sample(process.pid, stats)
+                returncode = await process.wait()
+            except asyncio.CancelledError:
+                await self._terminate(process)
+                raise
+            finally:
+                sampler.cancel()
+
+            stats.wall_time = time.perf_counter() - start
+            return ProcessResult(returncode, stats)
+        finally:
+            self._release_slot()
+            scheduler.release(reserved)
+
+    def run(self, job: ProcessJob) -> ProcessResult:
+        """
+        Like :meth:`run_async`, but blocks the calling thread until the process
+        is done. May be called from any thread but the supervisor's.
+        """
+        return self._run_sync(self.run_async(job))
+
+    async def run_group_async(
+        self,
+        jobs: Mapping[K, ProcessJob],
+    ) -> Dict[K, ProcessResult]:
+        """
+        Runs a group of processes simultaneously. If any process fails, all
+        others in the group are terminated.
+
+        If a process is found to stop the group (see
+        :attr:`ProcessJob.stops_group`), all other processes that have not
+        done the same are terminated, and are missing from the results.
+
+        :param jobs: The processes to run, by an arbitrary key.
+        :returns: The results of all processes that ran to completion, by key.
+        :raises ProcessGroupError: If any process exits with a non-zero code.
+        """
+        stopped = asyncio.Event()
+        stopping: Set[K] = set()
+
+        def stopper(key: K) -> Callable[[], None]:
+            def stop():
+                stopping.add(key)
+                stopped.set()
+
+            return stop
+
+        tasks: Dict[asyncio.Future, K] = {
+            asyncio.ensure_future(self.run_async(job, stopper(key))): key
+            for key, job in jobs.items()
+        }
+        stop_waiter: asyncio.Future = asyncio.ensure_future(stopped.wait())
+        results: Dict[K, ProcessResult] = {}
+        pending: Set[asyncio.Future] = set(tasks.keys())
+        try:
+            while len(pending):
+                # Once the group is stopping, the finished waiter would make
+                # every wait return immediately
+                waiting = pending if stop_waiter.done() else pending | {stop_waiter}
+                done, _ = await asyncio.wait(
+                    waiting,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task is stop_waiter:
+                        continue
+                    pending.discard(task)
+                    if task.cancelled():
+                        continue
+                    key = tasks[task]
+                    result = task.result()
+                    results[key] = result
+                    if result.returncode != 0:
+                        raise ProcessGroupError(
+                            key,
+                            result.returncode,
+                            [str(arg) for arg in jobs[key].cmd],
+                            results,
+                        )
+                if stopped.is_set():
+                    for task in pending:
+                        if tasks[task] not in stopping:
+                            task.cancel()
+        finally:
+            stop_waiter.cancel()
+            for task in pending:
+                task.cancel()
+            if len(pending):
+                await asyncio.wait(pending)
+        return results
+
+    def run_group(self, jobs: Mapping[K, ProcessJob]) -> Dict[K, ProcessResult]:
+        """
+        Like :meth:`run_group_async`, but blocks the calling thread until all
+        processes are done. May be called from any thread but the supervisor's.
+        """
+        return self._run_sync(self.run_group_async(jobs))
+
+
+SUPERVISOR = ProcessSupervisor()
+
+
+def set_supervisor(supervisor: ProcessSupervisor):
+    """
+    Sets the process supervisor used by all steps.
+    """
+    global SUPERVISOR
+    SUPERVISOR = supervisor
+
+
+def get_supervisor() -> ProcessSupervisor:
+    """
+    :returns: The process supervisor used by all steps.
+    """
+    global SUPERVISOR
+    return SUPERVISOR
@@ -34,7 +34,26 @@ from .step import ViewsUpdate, MetricsUpdate, Step, StepException
 from ..config import Keys
 from ..logging import info, warn
 from ..state import State, DesignFormat, Path
-from ..common import GenericDictEncoder, mkdirp, get_script_dir, get_openlane_root
+from ..common import (
+    GenericDictEncoder,
+    GenericImmutableDict,
+    mkdirp,
+    get_script_dir,
+    get_openlane_root,
+)
+
+#: The environment variable holding the path to the configuration file
+#: generated for Tcl scripts if ``TCL_CONFIG_MODE`` is ``file``.
+CONFIG_TCL = "CONFIG_TCL"
+
+
+def tcl_quote(value: str) -> str:
+    """
+    :returns: ``value`` as a double-quoted Tcl word, which evaluates to
+        ``value`` verbatim.
+    """
+    escaped = re.sub(r'([\\"$\[\]])', r"\\\1", value)
+    return f'"{escaped}"'
 
 
 def create_reproducible(
@@ -327,6 +346,8 @@ class TclStep(Step):
     """
 
     reproducibles_allowed: ClassVar[bool] = True
+    # The entire configuration is exported to the scripts: see prepare_env
+    uses_entire_config = True
 
     @staticmethod
     def value_to_tcl(value: Any) -> str:
@@ -363,6 +384,59 @@ class TclStep(Step):
         else:
             return str(value)
 
+    @staticmethod
+    def config_to_tcl(config: GenericImmutableDict[str, Any]) -> Dict[str, str]:
+        """
+        Converts all values of a configuration object that are not ``None`` to
+        Tcl as per :meth:`value_to_tcl`.
+
+        The result is memoized per configuration object. Copies of a
+        configuration share the result for the configuration they were copied
+        from, and only convert their own overrides.
+
+        :param config: The configuration object
+        :returns: A dictionary of Tcl values by key. It must not be modified.
+        """
+        memoized = getattr(config, "_tcl_values", None)
+        if memoized is not None:
+            return memoized
+
+        result: Dict[str, str]
+        if base := config._base:
+            result = TclStep.config_to_tcl(base).copy()
+            for key, value in config._own.items():
+                if value is None:
+                    result.pop(key, None)
+                else:
+                    result[key] = TclStep.value_to_tcl(value)
+        else:
+            result = {
+                key: TclStep.value_to_tcl(value)
+                for key, value in config.items()
+                if value is not None
+            }
+        setattr(config, "_tcl_values", result)
+        return result
+
+    @staticmethod
+    def tcl_config_file(values: Dict[str, str]) -> str:
+        """
+        :param values: A dictionary of Tcl values by key, e.g. from
+            :meth:`config_to_tcl`
+        :returns: A Tcl script setting each key as an environment variable,
+            unless it is already set, so the values a step exports itself take
+            precedence. Sourcing it again has no effect.
+        """
+        lines = [
+            "if { [info exists ::config_tcl_sourced] } { return }",
+            "set ::config_tcl_sourced 1",
+        ]
+        for key, value in values.items():
+            lines.append(
+                f"if {{ ![info exists ::env({key})] }} {{ set ::env({key}) {tcl_quote(value)} }}"
+            )
+        return "\n".join(lines) + "\n"
+
     @abstractmethod
     def get_script_path(self) -> str:
         """
@@ -386,7 +460,15 @@ class TclStep(Step):
         ``self.config`` variables and state inputs to environment variables so
         they may be used as inputs to the scripts.
 
-        The values are converted to strings as per :meth:`value_to_tcl`.
+        The values are converted to strings as per :meth:`config_to_tcl`.
+
+        If ``TCL_CONFIG_MODE`` is ``file``, the configuration is instead written
+        to ``config.tcl`` in the step directory, the path of which is exported
+        as ``CONFIG_TCL``, and only the variables declared by the step (and
+        the PDK and design name) are exported. ``config.tcl`` does not override
+        environment variables, so in both modes, values in ``env`` are replaced
+        by the configuration, while values a step adds to the environment
+        after this call take precedence over it.
 
         :param env: The input environment dictionary
         :param state: The input state
@@ -407,11 +489,23 @@ class TclStep(Step):
         macro_lefs = self.toolbox.get_macro_views(self.config, DesignFormat.LEF)
         env["MACRO_LEFS"] = " ".join([str(lef) for lef in macro_lefs])
 
-        for element in self.config.keys():
-            value = self.config[element]
-            if value is None:
-                continue
-            env[element] = TclStep.value_to_tcl(value)
+        tcl_values = TclStep.config_to_tcl(self.config)
+        if self.config["TCL_CONFIG_MODE"].value == "file":
+            config_path = os.path.join(self.step_dir, "config.tcl")
+            with open(config_path, "w", encoding="utf8") as f:
+                f.write(TclStep.tcl_config_file(tcl_values))
+            env[CONFIG_TCL] = os.path.abspath(config_path)
+
+            exported = [variable.name for variable in self.config_vars]
+            exported += list(vars(Keys).values())
+            exported.append("DESIGN_NAME")
+            # As with env.update() below
+            exported += [key for key in env if key in tcl_values]
+            for key in exported:
+                if key in tcl_values:
+                    env[key] = tcl_values[key]
+        else:
+            env.update(tcl_values)
 
         for input in self.inputs:
             key = f"CURRENT_{input.name}"
@@ -426,6 +520,27 @@ class TclStep(Step):
 
         return env
 
+    def run_script(
+        self,
+        command: List[str],
+        env: Dict[str, str],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Runs the command returned by :meth:`get_command` using
+        :meth:`run_subprocess`.
+
+        Subclasses may override this to run the script some other way, e.g. in
+        a persistent tool session.
+
+        :param command: The command
+        :param env: The environment prepared by :meth:`prepare_env`
+        :param **kwargs: Passed on to :meth:`run_subprocess`
+        :returns: The metrics generated by the script
+        :raises subprocess.CalledProcessError: If the script fails
+        """
+        return self.run_subprocess(command, env=env, **kwargs)
+
     def run(self, state_in: State, **kwargs) -> Tuple[ViewsUpdate, MetricsUpdate]:
         """
         This overriden :meth:`run` function prepares configuration variables and
@@ -457,22 +572,24 @@ class TclStep(Step):
         env = self.prepare_env(env, state_in)
 
         try:
-            generated_metrics = self.run_subprocess(
-                command,
-                env=env,
-                **kwargs,
-            )
+            generated_metrics = self.run_script(command, env=env, **kwargs)
         except subprocess.CalledProcessError as e:
             if (
                 e.returncode is not None
                 and e.returncode > 0
                 and self.reproducibles_allowed
             ):
+                reproducible_env = env
+                if CONFIG_TCL in env:
+                    # config.tcl does not override the environment
+                    reproducible_env = TclStep.config_to_tcl(self.config).copy()
+                    reproducible_env.update(env)
+                    del reproducible_env[CONFIG_TCL]
                 reproducible_folder = create_reproducible(
                     self.config["DESIGN_DIR"],
                     self.step_dir,
                     command,
-                    env,
+                    reproducible_env,
                     self.get_script_path(),
                 )
                 info(
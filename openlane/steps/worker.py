@@ -0,0 +1,122 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A step worker for :class:`openlane.steps.executor.SocketStepExecutor`.
+
+Usage: OPENLANE_WORKER_AUTHKEY=<key> python3 -m openlane.steps.worker <host>:<port>
+"""
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client
+from typing import Optional, Tuple
+
+import click
+
+from .. import common
+from ..logging import err, verbose
+from .cache import StepCache, set_step_cache
+from .executor import AUTHKEY_ENV, run_work_item
+from .scheduler import GiB, ResourceScheduler, get_physical_memory, set_scheduler
+from .step import StepException
+from .supervisor import ProcessSupervisor, set_supervisor
+from .session import SessionPool, set_session_pool
+
+
+def serve(address: Tuple[str, int], authkey: bytes):
+    """
+    Connects to a :class:`openlane.steps.executor.SocketStepExecutor` and runs
+    the steps it sends until it disconnects or shuts down.
+
+    :param address: The ``(host, port)`` the executor listens on.
+    :param authkey: The executor's authentication key.
+    """
+    with Client(address, authkey=authkey) as connection:
+        while True:
+            try:
+                payload = connection.recv()
+            except EOFError:
+                return
+            if payload is None:
+                return
+            result = run_work_item(payload)
+            try:
+                connection.send(result)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                # Unpicklable exception
+                connection.send(
+                    {
+                        "error": StepException(
+                            f"{type(result['error']).__name__}: {result['error']}"
+                        )
+                    }
+                )
+            verbose(f"Finished {payload['id']}.")
+
+
+@click.command()
+@click.option(
+    "-j",
+    "--jobs",
+    type=int,
+    default=os.cpu_count(),
+    help="The maximum number of threads or processes that can be used by this worker.",
+)
+@click.option(
+    "--max-memory",
+    type=float,
+    default=None,
+    help="The maximum memory, in GiB, that tools run by this worker are estimated to use at the same time. Defaults to the machine's physical memory.",
+)
+@click.option(
+    "--step-cache-dir",
+    type=click.Path(file_okay=False, dir_okay=True),
+    default=None,
+    help="If set, results of steps run by this worker are cached in this directory.",
+)
+@click.option(
+    "--openroad-sessions/--no-openroad-sessions",
+    default=False,
+    help="Run OpenROAD steps in persistent sessions.",
+)
+@click.argument("address")
+def cli(
+    jobs: int,
+    max_memory: Optional[float],
+    step_cache_dir: Optional[str],
+    openroad_sessions: bool,
+    address: str,
+):
+    authkey = os.getenv(AUTHKEY_ENV)
+    if authkey is None:
+        err(f"{AUTHKEY_ENV} is not set.")
+        exit(-1)
+    host, port = address.rsplit(":", maxsplit=1)
+
+    common.set_tpe(ThreadPoolExecutor(max_workers=jobs))
+    set_supervisor(ProcessSupervisor(max_processes=jobs))
+    memory_budget = get_physical_memory()
+    if max_memory is not None:
+        memory_budget = int(max_memory * GiB)
+    set_scheduler(ResourceScheduler(jobs, memory_budget))
+    if step_cache_dir is not None:
+        set_step_cache(StepCache(step_cache_dir))
+    if openroad_sessions:
+        set_session_pool(SessionPool())
+
+    serve((host, int(port)), authkey.encode("ascii"))
+
+
+if __name__ == "__main__":
+    cli()
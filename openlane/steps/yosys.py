@@ -20,6 +20,7 @@ from typing import List, Optional, Tuple
 
 from .tclstep import TclStep
 from .step import ViewsUpdate, MetricsUpdate, Step
+from .scheduler import ResourceRequest, GiB
 from .common_variables import constraint_variables
 
 from ..config import Variable
@@ -60,6 +61,8 @@ def parse_yosys_check(
 
 
 class YosysStep(TclStep):
+    resource_request = ResourceRequest(threads=1, memory=GiB)
+
     config_vars = [
         Variable(
             "VERILOG_FILES",
@@ -73,7 +76,7 @@ class YosysStep(TclStep):
         ),
         Variable(
             "VERILOG_INCLUDE_DIRS",
-            Optional[List[str]],
+            Optional[List[Path]],
             "Specifies the Verilog `include` directories.",
         ),
         Variable(
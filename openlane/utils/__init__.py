@@ -11,5 +11,33 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from .drc import DRC
+import importlib
+from typing import TYPE_CHECKING
+
 from .toolbox import Toolbox
+
+# Only needed by some steps and reports, so imported on demand, see __getattr__
+_lazy_attributes = {
+    "DRC": ("drc", "DRC"),
+    "DRCStore": ("drc", "DRCStore"),
+    "DRCIndex": ("drc_index", "DRCIndex"),
+    "TimingPathStore": ("sta", "TimingPathStore"),
+}
+
+if TYPE_CHECKING:
+    from .drc import DRC, DRCStore
+    from .drc_index import DRCIndex
+    from .sta import TimingPathStore
+
+
+def __getattr__(name: str):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    module_name, attribute = _lazy_attributes[name]
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_attributes))
@@ -13,13 +13,39 @@
 # limitations under the License.
 import io
 import re
+import sys
 import json
+import struct
+from array import array
 from enum import IntEnum
 from decimal import Decimal
 from dataclasses import dataclass, field, asdict
-from typing import List, Optional, Tuple, Dict
+from xml.sax.saxutils import escape
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 BoundingBox = Tuple[Decimal, Decimal, Decimal, Decimal]  # microns
+DBUBox = Tuple[int, int, int, int]  # database units
+
+MAGIC_SPLIT_LINE = "-" * 40
+MAGIC_RULE_PARSER = re.compile(r"\s*(.+?)\s*\((\w+)\.(\w+)\)\s*")
+
+STORE_MAGIC = b"OLDRCDB1"
+STORE_TRAILER = struct.Struct("<Q8s")
+STORE_VERSION = 1
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
 
 
 @dataclass
@@ -34,108 +60,745 @@ class Violation:
         return f"{self.layer}_{self.rule}"
 
 
-@dataclass
-class DRC:
-    module: str
-    violations: Dict[str, Violation]
+@dataclass(frozen=True)
+class DRCCategory:
+    """
+    A category of design rule violations in a :class:`DRCStore`.
+    """
 
-    @classmethod
-    def from_magic(
-        Self,
-        report: io.TextIOWrapper,
-        db_file: Optional[str] = None,
-    ) -> Tuple["DRC", int]:
-        class State(IntEnum):
-            drc = 0
-            data = 1
-            header = 10
+    layer: str
+    rule: str
+    description: str = ""
 
-        MAGIC_SPLIT_LINE = "-" * 40
-        MAGIC_RULE_PARSER = re.compile(r"\s*(.+)\s*\((\w+)\.(\w+)\)\s*")
+    @property
+    def category_name(self) -> str:
+        if self.rule == "":
+            return self.layer
+        return f"{self.layer}_{self.rule}"
 
-        violations: Dict[str, Violation] = {}
 
-        violation: Optional[Violation] = None
+class MagicReport:
+    """
+    Parses a Magic DRC report lazily, line by line.
+
+    Iterating over the object yields ``((layer, rule, description), coords)``
+    for every violation bounding box, where ``coords`` are the four coordinates
+    of the box in microns as written in the report, without the unit.
+
+    :param report: The lines of the report, e.g. an open text file.
+    :ivar module: The name of the checked cell, once it has been parsed.
+    """
+
+    class State(IntEnum):
+        drc = 0
+        data = 1
+        header = 10
+
+    def __init__(self, report: Iterable[str]):
+        self.report = report
+        self.module = "UNKNOWN"
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[str, str, str], List[str]]]:
+        State = MagicReport.State
+        category: Optional[Tuple[str, str, str]] = None
         state = State.header
-        module = "UNKNOWN"
-        counter = 0
-        bbox_count = 0
-        for line in report:
+        for line in self.report:
             line = line.strip()
             if ("[INFO]" in line) or (line == ""):
                 continue
 
             if MAGIC_SPLIT_LINE in line:
                 if state.value > 0:
-                    violation = None
+                    category = None
                     state = State.drc
                 else:
                     state = State.data
             elif state == State.header:
-                module = line
+                self.module = line
             elif state == State.drc:
                 if match := MAGIC_RULE_PARSER.match(line):
-                    description = match[1]
-                    layer = match[2]
-                    rule = match[3]
-                    violation = Violation(layer, rule, description)
-                    counter += 1
+                    category = (match[2], match[3], match[1])
             elif state == State.data:
-                coord_list = [Decimal(coord[:-2]) for coord in line.split()]
-                bounding_box: BoundingBox = (
-                    coord_list[0],
-                    coord_list[1],
-                    coord_list[2],
-                    coord_list[3],
-                )
-                if violation is None:
+                if category is None:
                     raise ValueError("Malformed Magic report")
-                else:
-                    violation.bounding_boxes.append(bounding_box)
-                    violations[violation.category_name] = violation
-                    bbox_count += 1
+                yield category, line.replace("um", "").split()
+
 
-        return (Self(module, violations), bbox_count)
+def dbu_box_format(dbu_per_micron: int) -> str:
+    """
+    :returns: A ``%``-format string for the four coordinates of a box, in
+        microns, with enough decimal places to resolve a single database
+        unit.
+    """
+    digits = len(str(dbu_per_micron - 1)) if dbu_per_micron > 1 else 0
+    return ",".join([f"%.{digits}f"] * 2) + ";" + ",".join([f"%.{digits}f"] * 2)
+
+
+def write_klayout_xml(
+    out: io.BufferedIOBase,
+    module: str,
+    categories: Iterable[Tuple[str, str]],
+    items: Iterable[Tuple[str, str]],
+    batch_size: int = 4096,
+):
+    """
+    Writes a KLayout report database incrementally.
+
+    :param out: A binary file to write the database to.
+    :param module: The name of the checked cell.
+    :param categories: ``(name, description)`` for every category of items.
+        Categories must be known before items are written.
+    :param items: ``(category name, box)`` for every item, where ``box`` is
+        formatted ``llx,lly;urx,ury`` in microns.
+    :param batch_size: The number of items to encode and write at a time.
+    """
+    cell = escape(module)
+    out.write(
+        f"<report-database><cells><cell><name>{cell}</name></cell></cells><categories>".encode(
+            "utf8"
+        )
+    )
+    for name, description in categories:
+        out.write(
+            f"<category><name>{escape(name)}</name><description>{escape(description)}</description></category>".encode(
+                "utf8"
+            )
+        )
+    out.write(b"</categories><items>")
+    batch: List[str] = []
+    escaped: Dict[str, str] = {}
+    for category, box in items:
+        if category not in escaped:
+            escaped[category] = escape(category)
+        batch.append(
+            f"<item><cell>{cell}</cell><category>{escaped[category]}</category><visited>false</visited><multiplicity>1</multiplicity><values><value>box: ({box})</value></values></item>"
+        )
+        if len(batch) >= batch_size:
+            out.write("".join(batch).encode("utf8"))
+            batch = []
+    out.write("".join(batch).encode("utf8"))
+    out.write(b"</items></report-database>")
+
+
+@dataclass
+class DRC:
+    module: str
+    violations: Dict[str, Violation]
+
+    @classmethod
+    def from_magic(
+        Self,
+        report: io.TextIOWrapper,
+        db_file: Optional[str] = None,
+    ) -> Tuple["DRC", int]:
+        """
+        Loads a Magic DRC report entirely into memory.
+
+        For large reports, prefer :func:`magic_report_to_store`.
+        """
+        violations: Dict[str, Violation] = {}
+        parsed = MagicReport(report)
+        bbox_count = 0
+        for (layer, rule, description), coords in parsed:
+            violation = Violation(layer, rule, description)
+            violation = violations.setdefault(violation.category_name, violation)
+            violation.bounding_boxes.append(
+                (
+                    Decimal(coords[0]),
+                    Decimal(coords[1]),
+                    Decimal(coords[2]),
+                    Decimal(coords[3]),
+                )
+            )
+            bbox_count += 1
+
+        return (Self(parsed.module, violations), bbox_count)
 
     def dumps(self):
         return json.dumps(asdict(self))
 
     def to_klayout_xml(self, out: io.BufferedIOBase):
-        from lxml import etree as ET
-
-        with ET.xmlfile(out, encoding="utf8", buffered=False) as xf:
-            with xf.element("report-database"):
-                # 1. Cells
-                with xf.element("cells"):
-                    with xf.element("cell"):
-                        name = ET.Element("name")
-                        name.text = self.module
-                        xf.write(name)
-                # 2. Categories
-                with xf.element("categories"):
-                    for _, violation in self.violations.items():
-                        with xf.element("category"):
-                            name = ET.Element("name")
-                            name.text = violation.category_name
-                            description = ET.Element("description")
-                            description.text = violation.description
-                            xf.write(name, description)
-                # 3. Items
-                with xf.element("items"):
-                    for _, violation in self.violations.items():
-                        for bounding_box in violation.bounding_boxes:
-                            with xf.element("item"):
-                                cell = ET.Element("cell")
-                                cell.text = self.module
-                                category = ET.Element("category")
-                                category.text = violation.category_name
-                                visited = ET.Element("visited")
-                                visited.text = "false"
-                                multiplicity = ET.Element("multiplicity")
-                                multiplicity.text = "1"
-                                xf.write(cell, category, visited, multiplicity)
-                                with xf.element("values"):
-                                    llx, lly, urx, ury = bounding_box
-                                    value = ET.Element("value")
-                                    value.text = f"box: ({llx},{lly};{urx},{ury})"
-                                    xf.write(value)
+        write_klayout_xml(
+            out,
+            self.module,
+            [
+                (violation.category_name, violation.description)
+                for violation in self.violations.values()
+            ],
+            (
+                (violation.category_name, f"{llx},{lly};{urx},{ury}")
+                for violation in self.violations.values()
+                for llx, lly, urx, ury in violation.bounding_boxes
+            ),
+        )
+
+
+class DRCStoreWriter:
+    """
+    Writes design rule violations to a columnar file incrementally, so the
+    violations never have to be held in memory all at once.
+
+    The file is made of blocks of up to ``block_size`` violations, each holding
+    the four coordinates of the violations' bounding boxes as little-endian
+    int64 columns in database units followed by an int32 column of category
+    indices. A JSON footer lists the categories and, for every block, its
+    offset, bounding box and violation count per category, which lets
+    :class:`DRCStore` skip blocks that cannot match a query.
+
+    :param path: The path of the file to create.
+    :param module: The name of the checked cell.
+    :param dbu_per_micron: The number of database units per micron.
+    :param block_size: The maximum number of violations per block.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        module: str = "UNKNOWN",
+        dbu_per_micron: int = 1000,
+        block_size: int = 65536,
+    ):
+        self.path = path
+        self.module = module
+        self.dbu_per_micron = dbu_per_micron
+        self.block_size = block_size
+        self.categories: List[DRCCategory] = []
+        self.count = 0
+        self._category_indices: Dict[Tuple[str, str], int] = {}
+        self._blocks: List[Dict[str, Any]] = []
+        self._columns = [array("q") for _ in range(4)]
+        self._category_column = array("i")
+        self._file: Optional[IO[bytes]] = open(path, "wb")
+        self._file.write(STORE_MAGIC)
+
+    def __enter__(self) -> "DRCStoreWriter":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def add_category(self, layer: str, rule: str, description: str = "") -> int:
+        """
+        Adds a category of violations if it does not already exist.
+
+        :returns: The index of the category, to be passed to :meth:`add`.
+        """
+        key = (layer, rule)
+        if (index := self._category_indices.get(key)) is None:
+            index = len(self.categories)
+            self.categories.append(DRCCategory(layer, rule, description))
+            self._category_indices[key] = index
+        return index
+
+    def add(self, category: int, llx: int, lly: int, urx: int, ury: int):
+        """
+        Adds a violation.
+
+        :param category: The index of the violation's category.
+        :param llx: The coordinates of the violation's bounding box in
+            database units.
+        """
+        llx_column, lly_column, urx_column, ury_column = self._columns
+        llx_column.append(llx)
+        lly_column.append(lly)
+        urx_column.append(urx)
+        ury_column.append(ury)
+        self._category_column.append(category)
+        self.count += 1
+        if len(self._category_column) >= self.block_size:
+            self._flush()
+
+    def _flush(self):
+        assert self._file is not None
+        rows = len(self._category_column)
+        if rows == 0:
+            return
+        llx_column, lly_column, urx_column, ury_column = self._columns
+        counts: Dict[int, int] = {}
+        for category in self._category_column:
+            counts[category] = counts.get(category, 0) + 1
+        self._blocks.append(
+            {
+                "offset": self._file.tell(),
+                "rows": rows,
+                "bbox": [
+                    min(llx_column),
+                    min(lly_column),
+                    max(urx_column),
+                    max(ury_column),
+                ],
+                "counts": sorted(counts.items()),
+            }
+        )
+        for column in self._columns + [self._category_column]:
+            if not _LITTLE_ENDIAN:
+                column.byteswap()
+            self._file.write(column.tobytes())
+        if rows % 2 == 1:
+            # Keep blocks aligned to eight bytes
+            self._file.write(b"\0" * 4)
+        self._columns = [array("q") for _ in range(4)]
+        self._category_column = array("i")
+
+    def close(self):
+        """
+        Writes the remaining violations and the footer, then closes the file.
+        """
+        if self._file is None:
+            return
+        self._flush()
+        footer = json.dumps(
+            {
+                "version": STORE_VERSION,
+                "module": self.module,
+                "dbu_per_micron": self.dbu_per_micron,
+                "count": self.count,
+                "categories": [
+                    [category.layer, category.rule, category.description]
+                    for category in self.categories
+                ],
+                "blocks": self._blocks,
+            }
+        ).encode("utf8")
+        self._file.write(footer)
+        self._file.write(STORE_TRAILER.pack(len(footer), STORE_MAGIC))
+        self._file.close()
+        self._file = None
+
+
+class DRCStore:
+    """
+    Reads a file written by :class:`DRCStoreWriter`. Only the footer is read
+    when the store is opened: violations are read one block at a time as they
+    are queried.
+
+    :param path: The path of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: IO[bytes] = open(path, "rb")
+        try:
+            magic = self._file.read(len(STORE_MAGIC))
+            self._file.seek(-STORE_TRAILER.size, io.SEEK_END)
+            footer_size, trailer_magic = STORE_TRAILER.unpack(
+                self._file.read(STORE_TRAILER.size)
+            )
+            if magic != STORE_MAGIC or trailer_magic != STORE_MAGIC:
+                raise ValueError(f"'{path}' is not a DRC store")
+            self._file.seek(-STORE_TRAILER.size - footer_size, io.SEEK_END)
+            footer = json.loads(self._file.read(footer_size))
+        except Exception:
+            self._file.close()
+            raise
+        if footer["version"] != STORE_VERSION:
+            self._file.close()
+            raise ValueError(
+                f"Unsupported DRC store version {footer['version']} in '{path}'"
+            )
+        self.module: str = footer["module"]
+        self.dbu_per_micron: int = footer["dbu_per_micron"]
+        self.count: int = footer["count"]
+        self.categories: List[DRCCategory] = [
+            DRCCategory(*category) for category in footer["categories"]
+        ]
+        self._blocks: List[Dict[str, Any]] = footer["blocks"]
+
+    def __enter__(self) -> "DRCStore":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    @property
+    def bbox(self) -> Optional[DBUBox]:
+        """
+        The bounding box of all violations, or ``None`` if there are none.
+        Only reads the footer.
+        """
+        if len(self._blocks) == 0:
+            return None
+        bboxes = [block["bbox"] for block in self._blocks]
+        return (
+            min(bbox[0] for bbox in bboxes),
+            min(bbox[1] for bbox in bboxes),
+            max(bbox[2] for bbox in bboxes),
+            max(bbox[3] for bbox in bboxes),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """
+        :returns: The number of violations per category name, for categories
+            with at least one violation. Only reads the footer.
+        """
+        counts: Dict[str, int] = {}
+        for block in self._blocks:
+            for index, count in block["counts"]:
+                name = self.categories[index].category_name
+                counts[name] = counts.get(name, 0) + count
+        return counts
+
+    def iter_blocks(self) -> Iterator[List[Sequence[int]]]:
+        """
+        Iterates over the blocks of the store.
+
+        :returns: An iterator of the columns of every block: ``llx``, ``lly``,
+            ``urx``, ``ury`` and the index of the category in
+            :attr:`categories`.
+        """
+        for block in self._blocks:
+            yield self._read_block(block)
+
+    def _read_block(self, block: Dict[str, Any]) -> List[Sequence[int]]:
+        rows = block["rows"]
+        self._file.seek(block["offset"])
+        data = self._file.read(rows * 36)
+        columns: List[Sequence[int]] = []
+        for i, typecode in enumerate("qqqqi"):
+            column = array(typecode)
+            column.frombytes(data[i * rows * 8 : i * rows * 8 + rows * column.itemsize])
+            if not _LITTLE_ENDIAN:
+                column.byteswap()
+            columns.append(column)
+        return columns
+
+    def query(
+        self,
+        layer: Optional[str] = None,
+        rule: Optional[str] = None,
+        region: Optional[DBUBox] = None,
+    ) -> Iterator[Tuple[DRCCategory, DBUBox]]:
+        """
+        Iterates over violations, optionally filtered.
+
+        :param layer: Only return violations on this layer.
+        :param rule: Only return violations of this rule.
+        :param region: Only return violations whose bounding boxes intersect
+            or touch this box, in database units.
+        :returns: An iterator of ``(category, (llx, lly, urx, ury))`` tuples.
+        """
+        wanted: Set[int] = {
+            i
+            for i, category in enumerate(self.categories)
+            if (layer is None or category.layer == layer)
+            and (rule is None or category.rule == rule)
+        }
+        all_categories = len(wanted) == len(self.categories)
+        for block in self._blocks:
+            if not all_categories and not any(
+                index in wanted for index, _ in block["counts"]
+            ):
+                continue
+            if region is not None and not _intersects(block["bbox"], region):
+                continue
+            llxs, llys, urxs, urys, indices = self._read_block(block)
+            for llx, lly, urx, ury, index in zip(llxs, llys, urxs, urys, indices):
+                if not all_categories and index not in wanted:
+                    continue
+                box = (llx, lly, urx, ury)
+                if region is not None and not _intersects(box, region):
+                    continue
+                yield self.categories[index], box
+
+    def to_klayout_xml(self, out: io.BufferedIOBase):
+        """
+        Writes the violations as a KLayout report database, one block at a
+        time.
+        """
+        counts = self.counts()
+        names = [category.category_name for category in self.categories]
+        box_format = dbu_box_format(self.dbu_per_micron)
+        dbu = self.dbu_per_micron
+
+        def items() -> Iterator[Tuple[str, str]]:
+            for llxs, llys, urxs, urys, indices in self.iter_blocks():
+                for llx, lly, urx, ury, index in zip(llxs, llys, urxs, urys, indices):
+                    yield names[index], box_format % (
+                        llx / dbu,
+                        lly / dbu,
+                        urx / dbu,
+                        ury / dbu,
+                    )
+
+        write_klayout_xml(
+            out,
+            self.module,
+            [
+                (category.category_name, category.description)
+                for category in self.categories
+                if category.category_name in counts
+            ],
+            items(),
+        )
+
+    def to_magic_report(self, out: IO[str]):
+        """
+        Writes the violations in the format of a Magic DRC report, reading the
+        store once per category.
+        """
+        digits = len(str(self.dbu_per_micron - 1)) if self.dbu_per_micron > 1 else 0
+        box_format = " " + " ".join([f"%.{digits}fum"] * 4) + "\n"
+        dbu = self.dbu_per_micron
+        counts = self.counts()
+        out.write(f"{self.module}\n{MAGIC_SPLIT_LINE}\n")
+        for category in self.categories:
+            if category.category_name not in counts:
+                continue
+            out.write(
+                f"{category.description} ({category.layer}.{category.rule})\n{MAGIC_SPLIT_LINE}\n"
+            )
+            for _, (llx, lly, urx, ury) in self.query(category.layer, category.rule):
+                out.write(box_format % (llx / dbu, lly / dbu, urx / dbu, ury / dbu))
+            out.write(f"{MAGIC_SPLIT_LINE}\n")
+        out.write(f"[INFO] COUNT: {self.count}\n")
+
+
+def _intersects(a: Sequence[int], b: Sequence[int]) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def magic_report_to_store(
+    report: Iterable[str],
+    path: str,
+    dbu_per_micron: int = 1000,
+    block_size: int = 65536,
+) -> int:
+    """
+    Converts a Magic DRC report to a :class:`DRCStore` without holding the
+    violations in memory.
+
+    :param report: The lines of the report, e.g. an open text file.
+    :param path: The path of the store to create.
+    :param dbu_per_micron: The number of database units per micron.
+        Coordinates are rounded to the nearest database unit.
+    :param block_size: See :class:`DRCStoreWriter`.
+    :returns: The number of violations.
+    """
+    with DRCStoreWriter(
+        path,
+        dbu_per_micron=dbu_per_micron,
+        block_size=block_size,
+    ) as writer:
+        parsed = MagicReport(report)
+        indices: Dict[Tuple[str, str, str], int] = {}
+        for category, coords in parsed:
+            if (index := indices.get(category)) is None:
+                index = indices[category] = writer.add_category(*category)
+            llx, lly, urx, ury = coords
+            writer.add(
+                index,
+                round(float(llx) * dbu_per_micron),
+                round(float(lly) * dbu_per_micron),
+                round(float(urx) * dbu_per_micron),
+                round(float(ury) * dbu_per_micron),
+            )
+        writer.module = parsed.module
+        return writer.count
+
+
+def merge_magic_reports(
+    reports: Sequence[Tuple[str, DBUBox]],
+    path: str,
+    dbu_per_micron: int = 1000,
+    block_size: int = 65536,
+) -> int:
+    """
+    Merges the Magic DRC reports of the tiles of a layout into a
+    :class:`DRCStore`.
+
+    Every violation is clipped to the window of the tile that reported it.
+    Pieces of a violation that touch a seam between tiles are then stitched
+    back together with the abutting pieces from the neighboring tiles, and
+    violations reported by more than one tile are only kept once. Only the
+    pieces touching seams are held in memory.
+
+    :param reports: The path of the report of every tile and the window of the
+        tile, in database units. The windows must not overlap.
+    :param path: The path of the store to create.
+    :param dbu_per_micron: The number of database units per micron.
+    :param block_size: See :class:`DRCStoreWriter`.
+    :returns: The number of violations after merging.
+    """
+    if len(reports) == 0:
+        seams_x: Set[int] = set()
+        seams_y: Set[int] = set()
+    else:
+        windows = [window for _, window in reports]
+        extent = (
+            min(window[0] for window in windows),
+            min(window[1] for window in windows),
+            max(window[2] for window in windows),
+            max(window[3] for window in windows),
+        )
+        seams_x = {w[0] for w in windows} | {w[2] for w in windows}
+        seams_x -= {extent[0], extent[2]}
+        seams_y = {w[1] for w in windows} | {w[3] for w in windows}
+        seams_y -= {extent[1], extent[3]}
+
+    with DRCStoreWriter(
+        path,
+        dbu_per_micron=dbu_per_micron,
+        block_size=block_size,
+    ) as writer:
+        pending: Dict[int, Set[DBUBox]] = {}
+        for report_path, (wllx, wlly, wurx, wury) in reports:
+            with open(report_path, encoding="utf8") as f:
+                parsed = MagicReport(f)
+                for category, (llx, lly, urx, ury) in parsed:
+                    index = writer.add_category(*category)
+                    box = (
+                        max(round(float(llx) * dbu_per_micron), wllx),
+                        max(round(float(lly) * dbu_per_micron), wlly),
+                        min(round(float(urx) * dbu_per_micron), wurx),
+                        min(round(float(ury) * dbu_per_micron), wury),
+                    )
+                    if box[0] >= box[2] or box[1] >= box[3]:
+                        # Only touches the tile
+                        continue
+                    if (
+                        (box[0] == wllx and wllx in seams_x)
+                        or (box[2] == wurx and wurx in seams_x)
+                        or (box[1] == wlly and wlly in seams_y)
+                        or (box[3] == wury and wury in seams_y)
+                    ):
+                        pending.setdefault(index, set()).add(box)
+                    else:
+                        writer.add(index, *box)
+                writer.module = parsed.module
+        for index, boxes in pending.items():
+            for box in _stitch(boxes, seams_x, seams_y):
+                writer.add(index, *box)
+        return writer.count
+
+
+def _stitch(
+    boxes: Iterable[DBUBox], seams_x: Set[int], seams_y: Set[int]
+) -> List[DBUBox]:
+    # Merges boxes abutting on a seam that have the same extent along it,
+    # alternating between vertical and horizontal seams until nothing changes
+    result = list(boxes)
+    changed = True
+    while changed:
+        changed = False
+        for lo, hi, seams in [(0, 2, seams_x), (1, 3, seams_y)]:
+            other_lo, other_hi = 1 - lo, 3 - lo
+            groups: Dict[Tuple[int, int], List[DBUBox]] = {}
+            for box in result:
+                groups.setdefault((box[other_lo], box[other_hi]), []).append(box)
+            result = []
+            for group in groups.values():
+                group.sort(key=lambda box: box[lo])
+                current = list(group[0])
+                for box in group[1:]:
+                    if box[lo] == current[hi] and current[hi] in seams:
+                        current[hi] = box[hi]
+                        changed = True
+                    else:
+                        result.append((current[0], current[1], current[2], current[3]))
+                        current = list(box)
+                result.append((current[0], current[1], current[2], current[3]))
+    return result
+
+
+KLAYOUT_SHAPE_VALUES = {"box", "polygon", "edge", "edge-pair", "path"}
+KLAYOUT_VALUE_PARSER = re.compile(r"([\w-]+):\s*(.*)", re.DOTALL)
+KLAYOUT_POINT_LISTS = re.compile(r"\(([^()]*)\)")
+KLAYOUT_SEPARATORS = re.compile(r"[;,/|]")
+
+
+def klayout_xml_to_store(
+    xml_paths: Union[str, Sequence[str]],
+    path: str,
+    dbu_per_micron: int = 1000,
+    block_size: int = 65536,
+) -> int:
+    """
+    Converts one or more KLayout report databases to a :class:`DRCStore`
+    without holding their items in memory. Every category becomes a
+    :class:`DRCCategory` named after it with an empty rule, and every item is
+    stored as the bounding box of its geometric values.
+
+    :param xml_paths: The path to the KLayout report database, or a list of
+        paths to databases of the same cell to combine.
+    :param path: The path of the store to create.
+    :param dbu_per_micron: The number of database units per micron.
+        Coordinates are rounded to the nearest database unit.
+    :param block_size: See :class:`DRCStoreWriter`.
+    :returns: The number of items with a geometric value.
+    """
+    from lxml import etree as ET
+
+    def unquote(name: str) -> str:
+        name = name.strip()
+        if len(name) >= 2 and name[0] == name[-1] == "'":
+            return name[1:-1]
+        return name
+
+    with DRCStoreWriter(
+        path,
+        dbu_per_micron=dbu_per_micron,
+        block_size=block_size,
+    ) as writer:
+        if isinstance(xml_paths, str):
+            xml_paths = [xml_paths]
+        indices: Dict[str, int] = {}
+        events = (
+            event
+            for xml_path in xml_paths
+            for event in ET.iterparse(
+                xml_path,
+                events=("end",),
+                tag=("cell", "category", "item"),
+                huge_tree=True,
+            )
+        )
+        for _, element in events:
+            parent = element.getparent()
+            if parent is None:
+                continue
+            if element.tag == "cell" and parent.tag == "cells":
+                writer.module = element.findtext("name") or writer.module
+                continue
+            elif element.tag == "category" and parent.tag == "categories":
+                name = unquote(element.findtext("name") or "")
+                indices[name] = writer.add_category(
+                    name, "", element.findtext("description") or ""
+                )
+                continue
+            elif element.tag != "item":
+                continue
+
+            name = unquote(element.findtext("category") or "")
+            if (index := indices.get(name)) is None:
+                index = indices[name] = writer.add_category(name, "")
+            xs: List[float] = []
+            ys: List[float] = []
+            for value in element.iterfind("values/value"):
+                match = KLAYOUT_VALUE_PARSER.match(value.text or "")
+                if match is None or match[1] not in KLAYOUT_SHAPE_VALUES:
+                    continue
+                for points in KLAYOUT_POINT_LISTS.findall(match[2]):
+                    coords = [
+                        float(coord)
+                        for coord in KLAYOUT_SEPARATORS.split(points)
+                        if coord.strip() != ""
+                    ]
+                    xs += coords[0::2]
+                    ys += coords[1::2]
+            if len(xs) != 0 and len(ys) != 0:
+                writer.add(
+                    index,
+                    round(min(xs) * dbu_per_micron),
+                    round(min(ys) * dbu_per_micron),
+                    round(max(xs) * dbu_per_micron),
+                    round(max(ys) * dbu_per_micron),
+                )
+
+            # Free the parsed items
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+        return writer.count
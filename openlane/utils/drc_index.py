@@ -0,0 +1,350 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .drc import DBUBox, DRCCategory, DRCStore
+
+TileCounts = Dict[Tuple[int, int], int]
+
+
+def tile_locator(
+    extent: DBUBox,
+    tiles_x: int,
+    tiles_y: int,
+) -> Callable[[int, int, int, int], Tuple[int, int]]:
+    """
+    :param extent: The area divided into tiles.
+    :param tiles_x: The number of columns of tiles.
+    :param tiles_y: The number of rows of tiles.
+    :returns: A function returning the ``(column, row)`` of the tile containing
+        the center of a box ``(llx, lly, urx, ury)``, where ``(0, 0)`` is the
+        lower-left tile. Boxes outside the extent are placed in the nearest
+        tile.
+    """
+    x0, y0, x1, y1 = extent
+    width = max(x1 - x0, 1)
+    height = max(y1 - y0, 1)
+
+    def locate(llx: int, lly: int, urx: int, ury: int) -> Tuple[int, int]:
+        column = ((llx + urx) // 2 - x0) * tiles_x // width
+        row = ((lly + ury) // 2 - y0) * tiles_y // height
+        return (
+            min(max(column, 0), tiles_x - 1),
+            min(max(row, 0), tiles_y - 1),
+        )
+
+    return locate
+
+
+def count_tiles(
+    boxes: Iterable[Sequence[int]],
+    extent: DBUBox,
+    tiles_x: int,
+    tiles_y: int,
+) -> TileCounts:
+    """
+    Counts boxes per tile of a grid laid over an extent. See
+    :func:`tile_locator`.
+
+    :param boxes: ``(llx, lly, urx, ury)`` for every box.
+    :returns: The number of boxes per ``(column, row)`` of tiles with at least
+        one box.
+    """
+    locate = tile_locator(extent, tiles_x, tiles_y)
+    counts: TileCounts = {}
+    for llx, lly, urx, ury in boxes:
+        tile = locate(llx, lly, urx, ury)
+        counts[tile] = counts.get(tile, 0) + 1
+    return counts
+
+
+def heatmap_metrics(metric: str, counts: TileCounts) -> Dict[str, int]:
+    """
+    :param metric: The name of the metric counting all violations, e.g.
+        ``magic__drc_error__count``.
+    :param counts: The number of violations per tile, from
+        :func:`count_tiles`.
+    :returns: A metric per tile with at least one violation, named
+        ``{metric}__tile:x{column}y{row}``.
+    """
+    return {
+        f"{metric}__tile:x{column}y{row}": count
+        for (column, row), count in sorted(counts.items())
+    }
+
+
+def parse_extent(bbox: str, dbu_per_micron: int) -> Optional[DBUBox]:
+    """
+    :param bbox: A rectangle in microns, formatted ``x0 y0 x1 y1``, such as the
+        value of the ``design__die__bbox`` metric.
+    :returns: The rectangle in database units, or ``None`` if ``bbox`` is
+        malformed or empty.
+    """
+    try:
+        x0, y0, x1, y1 = [round(float(c) * dbu_per_micron) for c in bbox.split()]
+    except ValueError:
+        return None
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def store_heatmap(
+    store: DRCStore,
+    tiles: int,
+    die_bbox: Optional[str] = None,
+) -> TileCounts:
+    """
+    Counts the violations of a store per tile without loading them into memory.
+
+    :param store: The store.
+    :param tiles: The number of columns and rows of tiles.
+    :param die_bbox: The die area in microns, formatted ``x0 y0 x1 y1``. If
+        unset or malformed, the bounding box of all violations is used.
+    :returns: See :func:`count_tiles`.
+    """
+    extent = None
+    if die_bbox is not None:
+        extent = parse_extent(die_bbox, store.dbu_per_micron)
+    extent = extent or store.bbox
+    if extent is None or tiles <= 0:
+        return {}
+    return count_tiles((box for _, box in store.query()), extent, tiles, tiles)
+
+
+class DRCIndex:
+    """
+    A uniform grid index over the violations of a :class:`DRCStore`, held in
+    memory, for interactive triage: windowed queries only visit the grid cells
+    overlapping the window.
+
+    Building the index reads the whole store once. A violation spanning
+    several grid cells is listed in each of them, but reported once per query.
+
+    :param store: The store to index.
+    :param cell_size: The size of the grid cells in database units. By
+        default, chosen such that there are about as many cells as violations.
+    """
+
+    #: The maximum number of grid cells per side.
+    max_cells = 4096
+
+    def __init__(self, store: DRCStore, cell_size: Optional[int] = None):
+        self.categories: List[DRCCategory] = store.categories
+        self.dbu_per_micron = store.dbu_per_micron
+
+        self._llx = array("q")
+        self._lly = array("q")
+        self._urx = array("q")
+        self._ury = array("q")
+        self._category = array("i")
+        for llxs, llys, urxs, urys, indices in store.iter_blocks():
+            self._llx.extend(llxs)
+            self._lly.extend(llys)
+            self._urx.extend(urxs)
+            self._ury.extend(urys)
+            self._category.extend(indices)
+        self.count = len(self._category)
+
+        if self.count == 0:
+            self.extent: DBUBox = (0, 0, 0, 0)
+        else:
+            self.extent = (
+                min(self._llx),
+                min(self._lly),
+                max(self._urx),
+                max(self._ury),
+            )
+        x0, y0, x1, y1 = self.extent
+        span = max(x1 - x0, y1 - y0, 1)
+        if cell_size is None:
+            cell_size = math.ceil(span / max(math.isqrt(self.count), 1))
+        self.cell_size = max(cell_size, math.ceil(span / self.max_cells), 1)
+        self._columns = (x1 - x0) // self.cell_size + 1
+        self._rows = (y1 - y0) // self.cell_size + 1
+
+        # Compressed rows: the violations in cell i are
+        # self._entries[self._starts[i] : self._starts[i + 1]]
+        size = self.cell_size
+        columns = self._columns
+        cells = array("q")
+        entries = array("i")
+        rows = zip(self._llx, self._lly, self._urx, self._ury)
+        for i, (llx, lly, urx, ury) in enumerate(rows):
+            cx0 = (llx - x0) // size
+            cy0 = (lly - y0) // size
+            cx1 = (urx - x0) // size
+            cy1 = (ury - y0) // size
+            if cx0 == cx1 and cy0 == cy1:
+                cells.append(cy0 * columns + cx0)
+                entries.append(i)
+                continue
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    cells.append(cy * columns + cx)
+                    entries.append(i)
+        order = sorted(range(len(cells)), key=cells.__getitem__)
+        self._entries = array("i", [entries[j] for j in order])
+        self._starts = array("q", bytes(8 * (columns * self._rows + 1)))
+        for cell in cells:
+            self._starts[cell + 1] += 1
+        for cell in range(1, len(self._starts)):
+            self._starts[cell] += self._starts[cell - 1]
+
+    def _cell_range(
+        self, llx: int, lly: int, urx: int, ury: int
+    ) -> Tuple[int, int, int, int]:
+        x0, y0, _, _ = self.extent
+        size = self.cell_size
+        return (
+            min(max((llx - x0) // size, 0), self._columns - 1),
+            min(max((lly - y0) // size, 0), self._rows - 1),
+            min(max((urx - x0) // size, 0), self._columns - 1),
+            min(max((ury - y0) // size, 0), self._rows - 1),
+        )
+
+    def _category_filter(
+        self,
+        layer: Optional[str],
+        rule: Optional[str],
+    ) -> Optional[List[bool]]:
+        if layer is None and rule is None:
+            return None
+        return [
+            (layer is None or category.layer == layer)
+            and (rule is None or category.rule == rule)
+            for category in self.categories
+        ]
+
+    def query(
+        self,
+        window: DBUBox,
+        layer: Optional[str] = None,
+        rule: Optional[str] = None,
+    ) -> List[Tuple[DRCCategory, DBUBox]]:
+        """
+        :param window: A box in database units.
+        :param layer: Only return violations on this layer.
+        :param rule: Only return violations of this rule.
+        :returns: ``(category, (llx, lly, urx, ury))`` for every violation whose
+            bounding box intersects or touches ``window``.
+        """
+        if self.count == 0:
+            return []
+        wx0, wy0, wx1, wy1 = window
+        wanted = self._category_filter(layer, rule)
+        cx0, cy0, cx1, cy1 = self._cell_range(wx0, wy0, wx1, wy1)
+        result: List[Tuple[DRCCategory, DBUBox]] = []
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = cy * self._columns + cx
+                for i in self._entries[self._starts[cell] : self._starts[cell + 1]]:
+                    llx, lly, urx, ury = (
+                        self._llx[i],
+                        self._lly[i],
+                        self._urx[i],
+                        self._ury[i],
+                    )
+                    if llx > wx1 or urx < wx0 or lly > wy1 or ury < wy0:
+                        continue
+                    if wanted is not None and not wanted[self._category[i]]:
+                        continue
+                    # Only report a violation in the cell holding the lower
+                    # left corner of its intersection with the window
+                    rx0, ry0, _, _ = self._cell_range(
+                        max(llx, wx0), max(lly, wy0), 0, 0
+                    )
+                    if (rx0, ry0) != (cx, cy):
+                        continue
+                    result.append(
+                        (self.categories[self._category[i]], (llx, lly, urx, ury))
+                    )
+        return result
+
+    def density(
+        self,
+        tiles_x: int,
+        tiles_y: int,
+        extent: Optional[DBUBox] = None,
+        layer: Optional[str] = None,
+        rule: Optional[str] = None,
+    ) -> TileCounts:
+        """
+        Counts violations per tile. See :func:`count_tiles`.
+
+        :param tiles_x: The number of columns of tiles.
+        :param tiles_y: The number of rows of tiles.
+        :param extent: The area divided into tiles. Defaults to the bounding box
+            of all violations.
+        :param layer: Only count violations on this layer.
+        :param rule: Only count violations of this rule.
+        """
+        wanted = self._category_filter(layer, rule)
+        rows = zip(self._llx, self._lly, self._urx, self._ury, self._category)
+        return count_tiles(
+            (
+                (llx, lly, urx, ury)
+                for llx, lly, urx, ury, category in rows
+                if wanted is None or wanted[category]
+            ),
+            extent or self.extent,
+            tiles_x,
+            tiles_y,
+        )
+
+    def hotspots(
+        self,
+        tiles_x: int,
+        tiles_y: int,
+        top: int = 5,
+        extent: Optional[DBUBox] = None,
+    ) -> Dict[str, List[Tuple[DBUBox, int]]]:
+        """
+        Finds the tiles with the most violations of every category.
+
+        :param tiles_x: The number of columns of tiles.
+        :param tiles_y: The number of rows of tiles.
+        :param top: The number of tiles to return per category.
+        :param extent: The area divided into tiles. Defaults to the bounding box
+            of all violations.
+        :returns: The ``top`` tiles, in database units, and their number of
+            violations, in descending order, per category name.
+        """
+        extent = extent or self.extent
+        x0, y0, x1, y1 = extent
+        locate = tile_locator(extent, tiles_x, tiles_y)
+        per_category: Dict[int, TileCounts] = {}
+        rows = zip(self._llx, self._lly, self._urx, self._ury, self._category)
+        for llx, lly, urx, ury, category in rows:
+            counts = per_category.setdefault(category, {})
+            tile = locate(llx, lly, urx, ury)
+            counts[tile] = counts.get(tile, 0) + 1
+
+        def tile_box(column: int, row: int) -> DBUBox:
+            return (
+                x0 + (x1 - x0) * column // tiles_x,
+                y0 + (y1 - y0) * row // tiles_y,
+                x0 + (x1 - x0) * (column + 1) // tiles_x,
+                y0 + (y1 - y0) * (row + 1) // tiles_y,
+            )
+
+        result: Dict[str, List[Tuple[DBUBox, int]]] = {}
+        for category, counts in per_category.items():
+            ranked = sorted(counts.items(), key=lambda e: (-e[1], e[0]))[:top]
+            result[self.categories[category].category_name] = [
+                (tile_box(*tile), count) for tile, count in ranked
+            ]
+        return result
@@ -0,0 +1,455 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Fast, byte-level scanning of Liberty files.
+
+Instead of parsing libraries, the ``cell`` groups of a library are located by
+their offsets, which allows cells to be extracted or removed by copying the
+byte ranges between them.
+
+:class:`LibertyIndex` stores these offsets, alongside a few commonly needed
+facts about each cell, in a compact on-disk index that is built once per file
+and shared between runs.
+"""
+import os
+import re
+import math
+import mmap
+import bisect
+import struct
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..cache import DiskCache, Hasher, get_cache_dir
+
+# Searching for the literal first is much faster than anchoring to line starts
+cell_keyword_rx = re.compile(rb"cell\s*\(")
+cell_start_rx = re.compile(rb"[ \t]*cell\s*\(\s*\"?([^\"\)]*?)\"?\s*\)\s*\{")
+pin_rx = re.compile(rb"\bpin\s*\(\s*\"?([^\"\)]*?)\"?\s*\)\s*\{")
+area_rx = re.compile(rb"\barea\s*:\s*\"?([^\s;\"]+)")
+leakage_rx = re.compile(rb"\bcell_leakage_power\s*:\s*\"?([^\s;\"]+)")
+brace_rx = re.compile(rb"\"(?:[^\"\\]|\\.)*\"|/\*.*?\*/|([{}])", re.S)
+
+
+class LibertyError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class LibertyCell:
+    """
+    The location of a ``cell`` group inside a Liberty file.
+
+    :param name: The name of the cell.
+    :param start: The offset of the start of the line the group starts on.
+    :param header_end: The offset right after the group's opening brace.
+    :param end: The offset right after the group's closing brace.
+    :param pins: The names of the cell's pins, if known.
+    :param area: The cell's area, if known.
+    :param leakage: The cell's leakage power, if known.
+    """
+
+    name: str
+    start: int
+    header_end: int
+    end: int
+    pins: Tuple[str, ...] = ()
+    area: Optional[float] = None
+    leakage: Optional[float] = None
+
+
+def _match_brace(data: Union[bytes, mmap.mmap], offset: int) -> int:
+    # Returns the offset right after the brace closing the group whose body
+    # starts at offset
+    depth = 1
+    for match in brace_rx.finditer(data, offset):  # type: ignore
+        brace = match[1]
+        if brace is None:
+            continue
+        depth += 1 if brace == b"{" else -1
+        if depth == 0:
+            return match.end()
+    raise LibertyError(f"Unterminated group starting at offset {offset}")
+
+
+def _find_cell_starts(data: Union[bytes, mmap.mmap]) -> List[re.Match]:
+    starts = []
+    for keyword in cell_keyword_rx.finditer(data):  # type: ignore
+        line_start = data.rfind(b"\n", 0, keyword.start()) + 1
+        match = cell_start_rx.match(data, line_start)  # type: ignore
+        if match is not None and match.start(1) > keyword.start():
+            starts.append(match)
+    return starts
+
+
+def scan_cells(data: Union[bytes, mmap.mmap]) -> List[LibertyCell]:
+    """
+    Locates all ``cell`` groups in the contents of a Liberty file.
+
+    Cells are assumed to be consecutive groups that start on their own line,
+    i.e., a cell ends at the last closing brace before the next cell starts,
+    which is only verified to be balanced. The end of the last cell is found by
+    matching braces, skipping strings and comments.
+
+    :param data: The contents of the Liberty file.
+    :returns: The cells in the order they appear in.
+    """
+    starts = _find_cell_starts(data)
+    cells: List[LibertyCell] = []
+    for i, match in enumerate(starts):
+        header_end = match.end()
+        if i + 1 < len(starts):
+            next_start = starts[i + 1].start()
+            end = data.rfind(b"}", header_end, next_start) + 1
+            if end == 0:
+                raise LibertyError(f"Unterminated cell '{match[1].decode('utf8')}'")
+            body = data[header_end : end - 1]
+            if body.count(b"{") != body.count(b"}"):
+                end = _match_brace(data, header_end)
+        else:
+            end = _match_brace(data, header_end)
+        cells.append(
+            LibertyCell(
+                match[1].decode("utf8").strip(),
+                match.start(),
+                header_end,
+                end,
+            )
+        )
+    return cells
+
+
+def _parse_float(match: Optional[re.Match]) -> Optional[float]:
+    if match is None:
+        return None
+    try:
+        return float(match[1])
+    except ValueError:
+        return None
+
+
+def _describe_cell(data: Union[bytes, mmap.mmap], cell: LibertyCell) -> LibertyCell:
+    body = data[cell.header_end : cell.end]
+    pins = tuple(
+        dict.fromkeys(
+            match[1].decode("utf8").strip() for match in pin_rx.finditer(body)
+        )
+    )
+    return LibertyCell(
+        cell.name,
+        cell.start,
+        cell.header_end,
+        cell.end,
+        pins,
+        _parse_float(area_rx.search(body)),
+        _parse_float(leakage_rx.search(body)),
+    )
+
+
+class LibertyIndex(object):
+    """
+    A memory-mapped index of the cells of a Liberty file, mapping each cell's
+    name to its byte range, pins, area and leakage power.
+
+    Use :meth:`load` to get the index of a file, which is built the first time
+    it is requested then stored in :func:`get_index_cache`. Cells are looked up
+    in the index using binary search, and the contents of a cell group are only
+    read from the Liberty file when requested with :meth:`read_cell`.
+
+    :param lib_path: The Liberty file.
+    :param index_path: The index of the Liberty file, written by :meth:`build`.
+    """
+
+    magic = b"OLLIBIX1"
+    header = struct.Struct("<8sQQ")  # magic, cell count, string table offset
+    record = struct.Struct("<QQQIIIIdd")
+
+    def __init__(self, lib_path: str, index_path: str):
+        self.lib_path = lib_path
+        self.index_path = index_path
+        with open(index_path, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._strings = self.header.unpack_from(self._index, 0)
+        if magic != self.magic:
+            raise LibertyError(f"'{index_path}' is not a Liberty index.")
+        self._lib: Optional[mmap.mmap] = None
+        self._lib_lock = threading.Lock()
+
+    @classmethod
+    def build(Self, lib_path: Union[str, os.PathLike], index_path: str):
+        """
+        Scans a Liberty file and writes its index.
+
+        :param lib_path: The Liberty file.
+        :param index_path: The path of the index.
+        """
+        with open(lib_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                cells: List[LibertyCell] = []
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    cells = [_describe_cell(data, cell) for cell in scan_cells(data)]
+        cells.sort(key=lambda cell: cell.name)
+
+        strings = bytearray()
+        records = bytearray()
+        for cell in cells:
+            name = cell.name.encode("utf8")
+            pins = ",".join(cell.pins).encode("utf8")
+            name_offset = len(strings)
+            strings += name
+            pins_offset = len(strings)
+            strings += pins
+            records += Self.record.pack(
+                cell.start,
+                cell.header_end,
+                cell.end,
+                name_offset,
+                len(name),
+                pins_offset,
+                len(pins),
+                math.nan if cell.area is None else cell.area,
+                math.nan if cell.leakage is None else cell.leakage,
+            )
+        with open(index_path, "wb") as f:
+            f.write(
+                Self.header.pack(
+                    Self.magic,
+                    len(cells),
+                    Self.header.size + len(records),
+                )
+            )
+            f.write(records)
+            f.write(strings)
+
+    @classmethod
+    def load(Self, lib_path: Union[str, os.PathLike]) -> "LibertyIndex":
+        """
+        Gets the index of a Liberty file, building it if it does not exist yet.
+
+        Indices are identified by the path, size and modification time of the
+        Liberty file, and are memoized per process.
+
+        :param lib_path: The Liberty file.
+        """
+        lib_path = os.path.abspath(lib_path)
+        stat = os.stat(lib_path)
+        key = Hasher().update(
+            "liberty-index/1",
+            lib_path,
+            str(stat.st_ino),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+        )
+        digest = key.hexdigest()
+        with _indices_lock:
+            if memoized := _indices.get(digest):
+                return memoized
+
+        index: Optional[LibertyIndex] = None
+        try:
+            entry = get_index_cache().put(
+                digest,
+                lambda dir: Self.build(lib_path, os.path.join(dir, INDEX_FILE)),
+            )
+            index = Self(lib_path, os.path.join(entry, INDEX_FILE))
+        except OSError:
+            if not os.path.exists(lib_path):
+                raise
+            # Unusable cache directory (e.g. not writable, not a directory or
+            # full) or evicted in the meantime
+
+        if index is None:
+            fd, index_path = tempfile.mkstemp(suffix=".bin")
+            os.close(fd)
+            try:
+                Self.build(lib_path, index_path)
+                index = Self(lib_path, index_path)
+            finally:
+                # The index stays mapped
+                os.unlink(index_path)
+
+        with _indices_lock:
+            return _indices.setdefault(digest, index)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _name_at(self, i: int) -> str:
+        record = self.record.unpack_from(
+            self._index, self.header.size + i * self.record.size
+        )
+        start = self._strings + record[3]
+        return self._index[start : start + record[4]].decode("utf8")
+
+    def _cell_at(self, i: int) -> LibertyCell:
+        (
+            start,
+            header_end,
+            end,
+            name_offset,
+            name_length,
+            pins_offset,
+            pins_length,
+            area,
+            leakage,
+        ) = self.record.unpack_from(
+            self._index, self.header.size + i * self.record.size
+        )
+        name = self._index[
+            self._strings + name_offset : self._strings + name_offset + name_length
+        ].decode("utf8")
+        pins_str = self._index[
+            self._strings + pins_offset : self._strings + pins_offset + pins_length
+        ].decode("utf8")
+        return LibertyCell(
+            name,
+            start,
+            header_end,
+            end,
+            tuple(pins_str.split(",")) if pins_str != "" else (),
+            None if math.isnan(area) else area,
+            None if math.isnan(leakage) else leakage,
+        )
+
+    def _find(self, name: str) -> Optional[int]:
+        i = bisect.bisect_left(_IndexNames(self), name)
+        if i < self._count and self._name_at(i) == name:
+            return i
+        return None
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._find(name) is not None
+
+    def __iter__(self) -> Iterator[LibertyCell]:
+        """
+        Iterates over all cells, sorted by name.
+        """
+        for i in range(self._count):
+            yield self._cell_at(i)
+
+    def names(self) -> List[str]:
+        """
+        :returns: The names of all cells, sorted.
+        """
+        return [self._name_at(i) for i in range(self._count)]
+
+    def get(self, name: str) -> Optional[LibertyCell]:
+        """
+        :param name: The name of a cell.
+        :returns: The cell's information, or ``None`` if it does not exist.
+        """
+        i = self._find(name)
+        if i is None:
+            return None
+        return self._cell_at(i)
+
+    def by_offset(self) -> List[LibertyCell]:
+        """
+        :returns: All cells, in the order they appear in the Liberty file.
+        """
+        return sorted(self, key=lambda cell: cell.start)
+
+    def read_cell(self, name: str) -> str:
+        """
+        Reads a single cell group from the Liberty file.
+
+        :param name: The name of the cell.
+        :returns: The text of the cell group, from the start of its line to its
+            closing brace.
+        :raises KeyError: If the cell does not exist.
+        """
+        cell = self.get(name)
+        if cell is None:
+            raise KeyError(name)
+        with self._lib_lock:
+            if self._lib is None:
+                with open(self.lib_path, "rb") as f:
+                    self._lib = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._lib[cell.start : cell.end].decode("utf8")
+
+
+class _IndexNames(object):
+    # A lazy sequence of the (sorted) cell names of an index, for bisect
+    def __init__(self, index: LibertyIndex):
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, i: int) -> str:
+        return self.index._name_at(i)
+
+
+INDEX_FILE = "index.bin"
+
+_indices: Dict[str, LibertyIndex] = {}
+_indices_lock = threading.Lock()
+
+INDEX_CACHE = DiskCache(
+    os.path.join(get_cache_dir(), "liberty"),
+    max_size=1024 * 1024 * 1024,
+)
+
+
+def set_index_cache(cache: DiskCache):
+    """
+    Sets the cache in which :class:`LibertyIndex` stores indices.
+    """
+    global INDEX_CACHE
+    INDEX_CACHE = cache
+
+
+def get_index_cache() -> DiskCache:
+    """
+    :returns: The cache in which :class:`LibertyIndex` stores indices.
+    """
+    global INDEX_CACHE
+    return INDEX_CACHE
+
+
+def remove_cells(
+    input_path: Union[str, os.PathLike],
+    output_path: Union[str, os.PathLike],
+    excluded_cells: Iterable[str],
+) -> int:
+    """
+    Writes a copy of a Liberty file without some of its cells, each replaced by
+    a comment.
+
+    :param input_path: The Liberty file.
+    :param output_path: The path of the new Liberty file.
+    :param excluded_cells: The names of the cells to remove.
+    :returns: The number of removed cells.
+    """
+    excluded = set(excluded_cells)
+    cells = LibertyIndex.load(input_path).by_offset()
+    removed = 0
+    with open(input_path, "rb") as f_in, open(output_path, "wb") as f_out:
+        if os.fstat(f_in.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = 0
+            for cell in cells:
+                if cell.name not in excluded:
+                    continue
+                f_out.write(data[offset : cell.start])
+                whitespace = data[cell.start : cell.header_end].split(b"cell")[0]
+                f_out.write(whitespace + f"/* removed {cell.name} */".encode("utf8"))
+                offset = cell.end
+                removed += 1
+            f_out.write(data[offset:])
+    return removed
@@ -0,0 +1,839 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import os
+import re
+import sys
+import json
+import math
+import heapq
+import struct
+from array import array
+from dataclasses import dataclass, field
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+STA_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|-?INF")
+STA_TOKEN = re.compile(r"\S+")
+STA_PIN_ROW = re.compile(r"([\^v]) (\S+)(?: \(([^()]*)\))?")
+STA_CLOCK_ROW = re.compile(r"clock (\S+) \((?:rise|fall) edge\)")
+STA_CLOCKED_BY = re.compile(r"clocked by (\S+?)\)")
+STA_POINT = re.compile(r"(\S+)(?:\s+(\(.*\)))?")
+
+#: Header labels of the columns of ``report_checks``, mapped to the names of
+#: the :class:`TimingStage` fields they hold.
+STA_COLUMNS = {
+    "fanout": "fanout",
+    "cap": "cap",
+    "slew": "slew",
+    "trans": "slew",
+    "delay": "delay",
+    "incr": "delay",
+    "time": "time",
+    "path": "time",
+}
+
+STORE_MAGIC = b"OLSTADB1"
+STORE_TRAILER = struct.Struct("<Q8s")
+STORE_VERSION = 1
+
+# Eight-byte columns come first to keep every column aligned
+PATH_COLUMNS = [
+    ("slack", "d"),
+    ("arrival", "d"),
+    ("required", "d"),
+    ("startpoint", "i"),
+    ("endpoint", "i"),
+    ("path_group", "i"),
+    ("launch_clock", "i"),
+    ("capture_clock", "i"),
+    ("corner", "i"),
+    ("report", "i"),
+    ("path_type", "i"),
+    ("stage_start", "i"),
+    ("stage_count", "i"),
+]
+STAGE_COLUMNS = [
+    ("cap", "d"),
+    ("slew", "d"),
+    ("delay", "d"),
+    ("time", "d"),
+    ("pin", "i"),
+    ("cell", "i"),
+    ("net", "i"),
+    ("fanout", "i"),
+    ("flags", "i"),
+]
+STAGE_FALL = 1
+STAGE_REQUIRED = 2
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+@dataclass
+class TimingStage:
+    """
+    A pin along a timing path.
+
+    :param pin: The full name of the pin or port.
+    :param cell: The name of the cell the pin belongs to, or the direction of
+        the port (``in`` or ``out``).
+    :param rise: Whether the transition at the pin is rising.
+    :param net: The net driven by or connected to the pin, if reported.
+    :param required: Whether the pin is on the required (capture clock) side
+        of the path rather than on its arrival side.
+    """
+
+    pin: str
+    cell: str
+    rise: bool
+    net: Optional[str] = None
+    fanout: Optional[int] = None
+    cap: Optional[float] = None
+    slew: Optional[float] = None
+    delay: Optional[float] = None
+    time: Optional[float] = None
+    required: bool = False
+
+
+@dataclass
+class TimingPath:
+    """
+    A timing path as reported by ``report_checks``.
+
+    Times are in the units of the report. ``slack`` and ``required`` are
+    ``None`` for unconstrained paths.
+
+    :param path_type: ``min`` for hold checks and ``max`` for setup checks.
+    :param corner: The timing corner the path was reported for.
+    :param report: The name of the report the path was read from.
+    """
+
+    startpoint: str
+    endpoint: str
+    path_type: str
+    path_group: str = ""
+    launch_clock: str = ""
+    capture_clock: str = ""
+    corner: str = ""
+    report: str = ""
+    arrival: Optional[float] = None
+    required: Optional[float] = None
+    slack: Optional[float] = None
+    stages: List[TimingStage] = field(default_factory=list)
+
+    @property
+    def arrival_stages(self) -> List[TimingStage]:
+        """
+        The stages from the launching clock to the endpoint.
+        """
+        return [stage for stage in self.stages if not stage.required]
+
+
+def _number(token: str) -> float:
+    if token.endswith("INF"):
+        return -math.inf if token.startswith("-") else math.inf
+    return float(token)
+
+
+class STAReport:
+    """
+    Parses the paths of an OpenSTA ``report_checks`` report lazily, line by
+    line. Any other text in the report is skipped.
+
+    The columns of a path are located using the positions of the labels in its
+    header, so any combination of ``-fields`` is supported. Iterating over the
+    object yields a :class:`TimingPath` for every path, including its stages.
+
+    :param report: The lines of the report, e.g. an open text file.
+    :param name: The name of the report, saved in every path.
+    :param corner: The corner saved in paths for which the report does not
+        name one, which OpenSTA only does when more than one corner is
+        defined.
+    """
+
+    def __init__(self, report: Iterable[str], name: str = "", corner: str = ""):
+        self.report = report
+        self.name = name
+        self.corner = corner
+
+    def __iter__(self) -> Iterator[TimingPath]:
+        path: Optional[TimingPath] = None
+        continued: Optional[str] = None
+        columns: List[Tuple[int, str]] = []
+        # Numbers are right-aligned with the labels of their columns, so the
+        # column of a number is usually found by its end alone
+        column_ends: Dict[int, str] = {}
+        description_start = 0
+        in_body = False
+        arrived = False
+        stage: Optional[TimingStage] = None
+        for line in self.report:
+            stripped = line.strip()
+            if stripped.startswith("Startpoint:"):
+                name, description = self._point(stripped[11:])
+                path = TimingPath(
+                    name,
+                    "",
+                    "max",
+                    corner=self.corner,
+                    report=self.name,
+                )
+                self._clock(path, "launch_clock", description)
+                continued = "launch_clock" if description is None else None
+                columns = []
+                column_ends = {}
+                in_body = False
+                arrived = False
+                stage = None
+                continue
+            if path is None:
+                continue
+
+            if not in_body:
+                if stripped.startswith("Endpoint:"):
+                    path.endpoint, description = self._point(stripped[9:])
+                    self._clock(path, "capture_clock", description)
+                    continued = "capture_clock" if description is None else None
+                elif stripped.startswith("(") and continued is not None:
+                    self._clock(path, continued, stripped)
+                    continued = None
+                elif stripped.startswith("Path Group:"):
+                    path.path_group = stripped[11:].strip()
+                elif stripped.startswith("Path Type:"):
+                    path.path_type = stripped[10:].strip()
+                elif stripped.startswith("Corner:"):
+                    path.corner = stripped[7:].strip()
+                elif stripped.endswith("Description"):
+                    for label in STA_TOKEN.finditer(line):
+                        name = label[0].lower()
+                        if name == "description":
+                            description_start = label.start()
+                        elif name in STA_COLUMNS:
+                            columns.append((label.end(), STA_COLUMNS[name]))
+                    column_ends = dict(columns)
+                elif stripped.startswith("---") and len(columns) != 0:
+                    in_body = True
+                continue
+
+            if stripped == "" or stripped.startswith("---"):
+                continue
+            if stripped == "(Path is unconstrained)":
+                yield path
+                path = None
+                continue
+
+            values: Dict[str, float] = {}
+            last: Optional[float] = None
+            description = ""
+            for token in STA_TOKEN.finditer(line):
+                end = token.end()
+                if end > description_start or not STA_NUMBER.fullmatch(token[0]):
+                    description = line[token.start() :].strip()
+                    break
+                last = _number(token[0])
+                if (column := column_ends.get(end)) is None:
+                    _, column = min(columns, key=lambda c: abs(c[0] - end))
+                values[column] = last
+
+            if description.endswith("(net)"):
+                if stage is not None and stage.net is None:
+                    stage.net = description[:-5].strip()
+                    if "fanout" in values and stage.fanout is None:
+                        stage.fanout = int(values["fanout"])
+                    if "cap" in values and stage.cap is None:
+                        stage.cap = values["cap"]
+            elif (pin := STA_PIN_ROW.fullmatch(description)) and "time" in values:
+                fanout = values.get("fanout")
+                stage = TimingStage(
+                    pin[2],
+                    pin[3] or "",
+                    pin[1] == "^",
+                    fanout=None if fanout is None else int(fanout),
+                    cap=values.get("cap"),
+                    slew=values.get("slew"),
+                    delay=values.get("delay"),
+                    time=values["time"],
+                    required=arrived,
+                )
+                path.stages.append(stage)
+            elif description == "data arrival time":
+                if not arrived:
+                    path.arrival = last
+                    arrived = True
+                stage = None
+            elif description == "data required time":
+                if path.required is None:
+                    path.required = last
+                stage = None
+            elif description.startswith("slack"):
+                path.slack = last
+                yield path
+                path = None
+            elif clock := STA_CLOCK_ROW.fullmatch(description):
+                attribute = "capture_clock" if arrived else "launch_clock"
+                if getattr(path, attribute) == "":
+                    setattr(path, attribute, clock[1])
+                stage = None
+            else:
+                stage = None
+
+    @staticmethod
+    def _point(text: str) -> Tuple[str, Optional[str]]:
+        match = STA_POINT.fullmatch(text.strip())
+        if match is None:
+            return text.strip(), None
+        return match[1], match[2]
+
+    @staticmethod
+    def _clock(path: TimingPath, attribute: str, description: Optional[str]):
+        if description is None:
+            return
+        if match := STA_CLOCKED_BY.search(description):
+            setattr(path, attribute, match[1])
+
+
+class TimingPathStoreWriter:
+    """
+    Writes timing paths to a columnar file incrementally, so the paths never
+    have to be held in memory all at once.
+
+    The file is made of blocks of up to ``block_size`` paths. Each block holds
+    the columns of its paths followed by the columns of their stages, as
+    little-endian float64 and int32 arrays. Names are stored as indices into a
+    table of unique strings. A JSON footer holds the string table and, for
+    every block, its offset, its range of slacks and the corners, reports and
+    path types it contains, which lets :class:`TimingPathStore` skip blocks
+    that cannot match a query.
+
+    :param path: The path of the file to create.
+    :param block_size: The maximum number of timing paths per block.
+    """
+
+    def __init__(self, path: str, block_size: int = 4096):
+        self.path = path
+        self.block_size = block_size
+        self.strings: List[str] = []
+        self.count = 0
+        self._string_indices: Dict[str, int] = {}
+        self._blocks: List[Dict[str, Any]] = []
+        self._paths: Dict[str, "array[Any]"] = {
+            name: array(typecode) for name, typecode in PATH_COLUMNS
+        }
+        self._stages: Dict[str, "array[Any]"] = {
+            name: array(typecode) for name, typecode in STAGE_COLUMNS
+        }
+        self._file: Optional[IO[bytes]] = open(path, "wb")
+        self._file.write(STORE_MAGIC)
+
+    def __enter__(self) -> "TimingPathStoreWriter":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _string(self, string: Optional[str]) -> int:
+        if string is None:
+            return -1
+        if (index := self._string_indices.get(string)) is None:
+            index = self._string_indices[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+    def add(self, timing_path: TimingPath):
+        """
+        Adds a timing path and its stages.
+        """
+        paths = self._paths
+        stages = self._stages
+        paths["slack"].append(_float(timing_path.slack))
+        paths["arrival"].append(_float(timing_path.arrival))
+        paths["required"].append(_float(timing_path.required))
+        for name in [
+            "startpoint",
+            "endpoint",
+            "path_group",
+            "launch_clock",
+            "capture_clock",
+            "corner",
+            "report",
+            "path_type",
+        ]:
+            paths[name].append(self._string(getattr(timing_path, name)))
+        paths["stage_start"].append(len(stages["pin"]))
+        paths["stage_count"].append(len(timing_path.stages))
+        for stage in timing_path.stages:
+            stages["cap"].append(_float(stage.cap))
+            stages["slew"].append(_float(stage.slew))
+            stages["delay"].append(_float(stage.delay))
+            stages["time"].append(_float(stage.time))
+            stages["pin"].append(self._string(stage.pin))
+            stages["cell"].append(self._string(stage.cell))
+            stages["net"].append(self._string(stage.net))
+            stages["fanout"].append(-1 if stage.fanout is None else stage.fanout)
+            stages["flags"].append(
+                (0 if stage.rise else STAGE_FALL)
+                | (STAGE_REQUIRED if stage.required else 0)
+            )
+        self.count += 1
+        if len(paths["slack"]) >= self.block_size:
+            self._flush()
+
+    def _flush(self):
+        assert self._file is not None
+        paths = self._paths
+        rows = len(paths["slack"])
+        if rows == 0:
+            return
+        slacks = [slack for slack in paths["slack"] if not math.isnan(slack)]
+        block: Dict[str, Any] = {
+            "offset": self._file.tell(),
+            "rows": rows,
+            "stages": len(self._stages["pin"]),
+            "slack": [min(slacks), max(slacks)] if len(slacks) else None,
+        }
+        for name in ["corner", "report", "path_type"]:
+            block[name] = sorted(set(paths[name]))
+        self._blocks.append(block)
+        for columns, layout in [(paths, PATH_COLUMNS), (self._stages, STAGE_COLUMNS)]:
+            written = 0
+            for name, _ in layout:
+                column = columns[name]
+                if not _LITTLE_ENDIAN:
+                    column.byteswap()
+                data = column.tobytes()
+                self._file.write(data)
+                written += len(data)
+            if written % 8 != 0:
+                # Keep the stage columns and the next block aligned to eight
+                # bytes
+                self._file.write(b"\0" * (8 - written % 8))
+        self._paths = {name: array(typecode) for name, typecode in PATH_COLUMNS}
+        self._stages = {name: array(typecode) for name, typecode in STAGE_COLUMNS}
+
+    def close(self):
+        """
+        Writes the remaining timing paths and the footer, then closes the
+        file.
+        """
+        if self._file is None:
+            return
+        self._flush()
+        footer = json.dumps(
+            {
+                "version": STORE_VERSION,
+                "count": self.count,
+                "strings": self.strings,
+                "blocks": self._blocks,
+            }
+        ).encode("utf8")
+        self._file.write(footer)
+        self._file.write(STORE_TRAILER.pack(len(footer), STORE_MAGIC))
+        self._file.close()
+        self._file = None
+
+
+def _float(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+Columns = Dict[str, Sequence[Any]]
+
+
+class TimingPathStore:
+    """
+    Reads a file written by :class:`TimingPathStoreWriter`. Only the footer is
+    read when the store is opened: paths are read one block at a time as they
+    are queried, and stages only when they are requested.
+
+    All queries can be filtered by corner, path type (``min`` or ``max``) and
+    report. Note that ``checks.rpt`` repeats the violating paths of
+    ``min.rpt`` and ``max.rpt``, so queries across all reports may return a
+    path more than once.
+
+    :param path: The path of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: IO[bytes] = open(path, "rb")
+        try:
+            magic = self._file.read(len(STORE_MAGIC))
+            self._file.seek(-STORE_TRAILER.size, io.SEEK_END)
+            footer_size, trailer_magic = STORE_TRAILER.unpack(
+                self._file.read(STORE_TRAILER.size)
+            )
+            if magic != STORE_MAGIC or trailer_magic != STORE_MAGIC:
+                raise ValueError(f"'{path}' is not a timing path store")
+            self._file.seek(-STORE_TRAILER.size - footer_size, io.SEEK_END)
+            footer = json.loads(self._file.read(footer_size))
+        except Exception:
+            self._file.close()
+            raise
+        if footer["version"] != STORE_VERSION:
+            self._file.close()
+            raise ValueError(
+                f"Unsupported timing path store version {footer['version']} in '{path}'"
+            )
+        self.count: int = footer["count"]
+        self.strings: List[str] = footer["strings"]
+        self._string_indices = {string: i for i, string in enumerate(self.strings)}
+        self._blocks: List[Dict[str, Any]] = footer["blocks"]
+
+    def __enter__(self) -> "TimingPathStore":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def _names(self, key: str) -> List[str]:
+        indices = set()
+        for block in self._blocks:
+            indices.update(block[key])
+        return sorted(self.strings[index] for index in indices)
+
+    @property
+    def corners(self) -> List[str]:
+        """
+        The corners of the timing paths in the store. Only reads the footer.
+        """
+        return self._names("corner")
+
+    @property
+    def reports(self) -> List[str]:
+        """
+        The reports the timing paths in the store were read from. Only reads
+        the footer.
+        """
+        return self._names("report")
+
+    def _filter(
+        self,
+        corner: Optional[str],
+        path_type: Optional[str],
+        report: Optional[str],
+    ) -> Optional[Dict[str, int]]:
+        # None if a value is not in the string table, i.e. nothing can match
+        wanted: Dict[str, int] = {}
+        for key, value in [
+            ("corner", corner),
+            ("path_type", path_type),
+            ("report", report),
+        ]:
+            if value is None:
+                continue
+            if (index := self._string_indices.get(value)) is None:
+                return None
+            wanted[key] = index
+        return wanted
+
+    def _candidates(self, wanted: Dict[str, int]) -> List[Dict[str, Any]]:
+        return [
+            block
+            for block in self._blocks
+            if all(index in block[key] for key, index in wanted.items())
+        ]
+
+    def _read_columns(
+        self,
+        layout: List[Tuple[str, str]],
+        rows: int,
+    ) -> Columns:
+        sizes = [array(typecode).itemsize for _, typecode in layout]
+        data = self._file.read(rows * sum(sizes))
+        columns: Columns = {}
+        position = 0
+        for (name, typecode), size in zip(layout, sizes):
+            column = array(typecode)
+            column.frombytes(data[position : position + rows * size])
+            if not _LITTLE_ENDIAN:
+                column.byteswap()
+            columns[name] = column
+            position += rows * size
+        return columns
+
+    def _read_block(
+        self,
+        block: Dict[str, Any],
+        stages: bool = False,
+    ) -> Tuple[Columns, Optional[Columns]]:
+        self._file.seek(block["offset"])
+        paths = self._read_columns(PATH_COLUMNS, block["rows"])
+        if not stages:
+            return paths, None
+        path_size = sum(array(typecode).itemsize for _, typecode in PATH_COLUMNS)
+        stage_offset = block["offset"] + block["rows"] * path_size
+        self._file.seek(stage_offset + (-stage_offset) % 8)
+        return paths, self._read_columns(STAGE_COLUMNS, block["stages"])
+
+    @staticmethod
+    def _rows(
+        block: Dict[str, Any],
+        paths: Columns,
+        wanted: Dict[str, int],
+    ) -> Iterator[int]:
+        # Filters matching every path of the block, according to its footer
+        # entry, are skipped
+        filters = [
+            (paths[key], index)
+            for key, index in wanted.items()
+            if block.get(key) != [index]
+        ]
+        if len(filters) == 0:
+            yield from range(block["rows"])
+            return
+        for row in range(len(paths["slack"])):
+            if all(column[row] == index for column, index in filters):
+                yield row
+
+    def _path(
+        self,
+        paths: Columns,
+        stages: Optional[Columns],
+        row: int,
+    ) -> TimingPath:
+        strings = self.strings
+
+        def string(index: int) -> str:
+            return strings[index] if index >= 0 else ""
+
+        timing_path = TimingPath(
+            string(paths["startpoint"][row]),
+            string(paths["endpoint"][row]),
+            string(paths["path_type"][row]),
+            path_group=string(paths["path_group"][row]),
+            launch_clock=string(paths["launch_clock"][row]),
+            capture_clock=string(paths["capture_clock"][row]),
+            corner=string(paths["corner"][row]),
+            report=string(paths["report"][row]),
+            arrival=_optional(paths["arrival"][row]),
+            required=_optional(paths["required"][row]),
+            slack=_optional(paths["slack"][row]),
+        )
+        if stages is None:
+            return timing_path
+        start = paths["stage_start"][row]
+        for i in range(start, start + paths["stage_count"][row]):
+            fanout = stages["fanout"][i]
+            net = stages["net"][i]
+            flags = stages["flags"][i]
+            timing_path.stages.append(
+                TimingStage(
+                    strings[stages["pin"][i]],
+                    string(stages["cell"][i]),
+                    not (flags & STAGE_FALL),
+                    net=strings[net] if net >= 0 else None,
+                    fanout=fanout if fanout >= 0 else None,
+                    cap=_optional(stages["cap"][i]),
+                    slew=_optional(stages["slew"][i]),
+                    delay=_optional(stages["delay"][i]),
+                    time=_optional(stages["time"][i]),
+                    required=bool(flags & STAGE_REQUIRED),
+                )
+            )
+        return timing_path
+
+    def paths(
+        self,
+        corner: Optional[str] = None,
+        path_type: Optional[str] = None,
+        report: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        stages: bool = False,
+    ) -> Iterator[TimingPath]:
+        """
+        Iterates over timing paths in the order they were added, optionally
+        filtered.
+
+        :param endpoint: Only return paths ending at this pin or port.
+        :param stages: Whether to also read the stages of the paths.
+        """
+        wanted = self._filter(corner, path_type, report)
+        if wanted is None:
+            return
+        if endpoint is not None:
+            if (index := self._string_indices.get(endpoint)) is None:
+                return
+            wanted["endpoint"] = index
+        for block in self._candidates(
+            {key: index for key, index in wanted.items() if key != "endpoint"}
+        ):
+            paths, stage_columns = self._read_block(block, stages)
+            for row in self._rows(block, paths, wanted):
+                yield self._path(paths, stage_columns, row)
+
+    def worst(
+        self,
+        n: int = 10,
+        corner: Optional[str] = None,
+        path_type: Optional[str] = None,
+        report: Optional[str] = None,
+        stages: bool = True,
+    ) -> List[TimingPath]:
+        """
+        :param n: The number of paths to return.
+        :param stages: Whether to also read the stages of the paths.
+        :returns: The ``n`` constrained timing paths with the lowest slack,
+            from worst to best. Blocks whose lowest slack is higher than that
+            of all paths found so far are not read.
+        """
+        wanted = self._filter(corner, path_type, report)
+        if wanted is None or n <= 0:
+            return []
+        blocks = [
+            block for block in self._candidates(wanted) if block["slack"] is not None
+        ]
+        blocks.sort(key=lambda block: block["slack"][0])
+        # Max-heap of (-slack, block, row)
+        heap: List[Tuple[float, int, int]] = []
+        for i, block in enumerate(blocks):
+            if len(heap) == n and block["slack"][0] >= -heap[0][0]:
+                break
+            paths, _ = self._read_block(block)
+            slacks = paths["slack"]
+            for row in self._rows(block, paths, wanted):
+                slack = slacks[row]
+                if math.isnan(slack):
+                    continue
+                if len(heap) < n:
+                    heapq.heappush(heap, (-slack, i, row))
+                elif slack < -heap[0][0]:
+                    heapq.heapreplace(heap, (-slack, i, row))
+
+        read: Dict[int, Tuple[Columns, Optional[Columns]]] = {}
+        result: List[TimingPath] = []
+        for _, i, row in sorted(heap, reverse=True):
+            if i not in read:
+                read[i] = self._read_block(blocks[i], stages)
+            paths, stage_columns = read[i]
+            result.append(self._path(paths, stage_columns, row))
+        return result
+
+    def slack_histogram(
+        self,
+        bin_width: float,
+        corner: Optional[str] = None,
+        path_type: Optional[str] = None,
+        report: Optional[str] = None,
+    ) -> List[Tuple[float, int]]:
+        """
+        :param bin_width: The width of every bin, in the units of the reports.
+        :returns: The lower bound and number of constrained timing paths of
+            every non-empty bin, by ascending slack.
+        """
+        wanted = self._filter(corner, path_type, report)
+        if wanted is None:
+            return []
+        counts: Dict[int, int] = {}
+        for block in self._candidates(wanted):
+            paths, _ = self._read_block(block)
+            slacks = paths["slack"]
+            for row in self._rows(block, paths, wanted):
+                slack = slacks[row]
+                if math.isnan(slack) or math.isinf(slack):
+                    continue
+                index = math.floor(slack / bin_width)
+                counts[index] = counts.get(index, 0) + 1
+        return [(index * bin_width, counts[index]) for index in sorted(counts)]
+
+    def compare_corners(
+        self,
+        path_type: str = "max",
+        report: Optional[str] = None,
+        endpoints: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compares the slack of endpoints across corners.
+
+        :param endpoints: Only compare these endpoints.
+        :returns: For every endpoint, the lowest slack of its constrained
+            paths in each corner it has any.
+        """
+        wanted = self._filter(None, path_type, report)
+        if wanted is None:
+            return {}
+        endpoint_filter: Optional[Set[int]] = None
+        if endpoints is not None:
+            endpoint_filter = {
+                self._string_indices[endpoint]
+                for endpoint in endpoints
+                if endpoint in self._string_indices
+            }
+        worst: Dict[Tuple[int, int], float] = {}
+        for block in self._candidates(wanted):
+            paths, _ = self._read_block(block)
+            slacks = paths["slack"]
+            endpoint_column = paths["endpoint"]
+            corner_column = paths["corner"]
+            for row in self._rows(block, paths, wanted):
+                slack = slacks[row]
+                if math.isnan(slack):
+                    continue
+                endpoint = endpoint_column[row]
+                if endpoint_filter is not None and endpoint not in endpoint_filter:
+                    continue
+                key = (endpoint, corner_column[row])
+                if slack < worst.get(key, math.inf):
+                    worst[key] = slack
+        result: Dict[str, Dict[str, float]] = {}
+        for (endpoint, corner), slack in worst.items():
+            result.setdefault(self.strings[endpoint], {})[
+                self.strings[corner] if corner >= 0 else ""
+            ] = slack
+        return result
+
+
+def sta_reports_to_store(
+    reports: Iterable[Tuple[str, str]],
+    path: str,
+    block_size: int = 4096,
+) -> int:
+    """
+    Converts OpenSTA reports to a :class:`TimingPathStore` without holding the
+    timing paths in memory.
+
+    :param reports: ``(corner, path)`` tuples of the reports to convert. The
+        corner is used for paths whose report does not name one. The file
+        name of each report is saved as the report of its paths.
+    :param path: The path of the store to create.
+    :param block_size: See :class:`TimingPathStoreWriter`.
+    :returns: The number of timing paths.
+    """
+    with TimingPathStoreWriter(path, block_size=block_size) as writer:
+        for corner, report_path in reports:
+            with open(report_path, encoding="utf8") as f:
+                for timing_path in STAReport(
+                    f,
+                    os.path.basename(report_path),
+                    corner,
+                ):
+                    writer.add(timing_path)
+        return writer.count
@@ -12,14 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
-import re
 import sys
 import uuid
 import fnmatch
 import tempfile
+import threading
 import subprocess
-from enum import IntEnum
 from shutil import which
+from functools import lru_cache
 from typing import (
     Any,
     Callable,
@@ -34,16 +34,106 @@ from typing import (
 )
 
 from .memoize import memoize
+from .liberty import LibertyError, remove_cells
 
 from ..logging import debug, warn
 from ..config import Config, Macro
 from ..state import DesignFormat, Path
+from ..state.snapshot import SnapshotMode, place_file
+from ..cache import DiskCache, Hasher, get_cache_dir, hash_file
 from ..common import mkdirp, get_script_dir, parse_metric_modifiers
 
+LIB_CACHE_FILE = "stripped.lib"
+
+
+def _default_lib_cache() -> DiskCache:
+    return DiskCache(
+        os.path.join(get_cache_dir(), "lib"),
+        max_size=4 * 1024 * 1024 * 1024,
+    )
+
+
+LIB_CACHE: Optional[DiskCache] = _default_lib_cache()
+
+
+def set_lib_cache(cache: Optional[DiskCache]):
+    """
+    Sets the cache shared between runs in which Liberty files processed by
+    :meth:`Toolbox.remove_cells_from_lib` are stored.
+
+    :param cache: The cache, or ``None`` to disable caching.
+    """
+    global LIB_CACHE
+    LIB_CACHE = cache
+
+
+def get_lib_cache() -> Optional[DiskCache]:
+    """
+    :returns: The cache in which processed Liberty files are stored, if any.
+    """
+    global LIB_CACHE
+    return LIB_CACHE
+
+
+@lru_cache(maxsize=4096)
+def _corner_matches(timing_corner: str, pattern: str) -> bool:
+    return fnmatch.fnmatch(timing_corner, pattern)
+
+
+class _ViewIndex(object):
+    """
+    Memoizes the resolution of views by timing corner for one configuration.
+
+    An index only reads (and holds on to) the configuration values in
+    :attr:`keys`. As copies of a configuration share their values, an index
+    remains valid for copies of the configuration it was built from, until
+    any of these values is changed.
+    """
+
+    keys = ["DEFAULT_CORNER", "LIB", "MACROS", "TECH_LEFS"]
+
+    def __init__(self, config: Config):
+        self.values = tuple(config.get(key) for key in self.keys)
+        self.results: Dict[Tuple, Any] = {}
+        self.lock = threading.Lock()
+
+    def matches(self, config: Config) -> bool:
+        return all(
+            config.get(key) is value for key, value in zip(self.keys, self.values)
+        )
+
+    def get(self, key: Tuple, compute: Callable[[], List]) -> List:
+        with self.lock:
+            if key in self.results:
+                return list(self.results[key])
+        result = compute()
+        with self.lock:
+            self.results[key] = result
+        return list(result)
+
 
 class Toolbox(object):
+    #: The maximum number of configurations for which resolved views are
+    #: memoized at a time.
+    max_view_indices = 8
+
     def __init__(self, tmp_dir: str) -> None:
         self.tmp_dir = os.path.abspath(tmp_dir)
+        self._view_indices: List[_ViewIndex] = []
+        self._view_indices_lock = threading.Lock()
+
+    def _get_view_index(self, config: Config) -> _ViewIndex:
+        with self._view_indices_lock:
+            for i, index in enumerate(self._view_indices):
+                if index.matches(config):
+                    # Most recently used last
+                    self._view_indices.append(self._view_indices.pop(i))
+                    return index
+            index = _ViewIndex(config)
+            self._view_indices.append(index)
+            if len(self._view_indices) > self.max_view_indices:
+                self._view_indices.pop(0)
+            return index
 
     def aggregate_metrics(
         self,
@@ -73,11 +163,39 @@ class Toolbox(object):
         views_by_corner: Mapping[str, Union[Path, List[Path]]],
         timing_corner: Optional[str] = None,
     ) -> List[Path]:
+        """
+        Returns the views of a mapping from corner wildcards to views that
+        apply to a given timing corner.
+
+        Results for ``LIB`` and ``TECH_LEFS`` of the configuration are memoized.
+
+        :param config: A configuration object.
+        :param views_by_corner: A mapping from corner wildcards to a view or a
+            list of views.
+        :param timing_corner: A fully qualified IPVT corner.
+
+            If not specified, the value for `DEFAULT_CORNER` from the SCL will
+            be used.
+        :returns: A list of views.
+        """
         timing_corner = timing_corner or config["DEFAULT_CORNER"]
-        result: List[Path] = []
+        index = self._get_view_index(config)
+        for key, value in zip(index.keys, index.values):
+            if value is views_by_corner:
+                return index.get(
+                    ("views", key, timing_corner),
+                    lambda: self._filter_views(views_by_corner, timing_corner),
+                )
+        return self._filter_views(views_by_corner, timing_corner)
 
+    def _filter_views(
+        self,
+        views_by_corner: Mapping[str, Union[Path, List[Path]]],
+        timing_corner: str,
+    ) -> List[Path]:
+        result: List[Path] = []
         for key, value in views_by_corner.items():
-            if not fnmatch.fnmatch(timing_corner, key):
+            if not _corner_matches(timing_corner, key):
                 continue
             if isinstance(value, list):
                 result += value
@@ -93,7 +211,36 @@ class Toolbox(object):
         timing_corner: Optional[str] = None,
         unless_exist: Optional[DesignFormat] = None,
     ) -> List[Path]:
+        """
+        Returns the views of a certain design format of all macros for a given
+        configuration and timing corner.
+
+        Results are memoized for the values of ``MACROS`` and ``DEFAULT_CORNER``
+        of the configuration.
+
+        :param config: A configuration object.
+        :param view: The design format of the views.
+        :param timing_corner: A fully qualified IPVT corner used to select
+            views that are specified by corner.
+
+            If not specified, the value for `DEFAULT_CORNER` from the SCL will
+            be used.
+        :param unless_exist: Skip macros that have views of this design format.
+        :returns: A list of views.
+        """
         timing_corner = timing_corner or config["DEFAULT_CORNER"]
+        return self._get_view_index(config).get(
+            ("macro_views", view, timing_corner, unless_exist),
+            lambda: self._get_macro_views(config, view, timing_corner, unless_exist),
+        )
+
+    def _get_macro_views(
+        self,
+        config: Config,
+        view: DesignFormat,
+        timing_corner: str,
+        unless_exist: Optional[DesignFormat],
+    ) -> List[Path]:
         macros = config["MACROS"]
         result: List[Path] = []
 
@@ -153,9 +300,25 @@ class Toolbox(object):
 
             It is left up to the step or tool to process this list as they see
             fit.
+
+            Results are memoized for the values of ``LIB``, ``MACROS`` and
+            ``DEFAULT_CORNER`` of the configuration.
         """
         timing_corner = timing_corner or config["DEFAULT_CORNER"]
-
+        return (
+            timing_corner,
+            self._get_view_index(config).get(
+                ("timing_files", timing_corner, prioritize_nl),
+                lambda: self._get_timing_files(config, timing_corner, prioritize_nl),
+            ),
+        )
+
+    def _get_timing_files(
+        self,
+        config: Config,
+        timing_corner: str,
+        prioritize_nl: bool,
+    ) -> List[str]:
         result: List[Union[str, Path]] = []
         result += self.filter_views(config, config["LIB"], timing_corner)
 
@@ -207,7 +370,7 @@ class Toolbox(object):
             debug(f"Adding {libs} to timing info…")
             result += libs
 
-        return (timing_corner, [str(path) for path in result])
+        return [str(path) for path in result]
 
     def _render_common(self, config: Config) -> Optional[Tuple[str, str, str]]:
         klayout_bin = which("klayout")
@@ -279,7 +442,9 @@ class Toolbox(object):
         Returns a path to a new lib file without specific cells.
 
         This function is memoized, i.e., results are cached for a specific set
-        of inputs.
+        of inputs. Processed lib files are also stored in the cache returned by
+        :func:`get_lib_cache`, keyed by the contents of the input lib file and
+        the set of excluded cells, so they are shared between runs.
 
         :param input_lib_files: A `frozenset` of input lib files.
         :param excluded_cells: A `frozenset` of either cells to be removed or
@@ -302,53 +467,55 @@ class Toolbox(object):
                 ]
             )
 
-        class State(IntEnum):
-            initial = 0
-            cell = 10
-            excluded_cell = 11
-
-        cell_start_rx = re.compile(r"(\s*)cell\s*\(\"?(.*?)\"?\)\s*\{")
-
         mkdirp(self.tmp_dir)
 
         out_paths = []
 
+        lib_cache = get_lib_cache()
         for file in input_lib_files:
-            input_lib_stream = open(file)
             out_filename = f"{uuid.uuid4().hex}.lib"
             out_path = os.path.join(self.tmp_dir, out_filename)
 
-            state = State.initial
-            brace_count = 0
-            output_file_handle = open(out_path, "w")
-            write = lambda x: print(x, file=output_file_handle, end="")
-            for line in input_lib_stream:
-                if state == State.initial:
-                    cell_m = cell_start_rx.search(line)
-                    if cell_m is not None:
-                        whitespace = cell_m[1]
-                        cell_name = cell_m[2]
-                        if cell_name in excluded_cells:
-                            state = State.excluded_cell
-                            write(f"{whitespace}/* removed {cell_name} */")
-                        else:
-                            state = State.cell
-                            write(line)
-                        brace_count = 1
-                    else:
-                        write(line)
-                elif state in [State.cell, State.excluded_cell]:
-                    if "{" in line:
-                        brace_count += 1
-                    if "}" in line:
-                        brace_count -= 1
-                    if state == State.cell:
-                        write(line)
-                    if brace_count == 0:
-                        state = State.initial
-
-            output_file_handle.close()
+            if lib_cache is not None:
+                key = (
+                    Hasher()
+                    .update("remove_cells_from_lib/1", hash_file(file))
+                    .update(*sorted(excluded_cells))
+                    .hexdigest()
+                )
+                try:
+                    entry = lib_cache.put(
+                        key,
+                        lambda dir: self._remove_cells(
+                            file,
+                            os.path.join(dir, LIB_CACHE_FILE),
+                            excluded_cells,
+                        ),
+                    )
+                    # Linked into the run so it survives eviction
+                    place_file(
+                        os.path.join(entry, LIB_CACHE_FILE),
+                        out_path,
+                        SnapshotMode.hardlink,
+                    )
+                    out_paths.append(out_path)
+                    continue
+                except OSError as e:
+                    debug(f"Failed to use the Liberty cache for '{file}': {e}")
 
+            self._remove_cells(file, out_path, excluded_cells)
             out_paths.append(out_path)
 
         return out_paths
+
+    def _remove_cells(
+        self,
+        input_lib: str,
+        output_lib: str,
+        excluded_cells: FrozenSet[str],
+    ):
+        try:
+            removed = remove_cells(input_lib, output_lib, excluded_cells)
+        except LibertyError as e:
+            raise ValueError(f"Failed to process '{input_lib}': {e}")
+        debug(f"Removed {removed} cells from '{input_lib}'.")
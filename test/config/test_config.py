@@ -0,0 +1,268 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+from typing import Any, Dict, List, Union
+
+import pytest
+
+from openlane.cache import DiskCache
+from openlane.config import Config, universal_flow_config_variables
+from openlane.config.config import (
+    PDK_CONFIG_FILE,
+    get_pdk_config_cache,
+    set_pdk_config_cache,
+    _pdk_configs,
+)
+from openlane.flows import Flow
+
+PDK = "fakepdk"
+SCL = "fake_scl"
+
+PDK_CONFIG = """
+if {{ ![info exists ::env(STD_CELL_LIBRARY)] }} {{ set ::env(STD_CELL_LIBRARY) {scl} }}
+set ::env(VDD_PIN) VPWR
+set ::env(GND_PIN) VGND
+set ::env(TECH_LEF) {root}/tech.lef
+set ::env(RCX_RULES) {root}/tech.lef
+set ::env(FP_TRACKS_INFO) {root}/tracks.info
+set ::env(FP_IO_HLAYER) met3
+set ::env(FP_IO_VLAYER) met2
+set ::env(RT_MIN_LAYER) met1
+set ::env(RT_MAX_LAYER) met5
+set ::env(FP_PDN_HORIZONTAL_LAYER) met5
+set ::env(FP_PDN_VERTICAL_LAYER) met4
+set ::env(FP_PDN_RAIL_LAYER) met1
+set ::env(GRT_LAYER_ADJUSTMENTS) "0,0,0,0,0,0"
+"""
+
+PDK_NUMBERS = [
+    "FP_TAPCELL_DIST",
+    "FP_PDN_RAIL_OFFSET",
+    "FP_PDN_VWIDTH",
+    "FP_PDN_VSPACING",
+    "FP_PDN_HSPACING",
+    "FP_PDN_HWIDTH",
+    "FP_PDN_CORE_RING_VWIDTH",
+    "FP_PDN_CORE_RING_HWIDTH",
+    "FP_PDN_CORE_RING_VSPACING",
+    "FP_PDN_CORE_RING_HSPACING",
+    "FP_PDN_CORE_RING_VOFFSET",
+    "FP_PDN_CORE_RING_HOFFSET",
+    "FP_PDN_RAIL_WIDTH",
+    "PLACE_SITE_WIDTH",
+    "PLACE_SITE_HEIGHT",
+    "GPL_CELL_PADDING",
+    "DPL_CELL_PADDING",
+    "SYNTH_CAP_LOAD",
+    "CTS_MAX_CAP",
+]
+
+SCL_CONFIG = """
+set ::env(CELL_LEFS) {root}/cells.lef
+set ::env(CELL_GDS) {root}/cells.gds
+set ::env(STA_CORNERS) "nom_tt_025C_1v80 nom_ss_100C_1v60"
+set ::env(LIB_SYNTH) {root}/cells__tt_025C_1v80.lib
+set ::env(LIB_SLOWEST) {root}/cells__ss_100C_1v60.lib
+set ::env(LIB_FASTEST) {root}/cells__ff_n40C_1v95.lib
+set ::env(SCL_GROUND_PINS) VGND
+set ::env(SCL_POWER_PINS) VPWR
+set ::env(FILL_CELL) fill
+set ::env(DECAP_CELL) decap
+set ::env(SYNTH_EXCLUSION_CELL_LIST) {root}/excluded.txt
+set ::env(PNR_EXCLUSION_CELL_LIST) {root}/excluded.txt
+set ::env(SYNTH_DRIVING_CELL) buf
+set ::env(SYNTH_DRIVING_CELL_PIN) X
+set ::env(SYNTH_TIEHI_PORT) "conb HI"
+set ::env(SYNTH_TIELO_PORT) "conb LO"
+set ::env(SYNTH_MIN_BUF_PORT) "buf A X"
+set ::env(DIODE_CELL) diode
+set ::env(DIODE_CELL_PIN) DIODE
+set ::env(CTS_ROOT_BUFFER) buf
+set ::env(CTS_CLK_BUFFERS) "buf"
+set ::env(FP_WELLTAP_CELL) tap
+set ::env(FP_ENDCAP_CELL) endcap
+set ::env(PLACE_SITE) unit
+set ::env(CELL_PAD_EXCLUDE) "tap*"
+if {{ [info exists ::env(TEST_TAPCELL_DIST)] }} {{
+    set ::env(FP_TAPCELL_DIST) $::env(TEST_TAPCELL_DIST)
+}}
+"""
+
+DESIGN_CONFIG = {
+    "DESIGN_NAME": "spm",
+    "VERILOG_FILES": "dir::*.v",
+    "CLOCK_PORT": "clk",
+    "CLOCK_PERIOD": 10,
+    "FP_CORE_UTIL": 50,
+    "PL_TARGET_DENSITY_PCT": "expr::$FP_CORE_UTIL + 5",
+    "pdk::fake*": {"GRT_ANTENNA_ITERS": 5},
+}
+
+
+@pytest.fixture
+def pdk_root(tmp_path):
+    root = tmp_path / "pdks"
+    scl_dir = root / PDK / "libs.tech" / "openlane" / SCL
+    os.makedirs(scl_dir)
+    for file in [
+        "tech.lef",
+        "cells.lef",
+        "cells.gds",
+        "tracks.info",
+        "cells__tt_025C_1v80.lib",
+        "cells__ss_100C_1v60.lib",
+        "cells__ff_n40C_1v95.lib",
+        "excluded.txt",
+    ]:
+        (root / file).write_text("")
+    pdk_config = PDK_CONFIG.format(root=root, scl=SCL)
+    pdk_config += "".join(f"set ::env({name}) 1\n" for name in PDK_NUMBERS)
+    (scl_dir.parent / "config.tcl").write_text(pdk_config)
+    (scl_dir / "config.tcl").write_text(SCL_CONFIG.format(root=root))
+
+    cache = get_pdk_config_cache()
+    set_pdk_config_cache(None)
+    yield str(root)
+    set_pdk_config_cache(cache)
+
+
+@pytest.fixture
+def config_file(tmp_path) -> str:
+    design_dir = tmp_path / "design"
+    os.makedirs(design_dir)
+    (design_dir / "spm.v").write_text("module spm(); endmodule\n")
+    config_file = design_dir / "config.json"
+    config_file.write_text(json.dumps(DESIGN_CONFIG))
+    return str(config_file)
+
+
+def _flow_variables():
+    Classic = Flow.factory.get("Classic")
+    assert Classic is not None
+    variables = {
+        variable.name: variable for variable in universal_flow_config_variables
+    }
+    for variable in Classic.config_vars:
+        variables[variable.name] = variable
+    for step in Classic.Steps:
+        for variable in step.config_vars:
+            variables[variable.name] = variable
+    return list(variables.values())
+
+
+def test_load_batch_matches_load(pdk_root, config_file):
+    flow_variables = _flow_variables()
+    variants: List[Union[List[str], Dict[str, Any]]] = [
+        [],
+        ["CLOCK_PERIOD=5"],
+        {"CLOCK_PERIOD": 15, "CLOCK_PORT": "ref::$DESIGN_NAME"},
+        # Referred to by PL_TARGET_DENSITY_PCT
+        ["FP_CORE_UTIL=40"],
+        # Assigned in a conditional block
+        ["GRT_ANTENNA_ITERS=10"],
+        ["STD_CELL_LIBRARY=fake_scl"],
+        ["FP_CORE_UTIL=abc"],
+        ["DIE_AREA=0 0 100"],
+    ]
+    configs, reports, design_dir = Config.load_batch(
+        config_file,
+        flow_variables,
+        variants,
+        pdk=PDK,
+        pdk_root=pdk_root,
+    )
+    assert design_dir == os.path.dirname(config_file)
+    assert [report.incremental for report in reports] == [
+        True,
+        True,
+        True,
+        True,
+        False,
+        False,
+        True,
+        True,
+    ]
+
+    for variant, config, report in zip(variants, configs, reports):
+        override_strings = variant
+        if isinstance(variant, dict):
+            override_strings = [f"{key}={value}" for key, value in variant.items()]
+        try:
+            expected, _ = Config.load(
+                config_file,
+                flow_variables,
+                config_override_strings=override_strings,
+                pdk=PDK,
+                pdk_root=pdk_root,
+            )
+        except Exception:
+            assert config is None, variant
+            assert len(report.errors) != 0
+            continue
+        assert config is not None, f"{variant}: {report.errors}"
+        assert config.to_raw_dict() == expected.to_raw_dict(), variant
+
+    assert configs[3]["PL_TARGET_DENSITY_PCT"] == 45
+    assert configs[4]["GRT_ANTENNA_ITERS"] == 10
+
+
+def test_pdk_config_cache(tmp_path, pdk_root, monkeypatch):
+    cache = DiskCache(str(tmp_path / "cache"), max_size=1024 * 1024)
+    set_pdk_config_cache(cache)
+    monkeypatch.delenv("TEST_TAPCELL_DIST", raising=False)
+
+    config, pdkpath, scl = Config._get_pdk_config(PDK, None, pdk_root)
+    assert scl == SCL
+    assert config["FP_TAPCELL_DIST"] == 1
+
+    # Loaded from the shared cache, without evaluating the PDK again
+    def evaluate(*args, **kwargs):
+        raise AssertionError("The PDK configuration has been evaluated again")
+
+    _pdk_configs.clear()
+    with monkeypatch.context() as m:
+        m.setattr(Config, "_evaluate_pdk_config", evaluate)
+        cached, cached_pdkpath, cached_scl = Config._get_pdk_config(PDK, None, pdk_root)
+    assert cached.to_raw_dict() == config.to_raw_dict()
+    assert (cached_pdkpath, cached_scl) == (pdkpath, scl)
+
+    entries = [
+        os.path.join(root, PDK_CONFIG_FILE)
+        for root, _, files in os.walk(cache.path)
+        if PDK_CONFIG_FILE in files
+    ]
+    assert len(entries) == 1
+    with open(entries[0]) as f:
+        assert json.load(f)["environment"] == {
+            "STD_CELL_LIBRARY": None,
+            "TEST_TAPCELL_DIST": None,
+        }
+
+
+def test_pdk_config_environment(tmp_path, pdk_root, monkeypatch):
+    set_pdk_config_cache(DiskCache(str(tmp_path / "cache"), max_size=1024 * 1024))
+    monkeypatch.delenv("TEST_TAPCELL_DIST", raising=False)
+    config, _, _ = Config._get_pdk_config(PDK, None, pdk_root)
+    assert config["FP_TAPCELL_DIST"] == 1
+
+    # Read by the SCL configuration file
+    monkeypatch.setenv("TEST_TAPCELL_DIST", "5")
+    config, _, _ = Config._get_pdk_config(PDK, None, pdk_root)
+    assert config["FP_TAPCELL_DIST"] == 5
+
+    _pdk_configs.clear()
+    monkeypatch.setenv("TEST_TAPCELL_DIST", "7")
+    config, _, _ = Config._get_pdk_config(PDK, None, pdk_root)
+    assert config["FP_TAPCELL_DIST"] == 7
@@ -0,0 +1,93 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from openlane.config.resolve import InvalidConfig, Resolver, process_config_dict
+
+EXPOSED = {
+    "PDK": "sky130A",
+    "PDKPATH": "/pdk/sky130A",
+    "STD_CELL_LIBRARY": "sky130_fd_sc_hd",
+    "DESIGN_DIR": "/d",
+}
+
+
+def test_reference_before_reassignment():
+    resolved = process_config_dict(
+        {"N": 10, "M": "expr::$N * 2", "pdk::sky*": {"N": 20}},
+        EXPOSED,
+    )
+    assert resolved["M"] == "20.0"
+    assert resolved["N"] == 20
+
+    resolved = process_config_dict(
+        {"A": "dir::x", "B": "ref::$A", "pdk::*": {"A": "dir::y"}},
+        EXPOSED,
+    )
+    assert resolved["B"] == "/d/x"
+    assert resolved["A"] == "/d/y"
+
+
+def test_reference_after_reassignment():
+    resolved = process_config_dict(
+        {"N": 10, "pdk::sky*": {"N": 20}, "M": "expr::$N * 2"},
+        EXPOSED,
+    )
+    assert resolved["M"] == "40.0"
+
+
+def test_self_reference():
+    resolved = process_config_dict(
+        {
+            "A": 4,
+            "pdk::sky130A": {"A": "expr::$A * 10"},
+            "scl::*_hd": {"A": "expr::$A + 2"},
+        },
+        EXPOSED,
+    )
+    assert resolved["A"] == "42.0"
+
+
+def test_forward_reference():
+    resolved = process_config_dict(
+        {"A": "ref::$B/x", "C": "expr::$D * 2", "B": "/b", "D": 4},
+        EXPOSED,
+    )
+    assert resolved["A"] == "/b/x"
+    assert resolved["C"] == "8.0"
+
+    # Keys only assigned later get their final value
+    resolved = process_config_dict(
+        {"M": "expr::$N * 2", "N": 10, "pdk::sky*": {"N": 20}},
+        EXPOSED,
+    )
+    assert resolved["M"] == "40.0"
+
+
+def test_circular_reference():
+    with pytest.raises(InvalidConfig, match="A -> B -> A"):
+        process_config_dict({"A": "ref::$B", "B": "ref::$A"}, EXPOSED)
+
+
+def test_override():
+    resolver = Resolver(
+        {"N": 10, "M": "expr::$N * 2", "X": 1},
+        EXPOSED,
+    )
+    assert resolver.override({"N": 5, "Y": "expr::$N + 1"}) == {
+        "N": 5,
+        "M": "10.0",
+        "Y": "6.0",
+    }
+    assert resolver.resolved()["M"] == "20.0"
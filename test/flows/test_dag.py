@@ -0,0 +1,233 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from openlane.common import get_tpe, set_tpe
+from openlane.config import Config
+from openlane.flows import DAGFlow, FlowError, SequentialFlow
+from openlane.flows.dag import get_step_dependencies
+from openlane.state import DesignFormat, Path
+from openlane.steps import Step
+from openlane.steps.checker import MetricChecker
+from openlane.steps.scheduler import (
+    ResourceScheduler,
+    get_scheduler,
+    set_scheduler,
+)
+
+ran: List[str] = []
+linting = threading.Event()
+
+
+def _write(step: Step, format: DesignFormat) -> Path:
+    path = os.path.join(step.step_dir, f"design.{format.value.extension}")
+    with open(path, "w") as f:
+        f.write(step.id)
+    return Path(path)
+
+
+class Synthesis(Step):
+    id = "Test.Synthesis"
+    inputs = []
+    outputs = [DesignFormat.NETLIST]
+
+    def run(self, state_in, **kwargs):
+        ran.append(self.id)
+        return {DesignFormat.NETLIST: _write(self, DesignFormat.NETLIST)}, {
+            "test__violations": 1
+        }
+
+
+class Place(Step):
+    id = "Test.Place"
+    inputs = [DesignFormat.NETLIST]
+    outputs = [DesignFormat.ODB]
+
+    def run(self, state_in, **kwargs):
+        ran.append(self.id)
+        # Only returns if Lint runs at the same time
+        assert linting.wait(10), "Place and Lint were not run simultaneously"
+        return {DesignFormat.ODB: _write(self, DesignFormat.ODB)}, {"place": 1}
+
+
+class Lint(Step):
+    id = "Test.Lint"
+    inputs = [DesignFormat.NETLIST]
+    outputs = [DesignFormat.DEF]
+
+    def run(self, state_in, **kwargs):
+        ran.append(self.id)
+        linting.set()
+        return {DesignFormat.DEF: _write(self, DesignFormat.DEF)}, {"lint": 1}
+
+
+class Route(Step):
+    id = "Test.Route"
+    inputs = [DesignFormat.ODB, DesignFormat.DEF]
+    outputs = [DesignFormat.GDS]
+
+    def run(self, state_in, **kwargs):
+        ran.append(self.id)
+        assert state_in[DesignFormat.ODB] is not None
+        assert state_in[DesignFormat.DEF] is not None
+        return {DesignFormat.GDS: _write(self, DesignFormat.GDS)}, {}
+
+
+class STA(Step):
+    id = "Test.STA"
+    inputs = [DesignFormat.NETLIST]
+    outputs = [DesignFormat.SPEF]
+
+
+class Resize(Step):
+    id = "Test.Resize"
+    inputs = []
+    outputs = [DesignFormat.SPEF]
+
+
+class Gate(MetricChecker):
+    id = "Test.Gate"
+    deferred = False
+
+    def get_metric_name(self) -> str:
+        return "test__violations"
+
+    def get_metric_description(self) -> str:
+        return "Test violations"
+
+
+class DeferredGate(Gate):
+    id = "Test.DeferredGate"
+    deferred = True
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    ran.clear()
+    linting.clear()
+    # Steps are run on the thread pool with the resources of the scheduler,
+    # both of which default to the number of CPUs
+    tpe, scheduler = get_tpe(), get_scheduler()
+    set_tpe(ThreadPoolExecutor(max_workers=4))
+    set_scheduler(ResourceScheduler(4))
+    yield
+    get_tpe().shutdown()
+    set_tpe(tpe)
+    set_scheduler(scheduler)
+
+
+def _start(Flow, tmp_path, **kwargs):
+    flow = Flow(
+        Config({"DESIGN_DIR": str(tmp_path), "DESIGN_NAME": "spm"}),
+        **kwargs,
+    )
+    try:
+        return flow.start(tag="test")
+    finally:
+        # Left running if the flow fails
+        if flow._progress is not None:
+            flow._progress.stop()
+
+
+def test_dependencies():
+    assert get_step_dependencies([Synthesis, Place, Lint, Route]) == [
+        set(),
+        {0},
+        {0},
+        {1, 2},
+    ]
+
+
+def test_multiple_view_dependencies():
+    # Formats with multiple views are read-modify-written, so writes by
+    # two steps are ordered
+    assert get_step_dependencies([Synthesis, Resize, STA]) == [
+        set(),
+        set(),
+        {0, 1},
+    ]
+
+
+def test_checker_dependencies():
+    assert get_step_dependencies(
+        [Synthesis, Resize, DeferredGate, Place, Gate, Lint, STA]
+    ) == [
+        set(),
+        set(),
+        # Checkers depend on all earlier steps that are not checkers
+        {0, 1},
+        {0},
+        {0, 1, 3},
+        # Steps after an immediate checker depend on it
+        {0, 4},
+        {0, 1, 4},
+    ]
+
+
+def test_run(tmp_path):
+    class Flow(DAGFlow):
+        Steps = [Synthesis, Place, Lint, Route]
+
+    state = _start(Flow, tmp_path, max_concurrent_steps=2)
+    assert ran[0] == "Test.Synthesis"
+    assert ran[-1] == "Test.Route"
+    assert state.metrics["place"] == 1
+    assert state.metrics["lint"] == 1
+    for format in [
+        DesignFormat.NETLIST,
+        DesignFormat.ODB,
+        DesignFormat.DEF,
+        DesignFormat.GDS,
+    ]:
+        assert state[format] is not None
+
+
+def test_same_result_as_sequential(tmp_path):
+    class Flow(DAGFlow):
+        Steps = [Synthesis, Place, Lint, Route]
+
+    dag_state = _start(Flow, tmp_path / "dag", max_concurrent_steps=2)
+    linting.set()
+
+    class Sequential(SequentialFlow):
+        Steps = [Synthesis, Place, Lint, Route]
+
+    sequential_state = _start(Sequential, tmp_path / "sequential")
+    assert dict(dag_state.metrics) == dict(sequential_state.metrics)
+    assert {format for format, value in dag_state.items() if value is not None} == {
+        format for format, value in sequential_state.items() if value is not None
+    }
+
+
+def test_immediate_checker_gates(tmp_path):
+    class Flow(DAGFlow):
+        Steps = [Synthesis, Gate, Lint]
+
+    with pytest.raises(FlowError):
+        _start(Flow, tmp_path, max_concurrent_steps=4)
+    assert "Test.Lint" not in ran
+
+
+def test_deferred_checker_does_not_gate(tmp_path):
+    class Flow(DAGFlow):
+        Steps = [Synthesis, DeferredGate, Lint]
+
+    with pytest.raises(FlowError, match="deferred"):
+        _start(Flow, tmp_path, max_concurrent_steps=4)
+    assert "Test.Lint" in ran
@@ -0,0 +1,183 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from openlane.config import Config, Variable
+from openlane.flows import FlowError
+from openlane.flows.exploration import (
+    REPORT_FILE,
+    Exploration,
+    evaluate_metric_expression,
+    grid_point,
+    grid_size,
+    sample_grid,
+)
+from openlane.state import State
+from openlane.steps import Step, StepError
+
+SPACE = {"A": [1, 2, 3], "B": ["x", "y"]}
+
+
+def test_grid():
+    assert grid_size(SPACE) == 6
+    assert [grid_point(SPACE, i) for i in range(6)] == [
+        {"A": 1, "B": "x"},
+        {"A": 1, "B": "y"},
+        {"A": 2, "B": "x"},
+        {"A": 2, "B": "y"},
+        {"A": 3, "B": "x"},
+        {"A": 3, "B": "y"},
+    ]
+    assert sample_grid(SPACE) == [grid_point(SPACE, i) for i in range(6)]
+    assert sample_grid(SPACE, 10) == sample_grid(SPACE)
+
+
+def test_random_sampling():
+    space = {"A": list(range(100)), "B": list(range(100))}
+    sampled = sample_grid(space, 20, seed=1)
+    assert len(sampled) == 20
+    assert len({(point["A"], point["B"]) for point in sampled}) == 20
+    assert sample_grid(space, 20, seed=1) == sampled
+    assert sample_grid(space, 20, seed=2) != sampled
+
+
+def test_metric_expressions():
+    metrics = {"area": 10, "timing__setup__ws__corner:nom": -1}
+    assert evaluate_metric_expression("$area * 2", metrics) == 20
+    assert evaluate_metric_expression("${timing__setup__ws__corner:nom}", metrics) == -1
+    assert evaluate_metric_expression("$power", metrics) is None
+
+
+class Synthesis(Step):
+    id = "Test.Synthesis"
+    inputs = []
+    outputs = []
+    config_vars = [Variable("TEST_SIZE", int, "A size.")]
+
+    def run(self, state_in, **kwargs):
+        size = self.config["TEST_SIZE"]
+        if size < 0:
+            raise StepError("Negative size")
+        return {}, {"test__area": size * 10}
+
+
+class Route(Step):
+    id = "Test.Route"
+    inputs = []
+    outputs = []
+
+    def run(self, state_in, **kwargs):
+        return {}, {"test__area": state_in.metrics["test__area"] + 1}
+
+
+class Explore(Exploration):
+    Steps = [Synthesis, Route]
+
+
+def _explore(tmp_path, sizes, **config) -> Tuple[State, Dict[int, Dict[str, Any]]]:
+    strategy = next(
+        variable.type
+        for variable in Exploration.config_vars
+        if variable.name == "EXPLORATION_STRATEGY"
+    )
+    flow = Explore(
+        Config(
+            {
+                "DESIGN_DIR": str(tmp_path),
+                "DESIGN_NAME": "spm",
+                "TEST_SIZE": 1,
+                "EXPLORATION_SPACE": {"TEST_SIZE": sizes},
+                "EXPLORATION_SAMPLES": None,
+                "EXPLORATION_SEED": 0,
+                "EXPLORATION_OBJECTIVE": "$test__area",
+                "EXPLORATION_MAXIMIZE": False,
+                "EXPLORATION_PRUNING_METRICS": None,
+                "EXPLORATION_RUNGS": None,
+                "EXPLORATION_REDUCTION_FACTOR": 2,
+                # Candidates are run in order
+                "EXPLORATION_CONCURRENCY": 1,
+                **config,
+                "EXPLORATION_STRATEGY": strategy(
+                    config.get("EXPLORATION_STRATEGY", "grid")
+                ),
+            }
+        )
+    )
+    try:
+        state = flow.start(tag="explore")
+    finally:
+        # Left running if the flow fails
+        if flow._progress is not None:
+            flow._progress.stop()
+    report = json.load(open(os.path.join(tmp_path, "runs", "explore", REPORT_FILE)))
+    return state, {
+        candidate["overrides"]["TEST_SIZE"]: candidate for candidate in report
+    }
+
+
+def test_grid_exploration(tmp_path):
+    state, report = _explore(tmp_path / "min", [3, 1, 2])
+    assert state.metrics["test__area"] == 11
+    assert {size: c["status"] for size, c in report.items()} == {
+        3: "complete",
+        1: "complete",
+        2: "complete",
+    }
+
+    state, _ = _explore(tmp_path / "max", [3, 1, 2], EXPLORATION_MAXIMIZE=True)
+    assert state.metrics["test__area"] == 31
+
+
+def test_failed_candidates(tmp_path):
+    state, report = _explore(tmp_path, [-1, 2, 1])
+    assert report[-1]["status"] == "failed"
+    assert state.metrics["test__area"] == 11
+
+    with pytest.raises(FlowError, match="no candidate"):
+        _explore(tmp_path / "none", [-1])
+
+
+def test_successive_halving(tmp_path):
+    state, report = _explore(
+        tmp_path,
+        [4, 2, 3, 1],
+        EXPLORATION_STRATEGY="successive_halving",
+        EXPLORATION_RUNGS=["Test.Synthesis"],
+    )
+    assert state.metrics["test__area"] == 11
+    assert {size: c["status"] for size, c in report.items()} == {
+        4: "eliminated",
+        2: "complete",
+        3: "eliminated",
+        1: "complete",
+    }
+    assert report[4]["steps_run"] == 1
+    assert report[2]["steps_run"] == 2
+
+
+def test_pruning(tmp_path):
+    state, report = _explore(
+        tmp_path,
+        [2, 3, 1],
+        EXPLORATION_PRUNING_METRICS=["$test__area"],
+    )
+    assert state.metrics["test__area"] == 11
+    # Worse than the best candidate to have completed after the first step
+    assert report[3]["status"] == "pruned"
+    assert report[3]["steps_run"] == 1
+    assert report[1]["status"] == "complete"
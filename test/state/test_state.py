@@ -0,0 +1,100 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+
+import pytest
+
+from openlane.common import GenericImmutableDict
+from openlane.state import DesignFormat, InvalidState, State
+
+
+def _state(tmp_path, name: str) -> State:
+    netlist = tmp_path / f"{name}.nl.v"
+    netlist.write_text(f"module {name}; endmodule\n")
+    return State(
+        overrides={DesignFormat.NETLIST: str(netlist)},
+        metrics={"design__instance__count": len(name)},
+    )
+
+
+def _derive(state: State, **metrics) -> State:
+    return State(
+        state,
+        metrics=GenericImmutableDict(state.metrics, overrides=metrics),
+    )
+
+
+def test_round_trip(tmp_path):
+    state = _state(tmp_path, "spm")
+    path = tmp_path / "state_out.json"
+    state.save(path)
+
+    # Self-contained: loadable by anything that reads JSON
+    with open(path, encoding="utf8") as f:
+        assert State.parent_key not in json.load(f)
+    with open(path, encoding="utf8") as f:
+        loaded = State.loads(f.read())
+    assert loaded.to_raw_dict() == state.to_raw_dict()
+    assert State.load(path).to_raw_dict() == state.to_raw_dict()
+
+
+def test_delta_round_trip(tmp_path):
+    parent = _state(tmp_path, "spm")
+    parent.save(tmp_path / "state_in.json")
+    child = _derive(parent, timing__setup__ws=1)
+    os.mkdir(tmp_path / "step")
+    child_path = tmp_path / "step" / "state_out.json"
+    child.save(child_path, parent=parent)
+
+    with open(child_path, encoding="utf8") as f:
+        raw = json.load(f)
+    assert raw[State.parent_key] == os.path.join("..", "state_in.json")
+    assert raw["metrics"] == {"timing__setup__ws": 1}
+
+    # Relative to the delta file, not the current working directory
+    loaded = State.load(child_path)
+    assert loaded.to_raw_dict() == child.to_raw_dict()
+
+    with open(child_path, encoding="utf8") as f:
+        with pytest.raises(InvalidState):
+            State.loads(f.read())
+
+
+def test_delta_chain_round_trip(tmp_path):
+    state = _state(tmp_path, "spm")
+    state.save(tmp_path / "0.json")
+    for i in range(1, 4):
+        derived = _derive(state, **{f"step{i}": i})
+        derived.save(tmp_path / f"{i}.json", parent=state)
+        state = derived
+
+    loaded = State.load(tmp_path / "3.json")
+    assert loaded.to_raw_dict(metrics=False) == state.to_raw_dict(metrics=False)
+    assert loaded.metrics.to_raw_dict() == state.metrics.to_raw_dict()
+
+
+def test_delta_parent_loaded_lazily(tmp_path):
+    parent = _state(tmp_path, "spm")
+    parent_path = tmp_path / "state_in.json"
+    parent.save(parent_path)
+    child = _derive(parent, timing__setup__ws=1)
+    child_path = tmp_path / "state_out.json"
+    child.save(child_path, parent=parent)
+
+    loaded = State.load(child_path, validate_path=False)
+    os.unlink(parent_path)
+    assert loaded.metrics["timing__setup__ws"] == 1
+    with pytest.raises(FileNotFoundError):
+        loaded.metrics["design__instance__count"]
@@ -0,0 +1,86 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+
+from openlane.common import GenericDict
+from openlane.config import Config
+from openlane.state import State
+from openlane.steps.cache import get_step_key
+from openlane.steps.magic import StreamOut
+from openlane.steps.yosys import Synthesis
+
+
+class _Synthesis(Synthesis):
+    # Skips the constructor, which needs a full configuration
+    def __init__(self, config: Config):
+        self.config = config
+
+
+def _get_key(include_dir: str) -> str:
+    variable = next(
+        variable
+        for variable in Synthesis.config_vars
+        if variable.name == "VERILOG_INCLUDE_DIRS"
+    )
+    _, include_dirs = variable.compile(
+        GenericDict({"VERILOG_INCLUDE_DIRS": [include_dir]}), [], {}
+    )
+    key = get_step_key(
+        _Synthesis(Config({"VERILOG_INCLUDE_DIRS": include_dirs})),
+        State(),
+    )
+    assert key is not None
+    return key
+
+
+def test_included_header_edit_misses(tmp_path):
+    include_dir = tmp_path / "include"
+    os.makedirs(include_dir / "nested")
+    header = include_dir / "nested" / "defines.vh"
+    header.write_text("`define WIDTH 8\n")
+
+    key = _get_key(str(include_dir))
+    assert _get_key(str(include_dir)) == key
+
+    header.write_text("`define WIDTH 16\n")
+    assert _get_key(str(include_dir)) != key
+
+
+class _StreamOut(StreamOut):
+    def __init__(self, config: Config):
+        self.config = config
+
+
+def test_input_metrics_in_key():
+    step = _StreamOut(Config({}))
+    keys = set()
+    for bbox in ["0 0 100 100", "0 0 200 200"]:
+        keys.add(get_step_key(step, State(metrics={"design__die__bbox": bbox})))
+    assert len(keys) == 2
+    # Metrics the step does not read are not part of the key
+    assert get_step_key(step, State(metrics={"design__die__bbox": bbox})) == (
+        get_step_key(
+            step,
+            State(metrics={"design__die__bbox": bbox, "timing__setup__ws": 1}),
+        )
+    )
+
+
+def test_entire_config_in_tcl_step_key():
+    keys = set()
+    for density in [0.5, 0.6]:
+        # Not one of the variables of the step
+        config = Config({"PL_TARGET_DENSITY_PCT": density})
+        keys.add(get_step_key(_Synthesis(config), State()))
+    assert len(keys) == 2
@@ -0,0 +1,26 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from openlane.steps.executor import LocalWorkerPool
+from openlane.steps.scheduler import GiB
+
+
+def test_local_worker_pool_splits_budgets():
+    pool = LocalWorkerPool(4, threads=8, memory=16 * GiB)
+    try:
+        for process in pool.processes:
+            args = process.args
+            assert args[args.index("--jobs") + 1] == "2"
+            assert float(args[args.index("--max-memory") + 1]) == 4
+    finally:
+        pool.shutdown()
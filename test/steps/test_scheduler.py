@@ -0,0 +1,106 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+import asyncio
+import threading
+from typing import Callable, List
+
+from openlane.steps.scheduler import GiB, ResourceRequest, ResourceScheduler
+
+
+def _wait_for(condition: Callable[[], bool]):
+    deadline = time.monotonic() + 10
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def _acquire_in_thread(
+    scheduler: ResourceScheduler,
+    request: ResourceRequest,
+    granted: List[ResourceRequest],
+) -> threading.Thread:
+    thread = threading.Thread(
+        target=lambda: granted.append(scheduler.acquire(request)),
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def test_clamping():
+    scheduler = ResourceScheduler(4, 8 * GiB)
+    reserved = scheduler.acquire(ResourceRequest(16, 32 * GiB))
+    assert reserved == ResourceRequest(4, 8 * GiB)
+    assert scheduler.usage() == (4, 8 * GiB)
+    scheduler.release(reserved)
+    assert scheduler.usage() == (0, 0)
+
+    # Memory is not accounted for without a memory budget
+    scheduler = ResourceScheduler(4)
+    assert scheduler.acquire(ResourceRequest(2, 32 * GiB)) == ResourceRequest(2, 0)
+    assert scheduler.usage() == (2, None)
+
+
+def test_empty_requests_do_not_wait():
+    scheduler = ResourceScheduler(1)
+    scheduler.acquire(ResourceRequest(1))
+    assert scheduler.acquire(ResourceRequest(0)).is_empty()
+
+
+def test_fifo_order():
+    scheduler = ResourceScheduler(4)
+    held = scheduler.acquire(ResourceRequest(3))
+
+    granted: List[ResourceRequest] = []
+    large = _acquire_in_thread(scheduler, ResourceRequest(4), granted)
+    _wait_for(lambda: len(scheduler.waiting()) == 1)
+    # Would fit, but is not admitted before the earlier, larger request
+    small = _acquire_in_thread(scheduler, ResourceRequest(1), granted)
+    _wait_for(lambda: len(scheduler.waiting()) == 2)
+    assert scheduler.waiting() == [ResourceRequest(4), ResourceRequest(1)]
+    assert granted == []
+
+    scheduler.release(held)
+    large.join(10)
+    assert granted == [ResourceRequest(4)]
+    assert scheduler.waiting() == [ResourceRequest(1)]
+
+    scheduler.release(granted[0])
+    small.join(10)
+    assert granted == [ResourceRequest(4), ResourceRequest(1)]
+    assert scheduler.usage() == (1, None)
+
+
+def test_cancelled_async_request():
+    scheduler = ResourceScheduler(2)
+    held = scheduler.acquire(ResourceRequest(1))
+
+    async def main():
+        large = asyncio.ensure_future(scheduler.acquire_async(ResourceRequest(2)))
+        await asyncio.sleep(0)
+        small = asyncio.ensure_future(scheduler.acquire_async(ResourceRequest(1)))
+        await asyncio.sleep(0)
+        assert scheduler.waiting() == [ResourceRequest(2), ResourceRequest(1)]
+
+        # Cancelling the request blocking the queue admits the ones after it
+        large.cancel()
+        assert await small == ResourceRequest(1)
+        assert large.cancelled()
+
+    asyncio.run(main())
+    assert scheduler.waiting() == []
+    assert scheduler.usage() == (2, None)
+    scheduler.release(held)
+    assert scheduler.usage() == (1, None)
@@ -0,0 +1,39 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+
+from openlane.steps.supervisor import ProcessJob, ProcessSupervisor
+
+
+def test_stopped_group_does_not_spin():
+    supervisor = ProcessSupervisor()
+    jobs = {
+        "hit": ProcessJob(
+            ["sh", "-c", "echo hit; sleep 2"],
+            stops_group=lambda line: line.strip() == "hit",
+        ),
+        "miss": ProcessJob(["sh", "-c", "sleep 30"]),
+    }
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    results = supervisor.run_group(jobs)
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - start
+
+    assert list(results) == ["hit"]
+    assert results["hit"].returncode == 0
+    assert wall_time < 10
+    # The supervisor waits for the stopping process to finish without polling
+    assert cpu_time < 0.5
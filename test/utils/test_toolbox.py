@@ -0,0 +1,119 @@
+# Copyright 2023 Efabless Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import List
+
+from openlane.config import Config, Macro
+from openlane.state import DesignFormat, Path
+from openlane.utils import Toolbox
+
+
+def _config() -> Config:
+    return Config(
+        {
+            "DEFAULT_CORNER": "nom_tt_025C_1v80",
+            "LIB": {
+                "nom_*": [Path("/pdk/nom.lib")],
+                "max_*": [Path("/pdk/max.lib")],
+            },
+            "TECH_LEFS": {"nom_*": Path("/pdk/nom.tlef")},
+            "MACROS": None,
+        }
+    )
+
+
+def _counting_toolbox(tmp_path, calls: List[str]) -> Toolbox:
+    toolbox = Toolbox(str(tmp_path))
+    filter_views = toolbox._filter_views
+
+    def counting(views_by_corner, timing_corner):
+        calls.append(timing_corner)
+        return filter_views(views_by_corner, timing_corner)
+
+    toolbox._filter_views = counting  # type: ignore
+    return toolbox
+
+
+def test_memoized(tmp_path):
+    calls: List[str] = []
+    toolbox = _counting_toolbox(tmp_path, calls)
+    config = _config()
+
+    expected = ("nom_tt_025C_1v80", ["/pdk/nom.lib"])
+    assert toolbox.get_timing_files(config) == expected
+    assert toolbox.get_timing_files(config) == expected
+    assert len(calls) == 1
+
+    # Returned lists are copies
+    toolbox.get_timing_files(config)[1].append("/pdk/extra.lib")
+    assert toolbox.get_timing_files(config) == expected
+
+    # Copies with unrelated changes share the index
+    assert toolbox.get_timing_files(config.copy(OTHER=1)) == expected
+    assert len(calls) == 1
+
+    assert toolbox.get_timing_files(config, "max_ss_100C_1v60") == (
+        "max_ss_100C_1v60",
+        ["/pdk/max.lib"],
+    )
+    assert len(calls) == 2
+
+
+def test_invalidation(tmp_path):
+    calls: List[str] = []
+    toolbox = _counting_toolbox(tmp_path, calls)
+    config = _config()
+    toolbox.get_timing_files(config)
+
+    changed = config.copy(LIB={"nom_*": [Path("/pdk/other.lib")]})
+    assert toolbox.get_timing_files(changed) == (
+        "nom_tt_025C_1v80",
+        ["/pdk/other.lib"],
+    )
+    assert len(calls) == 2
+
+    changed = config.copy(DEFAULT_CORNER="max_ss_100C_1v60")
+    assert toolbox.get_timing_files(changed) == (
+        "max_ss_100C_1v60",
+        ["/pdk/max.lib"],
+    )
+
+    assert toolbox.get_macro_views(config, DesignFormat.LEF) == []
+    macro = Macro(
+        gds=[Path("/macros/spm.gds")],
+        lef=[Path("/macros/spm.lef")],
+        lib={"nom_*": [Path("/macros/spm.lib")]},
+    )
+    changed = config.copy(MACROS={"spm": macro})
+    assert toolbox.get_macro_views(changed, DesignFormat.LEF) == ["/macros/spm.lef"]
+    assert toolbox.get_timing_files(changed) == (
+        "nom_tt_025C_1v80",
+        ["/pdk/nom.lib", "/macros/spm.lib"],
+    )
+
+    # The original configuration is still memoized
+    count = len(calls)
+    assert toolbox.get_timing_files(config) == ("nom_tt_025C_1v80", ["/pdk/nom.lib"])
+    assert len(calls) == count
+
+
+def test_eviction(tmp_path):
+    calls: List[str] = []
+    toolbox = _counting_toolbox(tmp_path, calls)
+    config = _config()
+    toolbox.get_timing_files(config)
+    for i in range(Toolbox.max_view_indices):
+        toolbox.get_timing_files(config.copy(LIB={"nom_*": [Path(f"/pdk/{i}.lib")]}))
+    count = len(calls)
+    toolbox.get_timing_files(config)
+    assert len(calls) == count + 1